@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for Maya ASCII compaction. Maya is not available outside of a Maya session, so load time is measured as
+the time needed to parse and tokenize all the statements of the file, which is what Maya replays when loading it
+Usage: python benchmarks/bench_asciiscene.py [node_count] [vertex_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import shutil
+import timeit
+import tempfile
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asciiscene
+
+
+def _load(file_path):
+    statement_count = 0
+    with open(file_path, 'r') as fh:
+        for statement in asciiscene.iterate_statements(fh):
+            statement.get_tokens()
+            statement_count += 1
+
+    return statement_count
+
+
+def main(node_count=20000, vertex_count=200000):
+    data_path = tempfile.mkdtemp()
+    timer = timeit.default_timer
+    try:
+        file_path = os.path.join(data_path, 'rig.ma')
+        with open(file_path, 'w') as fh:
+            fh.write('//Maya ASCII 2020 scene\nrequires maya "2020";\n')
+            fh.write('requires -nodeType "aiStandardSurface" "mtoa" "4.0.0";\n')
+            for i in range(node_count):
+                fh.write('createNode transform -n "ctrl_{}";\n'.format(i))
+                fh.write('\tsetAttr ".v" yes;\n\tsetAttr ".t" -type "double3" 0 0 0 ;\n')
+                fh.write('\tsetAttr ".r" -type "double3" 0 0 0 ;\n\tsetAttr ".r" -type "double3" 0 {} 0 ;\n'.format(i))
+                fh.write('\tsetAttr -k off ".sx";\n')
+            fh.write('createNode mesh -n "bodyShape";\n')
+            for i in range(vertex_count):
+                fh.write('\tsetAttr ".pt[{}]" -type "float3" 0 0.1 0 ;\n'.format(i))
+
+        start = timer()
+        statements = _load(file_path)
+        print('load original ({:.1f} MB, {} statements): {:.3f}s'.format(
+            os.path.getsize(file_path) / 1e6, statements, timer() - start))
+
+        start = timer()
+        stats = asciiscene.compact_maya_ascii(file_path)
+        print('compaction: {:.3f}s'.format(timer() - start))
+        print('removed {} bytes and {} statements'.format(
+            stats['bytes_before'] - stats['bytes_after'], stats['statements_before'] - stats['statements_after']))
+
+        start = timer()
+        statements = _load(file_path)
+        print('load compacted ({:.1f} MB, {} statements): {:.3f}s'.format(
+            os.path.getsize(file_path) / 1e6, statements, timer() - start))
+    finally:
+        shutil.rmtree(data_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
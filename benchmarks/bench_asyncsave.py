@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for rig builder background saves. Compares the time the caller is blocked when skin weights are written
+synchronously and when they are written by the background save queue
+Usage: python benchmarks/bench_asyncsave.py [vertex_count] [influence_count] [mesh_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import shutil
+import timeit
+import tempfile
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asyncsave, skinweights
+
+
+def main(vertex_count=100000, influence_count=20, mesh_count=4):
+    data_path = tempfile.mkdtemp()
+    timer = timeit.default_timer
+    try:
+        random_state = np.random.RandomState(0)
+        dense = random_state.rand(vertex_count, influence_count)
+        dense *= random_state.rand(vertex_count, influence_count) > 0.8
+        matrix = skinweights.SkinWeightsMatrix.from_dense(
+            dense, ['joint{}'.format(i) for i in range(influence_count)])
+
+        start = timer()
+        for i in range(mesh_count):
+            skinweights.write_mesh_folder(os.path.join(data_path, 'sync', 'mesh{}'.format(i)), matrix)
+        print('synchronous save ({} meshes): {:.3f}s blocked'.format(mesh_count, timer() - start))
+
+        save_queue = asyncsave.SaveQueue()
+        start = timer()
+        for i in range(mesh_count):
+            save_queue.submit(
+                os.path.join(data_path, 'async', 'mesh{}'.format(i)), skinweights.write_mesh_folder, args=(matrix, ))
+        blocked_time = timer() - start
+        save_queue.flush()
+        print('background save: {:.3f}s blocked, {:.3f}s until flushed'.format(blocked_time, timer() - start))
+    finally:
+        shutil.rmtree(data_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for rig builder data catalog. Compares parsing all data files with catalog cold and warm updates
+Usage: python benchmarks/bench_catalog.py [file_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import shutil
+import timeit
+import tempfile
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import catalog
+
+MAYA_ASCII_HEADER = """//Maya ASCII 2020 scene
+requires maya "2020";
+requires "mtoa" "4.0.0";
+currentUnit -l centimeter -a degree -t film;
+fileInfo "application" "maya";
+"""
+
+
+def main(file_count=3000):
+    data_path = tempfile.mkdtemp()
+    timer = timeit.default_timer
+    try:
+        body = 'createNode transform -n "node";\n    setAttr ".t" -type "double3" 0 1 0 ;\n' * 200
+        for i in range(file_count):
+            with open(os.path.join(data_path, 'data_{}.ma'.format(i)), 'w') as fh:
+                fh.write(MAYA_ASCII_HEADER + body)
+
+        start = timer()
+        for file_name in os.listdir(data_path):
+            catalog.get_maya_ascii_info(os.path.join(data_path, file_name))
+        print('parse all files: {:.3f}s'.format(timer() - start))
+
+        data_types = {'.ma': ('maya.ascii', catalog.get_maya_ascii_info)}
+        data_catalog = catalog.DataCatalog(data_path, data_types=data_types)
+        start = timer()
+        data_catalog.update()
+        print('catalog cold update ({} files): {:.3f}s'.format(file_count, timer() - start))
+
+        data_catalog.close()
+        data_catalog = catalog.DataCatalog(data_path, data_types=data_types)
+        start = timer()
+        data_catalog.update()
+        print('catalog warm update: {:.3f}s'.format(timer() - start))
+
+        start = timer()
+        entries = data_catalog.find(data_type='maya.ascii', name='data_1*')
+        print('query by type and name ({} results): {:.4f}s'.format(len(entries), timer() - start))
+        data_catalog.close()
+    finally:
+        shutil.rmtree(data_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
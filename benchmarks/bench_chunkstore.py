@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for rig builder content addressed chunk store. Stores a history of edited Maya ASCII file versions and
+compares the disk usage with storing full copies of each version
+Usage: python benchmarks/bench_chunkstore.py [node_count] [version_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import random
+import shutil
+import timeit
+import tempfile
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import chunkstore
+
+
+def main(node_count=100000, version_count=20):
+    data_path = tempfile.mkdtemp()
+    timer = timeit.default_timer
+    generator = random.Random(0)
+    try:
+        lines = list()
+        for i in range(node_count):
+            lines.append('createNode transform -n "node_{}";\n'.format(i))
+            lines.append('    setAttr ".t" -type "double3" {:.4f} {:.4f} 0 ;\n'.format(
+                generator.random(), generator.random()))
+
+        file_path = os.path.join(data_path, 'rig.ma')
+        full_size = 0
+        store_time = 0.0
+        for version in range(version_count):
+            # Each version edits a few random attributes, as a typical rig iteration would do
+            for _ in range(10):
+                index = generator.randrange(node_count) * 2 + 1
+                lines[index] = '    setAttr ".t" -type "double3" {:.4f} 0 0 ;\n'.format(generator.random())
+            with open(file_path, 'w') as fh:
+                fh.writelines(lines)
+            full_size += os.path.getsize(file_path)
+
+            start = timer()
+            chunkstore.store_data_version(file_path)
+            store_time += timer() - start
+
+        data_store = chunkstore.get_data_store(data_path)
+        print('stored {} versions of {:.1f} MB: {:.3f}s ({:.1f} MB/s)'.format(
+            version_count, os.path.getsize(file_path) / 1e6, store_time, full_size / 1e6 / store_time))
+        print('full copies: {:.1f} MB, chunk store: {:.1f} MB'.format(full_size / 1e6, data_store.disk_usage() / 1e6))
+
+        start = timer()
+        chunkstore.restore_data_version(file_path, version=1)
+        print('restore first version: {:.3f}s'.format(timer() - start))
+    finally:
+        shutil.rmtree(data_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,104 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for rig control storage. Compares the previous lists and nested dictionaries layout with the control table
+Usage: python benchmarks/bench_controltable.py [control_count] [query_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+import tracemalloc
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import controltable
+
+
+def _build_dictionaries(control_count):
+    controls = list()
+    sub_controls = list()
+    controls_dict = dict()
+    sub_controls_with_buffer = list()
+    for i in range(control_count):
+        control_name = 'CNT_control{}_l'.format(i)
+        controls.append(control_name)
+        sub_controls_with_buffer.append(None)
+        controls_dict[control_name] = dict()
+        controls_dict[control_name]['buffer'] = 'buffer_control{}_l'.format(i)
+        if i % 4 == 0:
+            sub_name = 'CNT_control{}Sub_l'.format(i)
+            sub_controls.append(sub_name)
+            sub_controls_with_buffer[-1] = sub_name
+            controls_dict[sub_name] = dict()
+
+    return controls, sub_controls, controls_dict, sub_controls_with_buffer
+
+
+def _build_table(control_count):
+    table = controltable.ControlTable()
+    for i in range(control_count):
+        control_name = 'CNT_control{}_l'.format(i)
+        table.add_control(control_name)
+        table.set_group(control_name, 'buffer', 'buffer_control{}_l'.format(i))
+        if i % 4 == 0:
+            table.add_control('CNT_control{}Sub_l'.format(i), role=controltable.ROLE_SUB_CONTROL)
+
+    return table
+
+
+def _measure(function, *args):
+    tracemalloc.start()
+    start = timeit.default_timer()
+    result = function(*args)
+    elapsed = timeit.default_timer() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return result, elapsed, memory
+
+
+def main(control_count=100000, query_count=100):
+    timer = timeit.default_timer
+
+    data, elapsed, memory = _measure(_build_dictionaries, control_count)
+    controls, sub_controls, controls_dict, _ = data
+    # Strings are shared by both layouts, so only the containers are compared
+    names_memory = sum(sys.getsizeof(name) for name in controls_dict) + sum(
+        sys.getsizeof(value['buffer']) for value in controls_dict.values() if 'buffer' in value)
+    print('dictionaries build: {:.3f}s, {:.1f}MB containers'.format(elapsed, (memory - names_memory) / 1e6))
+
+    start = timer()
+    for _ in range(query_count):
+        [controls_dict[ctrl]['buffer'] for ctrl in sub_controls if 'buffer' in controls_dict[ctrl]]
+    print('dictionaries sub control groups x{}: {:.3f}s'.format(query_count, timer() - start))
+
+    table, elapsed, memory = _measure(_build_table, control_count)
+    print('control table build: {:.3f}s, {:.1f}MB containers'.format(elapsed, (memory - names_memory) / 1e6))
+
+    start = timer()
+    for _ in range(query_count):
+        table.get_groups('buffer', role=controltable.ROLE_SUB_CONTROL)
+    print('control table sub control groups x{}: {:.3f}s'.format(query_count, timer() - start))
+
+    start = timer()
+    for _ in range(query_count):
+        [controls_dict[ctrl]['buffer'] for ctrl in controls if 'buffer' in controls_dict[ctrl]]
+    print('dictionaries control groups x{}: {:.3f}s'.format(query_count, timer() - start))
+
+    start = timer()
+    for _ in range(query_count):
+        table.get_groups('buffer', role=controltable.ROLE_CONTROL)
+    print('control table control groups x{}: {:.3f}s'.format(query_count, timer() - start))
+
+    names = controls[::max(1, control_count // 1000)]
+    start = timer()
+    for _ in range(query_count):
+        for name in names:
+            table.get_group(name, 'buffer')
+            table.get_sub_controls(name)
+    print('control table {} lookups: {:.3f}s'.format(len(names) * query_count * 2, timer() - start))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
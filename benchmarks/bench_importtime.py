@@ -0,0 +1,90 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for rig builder import time. Imports each module in a new interpreter with python -X importtime and reports
+its cumulative import time, the number of imported modules and which heavy modules were loaded.
+It can be used as a regression gate: exits with error if a module cannot be imported, takes more than the given budget
+or loads any of the forbidden modules
+Usage: python benchmarks/bench_importtime.py [--budget milliseconds] [--forbid module ...] [module ...]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import argparse
+import subprocess
+
+DEFAULT_MODULES = [
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.core.catalog',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.core.validators',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.core.asciiscene',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.core.asyncsave',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.data.mayaascii',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.data.skincluster',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.packages.mayarig.nodes.simpleFkChain',
+    'tpRigToolkit.tools.rigbuilder.dccs.maya.packages.mayarig.nodes.simpleLimbIk',
+]
+HEAVY_MODULES = ['numpy', 'maya.cmds', 'tpDcc.dccs.maya', 'tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core.rig']
+
+
+def get_import_time(module_name):
+    """
+    Imports given module in a new interpreter and returns its import time info
+    :param module_name: str
+    :return: dict or None, None if the module cannot be imported
+    """
+
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module_name)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    _, output = process.communicate()
+    if process.returncode != 0:
+        return None
+
+    imported = dict()
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative_time, name = line[len('import time:'):].split('|')
+        imported[name.strip()] = (int(self_time), int(cumulative_time))
+
+    return {
+        'cumulative': imported.get(module_name, (0, 0))[1] / 1000.0,
+        'total': sum(times[0] for times in imported.values()) / 1000.0,
+        'modules': len(imported),
+        'heavy': [heavy_module for heavy_module in HEAVY_MODULES if heavy_module in imported],
+        'imported': set(imported)
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Reports python -X importtime totals of rig builder modules')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget', type=float, default=None, help='maximum import time of each module (ms)')
+    parser.add_argument('--forbid', nargs='*', default=list(), help='modules that must not be imported')
+    parsed_args = parser.parse_args(args)
+
+    failures = list()
+    for module_name in parsed_args.modules:
+        info = get_import_time(module_name)
+        if not info:
+            failures.append('{} cannot be imported'.format(module_name))
+            continue
+        print('{}: {:.1f}ms cumulative, {:.1f}ms total, {} modules, heavy: {}'.format(
+            module_name, info['cumulative'], info['total'], info['modules'], ', '.join(info['heavy']) or '-'))
+        if parsed_args.budget is not None and info['cumulative'] > parsed_args.budget:
+            failures.append('{} import takes {:.1f}ms (budget {:.1f}ms)'.format(
+                module_name, info['cumulative'], parsed_args.budget))
+        for forbidden_module in parsed_args.forbid:
+            if forbidden_module in info['imported']:
+                failures.append('{} imports {}'.format(module_name, forbidden_module))
+
+    for failure in failures:
+        print('FAILED: {}'.format(failure))
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for joint chain duplication. Compares duplicating, renaming and parenting a chain with Maya commands with
+duplicating it from the matrices of its joints. It must be executed with mayapy
+Usage: mayapy benchmarks/bench_jointchain.py [joint_count] [chain_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+import maya.standalone
+maya.standalone.initialize()
+
+import maya.cmds as cmds
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import jointchain
+
+
+def _create_chain(joint_count):
+    cmds.select(clear=True)
+    joints = list()
+    for i in range(joint_count):
+        joints.append(cmds.joint(name='chain_joint_{}'.format(i), position=(i, i % 2, 0)))
+    cmds.joint(joints[0], edit=True, orientJoint='xyz', children=True)
+
+    return cmds.ls(joints, long=True)
+
+
+def _duplicate_chain_commands(joints, parent):
+    new_joints = cmds.ls(cmds.duplicate(joints[0], renameChildren=True), long=True)[:len(joints)]
+    new_names = [name.rsplit('|', 1)[-1].replace('joint', 'buffer') for name in joints]
+
+    # Children are renamed first so the full paths of their parents are still valid
+    for new_joint, new_name in reversed(list(zip(new_joints, new_names))):
+        cmds.rename(new_joint, new_name)
+
+    return cmds.parent(new_names[0], parent)
+
+
+def main(joint_count=100, chain_count=10):
+    timer = timeit.default_timer
+    for count in sorted(set([5, joint_count])):
+        cmds.file(new=True, force=True)
+        joints = _create_chain(count)
+        parent = cmds.group(empty=True, name='setup')
+
+        start = timer()
+        for _ in range(chain_count):
+            _duplicate_chain_commands(joints, parent)
+        print('commands ({} joints, {} chains): {:.3f}s'.format(count, chain_count, timer() - start))
+
+        start = timer()
+        for _ in range(chain_count):
+            jointchain.duplicate_chain(joints, parent=parent, replace=['joint', 'buffer'])
+        print('duplicate chain ({} joints, {} chains): {:.3f}s'.format(count, chain_count, timer() - start))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
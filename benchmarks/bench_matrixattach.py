@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for joint chain attachment. Builds a test rig where each limb has a bind chain driven by a Fk and an Ik
+chain and a switch attribute, and compares attaching them with constraints and with matrix blend networks: number of
+created nodes and evaluation time of an animation of the driver chains. It must be executed with mayapy 2020 or newer
+Usage: mayapy benchmarks/bench_matrixattach.py [limb_count] [frame_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+import maya.standalone
+maya.standalone.initialize()
+
+import maya.cmds as cmds
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import jointchain, matrixattach
+
+
+def _create_limbs(limb_count):
+    limbs = list()
+    for i in range(limb_count):
+        cmds.select(clear=True)
+        joints = list()
+        for name, position in (('shoulder', (0, 0, 0)), ('elbow', (5, 0, -1)), ('wrist', (10, 0, 0))):
+            joints.append(cmds.joint(name='limb{}_{}_joint'.format(i, name), position=position))
+        cmds.joint(joints[0], edit=True, orientJoint='xyz', children=True)
+        cmds.addAttr(joints[0], longName='switch', attributeType='double', minValue=0, maxValue=1, keyable=True)
+        chains = [jointchain.duplicate_chain(joints, replace=['joint', side]) for side in ('fk', 'ik')]
+        limbs.append((joints, chains))
+
+    return limbs
+
+
+def _animate_limbs(limbs, frame_count):
+    for joints, chains in limbs:
+        for chain_index, chain in enumerate(chains):
+            for joint in chain:
+                cmds.setKeyframe(joint, attribute='rotateZ', time=1, value=0)
+                cmds.setKeyframe(joint, attribute='rotateZ', time=frame_count, value=45 * (chain_index + 1))
+        cmds.setKeyframe(joints[0], attribute='switch', time=1, value=0)
+        cmds.setKeyframe(joints[0], attribute='switch', time=frame_count, value=1)
+
+
+def _attach_constraints(limbs):
+    for joints, chains in limbs:
+        switch_plug = '{}.switch'.format(joints[0])
+        reverse = cmds.createNode('reverse')
+        cmds.connectAttr(switch_plug, '{}.inputX'.format(reverse))
+        for i, joint in enumerate(joints):
+            for constraint_fn in (cmds.parentConstraint, cmds.scaleConstraint):
+                constraint = constraint_fn(chains[0][i], chains[1][i], joint)[0]
+                weights = constraint_fn(constraint, query=True, weightAliasList=True)
+                cmds.connectAttr('{}.outputX'.format(reverse), '{}.{}'.format(constraint, weights[0]))
+                cmds.connectAttr(switch_plug, '{}.{}'.format(constraint, weights[1]))
+
+
+def _attach_networks(limbs):
+    for joints, chains in limbs:
+        for chain in chains:
+            matrixattach.attach_chain(chain, joints, switch_attribute='switch')
+
+
+def _evaluate(limbs, frame_count):
+    plugs = ['{}.worldMatrix[0]'.format(joints[-1]) for joints, _ in limbs]
+    for frame in range(1, frame_count + 1):
+        cmds.currentTime(frame, update=False)
+        for plug in plugs:
+            cmds.getAttr(plug)
+
+
+def main(limb_count=100, frame_count=100):
+    timer = timeit.default_timer
+    for name, attach_fn in (('constraints', _attach_constraints), ('matrix networks', _attach_networks)):
+        cmds.file(new=True, force=True)
+        limbs = _create_limbs(limb_count)
+        _animate_limbs(limbs, frame_count)
+        node_count = len(cmds.ls())
+        start = timer()
+        attach_fn(limbs)
+        attach_time = timer() - start
+        node_count = len(cmds.ls()) - node_count
+        start = timer()
+        _evaluate(limbs, frame_count)
+        print('{} ({} limbs): {} nodes, attach {:.3f}s, evaluation of {} frames {:.3f}s'.format(
+            name, limb_count, node_count, attach_time, frame_count, timer() - start))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
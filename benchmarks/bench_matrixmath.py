@@ -0,0 +1,50 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the right side orientation fix of Ik limb rigs. Compares, per control, the orientation computed by
+rotating a temporary locator (emulated with euler matrices) with flipping the axes of the control world matrix.
+Scene operations are not included: the locator path also creates, matches and deletes two nodes per control
+Usage: python benchmarks/bench_matrixmath.py [control_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import random
+import timeit
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import matrixmath
+
+
+def _fix_with_locator(world_matrix):
+    locator_matrix = matrixmath.get_euler_matrix([0.0, 180.0, 180.0])
+    return matrixmath.multiply_matrices(locator_matrix, world_matrix)
+
+
+def main(control_count=10000):
+    timer = timeit.default_timer
+    random_generator = random.Random(0)
+    matrices = list()
+    for _ in range(control_count):
+        matrix = matrixmath.get_euler_matrix([random_generator.uniform(-180.0, 180.0) for _ in range(3)])
+        matrix[12:15] = [random_generator.uniform(-100.0, 100.0) for _ in range(3)]
+        matrices.append(matrix)
+
+    start = timer()
+    for matrix in matrices:
+        _fix_with_locator(matrix)
+    locator_time = timer() - start
+    print('locator rotation ({} controls): {:.3f}s ({:.2f}us per control)'.format(
+        control_count, locator_time, locator_time / control_count * 1e6))
+
+    start = timer()
+    for matrix in matrices:
+        matrixmath.flip_matrix_axes(matrix, 'yz')
+    flip_time = timer() - start
+    print('axes flip ({} controls): {:.3f}s ({:.2f}us per control)'.format(
+        control_count, flip_time, flip_time / control_count * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
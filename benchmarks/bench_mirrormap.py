@@ -0,0 +1,53 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for mirror name maps. Compares resolving mirror names with the naming rule function each time with a mirror
+map built once per skeleton. Naming rule is emulated by a function that parses and solves names token by token
+Usage: python benchmarks/bench_mirrormap.py [joint_count] [lookup_rounds]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import mirrormap
+
+SIDES = {'l': 'r', 'r': 'l', 'left': 'right', 'right': 'left'}
+
+
+def _get_mirror_name(name):
+    tokens = dict(zip(('description', 'index', 'side', 'node_type'), name.split('_')))
+    tokens['side'] = SIDES.get(tokens['side'], tokens['side'])
+
+    return '_'.join(tokens[token] for token in ('description', 'index', 'side', 'node_type'))
+
+
+def main(joint_count=10000, lookup_rounds=5):
+    timer = timeit.default_timer
+    names = list()
+    for i in range(joint_count // 2):
+        names.append('joint{}_{:03d}_l_jnt'.format(i // 100, i % 100))
+        names.append('joint{}_{:03d}_r_jnt'.format(i // 100, i % 100))
+
+    start = timer()
+    for _ in range(lookup_rounds):
+        for name in names:
+            _get_mirror_name(name)
+    print('naming rule ({} joints, {} rounds): {:.3f}s'.format(joint_count, lookup_rounds, timer() - start))
+
+    start = timer()
+    mirror_map = mirrormap.MirrorMap(_get_mirror_name, names)
+    print('mirror map build ({} joints, {} unmatched): {:.3f}s'.format(
+        joint_count, len(mirror_map.get_unmatched()), timer() - start))
+
+    start = timer()
+    for _ in range(lookup_rounds):
+        for name in names:
+            mirror_map.get_mirror(name)
+    print('mirror map lookups ({} joints, {} rounds): {:.3f}s'.format(joint_count, lookup_rounds, timer() - start))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
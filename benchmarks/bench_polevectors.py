@@ -0,0 +1,47 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for pole vectors computation. Compares computing the pole vector of each limb with vector operations with
+computing the pole vectors of all limbs at once. Joint positions reading is not included
+Usage: python benchmarks/bench_polevectors.py [limb_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import polevectors
+
+
+def _get_pole_vector(start, mid, end, offset):
+    chain = end - start
+    start_to_mid = mid - start
+    direction = start_to_mid - chain * (start_to_mid.dot(chain) / chain.dot(chain))
+
+    return mid + direction / np.linalg.norm(direction) * np.linalg.norm(chain) * offset
+
+
+def main(limb_count=1000):
+    timer = timeit.default_timer
+    positions = np.random.RandomState(0).uniform(-10.0, 10.0, (limb_count, 3, 3))
+
+    start = timer()
+    for limb_positions in positions:
+        _get_pole_vector(limb_positions[0], limb_positions[1], limb_positions[2], 1.0)
+    print('per limb ({} limbs): {:.4f}s'.format(limb_count, timer() - start))
+
+    start = timer()
+    pole_positions, orientations = polevectors.get_pole_vectors(positions, 1.0)
+    print('vectorized ({} limbs): {:.4f}s'.format(limb_count, timer() - start))
+
+    start = timer()
+    polevectors.mirror_pole_vectors(pole_positions, orientations)
+    print('mirrored ({} limbs): {:.4f}s'.format(limb_count, timer() - start))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
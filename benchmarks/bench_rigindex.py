@@ -0,0 +1,80 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for scene rig index. Compares scanning all the rigs of a scene for each query with the rig index,
+using the in-memory stand-in scene backend
+Usage: python benchmarks/bench_rigindex.py [character_count] [rig_count] [query_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import rigindex
+
+
+def _create_scene(character_count, rig_count):
+    backend = rigindex.MemorySceneBackend()
+    for i in range(character_count):
+        namespace = 'char{}'.format(i)
+        for j in range(rig_count):
+            backend.add_rig(
+                '{}:controls_rig{}'.format(namespace, j), class_name='FkRig', description='rig{}'.format(j), side='l',
+                controls=['{}:CNT_rig{}_{}'.format(namespace, j, k) for k in range(6)],
+                sub_controls=['{}:CNT_rig{}Sub_{}'.format(namespace, j, k) for k in range(2)],
+                joints=['{}:jnt_rig{}_{}'.format(namespace, j, k) for k in range(6)])
+
+    return backend
+
+
+def _scan_node_rig(backend, node):
+    for rig_info in backend.get_rigs():
+        if node in rig_info.controls or node in rig_info.sub_controls or node in rig_info.joints:
+            return rig_info
+
+    return None
+
+
+def _scan_character_controls(backend, namespace):
+    controls = list()
+    for rig_info in backend.get_rigs():
+        if rig_info.namespace == namespace:
+            controls.extend(rig_info.controls + rig_info.sub_controls)
+
+    return controls
+
+
+def main(character_count=50, rig_count=40, query_count=200):
+    timer = timeit.default_timer
+    backend = _create_scene(character_count, rig_count)
+    nodes = ['char{}:jnt_rig{}_{}'.format(i % character_count, i % rig_count, i % 6) for i in range(query_count)]
+    namespaces = ['char{}'.format(i % character_count) for i in range(query_count)]
+
+    start = timer()
+    for node, namespace in zip(nodes, namespaces):
+        _scan_node_rig(backend, node)
+        _scan_character_controls(backend, namespace)
+    print('scan ({} characters, {} rigs): {:.3f}s'.format(
+        character_count, character_count * rig_count, timer() - start))
+
+    index = rigindex.RigIndex(backend)
+    start = timer()
+    index.rebuild()
+    print('index build: {:.3f}s'.format(timer() - start))
+
+    start = timer()
+    for node, namespace in zip(nodes, namespaces):
+        index.get_node_rig(node)
+        index.get_character_controls(namespace)
+    print('index queries: {:.3f}s'.format(timer() - start))
+
+    start = timer()
+    backend.remove_rig('char0:controls_rig0')
+    index.get_node_rig(nodes[0])
+    print('index rebuild after scene change: {:.3f}s'.format(timer() - start))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
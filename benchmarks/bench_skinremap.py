@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for topology independent skin weights remapping on synthetic meshes
+Usage: python benchmarks/bench_skinremap.py [source_rings] [target_rings]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights, skinremap
+
+
+def build_sphere(rings, radius=10.0):
+    segments = rings * 2
+    theta = np.linspace(0.0, np.pi, rings)
+    phi = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing='ij')
+    return np.stack(
+        [radius * np.sin(theta) * np.cos(phi), radius * np.cos(theta), radius * np.sin(theta) * np.sin(phi)],
+        axis=-1).reshape(-1, 3)
+
+
+def build_weights(positions, influence_count=20):
+    centers = np.linspace(-10.0, 10.0, influence_count)
+    dense = np.exp(-((positions[:, 1][:, np.newaxis] - centers[np.newaxis, :]) ** 2))
+    dense[dense < 0.01] = 0.0
+    dense /= dense.sum(axis=1)[:, np.newaxis]
+    return skinweights.SkinWeightsMatrix.from_dense(dense, ['joint{}'.format(i) for i in range(influence_count)])
+
+
+def main(source_rings=300, target_rings=260):
+    source_positions = build_sphere(source_rings)
+    target_positions = build_sphere(target_rings)
+    matrix = build_weights(source_positions)
+    expected = build_weights(target_positions).to_dense()
+    timer = timeit.default_timer
+    print('source vertices: {}, target vertices: {}'.format(len(source_positions), len(target_positions)))
+
+    start = timer()
+    index = skinremap.GridIndex(source_positions)
+    print('index build: {:.3f}s'.format(timer() - start))
+
+    modes = (('nearest', skinremap.REMAP_MODE_NEAREST), ('interpolate', skinremap.REMAP_MODE_INTERPOLATE))
+    for mode_name, mode in modes:
+        start = timer()
+        remapped = skinremap.remap_weights(matrix, source_positions, target_positions, mode=mode, index=index)
+        elapsed = timer() - start
+        error = np.abs(remapped.to_dense() - expected)
+        print('{}: {:.3f}s, max error: {:.4f}, mean error: {:.5f}'.format(
+            mode_name, elapsed, error.max(), error.mean()))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,72 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark that compares delta encoded skin weights versions with full saves
+Usage: python benchmarks/bench_skinversions.py [vertex_count] [version_count] [changed_vertices]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import shutil
+import timeit
+import tempfile
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights, skinversions
+
+
+def build_matrix(vertex_count, influence_count=80, influences_per_vertex=4, seed=0):
+    random = np.random.RandomState(seed)
+    vertices = np.repeat(np.arange(vertex_count), influences_per_vertex)
+    influences = (np.arange(vertices.size) % influences_per_vertex) * (influence_count // influences_per_vertex)
+    influences += random.randint(0, influence_count // influences_per_vertex, size=vertices.size)
+    weights = random.random_sample(vertices.size)
+    matrix = skinweights.SkinWeightsMatrix(
+        vertices, influences, weights, ['joint{}'.format(i) for i in range(influence_count)], vertex_count=vertex_count)
+    return skinweights.normalize_weights(matrix)
+
+
+def main(vertex_count=300000, version_count=20, changed_vertices=200):
+    random = np.random.RandomState(1)
+    matrix = build_matrix(vertex_count)
+    versions_path = tempfile.mkdtemp()
+    timer = timeit.default_timer
+    try:
+        versions = skinversions.SkinWeightsVersions(versions_path)
+        full_size = 0
+        save_time = 0.0
+        for i in range(version_count):
+            changed = random.choice(vertex_count, changed_vertices, replace=False)
+            mask = np.isin(matrix.vertices, changed)
+            weights = matrix.weights.copy()
+            weights[mask] = random.random_sample(int(mask.sum()))
+            matrix = skinweights.normalize_weights(skinweights.SkinWeightsMatrix(
+                matrix.vertices, matrix.influences, weights, matrix.influence_names, vertex_count=vertex_count))
+            start = timer()
+            versions.save_version(matrix)
+            save_time += timer() - start
+            full_size += len(skinweights.format_weights(matrix.weights)) + matrix.vertices.nbytes
+
+        start = timer()
+        versions = skinversions.SkinWeightsVersions(versions_path)
+        versions.load_version()
+        load_time = timer() - start
+
+        delta_sizes = [info['size'] for info in versions.versions() if info['type'] == 'delta']
+        print('vertices: {}, versions: {}, changed vertices per version: {}'.format(
+            vertex_count, version_count, changed_vertices))
+        print('base snapshot: {} KB'.format(versions.versions()[0]['size'] // 1024))
+        print('average delta: {:.1f} KB'.format(np.mean(delta_sizes) / 1024.0))
+        print('total history: {:.1f} KB (approx. {:.1f} MB with full saves)'.format(
+            versions.disk_usage() / 1024.0, full_size / 1024.0 / 1024.0))
+        print('average save: {:.3f}s, cold load of last version: {:.3f}s'.format(save_time / version_count, load_time))
+    finally:
+        shutil.rmtree(versions_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,42 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for skin weights processing functions
+Usage: python benchmarks/bench_skinweights.py [vertex_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import timeit
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights
+
+
+def build_matrix(vertex_count, influence_count=60, influences_per_vertex=8, seed=0):
+    random = np.random.RandomState(seed)
+    vertices = np.repeat(np.arange(vertex_count), influences_per_vertex)
+    influences = random.randint(0, influence_count, size=vertices.size)
+    weights = random.random_sample(vertices.size) ** 4
+    return skinweights.SkinWeightsMatrix(
+        vertices, influences, weights, ['joint{}'.format(i) for i in range(influence_count)],
+        vertex_count=vertex_count)
+
+
+def main(vertex_count=1000000):
+    matrix = build_matrix(vertex_count)
+    timer = timeit.default_timer
+    start = timer()
+    result, stats = skinweights.process_weights(matrix, prune_threshold=0.001, max_influences=4)
+    elapsed = timer() - start
+    print('vertices: {}, entries: {} -> {}'.format(vertex_count, stats['entries_before'], stats['entries_after']))
+    print('pruned: {}, limited: {}, vertices changed: {}'.format(
+        stats['pruned'], stats['limited'], stats['vertices_changed']))
+    print('process_weights: {:.3f}s'.format(elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
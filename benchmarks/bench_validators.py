@@ -0,0 +1,48 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for rig builder data files validation. Compares validating files one by one, with a process pool and
+with the results cache
+Usage: python benchmarks/bench_validators.py [file_count] [node_count]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import shutil
+import timeit
+import tempfile
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import validators
+
+
+def main(file_count=200, node_count=5000):
+    data_path = tempfile.mkdtemp()
+    timer = timeit.default_timer
+    try:
+        body = 'createNode transform -n "node";\n\tsetAttr ".t" -type "double3" 0 1 0 ;\n' * node_count
+        for i in range(file_count):
+            with open(os.path.join(data_path, 'data_{}.ma'.format(i)), 'w') as fh:
+                fh.write('//Maya ASCII 2020 scene\nrequires maya "2020";\n' + body)
+
+        start = timer()
+        for file_name in sorted(os.listdir(data_path)):
+            for validator in validators.get_validators('.ma'):
+                validator(os.path.join(data_path, file_name))
+        print('sequential validation ({} files): {:.3f}s'.format(file_count, timer() - start))
+
+        start = timer()
+        validators.validate(data_path)
+        print('process pool validation: {:.3f}s'.format(timer() - start))
+
+        start = timer()
+        validators.validate(data_path)
+        print('cached validation: {:.3f}s'.format(timer() - start))
+    finally:
+        shutil.rmtree(data_path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
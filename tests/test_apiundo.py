@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for Maya API modifications undo
+"""
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo
+
+
+class _Cmds(object):
+    """
+    Maya commands stub that stores the undo queue of the undo command
+    """
+
+    def __init__(self, undo_state=True):
+        self.undo_state = undo_state
+        self.loaded = False
+        self.undo_queue = list()
+
+    def undoInfo(self, query=True, state=True):
+        return self.undo_state
+
+    def pluginInfo(self, plugin_path, query=True, loaded=True):
+        return self.loaded
+
+    def loadPlugin(self, plugin_path, quiet=True):
+        assert plugin_path.endswith('apiundo.py')
+        self.loaded = True
+
+    def rigBuilderApiUndo(self):
+        self.undo_queue.append(apiundo.pop_pending())
+
+
+class _Maya(object):
+    def __init__(self, cmds):
+        self.cmds = cmds
+
+
+class _Modifier(object):
+    def __init__(self, name, log):
+        self._name = name
+        self._log = log
+
+    def doIt(self):
+        self._log.append('do {}'.format(self._name))
+
+    def undoIt(self):
+        self._log.append('undo {}'.format(self._name))
+
+
+def test_modifiers_are_undone_in_reverse_order(monkeypatch):
+    cmds = _Cmds()
+    monkeypatch.setattr(apiundo, 'maya', _Maya(cmds))
+    log = list()
+
+    assert apiundo.commit(_Modifier('dag', log), _Modifier('dg', log))
+    assert cmds.loaded and len(cmds.undo_queue) == 1
+
+    undo_function, redo_function = cmds.undo_queue[0]
+    undo_function()
+    redo_function()
+    assert log == ['undo dg', 'undo dag', 'do dag', 'do dg']
+
+
+def test_nothing_is_queued_when_undo_is_disabled(monkeypatch):
+    cmds = _Cmds(undo_state=False)
+    monkeypatch.setattr(apiundo, 'maya', _Maya(cmds))
+
+    assert not apiundo.add_undo(lambda: None, lambda: None)
+    assert not cmds.loaded and not cmds.undo_queue
@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for Maya ASCII parsing and compaction
+"""
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asciiscene
+
+MAYA_ASCII_SCENE = """//Maya ASCII 2020 scene
+requires maya "2020";
+requires -nodeType "decomposeMatrix" "matrixNodes" "1.0";
+requires -nodeType "aiStandardSurface" "mtoa" "4.0.0";
+createNode transform -n "root";
+\tsetAttr ".v" yes;
+\tsetAttr ".t" -type "double3" 0 0 0 ;
+\tsetAttr ".t" -type "double3" 1 2 3 ;
+\tsetAttr ".nm";
+createNode mesh -n "shape" -p "root";
+\tsetAttr -k off ".v";
+\tsetAttr ".pt[0]" -type "float3" 0 0 1;
+\tsetAttr ".pt[1]" -type "float3" 0 1 1;
+\tsetAttr ".pt[2]" -type "float3" 1 1 1;
+\tsetAttr ".pt[4]" -type "float3" 1 1 1;
+\tsetAttr ".uvst[0].uvsn" -type "string" "map;1";
+createNode decomposeMatrix -n "dm";
+select -ne :time1;
+\tsetAttr ".v" yes;
+connectAttr "root.wm" "dm.imat";
+"""
+
+
+def test_compact_maya_ascii(tmpdir):
+    file_path = tmpdir.join('scene.ma')
+    file_path.write(MAYA_ASCII_SCENE)
+
+    stats = asciiscene.compact_maya_ascii(str(file_path))
+    assert stats['valid']
+    assert (stats['redundant'], stats['noop'], stats['defaults'], stats['requires'], stats['merged']) == (1, 1, 1, 1, 2)
+    assert stats['statements_before'] - stats['statements_after'] == 6
+    assert stats['bytes_after'] == len(file_path.read())
+
+    compacted = file_path.read()
+    assert '"mtoa"' not in compacted and '"matrixNodes"' in compacted
+    assert '".pt[0:2]" -type "float3"\n\t\t0 0 1 0 1 1 1 1 1;' in compacted
+    assert '".pt[4]"' in compacted and '"map;1"' in compacted
+    # Nodes that are only selected may not have default values, so their values are kept
+    assert compacted.endswith('select -ne :time1;\n\tsetAttr ".v" yes;\nconnectAttr "root.wm" "dm.imat";\n')
+
+    # Compaction of an already compacted file does nothing
+    assert asciiscene.compact_maya_ascii(str(file_path))['statements_before'] == stats['statements_after']
+    assert file_path.read() == compacted
+
+
+def test_invalid_files_are_not_replaced(tmpdir):
+    file_path = tmpdir.join('broken.ma')
+    file_path.write('createNode transform -n "root";\n\tsetAttr ".t" -type "double3" 0 0 0 ;\n\tsetAttr ".nm"\n')
+
+    stats = asciiscene.compact_maya_ascii(str(file_path))
+    assert not stats['valid'] and stats['errors']
+    assert file_path.read().endswith('setAttr ".nm"\n')
+
+
+def test_defaults_are_removed_after_node_uuids(tmpdir):
+    file_path = tmpdir.join('scene.ma')
+    file_path.write(
+        'createNode transform -n "root";\n\trename -uid "8A3C5B1E-4F2D-11EB-AE93-0242AC130002";\n'
+        '\taddAttr -ci true -sn "rigType" -ln "rigType" -dt "string";\n\tsetAttr ".v" yes;\n'
+        '\tsetAttr ".t" -type "double3" 1 2 3 ;\n')
+
+    stats = asciiscene.compact_maya_ascii(str(file_path))
+    assert stats['valid'] and stats['defaults'] == 1
+    assert 'rename -uid' in file_path.read() and '".v"' not in file_path.read()
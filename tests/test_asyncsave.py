@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig builder background save queue
+"""
+
+import os
+import threading
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asyncsave
+
+
+def _write_text(temp_path, text, event=None):
+    if event:
+        event.wait(5)
+    with open(temp_path, 'w') as fh:
+        fh.write(text)
+
+
+def _write_failure(temp_path):
+    with open(temp_path, 'w') as fh:
+        fh.write('partial')
+    raise RuntimeError('Disk full')
+
+
+def _write_folder(temp_path, file_names):
+    os.makedirs(temp_path)
+    for file_name in file_names:
+        with open(os.path.join(temp_path, file_name), 'w') as fh:
+            fh.write(file_name)
+
+
+def test_saves_are_atomic_and_reported(tmpdir):
+    save_queue = asyncsave.SaveQueue(workers=2, max_pending=4)
+    file_path = tmpdir.join('scene.ma')
+    file_path.write('old')
+    finished = list()
+
+    job = save_queue.submit(str(file_path), _write_failure, callback=finished.append)
+    assert job.wait(5)
+    assert job.status == asyncsave.SaveJob.STATUS_FAILED and job.error == 'Disk full'
+    assert file_path.read() == 'old' and [f.basename for f in tmpdir.listdir()] == ['scene.ma']
+
+    job = save_queue.submit(str(file_path), _write_text, args=('new', ), callback=finished.append)
+    assert save_queue.flush(timeout=5)
+    assert job.status == asyncsave.SaveJob.STATUS_DONE and file_path.read() == 'new'
+    assert finished == [finished[0], job]
+
+    folder_path = tmpdir.join('body')
+    save_queue.submit(str(folder_path), _write_folder, args=(['a.weights', 'b.weights'], ))
+    save_queue.submit(str(folder_path), _write_folder, args=(['c.weights'], ))
+    assert save_queue.flush(timeout=5)
+    assert [f.basename for f in folder_path.listdir()] == ['c.weights']
+
+
+def test_newer_saves_supersede_pending_ones(tmpdir):
+    save_queue = asyncsave.SaveQueue(workers=1, max_pending=4)
+    event = threading.Event()
+    blocker = save_queue.submit(str(tmpdir.join('blocker.ma')), _write_text, args=('blocker', event))
+
+    file_path = tmpdir.join('scene.ma')
+    capture_path = tmpdir.join('first.capture.ma')
+    capture_path.write('first')
+    first = save_queue.submit(str(file_path), _write_text, args=('first', ), cleanup_paths=[str(capture_path)])
+    second = save_queue.submit(str(file_path), _write_text, args=('second', ))
+    assert save_queue.pending_count() == 3
+    assert not save_queue.flush(timeout=0.2)
+
+    event.set()
+    assert save_queue.flush(timeout=5)
+    assert blocker.status == asyncsave.SaveJob.STATUS_DONE
+    assert first.status == asyncsave.SaveJob.STATUS_SUPERSEDED and not capture_path.check()
+    assert second.status == asyncsave.SaveJob.STATUS_DONE and file_path.read() == 'second'
@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for attribute schemas
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import attributeschema
+
+
+def _get_schema():
+    return attributeschema.AttributeSchema([
+        attributeschema.AttributeSpec('POLE_VECTOR', attributeschema.TYPE_TITLE),
+        attributeschema.AttributeSpec('poleVisibility', attributeschema.TYPE_BOOL, keyable=True),
+        attributeschema.AttributeSpec(
+            'twist', attributeschema.TYPE_LONG, default=2, min_value=0, max_value=4, keyable=True),
+        attributeschema.AttributeSpec('description', attributeschema.TYPE_STRING, locked=True)
+    ])
+
+
+def test_values_are_converted_and_validated():
+    schema = _get_schema()
+
+    assert schema.get_attribute('POLE_VECTOR').locked
+    assert schema.get_values({'twist': 3.0, 'poleVisibility': 1}) == {'twist': 3, 'poleVisibility': True}
+    with pytest.raises(ValueError):
+        schema.get_values({'twist': 5})
+    with pytest.raises(KeyError):
+        schema.get_values({'side': 'l'})
+    with pytest.raises(ValueError):
+        attributeschema.AttributeSpec('side', attributeschema.TYPE_STRING, max_value=1)
+
+
+def test_pending_attributes():
+    schema = _get_schema()
+    values = schema.get_values({'description': 'arm'})
+    state = {
+        'POLE_VECTOR': {'value': None, 'default': None, 'min_value': None, 'max_value': None,
+                        'keyable': False, 'locked': True},
+        'poleVisibility': {'value': None, 'default': False, 'min_value': None, 'max_value': None,
+                           'keyable': True, 'locked': False},
+        'twist': {'value': None, 'default': 2, 'min_value': 0, 'max_value': 3, 'keyable': True, 'locked': False},
+        'description': {'value': 'leg', 'default': None, 'min_value': None, 'max_value': None,
+                        'keyable': False, 'locked': True}
+    }
+
+    assert schema.get_pending_attributes(dict(), values) == ['POLE_VECTOR', 'poleVisibility', 'twist', 'description']
+    assert schema.get_pending_attributes(state, values) == ['twist', 'description']
+
+    state['twist']['max_value'] = 4
+    state['description']['value'] = 'arm'
+    assert schema.get_pending_attributes(state, values) == list()
+    assert schema.get_pending_attributes(state) == list()
@@ -0,0 +1,89 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig builder data catalog
+"""
+
+import os
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import catalog
+
+MAYA_ASCII_HEADER = """//Maya ASCII 2020 scene
+requires maya "2020";
+requires -nodeType "decomposeMatrix" "matrixNodes" "1.0";
+currentUnit -l centimeter -a degree -t film;
+fileInfo "license" "student";
+createNode transform -n "root";
+"""
+
+
+def _get_catalog(tmpdir):
+    data_types = {'.ma': ('maya.ascii', catalog.get_maya_ascii_info), '.skin': ('maya.skin', None)}
+    return catalog.DataCatalog(str(tmpdir), data_types=data_types)
+
+
+def test_catalog_updates_incrementally(tmpdir):
+    tmpdir.join('a.ma').write(MAYA_ASCII_HEADER)
+    tmpdir.mkdir('sub').join('b.ma').write(MAYA_ASCII_HEADER)
+    tmpdir.mkdir('body.skin').join('influence.info').write('{}')
+    tmpdir.join('notes.txt').write('')
+    data_catalog = _get_catalog(tmpdir)
+
+    assert data_catalog.update() == {'added': 3, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    assert data_catalog.update() == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 3}
+    assert not data_catalog.is_stale()
+
+    tmpdir.join('a.ma').write(MAYA_ASCII_HEADER + 'createNode joint -n "jnt";\n')
+    os.remove(str(tmpdir.join('sub', 'b.ma')))
+    assert data_catalog.is_stale()
+    assert data_catalog.update() == {'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 1}
+
+
+def test_catalog_queries(tmpdir):
+    tmpdir.join('arm.ma').write(MAYA_ASCII_HEADER)
+    tmpdir.join('leg.ma').write(MAYA_ASCII_HEADER)
+    tmpdir.mkdir('body.skin')
+    data_catalog = _get_catalog(tmpdir)
+    data_catalog.update()
+
+    assert [entry['name'] for entry in data_catalog.find(data_type='maya.ascii')] == ['arm.ma', 'leg.ma']
+    assert [entry['name'] for entry in data_catalog.find(name='a*')] == ['arm.ma']
+    info = data_catalog.get_info('arm.ma')
+    assert info['requires'] == {'maya': '2020', 'matrixNodes': '1.0'}
+    assert info['student']
+    assert info['currentUnit'] == '-l centimeter -a degree -t film'
+
+
+def test_catalog_info_is_kept_until_file_changes(tmpdir):
+    tmpdir.join('arm.ma').write(MAYA_ASCII_HEADER)
+    data_catalog = _get_catalog(tmpdir)
+    data_catalog.update()
+
+    info = data_catalog.get_info('arm.ma')
+    info['item_info'] = [{'name': 'plugins', 'value': 'matrixNodes'}]
+    assert data_catalog.set_info(str(tmpdir.join('arm.ma')), info)
+    data_catalog.update()
+    assert data_catalog.get_info('arm.ma')['item_info'] == info['item_info']
+
+    tmpdir.join('arm.ma').write(MAYA_ASCII_HEADER + 'createNode joint -n "jnt";\n')
+    assert 'item_info' not in data_catalog.get_info('arm.ma')
+
+
+def test_data_items_share_data_root_catalog(tmpdir, monkeypatch):
+    monkeypatch.setattr(catalog, '_CATALOGS', dict())
+    monkeypatch.setattr(catalog, '_DATA_ROOTS', list())
+    monkeypatch.setattr(catalog, '_DATA_TYPES', {'.ma': ('maya.ascii', catalog.get_maya_ascii_info)})
+    data_path = tmpdir.mkdir('data')
+    data_path.mkdir('arm').join('arm.ma').write(MAYA_ASCII_HEADER)
+    data_path.mkdir('leg').join('leg.ma').write(MAYA_ASCII_HEADER)
+
+    data_catalog = catalog.get_data_catalog(str(data_path.join('arm')))
+    assert data_catalog is catalog.get_data_catalog(str(data_path.join('leg')))
+    assert data_catalog.directory == str(data_path)
+    assert [entry['path'] for entry in data_catalog.find()] == ['arm/arm.ma', 'leg/leg.ma']
+    assert not data_path.join('arm', catalog.CATALOG_FILE_NAME).check()
+
+    catalog.register_data_root(str(tmpdir))
+    assert catalog.get_data_root(str(data_path.join('arm'))) == str(tmpdir)
+    data_catalog.close()
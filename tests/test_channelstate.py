@@ -0,0 +1,30 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for control channels state specification
+"""
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import channelstate
+
+
+def test_last_declaration_wins():
+    spec = channelstate.ChannelStateSpec()
+    spec.lock_and_hide('CNT_arm', channelstate.SCALE_ATTRIBUTES + channelstate.VISIBILITY_ATTRIBUTES)
+    spec.unlock_and_show('CNT_arm', ['scaleX'])
+    spec.set_state('CNT_arm', ['rotateOrder'], keyable=True)
+
+    assert len(spec) == 5
+    assert spec.get_state('CNT_arm', 'scaleX') == {'locked': False, 'hidden': False, 'keyable': True}
+    assert spec.get_state('CNT_arm', 'scaleY') == {'locked': True, 'hidden': True, 'keyable': False}
+    assert spec.get_state('CNT_arm', 'rotateOrder') == {'locked': None, 'hidden': False, 'keyable': True}
+    assert spec.get_state('CNT_arm', 'translateX') is None
+
+
+def test_declared_locked_states_do_not_read_scene():
+    spec = channelstate.ChannelStateSpec()
+    spec.lock_and_hide('CNT_a', channelstate.ROTATE_ATTRIBUTES)
+    spec.unlock_and_show('CNT_b', channelstate.ROTATE_ATTRIBUTES)
+
+    locked_states = spec.get_locked_states(['CNT_a', 'CNT_b'], channelstate.ROTATE_ATTRIBUTES)
+    assert locked_states == {'CNT_a': [True, True, True], 'CNT_b': [False, False, False]}
@@ -0,0 +1,69 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig builder content addressed chunk store
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import chunkstore
+
+
+def _get_scene_data(node_count, seed=0):
+    generator = random.Random(seed)
+    lines = list()
+    for i in range(node_count):
+        lines.append('createNode transform -n "node_{}";\n'.format(i))
+        translate = (generator.random(), generator.random())
+        lines.append('    setAttr ".t" -type "double3" {:.4f} {:.4f} 0 ;\n'.format(*translate))
+    return ''.join(lines).encode('utf-8')
+
+
+def test_chunk_boundaries_are_content_defined():
+    scene_data = _get_scene_data(5000)
+    boundaries = chunkstore.find_chunk_boundaries(scene_data)
+    assert boundaries[-1] == len(scene_data)
+    sizes = np.diff([0] + boundaries)
+    assert sizes[:-1].min() >= 2048 and sizes.max() <= 65536
+
+    # Inserting data at the beginning only changes the first chunks
+    shifted_boundaries = chunkstore.find_chunk_boundaries(b'// header line\n' + scene_data)
+    assert len(set(b - 15 for b in shifted_boundaries) & set(boundaries)) >= len(boundaries) - 2
+
+
+def test_store_deduplicates_versions(tmpdir):
+    file_path = tmpdir.join('scene.ma')
+    scene_data = _get_scene_data(5000)
+    file_path.write_binary(scene_data)
+    data_store = chunkstore.get_data_store(str(tmpdir))
+
+    first = chunkstore.store_data_version(str(file_path))
+    edited_data = scene_data[:50000] + b'createNode joint -n "new";\n' + scene_data[50000:]
+    file_path.write_binary(edited_data)
+    second = chunkstore.store_data_version(str(file_path))
+    assert data_store.keys() == ['scene.ma/0001', 'scene.ma/0002']
+    assert first['new_size'] == len(scene_data)
+    assert second['new_size'] < len(edited_data) * 0.2
+
+    chunkstore.restore_data_version(str(file_path), version=1)
+    assert file_path.read_binary() == scene_data
+    chunkstore.restore_data_version(str(file_path))
+    assert file_path.read_binary() == edited_data
+
+
+def test_store_folders(tmpdir):
+    weights_path = tmpdir.mkdir('body.skin')
+    weights_path.mkdir('body').join('influence.info').write('{}')
+    weights_path.join('body', 'joint1.weights').write('[1.0, 0.5]')
+    chunkstore.store_data_version(str(weights_path))
+
+    weights_path.join('body', 'joint1.weights').write('[0.0, 0.5]')
+    weights_path.join('body', 'joint2.weights').write('[1.0, 0.5]')
+    chunkstore.restore_data_version(str(weights_path), version=1)
+    assert sorted(f.basename for f in weights_path.join('body').listdir()) == ['influence.info', 'joint1.weights']
+    assert weights_path.join('body', 'joint1.weights').read() == '[1.0, 0.5]'
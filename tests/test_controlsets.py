@@ -0,0 +1,113 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig control sets registry
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import controlsets
+
+
+class _SceneDcc(object):
+    """
+    DCC stub that stores selection sets and their members, and counts the calls that access the scene
+    """
+
+    def __init__(self):
+        self.sets = dict()
+        self.calls = list()
+
+    def object_exists(self, node):
+        return node in self.sets
+
+    def node_type(self, node):
+        return 'objectSet'
+
+    def get_selection_groups(self, name=None):
+        self.calls.append('get_selection_groups')
+        return list()
+
+    def find_unique_name(self, name):
+        return name
+
+    def create_selection_group(self, name, empty=True):
+        self.calls.append('create_selection_group')
+        self.sets[name] = list()
+        return name
+
+    def add_node_to_selection_group(self, node, selection_group, force=False):
+        self.calls.append('add_node_to_selection_group')
+        self.sets[selection_group].append(node)
+
+
+class _Tp(object):
+    def __init__(self):
+        self.Dcc = _SceneDcc()
+
+    def is_maya(self):
+        return True
+
+
+class _Cmds(object):
+    def __init__(self, dcc):
+        self._dcc = dcc
+        self.calls = list()
+
+    def sets(self, nodes, add=None):
+        self.calls.append((list(nodes), add))
+        self._dcc.sets[add].extend(nodes)
+
+
+class _Maya(object):
+    def __init__(self, dcc):
+        self.cmds = _Cmds(dcc)
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    tp = _Tp()
+    maya = _Maya(tp.Dcc)
+    monkeypatch.setattr(controlsets, 'tp', tp)
+    monkeypatch.setattr(controlsets, 'maya', maya)
+    return tp.Dcc, maya.cmds
+
+
+def test_sets_hierarchy_is_resolved_once(scene):
+    dcc, _ = scene
+    registry = controlsets.ControlSetRegistry()
+
+    assert registry.get_rig_set(['body'], description='arm', side='l') == 'set_arm_l'
+    assert dcc.sets['set_controls'] == ['set_body'] and dcc.sets['set_body'] == ['set_arm_l']
+    call_count = len(dcc.calls)
+
+    assert registry.get_rig_set(['body'], description='arm', side='l') == 'set_arm_l'
+    assert registry.get_rig_set(['body']) == 'set_body'
+    assert len(dcc.calls) == call_count
+
+
+def test_deleted_sets_are_resolved_again(scene):
+    dcc, _ = scene
+    registry = controlsets.ControlSetRegistry()
+    registry.get_rig_set(['body'], description='arm', side='l')
+
+    # Leaf set still exists, but its parent set was deleted
+    dcc.sets.pop('set_body')
+    assert registry.get_rig_set(['body'], description='arm', side='l') == 'set_arm_l'
+    assert dcc.sets['set_body'] == ['set_arm_l']
+
+    dcc.sets.clear()
+    assert registry.get_rig_set(['body'], description='arm', side='l') == 'set_arm_l'
+    assert sorted(dcc.sets) == ['set_arm_l', 'set_body', 'set_controls']
+
+
+def test_controls_are_added_with_one_call(scene):
+    dcc, cmds = scene
+    registry = controlsets.ControlSetRegistry()
+    rig_set = registry.get_rig_set(description='spine')
+
+    assert registry.add_controls(rig_set, ('CNT_spine1', 'CNT_spine2', 'CNT_spine3')) == 3
+    assert registry.add_controls(rig_set, list()) == 0
+    assert cmds.calls == [(['CNT_spine1', 'CNT_spine2', 'CNT_spine3'], 'set_spine')]
+    assert dcc.sets['set_spine'] == ['CNT_spine1', 'CNT_spine2', 'CNT_spine3']
@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig control table
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import controltable
+
+
+def _create_table():
+    table = controltable.ControlTable()
+    table.add_control('CNT_a')
+    table.add_control('CNT_a_sub', role=controltable.ROLE_SUB_CONTROL)
+    table.add_control('CNT_b')
+    table.add_control('CNT_c')
+    table.add_control('CNT_c_sub1', role=controltable.ROLE_SUB_CONTROL)
+    table.add_control('CNT_c_sub2', role=controltable.ROLE_SUB_CONTROL)
+
+    return table
+
+
+def test_controls_are_indexed_by_role():
+    table = _create_table()
+
+    assert len(table) == 6
+    assert table.get_controls() == ['CNT_a', 'CNT_a_sub', 'CNT_b', 'CNT_c', 'CNT_c_sub1', 'CNT_c_sub2']
+    assert table.get_controls(controltable.ROLE_CONTROL) == ['CNT_a', 'CNT_b', 'CNT_c']
+    assert table.get_controls(controltable.ROLE_SUB_CONTROL) == ['CNT_a_sub', 'CNT_c_sub1', 'CNT_c_sub2']
+    assert table.get_role('CNT_c_sub1') == controltable.ROLE_SUB_CONTROL
+    assert table.get_parent('CNT_c_sub1') == 'CNT_c'
+    assert table.get_parent('CNT_b') is None
+    assert table.get_sub_controls('CNT_c') == ['CNT_c_sub1', 'CNT_c_sub2']
+    assert table.get_last_sub_controls() == ['CNT_a_sub', None, 'CNT_c_sub2']
+    assert table.get_row('CNT_b') == 2
+    assert table.get_row('missing') == -1
+    with pytest.raises(ValueError):
+        table.add_control('CNT_a')
+
+
+def test_groups_are_indexed_by_type():
+    table = _create_table()
+    table.set_group('CNT_c', 'buffer', 'buffer_c')
+    table.set_group('CNT_a', 'buffer', 'buffer_a')
+    table.set_group('CNT_a_sub', 'buffer', 'buffer_a_sub')
+    table.set_group('CNT_b', 'driver', 'driver_b')
+    table.add_control('CNT_d')
+
+    assert table.get_groups('buffer') == ['buffer_a', 'buffer_a_sub', 'buffer_c']
+    assert table.get_groups('buffer', role=controltable.ROLE_CONTROL) == ['buffer_a', 'buffer_c']
+    assert table.get_groups('buffer', role=controltable.ROLE_SUB_CONTROL) == ['buffer_a_sub']
+    assert table.get_groups('missing') == list()
+    assert table.get_group('CNT_b', 'driver') == 'driver_b'
+    assert table.get_group('CNT_d', 'driver') is None
+    assert table.get_group_types('CNT_a') == ['buffer']
+
+
+def test_dictionary_view():
+    table = _create_table()
+    controls_dict = controltable.ControlTableView(table)
+    controls_dict['CNT_a']['buffer'] = 'buffer_a'
+    controls_dict['CNT_e'] = {'driver': 'driver_e'}
+
+    assert 'buffer' in controls_dict['CNT_a']
+    assert 'buffer' not in controls_dict['CNT_b']
+    assert controls_dict['CNT_a']['buffer'] == 'buffer_a'
+    assert controls_dict['CNT_c']['subs'][-1] == 'CNT_c_sub2'
+    assert 'subs' not in controls_dict['CNT_b']
+    assert controls_dict['CNT_e'].get('driver') == 'driver_e'
+    assert list(controls_dict.keys())[-1] == 'CNT_e'
+    with pytest.raises(KeyError):
+        controls_dict['CNT_b']['buffer']
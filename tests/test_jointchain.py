@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for joint chain duplication
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import matrixmath
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import jointchain
+
+
+def test_chain_parents():
+    joints = ['|root|arm', '|root|arm|elbow', '|root|arm|elbow|twist|wrist', '|root|arm|elbow|twist|wrist|hand']
+    parents = [
+        ['|root'], ['|root|arm', '|root'], ['|root|arm|elbow|twist', '|root|arm|elbow', '|root|arm', '|root'],
+        ['|root|arm|elbow|twist|wrist', '|root|arm|elbow|twist', '|root|arm|elbow', '|root|arm', '|root']]
+
+    assert jointchain.get_chain_parents(joints, parents) == [-1, 0, 1, 2]
+    assert jointchain.get_chain_parents(joints[1:], parents[1:]) == [-1, 0, 1]
+    assert jointchain.get_chain_parents(['|a', '|b'], [list(), list()]) == [-1, -1]
+    assert jointchain.get_chain_parents(['|a', '|b', '|c'], [list(), list(), list()], build_hierarchy=True) == [
+        -1, 0, 1]
+
+
+def test_duplicate_name():
+    assert jointchain.get_duplicate_name('|root|arm_joint_l', ['joint', 'ik']) == 'arm_ik_l'
+    assert jointchain.get_duplicate_name('arm_l', ['joint', 'ik']) == 'arm_l'
+    assert jointchain.get_duplicate_name('|root|arm_l') == 'arm_l'
+
+
+@pytest.mark.parametrize('rotate_order', jointchain.ROTATE_ORDERS)
+def test_joint_orient_matrix(rotate_order):
+    rotation = [35.0, -20.0, 110.0]
+    rotate_axis = [15.0, 40.0, -25.0]
+    joint_orient = matrixmath.get_euler_matrix([-30.0, 60.0, 10.0])
+    local_matrix = matrixmath.multiply_matrices(
+        matrixmath.multiply_matrices(matrixmath.get_euler_matrix(rotate_axis), matrixmath.get_euler_matrix(
+            rotation, rotate_order)), joint_orient)
+    for row, scale in enumerate([2.0, 0.5, 3.0]):
+        local_matrix[row * 4:row * 4 + 3] = [value * scale for value in local_matrix[row * 4:row * 4 + 3]]
+    local_matrix[12:15] = [1.0, -4.0, 2.5]
+
+    assert matrixmath.is_close(
+        jointchain.get_joint_orient_matrix(local_matrix, rotation, rotate_axis, rotate_order), joint_orient)
+    assert matrixmath.is_close(
+        jointchain.get_joint_orient_matrix(local_matrix),
+        matrixmath.get_rotate_matrix(local_matrix))
+    assert not matrixmath.is_close(
+        jointchain.get_joint_orient_matrix(local_matrix, rotation, rotate_axis, rotate_order[::-1]), joint_orient)
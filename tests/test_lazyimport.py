@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig builder lazy module imports
+"""
+
+import sys
+import subprocess
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+
+
+def test_lazy_module_imports_on_first_use():
+    sys.modules.pop('colorsys', None)
+    colorsys = lazyimport.lazy_module('colorsys')
+    assert isinstance(colorsys, lazyimport.LazyModule)
+    assert not lazyimport.is_loaded(colorsys)
+    assert 'colorsys' not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert lazyimport.is_loaded(colorsys)
+    assert lazyimport.load(colorsys) is sys.modules['colorsys']
+
+
+def test_lazy_module_returns_imported_modules():
+    assert lazyimport.lazy_module('os') is sys.modules['os']
+
+
+def test_core_modules_do_not_import_heavy_modules():
+    # Import time regression gate: browsing and validating data must not load numpy
+    code = (
+        'import sys\n'
+        'from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asciiscene, asyncsave, catalog, validators\n'
+        'assert "numpy" not in sys.modules, "numpy was imported"\n')
+    process = subprocess.Popen(
+        [sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    _, output = process.communicate()
+    assert process.returncode == 0, output
+
+
+def test_lazy_attribute_is_computed_on_first_access():
+    sys.modules.pop('colorsys', None)
+    colorsys = lazyimport.lazy_module('colorsys')
+
+    class Data(object):
+        Value = lazyimport.LazyAttribute(lambda: colorsys.rgb_to_hsv(1.0, 0.0, 0.0))
+
+    assert not lazyimport.is_loaded(colorsys)
+    assert Data.Value == (0.0, 1.0, 1.0) and Data().Value == (0.0, 1.0, 1.0)
+    assert lazyimport.is_loaded(colorsys)
@@ -0,0 +1,120 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig builder component manifest
+"""
+
+import os
+import sys
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import manifest
+
+BASE_NODE = '''
+from tpRigToolkit.tools.rigbuilder.objects import component
+
+
+class BaseNode(component.RigComponent, object):
+
+    COLOR = [45, 185, 45]
+    SHORT_NAME = 'BASE'
+    DESCRIPTION = 'Base node'
+    ICON = 'new'
+
+    def setup_options(self):
+        setup_options = super(BaseNode, self).setup_options()
+        setup_options['Base'] = {'value': True, 'group': None, 'type': 'group'}
+        setup_options['Size'] = {'value': 1.0, 'group': 'Base', 'type': 'float'}
+        return setup_options
+'''
+
+CHILD_NODE = '''
+from tpRigToolkit.tools.rigbuilder.dccs.maya.packages.testrig.nodes import baseNode
+
+
+class ChildNode(baseNode.BaseNode, object):
+
+    SHORT_NAME = 'CHILD'
+
+    def setup_options(self):
+        setup_options = super(ChildNode, self).setup_options()
+        setup_options['Child'] = {'value': True, 'group': None, 'type': 'group'}
+        setup_options['Size'] = {'value': 2.0, 'group': 'Child', 'type': 'float'}
+        setup_options['Dynamic'] = {'value': get_value(), 'group': 'Child', 'type': 'float'}
+        return setup_options
+'''
+
+
+def _create_packages(tmpdir):
+    nodes_path = tmpdir.mkdir('packages').mkdir('testrig').mkdir('nodes')
+    tmpdir.join('packages', 'testrig', '__init__.py').write("MODULE_NAME = 'TestRig'\n")
+    nodes_path.join('__init__.py').write('')
+    nodes_path.join('baseNode.py').write(BASE_NODE)
+    nodes_path.join('childNode.py').write(CHILD_NODE)
+
+    return str(tmpdir.join('packages'))
+
+
+def test_components_are_parsed_without_import(tmpdir):
+    packages_path = _create_packages(tmpdir)
+    components = manifest.get_components(packages_path=packages_path, packages_module='test.packages')
+
+    base, child = components
+    assert base['name'] == 'BaseNode'
+    assert base['module'] == 'test.packages.testrig.nodes.baseNode'
+    assert base['package'] == 'TestRig'
+    assert base['COLOR'] == [45, 185, 45]
+    assert [option[0] for option in base['options']] == ['Base', 'Size']
+    assert child['SHORT_NAME'] == 'CHILD'
+    assert child['DESCRIPTION'] == 'Base node'
+    assert [option[0] for option in child['options']] == ['Base', 'Child', 'Size']
+    assert child['options'][-1][1]['value'] == 2.0
+    assert 'test.packages.testrig.nodes.baseNode' not in sys.modules
+    assert os.path.isfile(os.path.join(packages_path, manifest.MANIFEST_FILE_NAME))
+
+
+def test_manifest_is_regenerated_when_sources_change(tmpdir, monkeypatch):
+    packages_path = _create_packages(tmpdir)
+    manifest.get_component_manifest(packages_path=packages_path, packages_module='test.packages')
+
+    parsed = list()
+    parse_components = manifest.parse_components
+    monkeypatch.setattr(
+        manifest, 'parse_components', lambda *args, **kwargs: parsed.append(args[0]) or parse_components(
+            *args, **kwargs))
+    manifest.get_component_manifest(packages_path=packages_path, packages_module='test.packages')
+    assert not parsed
+
+    node_path = os.path.join(packages_path, 'testrig', 'nodes', 'baseNode.py')
+    with open(node_path, 'a') as fh:
+        fh.write("\n\nclass OtherNode(BaseNode, object):\n    SHORT_NAME = 'OTHER'\n")
+    components = manifest.get_components(packages_path=packages_path, packages_module='test.packages')
+    assert parsed == [node_path]
+    assert [component['name'] for component in components] == ['BaseNode', 'OtherNode', 'ChildNode']
+
+    os.remove(node_path)
+    components = manifest.get_components(packages_path=packages_path, packages_module='test.packages')
+    assert [component['name'] for component in components] == ['ChildNode']
+    assert 'COLOR' not in components[0]
+
+
+def test_maya_rig_components(tmpdir):
+    components = manifest.get_components(manifest_path=str(tmpdir.join('components.json')))
+
+    names = [component['name'] for component in components]
+    for name in ['GodRig', 'RigNode', 'SimpleFkChain', 'SimpleIkChain', 'SimpleFkIkChain', 'ReverseFootIk']:
+        assert name in names
+    fk_ik = components[names.index('SimpleFkIkChain')]
+    assert fk_ik['module'] == 'tpRigToolkit.tools.rigbuilder.dccs.maya.packages.mayarig.nodes.simpleFkIkSwitch'
+    assert fk_ik['bases'] == ['rigNode.RigNode']
+    assert 'Switch Attribute' in [option[0] for option in fk_ik['options']]
+
+
+def test_files_with_syntax_errors_are_skipped(tmpdir):
+    packages_path = _create_packages(tmpdir)
+    tmpdir.join('packages', 'testrig', 'nodes', 'brokenNode.py').write('class BrokenNode(object:\n    pass\n')
+    tmpdir.join('packages', 'testrig', '__init__.py').write("MODULE_NAME = 'TestRig\n")
+
+    components = manifest.get_components(packages_path=packages_path, packages_module='test.packages')
+    assert [component['name'] for component in components] == ['BaseNode', 'ChildNode']
+    assert components[0]['package'] == 'testrig'
@@ -0,0 +1,238 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for matrix blend network attachment
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, attributeschema, metadata, matrixattach
+
+
+class _Node(object):
+    def __init__(self, name, node_type):
+        self.name = name
+        self.node_type = node_type
+        self.values = dict()
+
+
+class _Plug(object):
+    def __init__(self, scene, node, attribute_name):
+        self._scene = scene
+        self.node_object = node
+        self.attribute_name = attribute_name
+
+    @property
+    def isDestination(self):
+        return any(target == self.name() for _, target in self._scene.connections)
+
+    def node(self):
+        return self.node_object
+
+    def source(self):
+        for source, target in self._scene.connections:
+            if target == self.name():
+                node_name, attribute_name = source.split('.', 1)
+                return _Plug(self._scene, self._scene.nodes[node_name], attribute_name)
+
+    def numConnectedElements(self):
+        prefix = '{}['.format(self.name())
+        return len(set(target.split(']', 1)[0] for _, target in self._scene.connections if target.startswith(prefix)))
+
+    def elementByLogicalIndex(self, index):
+        return _Plug(self._scene, self.node_object, '{}[{}]'.format(self.attribute_name, index))
+
+    def child(self, attribute):
+        return _Plug(self._scene, self.node_object, '{}.{}'.format(self.attribute_name, attribute))
+
+    def partialName(self, useLongNames=False):
+        return self.attribute_name
+
+    def name(self):
+        return '{}.{}'.format(self.node_object.name, self.attribute_name)
+
+
+class _Matrix(object):
+    def __init__(self, name):
+        self.name = name
+
+    def inverse(self):
+        return _Matrix('{}Inverse'.format(self.name))
+
+
+class _DagPath(object):
+    def __init__(self, node):
+        self._node = node
+
+    def node(self):
+        return self._node
+
+    def instanceNumber(self):
+        return 0
+
+    def partialPathName(self):
+        return self._node.name
+
+
+class _Scene(object):
+    """
+    Maya API stub that stores nodes, their values and their connections
+    """
+
+    def __init__(self, joints):
+        self.nodes = dict((joint, _Node(joint, 'joint')) for joint in joints)
+        self.connections = list()
+        self.undo_queue = list()
+        self.applied_schemas = list()
+        scene = self
+
+        class MSelectionList(object):
+            def __init__(self):
+                self._nodes = list()
+
+            def add(self, node):
+                self._nodes.append(scene.nodes[node])
+
+            def getDagPath(self, index):
+                return _DagPath(self._nodes[index])
+
+        class MFnDependencyNode(object):
+            def __init__(self, node):
+                self._node = node
+
+            @property
+            def typeName(self):
+                return self._node.node_type
+
+            def attribute(self, attribute_name):
+                return attribute_name
+
+            def findPlug(self, attribute_name, want_network):
+                return _Plug(scene, self._node, attribute_name)
+
+        class MFnTransform(object):
+            def __init__(self, dag_path):
+                self._node = dag_path.node()
+
+            def transformationMatrix(self):
+                return _Matrix('{}Rest'.format(self._node.name))
+
+        class MFnMatrixData(object):
+            def create(self, matrix):
+                return matrix.name
+
+        class MDGModifier(object):
+            def __init__(self):
+                self._operations = list()
+
+            def createNode(self, node_type):
+                node = _Node('{}{}'.format(node_type, len(scene.nodes)), node_type)
+                self._operations.append(lambda: scene.nodes.__setitem__(node.name, node))
+                return node
+
+            def renameNode(self, node, name):
+                def _rename():
+                    scene.nodes[name] = scene.nodes.pop(node.name)
+                    node.name = name
+                self._operations.append(_rename)
+
+            def newPlugValue(self, plug, value):
+                self._operations.append(lambda: plug.node_object.values.__setitem__(plug.attribute_name, value))
+
+            newPlugValueDouble = newPlugValue
+
+            def connect(self, source_plug, target_plug):
+                self._operations.append(lambda: scene.connections.append((source_plug.name(), target_plug.name())))
+
+            def doIt(self):
+                for operation in self._operations:
+                    operation()
+                del self._operations[:]
+
+        class Cmds(object):
+            def undoInfo(self, query=True, state=True):
+                return True
+
+            def pluginInfo(self, plugin_path, query=True, loaded=True):
+                return True
+
+            def rigBuilderApiUndo(self):
+                scene.undo_queue.append(apiundo.pop_pending())
+
+        def apply_schema(schema, nodes, values=None):
+            scene.applied_schemas.append((nodes, [
+                (attribute.name, attribute.max_value) for attribute in schema._attributes.values()]))
+            return 1
+
+        self.OpenMaya = type('OpenMaya', (object, ), dict(
+            MSelectionList=MSelectionList, MFnDependencyNode=MFnDependencyNode, MFnTransform=MFnTransform,
+            MFnMatrixData=MFnMatrixData, MDGModifier=MDGModifier))
+        self.maya = type('Maya', (object, ), dict(cmds=Cmds()))
+        self.apply_schema = apply_schema
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    scene = _Scene(['arm', 'elbow', 'arm_fk', 'elbow_fk', 'arm_ik', 'elbow_ik', 'arm_ribbon', 'elbow_ribbon'])
+    monkeypatch.setattr(matrixattach, 'OpenMaya', scene.OpenMaya)
+    monkeypatch.setattr(apiundo, 'maya', scene.maya)
+    monkeypatch.setattr(attributeschema.AttributeSchema, 'apply', scene.apply_schema)
+    monkeypatch.setattr(metadata, 'get_node_object', lambda node: scene.nodes[node])
+    return scene
+
+
+def test_attach_chain_network(scene):
+    assert matrixattach.get_chain_count('arm') == 0
+    assert matrixattach.attach_chain(['arm_fk', 'elbow_fk'], ['arm', 'elbow']) == 0
+
+    assert len(scene.undo_queue) == 1
+    assert scene.nodes['arm_attachBlend'].node_type == 'blendMatrix'
+    assert scene.nodes['arm_attachMult'].node_type == 'multMatrix'
+    assert scene.nodes['elbow_attachMult'].values == {'matrixIn[0]': 'elbowRestInverse'}
+    assert scene.connections[:5] == [
+        ('arm_attachBlend.outputMatrix', 'arm_attachMult.matrixIn[1]'),
+        ('arm.parentInverseMatrix[0]', 'arm_attachMult.matrixIn[2]'),
+        ('arm_fk.worldMatrix[0]', 'arm_attachBlend.inputMatrix'),
+        ('arm_attachMult.matrixSum', 'arm.offsetParentMatrix'),
+        ('elbow_attachBlend.outputMatrix', 'elbow_attachMult.matrixIn[1]')]
+    assert ('elbow_attachMult.matrixSum', 'elbow.offsetParentMatrix') in scene.connections
+    assert matrixattach.get_chain_count('arm') == matrixattach.get_chain_count('elbow') == 1
+
+
+def test_attach_chains_incrementally(scene):
+    matrixattach.attach_chain(['arm_fk', 'elbow_fk'], ['arm', 'elbow'])
+    connections = list(scene.connections)
+    node_count = len(scene.nodes)
+
+    assert matrixattach.attach_chain(['arm_ik', 'elbow_ik'], ['arm', 'elbow'], switch_attribute='fkIk') == 1
+    assert matrixattach.attach_chain(['arm_ribbon', 'elbow_ribbon'], ['arm', 'elbow'], switch_attribute='fkIk') == 2
+
+    assert len(scene.undo_queue) == 3
+    assert len(scene.nodes) == node_count + 2
+    assert scene.applied_schemas == [('arm', [('fkIk', 1.0)]), ('arm', [('fkIk', 2.0)])]
+    assert scene.nodes['arm_fkIk1'].values == {'inputMin': 0, 'inputMax': 1}
+    assert scene.nodes['arm_fkIk2'].values == {'inputMin': 1, 'inputMax': 2}
+    assert scene.connections[:len(connections)] == connections
+    assert scene.connections[len(connections):] == [
+        ('arm.fkIk', 'arm_fkIk1.inputValue'),
+        ('arm_ik.worldMatrix[0]', 'arm_attachBlend.target[0].targetMatrix'),
+        ('arm_fkIk1.outValue', 'arm_attachBlend.target[0].weight'),
+        ('elbow_ik.worldMatrix[0]', 'elbow_attachBlend.target[0].targetMatrix'),
+        ('arm_fkIk1.outValue', 'elbow_attachBlend.target[0].weight'),
+        ('arm.fkIk', 'arm_fkIk2.inputValue'),
+        ('arm_ribbon.worldMatrix[0]', 'arm_attachBlend.target[1].targetMatrix'),
+        ('arm_fkIk2.outValue', 'arm_attachBlend.target[1].weight'),
+        ('elbow_ribbon.worldMatrix[0]', 'elbow_attachBlend.target[1].targetMatrix'),
+        ('arm_fkIk2.outValue', 'elbow_attachBlend.target[1].weight')]
+    assert matrixattach.get_chain_count('elbow') == 3
+
+
+def test_attach_chain_errors(scene):
+    with pytest.raises(ValueError):
+        matrixattach.attach_chain(['arm_fk'], ['arm', 'elbow'])
+
+    matrixattach.attach_chain(['arm_fk'], ['arm'])
+    with pytest.raises(ValueError):
+        matrixattach.attach_chain(['arm_ik', 'elbow_ik'], ['arm', 'elbow'])
+    assert len(scene.undo_queue) == 1
@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for transform matrices functions
+"""
+
+import random
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import matrixmath
+
+
+def _get_random_matrix(random_generator):
+    rotation = [random_generator.uniform(-180.0, 180.0) for _ in range(3)]
+    rotate_order = random_generator.choice(['xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx'])
+    matrix = matrixmath.get_euler_matrix(rotation, rotate_order)
+    for row in range(3):
+        scale = random_generator.uniform(0.1, 3.0)
+        matrix[row * 4:row * 4 + 3] = [value * scale for value in matrix[row * 4:row * 4 + 3]]
+    matrix[12:15] = [random_generator.uniform(-100.0, 100.0) for _ in range(3)]
+
+    return matrix
+
+
+def test_euler_matrix():
+    matrix = matrixmath.get_euler_matrix([0.0, 0.0, 90.0])
+
+    assert matrixmath.is_close(matrix[0:3], [0.0, 1.0, 0.0])
+    assert matrixmath.is_close(matrix[4:7], [-1.0, 0.0, 0.0])
+    assert matrixmath.is_close(
+        matrixmath.get_euler_matrix([90.0, 0.0, 90.0], 'xyz'),
+        matrixmath.multiply_matrices(
+            matrixmath.get_euler_matrix([90.0, 0.0, 0.0]), matrixmath.get_euler_matrix([0.0, 0.0, 90.0])))
+
+
+def test_flip_matches_locator_rotation():
+    # Right side orient fix used to parent a locator under a buffer matching the control, rotate it 180 degrees
+    # in Y and Z and match the control back to the locator
+    random_generator = random.Random(0)
+    locator_matrix = matrixmath.get_euler_matrix([0.0, 180.0, 180.0])
+    for _ in range(100):
+        world_matrix = _get_random_matrix(random_generator)
+        expected_matrix = matrixmath.multiply_matrices(locator_matrix, world_matrix)
+        assert matrixmath.is_close(matrixmath.flip_matrix_axes(world_matrix, 'yz'), expected_matrix)
@@ -0,0 +1,184 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig message attributes metadata
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, metadata
+
+
+def test_parse_message_attributes():
+    assert metadata.parse_message_attribute('control3') == ('control', 3)
+    assert metadata.parse_message_attribute('controls[2]') == ('control', 3)
+    assert metadata.parse_message_attribute('subControls[0]') == ('subControl', 1)
+    assert metadata.parse_message_attribute('subControl12') == ('subControl', 12)
+    assert metadata.parse_message_attribute('joints[10]') == ('joint', 11)
+    assert metadata.parse_message_attribute('controlSize') is None
+    assert metadata.parse_message_attribute('fkIk') is None
+    assert metadata.parse_message_attribute('joint1', descriptions=['control']) is None
+
+
+class _Node(object):
+    def __init__(self, name, attributes=None):
+        self.name = name
+        self.attributes = set(attributes or ['message'])
+        self.aliases = dict()
+        self.connections = dict()
+
+
+class _Plug(object):
+    def __init__(self, node, attribute_name):
+        self.node = node
+        self.attribute_name = attribute_name
+
+    def elementByLogicalIndex(self, index):
+        return _Plug(self.node, '{}[{}]'.format(self.attribute_name, index))
+
+
+class _Scene(object):
+    """
+    Maya API and commands stub that stores nodes, message connections and aliases
+    """
+
+    def __init__(self, *nodes):
+        self.nodes = dict((node.name, node) for node in nodes)
+        self.undo_queue = list()
+        scene = self
+
+        class MSelectionList(object):
+            def __init__(self):
+                self._items = list()
+
+            def add(self, item):
+                self._items.append(item)
+
+            def getDependNode(self, index):
+                return scene.nodes[self._items[index]]
+
+            def getPlug(self, index):
+                node_name, attribute_name = self._items[index].split('.', 1)
+                return _Plug(scene.nodes[node_name], attribute_name)
+
+        class MFnDependencyNode(object):
+            def __init__(self, node):
+                self._node = node
+
+            def hasAttribute(self, attribute_name):
+                return attribute_name in self._node.attributes
+
+            def attribute(self, attribute_name):
+                return attribute_name
+
+            def findPlug(self, attribute_name, want_network):
+                return _Plug(self._node, attribute_name)
+
+            def getAliasList(self):
+                return list(self._node.aliases.items())
+
+            def setAlias(self, alias_name, attribute_name, plug, add=True):
+                if add:
+                    # Maya does not allow aliases with the name of an existing attribute
+                    assert alias_name not in self._node.attributes
+                    self._node.aliases[alias_name] = plug.attribute_name
+                else:
+                    self._node.aliases.pop(alias_name)
+
+        class MFnMessageAttribute(object):
+            array = False
+
+            def create(self, long_name, short_name):
+                return long_name
+
+        class MDGModifier(object):
+            def __init__(self):
+                self._operations = list()
+                self._done = 0
+
+            def addAttribute(self, node, attribute_name):
+                self._operations.append((node.attributes.add, node.attributes.discard, attribute_name))
+
+            def removeAttribute(self, node, attribute_name):
+                self._operations.append((node.attributes.discard, node.attributes.add, attribute_name))
+
+            def connect(self, source_plug, target_plug):
+                connections = target_plug.node.connections
+                self._operations.append((
+                    lambda name: connections.__setitem__(name, source_plug.node.name), connections.pop,
+                    target_plug.attribute_name))
+
+            def doIt(self):
+                for do_function, _, value in self._operations[self._done:]:
+                    do_function(value)
+                self._done = len(self._operations)
+
+            def undoIt(self):
+                for _, undo_function, value in reversed(self._operations[:self._done]):
+                    undo_function(value)
+                self._done = 0
+
+        class Cmds(object):
+            def undoInfo(self, query=True, state=True):
+                return True
+
+            def pluginInfo(self, plugin_path, query=True, loaded=True):
+                return True
+
+            def rigBuilderApiUndo(self):
+                scene.undo_queue.append(apiundo.pop_pending())
+
+            def listConnections(self, node_name, **kwargs):
+                connections = list()
+                for attribute_name, source_name in sorted(scene.nodes[node_name].connections.items()):
+                    connections.extend(['{}.{}'.format(node_name, attribute_name), source_name])
+                return connections
+
+        self.OpenMaya = type('OpenMaya', (object, ), dict(
+            MSelectionList=MSelectionList, MFnDependencyNode=MFnDependencyNode,
+            MFnMessageAttribute=MFnMessageAttribute, MDGModifier=MDGModifier))
+        self.maya = type('Maya', (object, ), dict(cmds=Cmds()))
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    scene = _Scene(_Node('controls_arm'), _Node('CNT_arm'), _Node('CNT_elbow'), _Node('arm'), _Node('elbow'))
+    monkeypatch.setattr(metadata, 'OpenMaya', scene.OpenMaya)
+    monkeypatch.setattr(metadata, 'maya', scene.maya)
+    monkeypatch.setattr(apiundo, 'maya', scene.maya)
+    return scene
+
+
+def test_connect_and_get_rig_messages(scene):
+    assert metadata.connect_messages(['CNT_arm', None, 'CNT_elbow'], 'controls_arm', 'control') == 2
+    assert metadata.connect_messages(['arm', 'elbow'], 'controls_arm', 'joint') == 2
+
+    group = scene.nodes['controls_arm']
+    assert group.connections == {
+        'controls[0]': 'CNT_arm', 'controls[2]': 'CNT_elbow', 'joints[0]': 'arm', 'joints[1]': 'elbow'}
+    assert group.aliases == {
+        'control1': 'controls[0]', 'control3': 'controls[2]', 'joint1': 'joints[0]', 'joint2': 'joints[1]'}
+    assert metadata.get_rig_messages('controls_arm') == {
+        'control': ['CNT_arm', 'CNT_elbow'], 'subControl': list(), 'joint': ['arm', 'elbow']}
+
+    # Connecting again does not add the aliases again
+    assert metadata.connect_messages(['CNT_arm', None, 'CNT_elbow'], 'controls_arm', 'control') == 2
+    assert len(group.aliases) == 4
+
+
+def test_old_layout_attributes_are_replaced_by_aliases(scene):
+    group = scene.nodes['controls_arm']
+    group.attributes.update(['control1', 'control2'])
+
+    metadata.connect_messages(['CNT_arm', 'CNT_elbow'], 'controls_arm', 'control')
+    assert 'control1' not in group.attributes and 'control2' not in group.attributes
+    assert group.aliases == {'control1': 'controls[0]', 'control2': 'controls[1]'}
+    assert group.connections == {'controls[0]': 'CNT_arm', 'controls[1]': 'CNT_elbow'}
+
+    undo_function, redo_function = scene.undo_queue[-1]
+    undo_function()
+    assert not group.aliases and {'control1', 'control2'}.issubset(group.attributes)
+    assert 'controls' not in group.attributes
+    redo_function()
+    assert group.aliases == {'control1': 'controls[0]', 'control2': 'controls[1]'}
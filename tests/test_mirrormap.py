@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for mirror name maps
+"""
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import mirrormap
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import mirrornaming, skeleton
+
+
+class _MirrorNameFn(object):
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, name):
+        self.calls += 1
+        tokens = name.split('_')
+        tokens[-1] = {'l': 'r', 'r': 'l'}.get(tokens[-1], tokens[-1])
+        return '_'.join(tokens)
+
+
+def test_mirror_map():
+    mirror_name_fn = _MirrorNameFn()
+    mirror_map = mirrormap.MirrorMap(mirror_name_fn, ['arm_l', 'arm_r', 'spine_c', 'hand_l'])
+
+    assert mirror_map.get_mirror('arm_l') == 'arm_r'
+    assert mirror_map.get_mirror('arm_r') == 'arm_l'
+    assert mirror_map.get_mirror('spine_c') is None
+    assert mirror_map.is_centered('spine_c')
+    assert mirror_map.get_unmatched() == ['hand_l']
+    assert mirror_map.get_pairs() == [('arm_l', 'arm_r')]
+    assert mirror_name_fn.calls == 3
+
+    assert mirror_map.get_mirror_names(['arm_r', 'leg_l', 'leg_r']) == ['arm_l', 'leg_r', 'leg_l']
+    assert mirror_name_fn.calls == 4
+
+    mirror_map.update(['hand_r'])
+    assert mirror_map.get_unmatched() == list()
+    assert mirror_map.get_mirror('hand_r') == 'hand_l'
+
+
+def test_mirror_maps_cache():
+    mirrormap.clear_mirror_maps()
+    mirror_name_fn = _MirrorNameFn()
+    mirror_map = mirrormap.get_mirror_map(('project', 'rule'), mirror_name_fn, ['arm_l', 'arm_r'])
+
+    assert mirrormap.get_mirror_map(('project', 'rule'), mirror_name_fn) is mirror_map
+    assert mirrormap.get_mirror_map(('project', 'other_rule'), mirror_name_fn) is not mirror_map
+    mirrormap.clear_mirror_maps()
+    assert mirrormap.get_mirror_map(('project', 'rule'), mirror_name_fn) is not mirror_map
+
+
+class _Rule(object):
+    def __init__(self, expression):
+        self.name = 'default'
+        self.expression = expression
+        self.iterator_format = '@'
+
+
+class _Project(object):
+    def __init__(self):
+        self.rule = _Rule('{description}_{side}')
+
+    def get_name_rule(self):
+        return self.rule
+
+
+class _Api(object):
+    def __init__(self):
+        self.project = _Project()
+        self.get_mirror_name = _MirrorNameFn()
+
+    def get_current_project(self):
+        return self.project
+
+
+def test_mirror_naming_cache(monkeypatch):
+    api = _Api()
+    monkeypatch.setattr(mirrornaming, 'api', api)
+    mirrornaming.clear_cache()
+
+    cache_key = mirrornaming.get_cache_key()
+    assert mirrornaming.get_mirror_map() is mirrornaming.get_mirror_map()
+    api.project.rule = _Rule('{description}_{side}')
+    assert mirrornaming.get_cache_key() == cache_key
+    api.project.rule.expression = '{side}_{description}'
+    assert mirrornaming.get_cache_key() != cache_key
+
+    for nodes in (['arm_l', 'arm_r'], ['leg_l', 'leg_r']):
+        skeleton_model = skeleton.SkeletonModel()
+        for node in nodes:
+            skeleton_model.add_node(node)
+        monkeypatch.setattr(skeleton, '_ACTIVE_SKELETON', skeleton_model)
+        mirror_map = mirrornaming.get_mirror_map()
+        assert mirrornaming.get_mirror_map() is mirror_map
+        assert mirror_map.get_pairs() == [tuple(nodes)]
+    assert api.get_mirror_name.calls == 2
+
+    mirrornaming.clear_cache()
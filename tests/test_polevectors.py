@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for vectorized pole vectors computation
+"""
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import polevectors
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import polesolver
+
+
+def _get_pole_vector(start, mid, end, offset):
+    start, mid, end = [np.asarray(position, dtype=np.float64) for position in (start, mid, end)]
+    chain = end - start
+    start_to_mid = mid - start
+    projection = chain * (start_to_mid.dot(chain) / chain.dot(chain))
+    direction = start_to_mid - projection
+
+    return mid + direction / np.linalg.norm(direction) * np.linalg.norm(chain) * offset
+
+
+def test_pole_vectors_match_single_limb():
+    random_generator = np.random.RandomState(0)
+    positions = random_generator.uniform(-10.0, 10.0, (50, 3, 3))
+    offsets = random_generator.uniform(0.5, 2.0, 50)
+
+    pole_positions, orientations = polevectors.get_pole_vectors(positions, offsets)
+    for limb_positions, offset, pole_position, orientation in zip(positions, offsets, pole_positions, orientations):
+        expected_position = _get_pole_vector(limb_positions[0], limb_positions[1], limb_positions[2], offset)
+        assert np.allclose(pole_position, expected_position)
+        assert np.allclose(orientation.dot(orientation.T), np.eye(3))
+        assert np.isclose(np.linalg.det(orientation), 1.0)
+
+
+def test_straight_limbs():
+    positions = [
+        [[0.0, 10.0, 0.0], [0.0, 5.0, 0.0], [0.0, 0.0, 0.0]],
+        [[0.0, 0.0, 0.0], [0.0, 0.0, 5.0], [0.0, 0.0, 10.0]],
+    ]
+
+    pole_positions, orientations = polevectors.get_pole_vectors(positions)
+    assert np.allclose(pole_positions, [[0.0, 5.0, 10.0], [0.0, 10.0, 5.0]])
+    assert np.allclose([np.linalg.det(orientation) for orientation in orientations], 1.0)
+
+    pole_positions, _ = polevectors.get_pole_vectors(positions[:1], 2.0, fallback_vector=[1.0, 1.0, 0.0])
+    assert np.allclose(pole_positions, [[20.0, 5.0, 0.0]])
+
+
+def test_mirror_pole_vectors():
+    random_generator = np.random.RandomState(1)
+    positions = random_generator.uniform(-10.0, 10.0, (20, 3, 3))
+    mirrored_positions = positions * [-1.0, 1.0, 1.0]
+
+    pole_positions, orientations = polevectors.get_pole_vectors(positions, 1.5)
+    expected_positions, expected_orientations = polevectors.get_pole_vectors(mirrored_positions, 1.5)
+    mirrored_pole_positions, mirrored_orientations = polevectors.mirror_pole_vectors(pole_positions, orientations)
+    assert np.allclose(mirrored_pole_positions, expected_positions)
+    assert np.allclose(mirrored_orientations, expected_orientations)
+
+
+def test_session_limbs_are_solved_in_one_batch(monkeypatch):
+    positions = {
+        'arm_l': [0.0, 10.0, 0.0], 'elbow_l': [1.0, 5.0, 0.0], 'hand_l': [0.0, 0.0, 0.0],
+        'arm_r': [0.0, 10.0, 0.0], 'elbow_r': [-1.0, 5.0, 0.0], 'hand_r': [0.0, 0.0, 0.0]}
+    reads = list()
+
+    def _read_world_positions(nodes):
+        reads.append(list(nodes))
+        return np.array([positions[node] for node in nodes], dtype=np.float64)
+
+    monkeypatch.setattr(polesolver, 'read_world_positions', _read_world_positions)
+    with polesolver.pole_vectors_session() as solver:
+        assert polesolver.get_pole_vector_solver() is solver
+        solver.add_limb(['arm_l', 'elbow_l', 'hand_l'])
+        solver.add_limb(['arm_r', 'elbow_r', 'hand_r'], offset=2.0)
+        solver.add_limb(['arm_r', 'elbow_r', 'hand_r'])
+        solver.remove_limb(['arm_r', 'elbow_r', 'hand_r'], offset=2.0)
+
+        pole_position, _ = solver.get_pole_vector(['arm_l', 'elbow_l', 'hand_l'])
+        assert np.allclose(pole_position, [11.0, 5.0, 0.0])
+        pole_position, _ = solver.get_pole_vector(['arm_r', 'elbow_r', 'hand_r'])
+        assert np.allclose(pole_position, [-11.0, 5.0, 0.0])
+
+    assert reads == [['arm_l', 'elbow_l', 'hand_l', 'arm_r', 'elbow_r', 'hand_r']]
+    assert polesolver.get_pole_vector_solver() is not solver
@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for scene rig index
+"""
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import rigindex
+
+
+def _create_scene():
+    backend = rigindex.MemorySceneBackend()
+    for namespace in ('hero', 'villain'):
+        backend.add_rig(
+            '{}:controls_arm_l'.format(namespace), class_name='IkLimbRig', description='arm', side='l',
+            controls=['{}:CNT_arm_l'.format(namespace), '{}:CNT_elbow_l'.format(namespace)],
+            sub_controls=['{}:CNT_armSub_l'.format(namespace)],
+            joints=['{}:arm_l'.format(namespace), '{}:elbow_l'.format(namespace)])
+        backend.add_rig(
+            '{}:controls_spine'.format(namespace), class_name='FkRig', description='spine', side='c',
+            controls=['{}:CNT_spine'.format(namespace)], joints=['{}:spine'.format(namespace)])
+
+    return backend
+
+
+def test_rig_queries():
+    index = rigindex.RigIndex(_create_scene())
+
+    assert index.get_namespaces() == ['hero', 'villain']
+    assert len(index.get_rigs()) == 4
+    assert [rig.description for rig in index.get_rigs('hero')] == ['arm', 'spine']
+    assert index.get_character_controls('villain') == [
+        'villain:CNT_arm_l', 'villain:CNT_elbow_l', 'villain:CNT_armSub_l', 'villain:CNT_spine']
+    assert index.get_node_rig('hero:elbow_l').group == 'hero:controls_arm_l'
+    assert index.get_node_rig('hero:CNT_armSub_l').class_name == 'IkLimbRig'
+    assert index.get_node_rig('missing') is None
+    assert index.get_rig('villain:controls_spine').side == 'c'
+
+
+def test_index_is_rebuilt_when_scene_changes(monkeypatch):
+    backend = _create_scene()
+    index = rigindex.RigIndex(backend)
+    assert len(index.get_rigs()) == 4
+
+    scans = list()
+    get_rigs = backend.get_rigs
+    monkeypatch.setattr(backend, 'get_rigs', lambda: scans.append(True) or get_rigs())
+    index.get_node_rig('hero:CNT_spine')
+    index.get_character_controls('hero')
+    assert not scans
+
+    backend.remove_rig('hero:controls_spine')
+    assert index.get_node_rig('hero:CNT_spine') is None
+    assert index.get_character_controls('hero')[-1] == 'hero:CNT_armSub_l'
+    assert len(scans) == 1
+
+
+def test_namespace():
+    assert rigindex.get_namespace('|hero:root|hero:sub:CNT_spine') == 'hero:sub'
+    assert rigindex.get_namespace('CNT_spine') == ''
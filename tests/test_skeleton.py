@@ -0,0 +1,152 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for skeleton model
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import matrixmath
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core import joint
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import skeleton
+
+
+def _get_matrix(translation, rotation=(0.0, 0.0, 0.0)):
+    matrix = matrixmath.get_euler_matrix(rotation)
+    matrix[12:15] = translation
+
+    return matrix
+
+
+def _create_skeleton():
+    skeleton_model = skeleton.SkeletonModel(mirror_name_fn=lambda name: name.replace('_l', '_r'))
+    skeleton_model.add_node('root', skeleton.NODE_TYPE_TRANSFORM, world_matrix=_get_matrix([0.0, 10.0, 0.0]))
+    for side, offset in (('l', 1.0), ('r', -1.0)):
+        skeleton_model.add_node(
+            'upperarm_{}'.format(side), parent='root', world_matrix=_get_matrix([offset, 10.0, 0.0], [0.0, 0.0, 90.0]))
+        skeleton_model.add_node(
+            'lowerarm_{}'.format(side), parent='upperarm_{}'.format(side),
+            world_matrix=_get_matrix([offset * 3.0, 10.0, 0.0], [0.0, 0.0, 90.0]))
+
+    return skeleton_model
+
+
+def test_skeleton_queries():
+    skeleton_model = _create_skeleton()
+
+    assert len(skeleton_model) == 5
+    assert skeleton_model.is_joint('upperarm_l') and not skeleton_model.is_joint('root')
+    assert skeleton_model.is_transform('root') and not skeleton_model.is_transform('hand_l')
+    assert skeleton_model.get_node_type('hand_l') is None
+    assert skeleton_model.get_children('root') == ['upperarm_l', 'upperarm_r']
+    assert skeleton_model.get_world_position('lowerarm_l') == [3.0, 10.0, 0.0]
+    assert matrixmath.is_close(skeleton_model.get_local_matrix('lowerarm_l'), _get_matrix([0.0, -2.0, 0.0]))
+    assert skeleton_model.get_mirror('lowerarm_l') == 'lowerarm_r'
+    assert skeleton_model.get_mirror('root') is None
+
+
+def test_skeleton_updates():
+    skeleton_model = _create_skeleton()
+    skeleton_model.add_node('lowerarm_l_twist', parent='lowerarm_l', world_matrix=_get_matrix([4.0, 10.0, 0.0]))
+
+    added = skeleton_model.add_duplicates(['upperarm_l', 'lowerarm_l'], ['upperarm_l_buffer', 'lowerarm_l_buffer'])
+    assert added == 2
+    assert skeleton_model.get_parent('upperarm_l_buffer') == 'root'
+    assert skeleton_model.get_parent('lowerarm_l_buffer') == 'upperarm_l_buffer'
+    assert skeleton_model.get_children('lowerarm_l') == ['lowerarm_l_twist']
+    assert skeleton_model.get_world_matrix('lowerarm_l_buffer') == skeleton_model.get_world_matrix('lowerarm_l')
+
+    skeleton_model.add_node('setup', skeleton.NODE_TYPE_TRANSFORM, world_matrix=_get_matrix([0.0, 5.0, 0.0]))
+    skeleton_model.set_parent('upperarm_l_buffer', 'setup')
+    assert skeleton_model.get_children('root') == ['upperarm_l', 'upperarm_r']
+    assert skeleton_model.get_children('setup') == ['upperarm_l_buffer']
+    assert skeleton_model.get_world_position('upperarm_l_buffer') == [1.0, 10.0, 0.0]
+    assert matrixmath.is_close(
+        skeleton_model.get_local_matrix('upperarm_l_buffer'), _get_matrix([1.0, 5.0, 0.0], [0.0, 0.0, 90.0]))
+
+    skeleton_model.set_parent('upperarm_l_buffer', 'ik_group')
+    assert skeleton_model.get_local_matrix('upperarm_l_buffer') is None
+
+
+class _Dcc(object):
+    calls = list()
+
+    @classmethod
+    def node_is_joint(cls, node):
+        cls.calls.append(node)
+        return False
+
+    @classmethod
+    def node_is_transform(cls, node):
+        cls.calls.append(node)
+        return False
+
+
+class _Tp(object):
+    Dcc = _Dcc
+
+
+class _Api(object):
+
+    @staticmethod
+    def get_mirror_name(name):
+        return name.replace('_l', '_r')
+
+
+@pytest.fixture
+def scene_skeleton(monkeypatch):
+    loads = list()
+
+    def _load_scene_skeleton(mirror_name_fn=None):
+        loads.append(mirror_name_fn)
+        return _create_skeleton()
+
+    _Dcc.calls = list()
+    monkeypatch.setattr(skeleton, 'load_scene_skeleton', _load_scene_skeleton)
+    monkeypatch.setattr(skeleton, 'api', _Api)
+    monkeypatch.setattr(joint, 'tp', _Tp)
+
+    return loads
+
+
+def test_skeleton_sessions(scene_skeleton):
+    assert skeleton.get_skeleton() is None
+
+    build_skeleton = skeleton.begin_skeleton_session()
+    with skeleton.skeleton_session() as node_skeleton:
+        assert skeleton.get_skeleton() is node_skeleton is not build_skeleton
+    assert skeleton.get_skeleton() is build_skeleton
+    skeleton.end_skeleton_session()
+
+    assert skeleton.get_skeleton() is None
+    assert len(scene_skeleton) == 2
+
+
+def test_skeleton_run(scene_skeleton):
+    joint_rig = joint.JointRig.__new__(joint.JointRig)
+
+    @skeleton.skeleton_run
+    def run_child(joints):
+        joint_rig._check_joints(joints)
+        return skeleton.get_skeleton()
+
+    @skeleton.skeleton_run
+    def run(joints):
+        return skeleton.get_skeleton(), run_child(joints)
+
+    node_skeleton, child_skeleton = run(['upperarm_l', 'lowerarm_r'])
+    assert node_skeleton is child_skeleton
+    assert node_skeleton.get_mirror('upperarm_l') == 'upperarm_r'
+    assert scene_skeleton == [_Api.get_mirror_name]
+    assert not _Dcc.calls
+    assert skeleton.get_skeleton() is None
+
+    with pytest.raises(Exception):
+        run(['hand_l'])
+    assert _Dcc.calls == ['hand_l', 'hand_l']
+    assert skeleton.get_skeleton() is None
+
+    with pytest.raises(Exception):
+        joint_rig._check_joints(['upperarm_l'])
+    assert len(scene_skeleton) == 2
@@ -0,0 +1,77 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for skin weights remapping functions
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights, skinremap
+
+
+def _get_sphere(rings, segments, radius=10.0):
+    theta = np.linspace(0.0, np.pi, rings)
+    phi = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing='ij')
+    return np.stack(
+        [radius * np.sin(theta) * np.cos(phi), radius * np.cos(theta), radius * np.sin(theta) * np.sin(phi)],
+        axis=-1).reshape(-1, 3)
+
+
+def _get_weights(positions):
+    # Smooth weights that blend between two joints along the Y axis
+    top = np.clip((positions[:, 1] + 10.0) / 20.0, 0.0, 1.0)
+    return skinweights.SkinWeightsMatrix.from_dense(np.stack([top, 1.0 - top], axis=-1), ['top', 'bottom'])
+
+
+def test_grid_index_matches_brute_force():
+    random = np.random.RandomState(1)
+    points = random.random_sample((2000, 3)) * [10.0, 1.0, 5.0]
+    queries = random.random_sample((300, 3)) * [12.0, 2.0, 6.0] - 1.0
+    distances, indices = skinremap.GridIndex(points).query(queries, k=3)
+    brute = np.linalg.norm(queries[:, np.newaxis, :] - points[np.newaxis, :, :], axis=-1)
+    np.testing.assert_allclose(distances, np.sort(brute, axis=1)[:, :3])
+
+
+def test_remap_same_topology_is_identity():
+    positions = _get_sphere(20, 30)
+    matrix = _get_weights(positions)
+    remapped = skinremap.remap_weights(matrix, positions, positions, mode=skinremap.REMAP_MODE_INTERPOLATE)
+    np.testing.assert_allclose(remapped.to_dense(), matrix.to_dense(), atol=1e-9)
+
+
+@pytest.mark.parametrize('mode, tolerance', [
+    (skinremap.REMAP_MODE_NEAREST, 0.06), (skinremap.REMAP_MODE_INTERPOLATE, 0.04)])
+def test_remap_retopologized_mesh(mode, tolerance):
+    source_positions = _get_sphere(40, 60)
+    target_positions = _get_sphere(33, 47)
+    remapped = skinremap.remap_weights(_get_weights(source_positions), source_positions, target_positions, mode=mode)
+    expected = _get_weights(target_positions).to_dense()
+    assert remapped.vertex_count == len(target_positions)
+    assert np.abs(remapped.to_dense() - expected).max() < tolerance
+    np.testing.assert_allclose(remapped.vertex_sums(), 1.0)
+
+
+@pytest.mark.parametrize('points', [
+    [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]],
+    np.stack([np.linspace(0.0, 100.0, 500), np.zeros(500), np.zeros(500)], axis=-1),
+    np.stack([np.repeat(np.arange(30.0), 30), np.tile(np.arange(30.0), 30), np.zeros(900)], axis=-1)])
+def test_grid_index_degenerate_points(points):
+    points = np.asarray(points)
+    queries = np.random.RandomState(2).random_sample((50, 3)) * 120.0 - 10.0
+    distances, _ = skinremap.GridIndex(points).query(queries, k=2)
+    brute = np.linalg.norm(queries[:, np.newaxis, :] - points[np.newaxis, :, :], axis=-1)
+    np.testing.assert_allclose(distances, np.sort(brute, axis=1)[:, :2])
+
+
+def test_remap_with_fewer_source_vertices_than_neighbours():
+    source_positions = np.array([[0.0, -10.0, 0.0], [0.0, 0.0, 0.0], [0.0, 10.0, 0.0]])
+    target_positions = _get_sphere(5, 6)
+    remapped = skinremap.remap_weights(
+        _get_weights(source_positions), source_positions, target_positions, mode=skinremap.REMAP_MODE_INTERPOLATE,
+        neighbours=4)
+    assert remapped.vertex_count == len(target_positions)
+    np.testing.assert_allclose(remapped.vertex_sums(), 1.0)
@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for delta encoded skin weights versions
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights, skinversions
+
+
+def _get_dense(vertex_count=1000, influence_count=6, seed=0):
+    dense = np.random.RandomState(seed).random_sample((vertex_count, influence_count))
+    dense[dense < 0.5] = 0.0
+    dense[:, 0] += 0.01
+    return dense / dense.sum(axis=1)[:, np.newaxis]
+
+
+def _get_matrix(dense, influence_names=None):
+    influence_names = influence_names or ['joint{}'.format(i) for i in range(dense.shape[1])]
+    return skinweights.SkinWeightsMatrix.from_dense(dense, influence_names)
+
+
+def test_versions_are_rebuilt(tmpdir):
+    versions = skinversions.SkinWeightsVersions(str(tmpdir))
+    dense_1 = _get_dense()
+    dense_2 = dense_1.copy()
+    dense_2[10:30] = _get_dense(20, seed=1)
+    assert versions.save_version(_get_matrix(dense_1))['type'] == 'base'
+    version_info = versions.save_version(_get_matrix(dense_2))
+    assert version_info['type'] == 'delta'
+    assert version_info['changed'] == 20
+
+    versions = skinversions.SkinWeightsVersions(str(tmpdir))
+    np.testing.assert_allclose(versions.load_version(1).to_dense(), dense_1)
+    np.testing.assert_allclose(versions.load_version(2).to_dense(), dense_2)
+
+
+def test_big_changes_are_compacted(tmpdir):
+    versions = skinversions.SkinWeightsVersions(str(tmpdir), compaction_ratio=0.25)
+    versions.save_version(_get_matrix(_get_dense()))
+    assert versions.save_version(_get_matrix(_get_dense(seed=2)))['type'] == 'base'
+    assert versions.compact()['type'] == 'base'
+    np.testing.assert_allclose(versions.load_version().to_dense(), _get_dense(seed=2))
+
+
+def test_delta_with_new_influences_and_vertices(tmpdir):
+    versions = skinversions.SkinWeightsVersions(str(tmpdir))
+    dense_1 = _get_dense(100, 3)
+    dense_2 = np.zeros((102, 4))
+    dense_2[:100, :3] = dense_1
+    dense_2[[5, 100, 101], :] = [0.0, 0.0, 0.0, 1.0]
+    versions.save_version(_get_matrix(dense_1, ['a', 'b', 'c']))
+    assert versions.save_version(_get_matrix(dense_2, ['a', 'b', 'c', 'd']))['changed'] == 3
+    matrix = versions.load_version()
+    assert matrix.vertex_count == 102
+    np.testing.assert_allclose(matrix.to_dense()[:, [matrix.influence_names.index(n) for n in 'abcd']], dense_2)
+
+
+def test_apply_delta_with_removed_vertices():
+    dense_1 = _get_dense(50, 3)
+    dense_2 = dense_1[:40].copy()
+    dense_2[[0, 7, 39]] = [0.0, 1.0, 0.0]
+    base_matrix = _get_matrix(dense_1)
+    delta = skinversions.compute_delta(base_matrix, _get_matrix(dense_2))
+    matrix = skinversions.apply_delta(base_matrix, delta, base_offsets=skinversions.get_vertex_offsets(base_matrix))
+
+    assert matrix.vertex_count == 40
+    assert (matrix.vertices[1:] >= matrix.vertices[:-1]).all()
+    np.testing.assert_allclose(matrix.to_dense(), dense_2)
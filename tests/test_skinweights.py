@@ -0,0 +1,90 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for skin weights processing functions
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights
+
+
+def _get_matrix():
+    dense = np.array([
+        [0.5, 0.3, 0.15, 0.05, 0.0],
+        [0.0005, 0.9995, 0.0, 0.0, 0.0],
+        [0.2, 0.2, 0.2, 0.2, 0.2],
+        [0.0, 0.0, 0.0, 0.0, 0.0005]
+    ])
+    return skinweights.SkinWeightsMatrix.from_dense(dense, ['a', 'b', 'c', 'd', 'e'])
+
+
+def test_prune_keeps_biggest_weight():
+    matrix = skinweights.prune_weights(_get_matrix(), 0.001)
+    dense = matrix.to_dense()
+    assert dense[1, 0] == 0.0
+    assert dense[3, 4] == 0.0005
+
+
+def test_limit_influences():
+    matrix = skinweights.limit_influences(_get_matrix(), 2)
+    assert matrix.influence_counts().max() == 2
+    dense = matrix.to_dense()
+    assert dense[0, 0] == 0.5 and dense[0, 1] == 0.3 and dense[0, 2] == 0.0
+
+
+def test_process_weights_normalizes():
+    matrix, stats = skinweights.process_weights(_get_matrix(), prune_threshold=0.001, max_influences=3)
+    np.testing.assert_allclose(matrix.vertex_sums(), 1.0)
+    assert stats['pruned'] == 1
+    assert stats['max_influences_after'] == 3
+
+
+def test_influence_weights_round_trip():
+    matrix = _get_matrix()
+    new_matrix = skinweights.SkinWeightsMatrix.from_influence_weights(matrix.to_influence_weights())
+    np.testing.assert_allclose(new_matrix.to_dense()[:, [new_matrix.influence_names.index(n) for n in 'abcde']],
+                               matrix.to_dense())
+
+
+def test_weights_text_round_trip():
+    weights = np.array([0.0, 0.25, 1.0])
+    np.testing.assert_allclose(skinweights.parse_weights(skinweights.format_weights(weights)), weights)
+
+
+def test_mesh_weights_hash(tmpdir):
+    mesh_folder = tmpdir.mkdir('mesh')
+    mesh_folder.join('influence.info').write('{}')
+    mesh_folder.join('joint1.weights').write('[1.0, 0.5]')
+    weights_hash = skinweights.get_mesh_weights_hash(str(mesh_folder))
+    assert weights_hash == skinweights.get_mesh_weights_hash(str(mesh_folder))
+    mesh_folder.join('joint1.weights').write('[1.0, 0.25]')
+    assert weights_hash != skinweights.get_mesh_weights_hash(str(mesh_folder))
+
+
+def test_topology_fingerprint():
+    fingerprint = skinweights.get_topology_fingerprint(10, ['a', 'b'])
+    assert fingerprint == skinweights.get_topology_fingerprint(10, ['b', 'a'])
+    assert fingerprint != skinweights.get_topology_fingerprint(11, ['a', 'b'])
+
+
+def test_weights_stats_are_cached(tmpdir):
+    mesh_folder = tmpdir.mkdir('weights').mkdir('body')
+    mesh_folder.join('influence.info').write('{}')
+    mesh_folder.join('root.weights').write('[1.0, 0.5, 0.0]')
+    mesh_folder.join('spine.weights').write('[0.0, 0.5, 1.0]')
+    stats_path = str(tmpdir.join('weights.stats'))
+
+    stats = skinweights.get_weights_stats(str(tmpdir.join('weights')), stats_path)['body']
+    assert stats['vertices'] == 3
+    assert stats['max_influences'] == 2
+    assert stats['influences_histogram'] == [0, 2, 1]
+    assert stats['influence_sums'] == {'root': 1.5, 'spine': 1.5}
+
+    cached_stats = skinweights.get_weights_stats(str(tmpdir.join('weights')), stats_path)
+    assert cached_stats['body'] == stats
+    mesh_folder.join('spine.weights').write('[0.0, 0.0, 1.0, 1.0]')
+    assert skinweights.get_weights_stats(str(tmpdir.join('weights')), stats_path)['body']['vertices'] == 4
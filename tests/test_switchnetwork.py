@@ -0,0 +1,200 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for switch networks
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, metadata, switchnetwork
+
+
+def test_index_weight():
+    assert switchnetwork.get_index_weight(0.0, 0) == 1.0
+    assert switchnetwork.get_index_weight(0.0, 1) == 0.0
+    assert switchnetwork.get_index_weight(1.25, 1) == 0.75
+    assert switchnetwork.get_index_weight(1.25, 2) == 0.25
+    assert switchnetwork.get_index_weight(3.0, 1) == 0.0
+
+    for switch_value in (0.0, 0.3, 1.0, 1.5, 2.9, 3.0):
+        assert sum(switchnetwork.get_index_weight(switch_value, index) for index in range(4)) == pytest.approx(1.0)
+
+
+class _Node(object):
+    def __init__(self, name, node_type):
+        self.name = name
+        self.node_type = node_type
+        self.values = dict()
+
+
+class _Plug(object):
+    def __init__(self, scene, node, attribute_name):
+        self._scene = scene
+        self.node_object = node
+        self.attribute_name = attribute_name
+
+    def node(self):
+        return self.node_object
+
+    def asInt(self):
+        return self.node_object.values[self.attribute_name]
+
+    def elementByLogicalIndex(self, index):
+        return _Plug(self._scene, self.node_object, '{}[{}]'.format(self.attribute_name, index))
+
+    def child(self, index):
+        return _Plug(self._scene, self.node_object, '{}.{}'.format(self.attribute_name, index))
+
+    def destinations(self):
+        return [_Plug(self._scene, self._scene.nodes[target.split('.', 1)[0]], target.split('.', 1)[1])
+                for source, target in self._scene.api_connections if source == self.name()]
+
+    def name(self):
+        return '{}.{}'.format(self.node_object.name, self.attribute_name)
+
+
+class _Scene(object):
+    """
+    Maya API and commands stub that stores nodes, their values and their connections
+    """
+
+    def __init__(self):
+        self.nodes = {'switch_grp': _Node('switch_grp', 'transform')}
+        self.api_connections = list()
+        self.connections = list()
+        self.undo_queue = list()
+        scene = self
+
+        class MFnDependencyNode(object):
+            def __init__(self, node):
+                self._node = node
+
+            @property
+            def typeName(self):
+                return self._node.node_type
+
+            def name(self):
+                return self._node.name
+
+            def hasAttribute(self, attribute_name):
+                return attribute_name in self._node.values
+
+            def findPlug(self, attribute_name, want_network):
+                return _Plug(scene, self._node, attribute_name)
+
+        class MFnNumericAttribute(object):
+            def create(self, long_name, short_name, numeric_type, default):
+                return long_name
+
+        class MFnNumericData(object):
+            kInt = 0
+
+        class MDGModifier(object):
+            def __init__(self):
+                self._operations = list()
+
+            def createNode(self, node_type):
+                node = _Node('{}{}'.format(node_type, len(scene.nodes)), node_type)
+                self._operations.append(lambda: scene.nodes.__setitem__(node.name, node))
+                return node
+
+            def renameNode(self, node, name):
+                def _rename():
+                    scene.nodes[name] = scene.nodes.pop(node.name)
+                    node.name = name
+                self._operations.append(_rename)
+
+            def addAttribute(self, node, attribute_name):
+                self._operations.append(lambda: node.values.__setitem__(attribute_name, None))
+
+            def newPlugValueInt(self, plug, value):
+                self._operations.append(lambda: plug.node_object.values.__setitem__(plug.attribute_name, value))
+
+            newPlugValueDouble = newPlugValueInt
+
+            def connect(self, source_plug, target_plug):
+                self._operations.append(
+                    lambda: scene.api_connections.append((source_plug.name(), target_plug.name())))
+
+            def doIt(self):
+                for operation in self._operations:
+                    operation()
+                del self._operations[:]
+
+        class Cmds(object):
+            def undoInfo(self, query=True, state=True):
+                return True
+
+            def pluginInfo(self, plugin_path, query=True, loaded=True):
+                return True
+
+            def rigBuilderApiUndo(self):
+                scene.undo_queue.append(apiundo.pop_pending())
+
+            def isConnected(self, source_plug, target_plug):
+                return (source_plug, target_plug) in scene.connections
+
+            def connectAttr(self, source_plug, target_plug, force=False):
+                scene.connections.append((source_plug, target_plug))
+
+        self.OpenMaya = type('OpenMaya', (object, ), dict(
+            MFnDependencyNode=MFnDependencyNode, MFnNumericAttribute=MFnNumericAttribute,
+            MFnNumericData=MFnNumericData, MDGModifier=MDGModifier))
+        self.maya = type('Maya', (object, ), dict(cmds=Cmds()))
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    scene = _Scene()
+    monkeypatch.setattr(switchnetwork, 'OpenMaya', scene.OpenMaya)
+    monkeypatch.setattr(switchnetwork, 'maya', scene.maya)
+    monkeypatch.setattr(apiundo, 'maya', scene.maya)
+    monkeypatch.setattr(metadata, 'get_node_object', lambda node: scene.nodes[node])
+    return scene
+
+
+def test_index_nodes_are_reused(scene):
+    switch = switchnetwork.SwitchNetwork('switch_grp', 'switch')
+    switch.connect_weights(0, ['arm_parentConstraint1.arm_fkW0', 'elbow_parentConstraint1.elbow_fkW0'])
+    switch.connect_visibility(0, ['controls_fk', 'controls_fk_sub'])
+    switch.connect_visibility(0, 'controls_fk')
+    node_count = len(scene.nodes)
+    undo_count = len(scene.undo_queue)
+
+    assert node_count == 3 and undo_count == 2
+    assert scene.nodes['switch_grp_switch0'].node_type == switchnetwork.WEIGHT_NODE_TYPE
+    visibility_node = scene.nodes['switch_grp_switch0Visibility']
+    assert visibility_node.node_type == switchnetwork.VISIBILITY_NODE_TYPE
+    assert visibility_node.values['secondTerm'] == 0 and visibility_node.values['operation'] == 0
+    assert scene.connections == [
+        ('switch_grp_switch0.outValue', 'arm_parentConstraint1.arm_fkW0'),
+        ('switch_grp_switch0.outValue', 'elbow_parentConstraint1.elbow_fkW0'),
+        ('switch_grp_switch0Visibility.outColorR', 'controls_fk.visibility'),
+        ('switch_grp_switch0Visibility.outColorR', 'controls_fk_sub.visibility')]
+
+    # A new network of the same switch attribute finds the existing index nodes
+    switch = switchnetwork.SwitchNetwork('switch_grp', 'switch')
+    assert len(switch) == 1 and switch.get_index_count() == 1
+    switch.connect_weights(0, ['hand_parentConstraint1.hand_fkW0'])
+    switch.connect_visibility(0, 'controls_fk')
+    assert len(scene.nodes) == node_count and len(scene.undo_queue) == undo_count
+
+
+def test_chains_join_incrementally(scene):
+    switchnetwork.SwitchNetwork('switch_grp', 'switch').connect_visibility(0, 'controls_fk')
+    api_connections = list(scene.api_connections)
+
+    switch = switchnetwork.SwitchNetwork('switch_grp', 'switch')
+    switch.connect_weights(1, ['arm_parentConstraint1.arm_ikW1'])
+    switch.connect_visibility(1, 'controls_ik')
+
+    assert switch.get_index_count() == 2
+    assert scene.api_connections[:len(api_connections)] == api_connections
+    assert scene.api_connections[len(api_connections):] == [
+        ('switch_grp.switch', 'switch_grp_switch1.inputValue'),
+        ('switch_grp.switch', 'switch_grp_switch1Visibility.firstTerm')]
+    assert scene.nodes['switch_grp_switch1'].values['inputMin'] == 0
+    assert scene.nodes['switch_grp_switch1'].values['inputMax'] == 2
+    assert scene.nodes['switch_grp_switch1Visibility'].values['secondTerm'] == 1
+    assert ('switch_grp_switch1Visibility.outColorR', 'controls_ik.visibility') in scene.connections
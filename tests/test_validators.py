@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for rig builder data files validators
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import validators
+
+
+def _get_validators():
+    return {
+        '.ma': validators.get_validators('.ma'),
+        '.skin': validators.get_validators('.skin')
+    }
+
+
+def _write_data_files(tmpdir):
+    tmpdir.join('valid.ma').write('//Maya ASCII 2020 scene\nrequires maya "2020";\ncreateNode transform -n "root";\n')
+    tmpdir.join('student.ma').write('//Maya ASCII 2020 scene\nfileInfo "license" "student";\n')
+    tmpdir.join('broken.ma').write('createNode transform -n "root";\n\tsetAttr ".t" -type "double3" 0 0 0\n')
+    tmpdir.join('reference.ma').write('file -r -ns "geo" -rfn "geoRN" "geo/body.ma";\n')
+    tmpdir.join('.valid.ma.0f1e.tmp.ma').write('createNode transform -n "')
+
+    mesh_folder = tmpdir.mkdir('body.skin').mkdir('body')
+    mesh_folder.join('influence.info').write('{}')
+    mesh_folder.join('joint1.weights').write('[1.0, 0.5, 0.2]')
+    mesh_folder.join('joint2.weights').write('[0.0, 0.5]')
+
+
+def test_validate_data_files(tmpdir):
+    _write_data_files(tmpdir)
+
+    results = {result['path']: result for result in validators.validate(
+        str(tmpdir), processes=2, validators=_get_validators())}
+    assert sorted(results) == ['body.skin', 'broken.ma', 'reference.ma', 'student.ma', 'valid.ma']
+    assert [path for path, result in sorted(results.items()) if result['valid']] == ['valid.ma']
+    assert results['student.ma']['issues'] == [('error', 'File was saved with a student license')]
+    assert results['reference.ma']['issues'] == [('error', 'Referenced file not found: geo/body.ma')]
+    assert results['body.skin']['issues'][0] == ('error', 'body: joint2 stores 2 vertices, expected 3')
+    assert not any(result['cached'] for result in results.values())
+
+    tmpdir.mkdir('geo').join('body.ma').write('createNode mesh -n "bodyShape";\n')
+    results = {result['path']: result for result in validators.validate(
+        str(tmpdir), processes=2, validators=_get_validators())}
+    # References validation does not only depend on the file contents, so it is not cached
+    assert results['reference.ma']['cached'] and results['reference.ma']['valid']
+    assert not results['geo/body.ma']['cached'] and results['geo/body.ma']['valid']
+
+    tmpdir.join('broken.ma').write('createNode transform -n "root";\n')
+    results = {result['path']: result for result in validators.validate(
+        str(tmpdir), processes=2, validators=_get_validators())}
+    assert results['broken.ma']['valid'] and not results['broken.ma']['cached']
+    assert results['student.ma']['cached']
+
+
+def test_command_line(tmpdir, capsys):
+    tmpdir.join('valid.ma').write('createNode transform -n "root";\n')
+    assert validators.main([str(tmpdir), '--processes', '1']) == 0
+    tmpdir.join('student.ma').write('fileInfo "license" "student";\n')
+    assert validators.main([str(tmpdir), '--processes', '1']) == 1
+    assert 'FAIL student.ma' in capsys.readouterr().out
@@ -0,0 +1,468 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to parse, validate and compact Maya ASCII files outside of Maya
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import re
+import uuid
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import fileutils
+
+# Number of arguments of each setAttr flag. setAttr statements with other flags are never modified
+SET_ATTR_FLAGS = {
+    '-k': 1, '-keyable': 1, '-l': 1, '-lock': 1, '-cb': 1, '-channelBox': 1, '-s': 1, '-size': 1,
+    '-type': 1, '-typ': 1, '-ca': 1, '-caching': 1, '-c': 0, '-clamp': 0, '-av': 0, '-alteredValue': 0
+}
+
+# Values that nodes already have when they are created, so setting them right after createNode does nothing
+DEFAULT_ATTRIBUTE_VALUES = {
+    ('.v', ()): ('yes',),
+    ('.t', ('-type', '"double3"')): ('0', '0', '0'),
+    ('.r', ('-type', '"double3"')): ('0', '0', '0'),
+    ('.s', ('-type', '"double3"')): ('1', '1', '1'),
+    ('.sh', ('-type', '"double3"')): ('0', '0', '0'),
+    ('.ra', ('-type', '"double3"')): ('0', '0', '0'),
+    ('.jo', ('-type', '"double3"')): ('0', '0', '0'),
+    ('.tx', ()): ('0',), ('.ty', ()): ('0',), ('.tz', ()): ('0',),
+    ('.rx', ()): ('0',), ('.ry', ()): ('0',), ('.rz', ()): ('0',),
+    ('.sx', ()): ('1',), ('.sy', ()): ('1',), ('.sz', ()): ('1',),
+}
+
+VALUES_PER_LINE = 12
+
+_ARRAY_ELEMENT_REGEX = re.compile(r'^"(.*)\[(\d+)\]"$')
+_TOKEN_REGEX = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s;"]+')
+_SIMPLE_SET_ATTR_REGEX = re.compile(
+    r'^\s*setAttr\s+("[^"\\]*")(?:\s+(-type|-typ)\s+("[^"\\]*"))?((?:\s+[-+.\w]+)*)\s*;\s*$')
+_COMMAND_REGEX = re.compile(r'\s*([^\s;]*)')
+_ESCAPED_QUOTE_REGEX = re.compile(r'(?<!\\)(?:\\\\)*\\"')
+_NUMBER_REGEX = re.compile(r'^-?(\d+\.?\d*|\.\d+)(e[-+]?\d+)?$', re.IGNORECASE)
+
+
+class Statement(object):
+    """
+    MEL statement of a Maya ASCII file
+    """
+
+    __slots__ = ('text', 'tokens')
+
+    def __init__(self, text):
+        self.text = text                    # Original text of the statement, including its ending line break
+        self.tokens = None                  # Tokens of the statement, computed only when needed
+
+    # ==============================================================================================
+    # PROPERTIES
+    # ==============================================================================================
+
+    @property
+    def command(self):
+        return _COMMAND_REGEX.match(self.text).group(1)
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def get_tokens(self):
+        """
+        Returns the tokens of the statement (command, flags and arguments, strings keep their quotes)
+        :return: list(str)
+        """
+
+        if self.tokens is None:
+            self.tokens = tokenize(self.text)
+
+        return self.tokens
+
+
+class SetAttrStatement(object):
+    """
+    Parsed setAttr statement
+    """
+
+    __slots__ = ('attribute', 'flags', 'values')
+
+    def __init__(self, attribute, flags, values):
+        self.attribute = attribute          # Attribute name, with quotes
+        self.flags = flags                  # Tuple with all the flags and flags arguments
+        self.values = values                # Tuple with all the values
+
+    @classmethod
+    def parse_statement(cls, statement):
+        """
+        Parses given setAttr statement. Simple statements (attribute, optional type and values) are parsed with a
+        single regular expression, others are tokenized
+        :param statement: Statement
+        :return: SetAttrStatement or None, None if the statement uses flags that are not supported
+        """
+
+        match = _SIMPLE_SET_ATTR_REGEX.match(statement.text)
+        if not match:
+            return cls.parse(statement.get_tokens())
+
+        attribute, type_flag, type_name, values = match.groups()
+
+        return cls(attribute, (type_flag, type_name) if type_flag else (), tuple(values.split()))
+
+    @classmethod
+    def parse(cls, tokens):
+        """
+        Parses given setAttr tokens
+        :param tokens: list(str)
+        :return: SetAttrStatement or None, None if the statement uses flags that are not supported
+        """
+
+        attribute = None
+        flags, values = list(), list()
+        index = 1
+        while index < len(tokens):
+            token = tokens[index]
+            if token.startswith('-') and not _NUMBER_REGEX.match(token):
+                if token not in SET_ATTR_FLAGS:
+                    return None
+                argument_count = SET_ATTR_FLAGS[token]
+                flags.extend(tokens[index:index + argument_count + 1])
+                index += argument_count + 1
+                continue
+            if attribute is None:
+                attribute = token
+            else:
+                values.append(token)
+            index += 1
+
+        if attribute is None or not attribute.startswith('"'):
+            return None
+
+        return cls(attribute, tuple(flags), tuple(values))
+
+    def to_text(self):
+        """
+        Returns the text of the statement
+        :return: str
+        """
+
+        lines = [' '.join(('\tsetAttr', self.attribute) + self.flags)]
+        for i in range(0, len(self.values), VALUES_PER_LINE):
+            lines.append(' '.join(self.values[i:i + VALUES_PER_LINE]))
+
+        return '\n\t\t'.join(lines) + ';\n'
+
+
+def tokenize(text):
+    """
+    Splits given statement text into tokens. Strings are kept as single tokens with their quotes
+    :param text: str
+    :return: list(str)
+    """
+
+    return _TOKEN_REGEX.findall(text)
+
+
+def _update_string_state(line, in_string):
+    """
+    Internal function that returns whether a string is still open at the end of the given line
+    :param line: str
+    :param in_string: bool, whether a string was open at the start of the line
+    :return: bool
+    """
+
+    quote_count = line.count('"')
+    if quote_count and '\\' in line:
+        quote_count -= len(_ESCAPED_QUOTE_REGEX.findall(line))
+
+    return in_string != bool(quote_count % 2)
+
+
+def iterate_statements(lines):
+    """
+    Groups given Maya ASCII lines into statements. Comment lines are returned as statements with no command
+    :param lines: iterable(str)
+    :return: generator(Statement)
+    :raises: ValueError, if last statement is not terminated
+    """
+
+    pending = list()
+    in_string = False
+    for line in lines:
+        if not pending:
+            # Most statements are written in a single line, so those are returned directly
+            if line.startswith('//') or not line.strip():
+                yield Statement(line)
+                continue
+            if line.rstrip().endswith(';') and not _update_string_state(line, False):
+                yield Statement(line)
+                continue
+        pending.append(line)
+        in_string = _update_string_state(line, in_string)
+        if not in_string and line.rstrip().endswith(';'):
+            yield Statement(''.join(pending))
+            pending = list()
+
+    if pending:
+        raise ValueError('Statement not terminated: {}'.format(pending[0].strip()[:80]))
+
+
+def validate_syntax(file_path):
+    """
+    Validates the syntax of the given Maya ASCII file: all statements and strings are terminated and all attribute
+    brackets are balanced
+    :param file_path: str
+    :return: tuple(list(str), dict(str, int)), list of errors and number of statements of each command
+    """
+
+    errors = list()
+    command_counts = dict()
+    with open(file_path, 'r') as fh:
+        try:
+            for statement in iterate_statements(fh):
+                command = statement.command
+                if not command or command.startswith('//'):
+                    continue
+                command_counts[command] = command_counts.get(command, 0) + 1
+                if command == 'setAttr' and '[' in statement.text:
+                    for token in statement.get_tokens():
+                        if token.startswith('"') and token.count('[') != token.count(']'):
+                            errors.append('Unbalanced brackets in attribute {}'.format(token))
+        except ValueError as exc:
+            errors.append(str(exc))
+
+    return errors, command_counts
+
+
+def get_scene_usage(file_path):
+    """
+    Returns the node types and data types used by the given Maya ASCII file
+    :param file_path: str
+    :return: tuple(set(str), set(str), bool), used node types, used data types and whether the file has references
+    """
+
+    node_regex = re.compile(r'^createNode\s+(\w+)')
+    data_type_regex = re.compile(r'-(?:type|typ|dt|dataType)\s+"(\w+)"')
+    reference_regex = re.compile(r'^file\s.*-r(?:eference)?\s')
+
+    node_types, data_types = set(), set()
+    has_references = False
+    with open(file_path, 'r') as fh:
+        for line in fh:
+            match = node_regex.match(line)
+            if match:
+                node_types.add(match.group(1))
+                continue
+            if '-typ' in line or '-d' in line:
+                data_types.update(data_type_regex.findall(line))
+            if line.startswith('file ') and reference_regex.match(line):
+                has_references = True
+
+    return node_types, data_types, has_references
+
+
+def _get_requires_usage(tokens):
+    """
+    Internal function that returns the plugin, node types and data types declared by the given requires statement
+    :param tokens: list(str)
+    :return: tuple(str, list(str), list(str))
+    """
+
+    node_types, data_types = list(), list()
+    arguments = list()
+    index = 1
+    while index < len(tokens):
+        token = tokens[index]
+        if token in ('-nodeType', '-dataType'):
+            (node_types if token == '-nodeType' else data_types).append(tokens[index + 1].strip('"'))
+            index += 2
+            continue
+        arguments.append(token)
+        index += 1
+
+    return (arguments[0].strip('"') if arguments else ''), node_types, data_types
+
+
+def compact_maya_ascii(
+        file_path, output_path=None, remove_defaults=True, merge_arrays=True, remove_unused_requires=True):
+    """
+    Compacts given Maya ASCII file so Maya replays less statements when loading it:
+        - setAttr statements overridden by a later setAttr of the same attribute (in the same node) are removed
+        - setAttr statements that do nothing (no values and no flags, or default values after createNode) are removed
+        - Consecutive setAttr of consecutive array elements are merged into a single ranged setAttr
+        - requires statements of plugins whose node types and data types are not used are removed
+    File is processed in a streaming fashion. Compacted file is validated before replacing the original one
+    :param file_path: str
+    :param output_path: str or None, path where compacted file is stored. If not given, original file is replaced
+    :param remove_defaults: bool
+    :param merge_arrays: bool
+    :param remove_unused_requires: bool
+    :return: dict, compaction stats
+    """
+
+    output_path = output_path or file_path
+    stats = {
+        'bytes_before': os.path.getsize(file_path), 'bytes_after': 0, 'statements_before': 0, 'statements_after': 0,
+        'redundant': 0, 'noop': 0, 'defaults': 0, 'requires': 0, 'merged': 0, 'valid': False, 'errors': list()
+    }
+
+    used_node_types, used_data_types, has_references = get_scene_usage(file_path)
+    # Plugins of referenced files are not known, so requires are kept when the file has references
+    remove_unused_requires = remove_unused_requires and not has_references
+
+    original_counts = dict()
+    temp_path = '{}.{}.tmp'.format(output_path, uuid.uuid4().hex)
+    try:
+        with open(file_path, 'r') as read_fh, open(temp_path, 'w') as write_fh:
+            run = list()
+            node_created = False
+            statements = iterate_statements(read_fh)
+            while True:
+                # Files with syntax errors are never compacted
+                try:
+                    statement = next(statements)
+                except StopIteration:
+                    break
+                except ValueError as exc:
+                    stats['errors'] = [str(exc)]
+                    return stats
+                command = statement.command
+                if command and not command.startswith('//'):
+                    stats['statements_before'] += 1
+                    original_counts[command] = original_counts.get(command, 0) + 1
+                if command == 'setAttr':
+                    run.append((statement, SetAttrStatement.parse_statement(statement)))
+                    continue
+
+                _write_set_attr_run(write_fh, run, node_created, stats, remove_defaults, merge_arrays)
+                run = list()
+                # Maya 2016+ stores the UUID of each created node with a rename statement after its createNode
+                if command == 'createNode':
+                    node_created = True
+                elif command != 'addAttr' and not (command == 'rename' and '-uid' in statement.get_tokens()):
+                    node_created = False
+
+                if command == 'requires' and remove_unused_requires:
+                    plugin, node_types, data_types = _get_requires_usage(statement.get_tokens())
+                    if plugin != 'maya' and (node_types or data_types) and not (
+                            used_node_types.intersection(node_types) or used_data_types.intersection(data_types)):
+                        stats['requires'] += 1
+                        continue
+
+                write_fh.write(statement.text)
+                if command and not command.startswith('//'):
+                    stats['statements_after'] += 1
+            _write_set_attr_run(write_fh, run, node_created, stats, remove_defaults, merge_arrays)
+
+        # Round trip validation: compacted file is parsed again and must contain the same commands
+        errors, command_counts = validate_syntax(temp_path)
+        for command in set(original_counts).union(command_counts):
+            if command in ('setAttr', 'requires'):
+                continue
+            if original_counts.get(command, 0) != command_counts.get(command, 0):
+                errors.append('Number of {} statements changed after compaction'.format(command))
+        stats['errors'] = errors
+        stats['valid'] = not errors
+        if errors:
+            return stats
+
+        stats['bytes_after'] = os.path.getsize(temp_path)
+        fileutils.replace_path(temp_path, output_path)
+    finally:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+
+    return stats
+
+
+def _write_set_attr_run(write_fh, run, node_created, stats, remove_defaults, merge_arrays):
+    """
+    Internal function that compacts and writes a run of consecutive setAttr statements of the same node
+    :param write_fh: file
+    :param run: list(tuple(Statement, SetAttrStatement or None))
+    :param node_created: bool, whether the node was created (and not just selected) by the run's block
+    :param stats: dict
+    :param remove_defaults: bool
+    :param merge_arrays: bool
+    """
+
+    if not run:
+        return
+
+    # Statements overridden by a later statement that sets the same attribute with the same flags are removed
+    last_indices = dict()
+    for i, (_, parsed) in enumerate(run):
+        if parsed:
+            last_indices[(parsed.attribute, parsed.flags, bool(parsed.values))] = i
+
+    kept = list()
+    for i, (statement, parsed) in enumerate(run):
+        if not parsed:
+            kept.append((statement, parsed))
+            continue
+        if last_indices[(parsed.attribute, parsed.flags, bool(parsed.values))] != i:
+            stats['redundant'] += 1
+            continue
+        if not parsed.values and not parsed.flags:
+            stats['noop'] += 1
+            continue
+        if remove_defaults and node_created and DEFAULT_ATTRIBUTE_VALUES.get(
+                (parsed.attribute.strip('"'), parsed.flags), None) == parsed.values:
+            stats['defaults'] += 1
+            continue
+        kept.append((statement, parsed))
+
+    if merge_arrays:
+        kept = _merge_array_elements(kept, stats)
+
+    for statement, _ in kept:
+        write_fh.write(statement.text)
+    stats['statements_after'] += len(kept)
+
+
+def _merge_array_elements(run, stats):
+    """
+    Internal function that merges consecutive setAttr statements of consecutive array elements into ranged setAttr
+    :param run: list(tuple(Statement, SetAttrStatement or None))
+    :param stats: dict
+    :return: list(tuple(Statement, SetAttrStatement or None))
+    """
+
+    merged = list()
+    group = list()
+
+    def _flush():
+        if len(group) > 1:
+            prefix, first_index, first_parsed, _ = group[0]
+            attribute = '"{}[{}:{}]"'.format(prefix, first_index, group[-1][1])
+            values = tuple(value for _, _, parsed, _ in group for value in parsed.values)
+            ranged = SetAttrStatement(attribute, first_parsed.flags, values)
+            merged.append((Statement(ranged.to_text()), ranged))
+            stats['merged'] += len(group) - 1
+        elif group:
+            merged.append(group[0][3])
+        del group[:]
+
+    for statement, parsed in run:
+        match = _ARRAY_ELEMENT_REGEX.match(parsed.attribute) if parsed else None
+        numeric = bool(parsed and parsed.values) and all(_NUMBER_REGEX.match(value) for value in parsed.values)
+        mergeable = bool(match and numeric) and all(flag in ('-type', '-typ') for flag in parsed.flags[::2])
+        if not mergeable:
+            _flush()
+            merged.append((statement, parsed))
+            continue
+
+        prefix, index = match.group(1), int(match.group(2))
+        if group:
+            group_prefix, group_index, group_parsed, _ = group[-1]
+            same_format = parsed.flags == group_parsed.flags and len(parsed.values) == len(group_parsed.values)
+            if prefix != group_prefix or index != group_index + 1 or not same_format:
+                _flush()
+        group.append((prefix, index, parsed, (statement, parsed)))
+    _flush()
+
+    return merged
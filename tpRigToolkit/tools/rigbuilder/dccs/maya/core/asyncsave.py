@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a background save queue that writes data files without blocking the build or the UI
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import time
+import uuid
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import fileutils
+
+_SAVE_QUEUE = None
+_SAVE_QUEUE_LOCK = threading.Lock()
+
+
+def get_save_queue():
+    """
+    Returns the save queue shared by all data items
+    :return: SaveQueue
+    """
+
+    global _SAVE_QUEUE
+    with _SAVE_QUEUE_LOCK:
+        if _SAVE_QUEUE is None:
+            _SAVE_QUEUE = SaveQueue()
+
+    return _SAVE_QUEUE
+
+
+def flush_saves(timeout=None):
+    """
+    Waits until all the pending saves of the shared save queue are written to disk
+    :param timeout: float or None
+    :return: bool, True if all saves finished; False if timeout was reached
+    """
+
+    return get_save_queue().flush(timeout=timeout)
+
+
+class SaveJob(object):
+    """
+    Pending write of a data file or folder
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_SUPERSEDED = 'superseded'
+
+    def __init__(self, target_path, write_function, args, callback, cleanup_paths=None):
+        self.target_path = target_path
+        self.write_function = write_function        # Function that receives a temporary path and writes the data
+        self.args = args
+        self.callback = callback                    # Function called with the job once it finishes
+        self.cleanup_paths = cleanup_paths or ()    # Paths removed once the job finishes, even if it is skipped
+        self.status = self.STATUS_PENDING
+        self.error = None
+        self.callback_error = None
+        self.result = None
+        self.submit_time = time.time()
+        self.write_time = 0.0
+        self._finished = threading.Event()
+
+    def is_finished(self):
+        """
+        Returns whether or not the job already finished
+        :return: bool
+        """
+
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Waits until the job finishes
+        :param timeout: float or None
+        :return: bool, whether or not the job finished
+        """
+
+        return self._finished.wait(timeout)
+
+    def finish(self, status, error=None):
+        """
+        Marks the job as finished and calls its callback
+        :param status: str
+        :param error: str or None
+        """
+
+        for cleanup_path in self.cleanup_paths:
+            try:
+                fileutils.remove_path(cleanup_path)
+            except OSError:
+                pass
+
+        self.status = status
+        self.error = error
+        self._finished.set()
+        if not self.callback:
+            return
+        try:
+            self.callback(self)
+        except Exception as exc:
+            self.callback_error = str(exc)
+
+
+class SaveQueue(object):
+    """
+    Bounded queue of data saves executed by background worker threads.
+    Data is written into a temporary path that atomically replaces the target path once the write succeeds, so a
+    failed or interrupted save never leaves a partially written data file. If a target is saved again before its
+    previous save started, the previous save is skipped
+    """
+
+    def __init__(self, workers=2, max_pending=8):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._latest_jobs = dict()                  # Last submitted job of each target path
+        self._target_locks = dict()
+        self._lock = threading.Lock()
+        self._workers = list()
+        for i in range(workers):
+            worker = threading.Thread(target=self._run, name='RigBuilderSave{}'.format(i))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def submit(self, target_path, write_function, args=None, callback=None, cleanup_paths=None):
+        """
+        Queues the save of the given data. If the queue is full, this call blocks until there is room for the save
+        :param target_path: str, file or folder where data is saved
+        :param write_function: callable, function that receives a temporary path (plus given args) and writes the
+            data into it. Temporary path is located in the same folder as the target path
+        :param args: tuple or None, extra arguments passed to the write function
+        :param callback: callable or None, function called with the SaveJob once the save finishes or fails.
+            It is executed in the worker thread
+        :param cleanup_paths: list(str) or None, temporary paths used by the write function. They are removed once
+            the save finishes, fails or is superseded by a newer save
+        :return: SaveJob
+        """
+
+        job = SaveJob(
+            os.path.normpath(target_path), write_function, tuple(args or ()), callback,
+            cleanup_paths=tuple(cleanup_paths or ()))
+        with self._lock:
+            self._latest_jobs[job.target_path] = job
+        self._queue.put(job)
+
+        return job
+
+    def pending_count(self):
+        """
+        Returns the number of queued saves that did not finish yet
+        :return: int
+        """
+
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout=None):
+        """
+        Waits until all queued saves are finished
+        :param timeout: float or None
+        :return: bool, True if all saves finished; False if timeout was reached
+        """
+
+        end_time = None if timeout is None else time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if end_time is not None and time.time() >= end_time:
+                return False
+            with self._queue.all_tasks_done:
+                if self._queue.unfinished_tasks:
+                    self._queue.all_tasks_done.wait(0.1)
+
+        return True
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _run(self):
+        """
+        Internal function executed by the worker threads
+        """
+
+        while True:
+            job = self._queue.get()
+            try:
+                self._save(job)
+            finally:
+                self._queue.task_done()
+
+    def _save(self, job):
+        """
+        Internal function that executes the given save job
+        :param job: SaveJob
+        """
+
+        # Saves of the same target are serialized, so an older save never replaces the data of a newer one
+        with self._lock:
+            target_lock = self._target_locks.setdefault(job.target_path, threading.Lock())
+        with target_lock:
+            with self._lock:
+                superseded = self._latest_jobs.get(job.target_path, None) is not job
+            if superseded:
+                job.finish(SaveJob.STATUS_SUPERSEDED)
+                return
+            self._write(job)
+
+    def _write(self, job):
+        """
+        Internal function that writes the data of the given job into a temporary path and moves it into its target
+        :param job: SaveJob
+        """
+
+        target_folder, target_name = os.path.split(job.target_path)
+        temp_path = os.path.join(target_folder, '.{}.{}.tmp'.format(target_name, uuid.uuid4().hex))
+        start_time = time.time()
+        try:
+            if target_folder and not os.path.isdir(target_folder):
+                os.makedirs(target_folder)
+            job.result = job.write_function(temp_path, *job.args)
+            fileutils.replace_path(temp_path, job.target_path)
+        except Exception as exc:
+            fileutils.remove_path(temp_path)
+            job.write_time = time.time() - start_time
+            job.finish(SaveJob.STATUS_FAILED, error=str(exc))
+            return
+        finally:
+            with self._lock:
+                if self._latest_jobs.get(job.target_path, None) is job:
+                    self._latest_jobs.pop(job.target_path)
+
+        job.write_time = time.time() - start_time
+        job.finish(SaveJob.STATUS_DONE)
@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains an on-disk SQLite catalog of the data files stored in a rig builder data directory
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+from multiprocessing.pool import ThreadPool
+
+CATALOG_FILE_NAME = '.catalog.db'
+
+_DATA_TYPES = dict()
+_CATALOGS = dict()
+_DATA_ROOTS = list()
+
+
+def register_data_type(extension, data_type, info_function=None):
+    """
+    Registers a data type, so the files with the given extension are stored in the data catalogs
+    :param extension: str, extension of the data files (for example, .ma)
+    :param data_type: str, data type name stored in the catalog
+    :param info_function: callable or None, function that receives a file path and returns its info dict
+    """
+
+    _DATA_TYPES[extension.lower()] = (data_type, info_function)
+
+
+def register_data_root(directory):
+    """
+    Registers a data root directory. Data items stored inside a data root share the catalog of the root
+    :param directory: str
+    """
+
+    directory = os.path.normpath(os.path.abspath(directory))
+    if directory not in _DATA_ROOTS:
+        _DATA_ROOTS.append(directory)
+
+
+def get_data_root(item_path):
+    """
+    Returns the data root directory of the given data item folder. Registered data roots are used first, then the
+    nearest parent folder that already contains a catalog. Otherwise, the folder that contains the item folder is used
+    :param item_path: str, folder where the data item files are stored
+    :return: str
+    """
+
+    item_path = os.path.normpath(os.path.abspath(item_path))
+    for data_root in sorted(_DATA_ROOTS, key=len, reverse=True):
+        if item_path == data_root or item_path.startswith(data_root + os.sep):
+            return data_root
+
+    data_root = os.path.dirname(item_path)
+    current_path = data_root
+    while True:
+        if os.path.isfile(os.path.join(current_path, CATALOG_FILE_NAME)):
+            return current_path
+        parent_path = os.path.dirname(current_path)
+        if parent_path == current_path:
+            break
+        current_path = parent_path
+
+    return data_root
+
+
+def get_data_catalog(item_path):
+    """
+    Returns the catalog of the data root of the given data item folder. Catalogs are cached, so each data root is only
+    opened once per session. When a catalog is opened, it is updated in parallel with the current data files
+    :param item_path: str, folder where the data item files are stored
+    :return: DataCatalog
+    """
+
+    data_root = get_data_root(item_path)
+    if data_root not in _CATALOGS:
+        data_catalog = DataCatalog(data_root)
+        if data_catalog.is_stale():
+            data_catalog.update()
+        _CATALOGS[data_root] = data_catalog
+
+    return _CATALOGS[data_root]
+
+
+class DataCatalog(object):
+    """
+    Catalog that stores the type, size, modification time, hash and extracted info of each data file of a folder.
+    Catalog is updated incrementally: only files whose modification time or size changed are parsed again
+    """
+
+    def __init__(self, directory, database_path=None, data_types=None):
+        self._directory = os.path.normpath(os.path.abspath(directory))
+        self._database_path = database_path or os.path.join(self._directory, CATALOG_FILE_NAME)
+        self._data_types = data_types if data_types is not None else _DATA_TYPES
+        self._connection = None
+
+    # ==============================================================================================
+    # PROPERTIES
+    # ==============================================================================================
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def database_path(self):
+        return self._database_path
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def close(self):
+        """
+        Closes the connection with the catalog database
+        """
+
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def update(self, processes=None):
+        """
+        Updates the catalog with the current contents of the data directory.
+        Only new files and files whose modification time or size changed are hashed and parsed, in parallel
+        :param processes: int or None, number of threads used to parse files (None uses the number of CPUs)
+        :return: dict, number of added, updated, removed and unchanged files
+        """
+
+        connection = self._get_connection()
+        stored = {row[0]: (row[1], row[2]) for row in connection.execute('SELECT path, mtime, size FROM files')}
+
+        stale_entries = list()
+        found_paths = set()
+        unchanged = 0
+        for relative_path, full_path, data_type, info_function in self._find_data_files():
+            found_paths.add(relative_path)
+            mtime, size = get_path_mtime_and_size(full_path)
+            if stored.get(relative_path, None) == (mtime, size):
+                unchanged += 1
+                continue
+            stale_entries.append((relative_path, full_path, data_type, info_function, mtime, size))
+
+        rows = list()
+        if stale_entries:
+            pool = ThreadPool(processes)
+            try:
+                rows = pool.map(_get_entry_row, stale_entries)
+            finally:
+                pool.close()
+                pool.join()
+
+        removed_paths = [path for path in stored if path not in found_paths]
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO files (path, name, type, size, mtime, hash, info) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows)
+            connection.executemany('DELETE FROM files WHERE path = ?', [(path,) for path in removed_paths])
+
+        updated = len([entry for entry in stale_entries if entry[0] in stored])
+
+        return {
+            'added': len(stale_entries) - updated, 'updated': updated, 'removed': len(removed_paths),
+            'unchanged': unchanged
+        }
+
+    def find(self, data_type=None, name=None):
+        """
+        Returns the catalog entries that match the given data type and name
+        :param data_type: str or None
+        :param name: str or None, name or name pattern (using * as wildcard)
+        :return: list(dict)
+        """
+
+        query = 'SELECT path, name, type, size, mtime, hash, info FROM files'
+        conditions, values = list(), list()
+        if data_type:
+            conditions.append('type = ?')
+            values.append(data_type)
+        if name:
+            conditions.append('name LIKE ?' if '*' in name else 'name = ?')
+            values.append(name.replace('*', '%'))
+        if conditions:
+            query += ' WHERE {}'.format(' AND '.join(conditions))
+        query += ' ORDER BY path'
+
+        return [_row_to_entry(row) for row in self._get_connection().execute(query, values)]
+
+    def get_entry(self, file_path, update=True):
+        """
+        Returns the catalog entry of the given file
+        :param file_path: str, absolute path or path relative to the data directory
+        :param update: bool, whether to update the entry if it is not stored or it is not valid anymore
+        :return: dict or None
+        """
+
+        full_path = os.path.join(self._directory, file_path)
+        if not os.path.exists(full_path):
+            return None
+        relative_path = self._get_relative_path(full_path)
+        connection = self._get_connection()
+        row = connection.execute(
+            'SELECT path, name, type, size, mtime, hash, info FROM files WHERE path = ?', (relative_path,)).fetchone()
+        mtime, size = get_path_mtime_and_size(full_path)
+        if row and (row[4], row[3]) == (mtime, size):
+            return _row_to_entry(row)
+        if not update:
+            return None
+
+        data_type = self._data_types.get(os.path.splitext(full_path)[-1].lower(), None)
+        if not data_type:
+            return None
+        row = _get_entry_row((relative_path, full_path, data_type[0], data_type[1], mtime, size))
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO files (path, name, type, size, mtime, hash, info) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                row)
+
+        return _row_to_entry(row)
+
+    def get_info(self, file_path, update=True):
+        """
+        Returns the extracted info of the given file
+        :param file_path: str
+        :param update: bool, whether to update the entry if it is not stored or it is not valid anymore
+        :return: dict or None
+        """
+
+        entry = self.get_entry(file_path, update=update)
+
+        return entry['info'] if entry else None
+
+    def set_info(self, file_path, info):
+        """
+        Stores the given info in the catalog entry of the given file. Stored info is kept until the file changes
+        :param file_path: str, absolute path or path relative to the data directory
+        :param info: dict
+        :return: bool, whether or not the info was stored
+        """
+
+        try:
+            info = json.dumps(info)
+        except (TypeError, ValueError):
+            return False
+
+        relative_path = self._get_relative_path(os.path.join(self._directory, file_path))
+        with self._get_connection() as connection:
+            cursor = connection.execute('UPDATE files SET info = ? WHERE path = ?', (info, relative_path))
+
+        return cursor.rowcount > 0
+
+    def is_stale(self):
+        """
+        Returns whether or not the catalog needs to be updated
+        :return: bool
+        """
+
+        connection = self._get_connection()
+        stored = {row[0]: (row[1], row[2]) for row in connection.execute('SELECT path, mtime, size FROM files')}
+        found_paths = set()
+        for relative_path, full_path, _, _ in self._find_data_files():
+            found_paths.add(relative_path)
+            if stored.get(relative_path, None) != get_path_mtime_and_size(full_path):
+                return True
+
+        return len(found_paths) != len(stored)
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _get_connection(self):
+        """
+        Internal function that returns the connection with the catalog database, creating its tables if necessary
+        :return: sqlite3.Connection
+        """
+
+        if not self._connection:
+            self._connection = sqlite3.connect(self._database_path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, name TEXT, type TEXT, size INTEGER, '
+                    'mtime REAL, hash TEXT, info TEXT)')
+                self._connection.execute('CREATE INDEX IF NOT EXISTS files_type ON files (type)')
+                self._connection.execute('CREATE INDEX IF NOT EXISTS files_name ON files (name)')
+
+        return self._connection
+
+    def _get_relative_path(self, full_path):
+        """
+        Internal function that returns the path of the given file relative to the data directory
+        :param full_path: str
+        :return: str
+        """
+
+        return os.path.relpath(full_path, self._directory).replace('\\', '/')
+
+    def _find_data_files(self):
+        """
+        Internal function that returns all data files found in the data directory
+        Data files can be files or folders (for example, skin weights), folders of registered types are not traversed
+        Hidden files and folders (temporary and cache files) are skipped
+        :return: list(tuple(str, str, str, callable))
+        """
+
+        data_files = list()
+        for root, dir_names, file_names in os.walk(self._directory):
+            for dir_name in list(dir_names):
+                if dir_name.startswith('.'):
+                    dir_names.remove(dir_name)
+                    continue
+                data_type = self._data_types.get(os.path.splitext(dir_name)[-1].lower(), None)
+                if data_type:
+                    dir_names.remove(dir_name)
+                    data_files.append((os.path.join(root, dir_name), ) + data_type)
+            for file_name in file_names:
+                if file_name.startswith('.'):
+                    continue
+                data_type = self._data_types.get(os.path.splitext(file_name)[-1].lower(), None)
+                if data_type:
+                    data_files.append((os.path.join(root, file_name), ) + data_type)
+
+        return [
+            (os.path.relpath(full_path, self._directory).replace('\\', '/'), full_path, data_type, info_function)
+            for full_path, data_type, info_function in data_files]
+
+
+def get_path_mtime_and_size(path):
+    """
+    Returns the modification time and size of the given path.
+    For folders, the latest modification time and the total size of all the files inside the folder are returned
+    :param path: str
+    :return: tuple(float, int)
+    """
+
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    mtime, size = os.stat(path).st_mtime, 0
+    for root, _, file_names in os.walk(path):
+        for file_name in file_names:
+            stat = os.stat(os.path.join(root, file_name))
+            mtime = max(mtime, stat.st_mtime)
+            size += stat.st_size
+
+    return mtime, size
+
+
+def get_path_hash(path, block_size=1 << 20):
+    """
+    Returns the content hash of the given file or folder. Folders hash all their files, sorted by path
+    :param path: str
+    :param block_size: int
+    :return: str
+    """
+
+    if os.path.isdir(path):
+        file_paths = list()
+        for root, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            file_paths.extend(os.path.join(root, file_name) for file_name in sorted(file_names))
+    else:
+        file_paths = [path]
+
+    hasher = hashlib.sha1()
+    for file_path in file_paths:
+        hasher.update(os.path.relpath(file_path, path).replace('\\', '/').encode('utf-8'))
+        with open(file_path, 'rb') as fh:
+            for block in iter(lambda: fh.read(block_size), b''):
+                hasher.update(block)
+
+    return hasher.hexdigest()
+
+
+def _get_entry_row(entry):
+    """
+    Internal function that returns the database row of the given data file entry. Executed in worker threads
+    :param entry: tuple(str, str, str, callable, float, int)
+    :return: tuple
+    """
+
+    relative_path, full_path, data_type, info_function, mtime, size = entry
+
+    info = dict()
+    if info_function:
+        try:
+            info = info_function(full_path) or dict()
+        except Exception as exc:
+            info = {'error': str(exc)}
+
+    name = os.path.basename(full_path)
+
+    return relative_path, name, data_type, size, mtime, get_path_hash(full_path), json.dumps(info)
+
+
+def _row_to_entry(row):
+    """
+    Internal function that converts given database row into a catalog entry dictionary
+    :param row: tuple
+    :return: dict
+    """
+
+    return {
+        'path': row[0], 'name': row[1], 'type': row[2], 'size': row[3], 'mtime': row[4], 'hash': row[5],
+        'info': json.loads(row[6]) if row[6] else dict()
+    }
+
+
+def get_maya_ascii_info(file_path):
+    """
+    Returns the info stored in the header of the given Maya ASCII file (required plugins, units and file info)
+    Only the header of the file is read, parsing stops in the first node creation statement
+    :param file_path: str
+    :return: dict
+    """
+
+    requires_regex = re.compile(r'^requires\s+(?:-\w+\s+"[^"]*"\s+)*"?([^"\s]+)"?\s+"([^"]*)"')
+    file_info_regex = re.compile(r'^fileInfo\s+"([^"]+)"\s+"([^"]*)"')
+    unit_regex = re.compile(r'^currentUnit\s+(.*);')
+
+    info = {'requires': dict(), 'fileInfo': dict(), 'currentUnit': ''}
+    with open(file_path, 'r') as fh:
+        for line in fh:
+            if line.startswith('createNode'):
+                break
+            match = requires_regex.match(line)
+            if match:
+                info['requires'][match.group(1)] = match.group(2)
+                continue
+            match = file_info_regex.match(line)
+            if match:
+                info['fileInfo'][match.group(1)] = match.group(2)
+                continue
+            match = unit_regex.match(line)
+            if match:
+                info['currentUnit'] = match.group(1).strip()
+    info['student'] = info['fileInfo'].get('license', '') == 'student'
+
+    return info
+
+
+def get_skin_weights_info(weights_path):
+    """
+    Returns the info of the given skin weights data folder (meshes, vertices and influences)
+    :param weights_path: str
+    :return: dict
+    """
+
+    from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights
+
+    info = dict()
+    for mesh_folder in skinweights.get_mesh_folders(weights_path):
+        info[os.path.basename(mesh_folder)] = sorted(skinweights.get_influence_files(mesh_folder).keys())
+
+    return {'meshes': info}
+
+
+# Data types of the rig builder data items are registered here, so catalogs do not need to import the data items
+register_data_type('.ma', 'maya.ascii', get_maya_ascii_info)
+register_data_type('.skin', 'maya.skin', get_skin_weights_info)
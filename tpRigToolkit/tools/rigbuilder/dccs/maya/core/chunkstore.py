@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a content addressed storage that stores data files as deduplicated content defined chunks
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import json
+import zlib
+import time
+import uuid
+import hashlib
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import fileutils
+
+STORE_FOLDER_NAME = '.store'
+GEAR_WINDOW = 32
+GEAR_TABLE = np.random.RandomState(0x5eed).randint(0, 2 ** 32, size=256, dtype=np.uint64).astype(np.uint32)
+
+_STORES = dict()
+
+
+def get_data_store(directory):
+    """
+    Returns the chunk store of the given data directory. All data files of a directory share the same store, so
+    chunks are deduplicated between versions of the same file and also between different files
+    :param directory: str
+    :return: ChunkStore
+    """
+
+    directory = os.path.normpath(os.path.abspath(directory))
+    if directory not in _STORES:
+        _STORES[directory] = ChunkStore(os.path.join(directory, STORE_FOLDER_NAME))
+
+    return _STORES[directory]
+
+
+def store_data_version(data_path):
+    """
+    Stores the current contents of the given data file or folder as a new version in its directory store
+    :param data_path: str
+    :return: dict, recipe of the new version
+    """
+
+    data_store = get_data_store(os.path.dirname(data_path))
+    data_name = os.path.basename(data_path)
+    versions = data_store.keys(prefix='{}/'.format(data_name))
+    version = int(versions[-1].split('/')[-1]) + 1 if versions else 1
+
+    return data_store.put(data_path, '{}/{:04d}'.format(data_name, version))
+
+
+def restore_data_version(data_path, version=None):
+    """
+    Restores the given data file or folder to the given version stored in its directory store
+    :param data_path: str
+    :param version: int or None, if not given, last stored version is restored
+    :return: str or None, restored path
+    """
+
+    data_store = get_data_store(os.path.dirname(data_path))
+    data_name = os.path.basename(data_path)
+    if version is None:
+        versions = data_store.keys(prefix='{}/'.format(data_name))
+        if not versions:
+            return None
+        key = versions[-1]
+    else:
+        key = '{}/{:04d}'.format(data_name, version)
+
+    return data_store.get(key, data_path)
+
+
+def find_chunk_boundaries(data, min_size=2048, average_size=8192, max_size=65536):
+    """
+    Returns the positions where given data should be split using a gear rolling hash, so chunk boundaries only
+    depend on the data content and identical content found in different files produces identical chunks
+    :param data: bytes
+    :param min_size: int, minimum size of the chunks
+    :param average_size: int, expected average size of the chunks (must be a power of 2)
+    :param max_size: int, maximum size of the chunks
+    :return: list(int), end position of each chunk
+    """
+
+    size = len(data)
+    if size <= min_size:
+        return [size] if size else list()
+
+    # Gear hash of each position is sum(gear[i - j] << j) for the bytes of the window. It is computed with window
+    # doubling: a window of 2 * n bytes is the window of n bytes plus the previous window of n bytes shifted n bits
+    rolling_hash = GEAR_TABLE[np.frombuffer(data, dtype=np.uint8)]
+    window = 1
+    while window < GEAR_WINDOW:
+        shifted = rolling_hash[:size - window] << np.uint32(window)
+        rolling_hash[window:] += shifted
+        window *= 2
+
+    # Highest bits of the gear hash depend on all the bytes of the window, so we check those
+    mask_bits = int(np.log2(average_size - min_size)) if average_size > min_size else 1
+    mask = np.uint32(((1 << mask_bits) - 1) << (32 - mask_bits))
+    candidates = np.flatnonzero((rolling_hash & mask) == 0) + 1
+
+    boundaries = list()
+    last = 0
+    while size - last > max_size:
+        candidate_index = np.searchsorted(candidates, last + min_size, side='left')
+        if candidate_index < len(candidates) and candidates[candidate_index] <= last + max_size:
+            last = int(candidates[candidate_index])
+        else:
+            last += max_size
+        boundaries.append(last)
+    while True:
+        candidate_index = np.searchsorted(candidates, last + min_size, side='left')
+        if candidate_index >= len(candidates) or candidates[candidate_index] >= size:
+            break
+        last = int(candidates[candidate_index])
+        boundaries.append(last)
+    boundaries.append(size)
+
+    return boundaries
+
+
+def iterate_chunks(file_path, block_size=1 << 22, **kwargs):
+    """
+    Reads given file in blocks and yields its content defined chunks
+    :param file_path: str
+    :param block_size: int, size of the blocks the file is read with
+    :return: generator(bytes)
+    """
+
+    pending = b''
+    with open(file_path, 'rb') as fh:
+        for block in iter(lambda: fh.read(block_size), b''):
+            buffer_data = pending + block
+            boundaries = find_chunk_boundaries(buffer_data, **kwargs)
+
+            # Last chunk of the buffer is kept, because its end depends on data not read yet
+            start = 0
+            for boundary in boundaries[:-1]:
+                yield buffer_data[start:boundary]
+                start = boundary
+            pending = buffer_data[start:]
+
+    start = 0
+    for boundary in find_chunk_boundaries(pending, **kwargs):
+        yield pending[start:boundary]
+        start = boundary
+
+
+class ChunkStore(object):
+    """
+    Content addressed storage. Files are split in content defined chunks and each unique chunk is stored once,
+    compressed, under its hash. Each stored file version is described by a recipe: the list of its chunks
+    """
+
+    def __init__(self, store_path, compression_level=1):
+        self._store_path = store_path
+        self._compression_level = compression_level
+
+    # ==============================================================================================
+    # PROPERTIES
+    # ==============================================================================================
+
+    @property
+    def store_path(self):
+        return self._store_path
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def put(self, source_path, key):
+        """
+        Stores given file or folder under the given key
+        :param source_path: str, file or folder (all its files are stored) to store
+        :param key: str, key used to retrieve the data later (for example: name/version)
+        :return: dict, recipe of the stored data with its stats
+        """
+
+        if os.path.isdir(source_path):
+            file_paths = list()
+            for root, dir_names, file_names in os.walk(source_path):
+                dir_names.sort()
+                file_paths.extend(os.path.join(root, file_name) for file_name in sorted(file_names))
+        else:
+            file_paths = [source_path]
+
+        recipe = {
+            'key': key, 'directory': os.path.isdir(source_path), 'time': time.time(), 'files': list(),
+            'size': 0, 'new_size': 0}
+        for file_path in file_paths:
+            chunks = list()
+            for chunk in iterate_chunks(file_path):
+                chunk_hash, is_new = self._put_chunk(chunk)
+                chunks.append(chunk_hash)
+                recipe['size'] += len(chunk)
+                recipe['new_size'] += len(chunk) if is_new else 0
+            relative_path = os.path.relpath(file_path, source_path) if recipe['directory'] else ''
+            recipe['files'].append({'path': relative_path.replace('\\', '/'), 'chunks': chunks})
+
+        recipe_path = self._get_recipe_path(key)
+        _write_atomic(recipe_path, json.dumps(recipe).encode('utf-8'))
+
+        return recipe
+
+    def get(self, key, target_path):
+        """
+        Rebuilds the data stored under the given key into the given path. Chunks are written one by one
+        :param key: str
+        :param target_path: str
+        :return: str, target path
+        """
+
+        recipe = self.get_recipe(key)
+        if not recipe:
+            raise ValueError('Key "{}" not found in store "{}"'.format(key, self._store_path))
+
+        for file_info in recipe['files']:
+            file_path = os.path.join(target_path, file_info['path']) if recipe['directory'] else target_path
+            file_folder = os.path.dirname(file_path)
+            if file_folder and not os.path.isdir(file_folder):
+                os.makedirs(file_folder)
+            temp_path = '{}.{}.tmp'.format(file_path, uuid.uuid4().hex)
+            with open(temp_path, 'wb') as fh:
+                for chunk_hash in file_info['chunks']:
+                    fh.write(self._get_chunk(chunk_hash))
+            fileutils.replace_path(temp_path, file_path)
+
+        # Files added to a folder after the version was stored are not part of that version
+        if recipe['directory']:
+            stored_paths = set(file_info['path'] for file_info in recipe['files'])
+            for root, _, file_names in os.walk(target_path):
+                for file_name in file_names:
+                    file_path = os.path.join(root, file_name)
+                    if os.path.relpath(file_path, target_path).replace('\\', '/') not in stored_paths:
+                        os.remove(file_path)
+
+        return target_path
+
+    def get_recipe(self, key):
+        """
+        Returns the recipe of the data stored under the given key
+        :param key: str
+        :return: dict or None
+        """
+
+        recipe_path = self._get_recipe_path(key)
+        if not os.path.isfile(recipe_path):
+            return None
+
+        with open(recipe_path, 'r') as fh:
+            return json.load(fh)
+
+    def keys(self, prefix=''):
+        """
+        Returns all keys stored that start with the given prefix
+        :param prefix: str
+        :return: list(str)
+        """
+
+        recipes_path = os.path.join(self._store_path, 'recipes')
+        found_keys = list()
+        for root, _, file_names in os.walk(recipes_path):
+            for file_name in file_names:
+                if not file_name.endswith('.json'):
+                    continue
+                key = os.path.relpath(os.path.join(root, file_name), recipes_path)[:-len('.json')].replace('\\', '/')
+                if key.startswith(prefix):
+                    found_keys.append(key)
+
+        return sorted(found_keys)
+
+    def disk_usage(self):
+        """
+        Returns the number of bytes used by the store in disk
+        :return: int
+        """
+
+        total = 0
+        for root, _, file_names in os.walk(self._store_path):
+            total += sum(os.path.getsize(os.path.join(root, file_name)) for file_name in file_names)
+
+        return total
+
+    def collect_garbage(self):
+        """
+        Removes all the chunks that are not referenced by any recipe
+        :return: int, number of removed chunks
+        """
+
+        used_chunks = set()
+        for key in self.keys():
+            for file_info in self.get_recipe(key)['files']:
+                used_chunks.update(file_info['chunks'])
+
+        removed = 0
+        objects_path = os.path.join(self._store_path, 'objects')
+        for root, _, file_names in os.walk(objects_path):
+            for file_name in file_names:
+                if os.path.basename(root) + file_name not in used_chunks:
+                    os.remove(os.path.join(root, file_name))
+                    removed += 1
+
+        return removed
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _get_recipe_path(self, key):
+        """
+        Internal function that returns the path of the recipe file of the given key
+        :param key: str
+        :return: str
+        """
+
+        return os.path.join(self._store_path, 'recipes', *'{}.json'.format(key).split('/'))
+
+    def _get_chunk_path(self, chunk_hash):
+        """
+        Internal function that returns the path where the given chunk is stored
+        :param chunk_hash: str
+        :return: str
+        """
+
+        return os.path.join(self._store_path, 'objects', chunk_hash[:2], chunk_hash[2:])
+
+    def _put_chunk(self, chunk):
+        """
+        Internal function that stores given chunk, if it is not already stored
+        :param chunk: bytes
+        :return: tuple(str, bool), chunk hash and whether or not the chunk was stored
+        """
+
+        chunk_hash = hashlib.sha1(chunk).hexdigest()
+        chunk_path = self._get_chunk_path(chunk_hash)
+        if os.path.isfile(chunk_path):
+            return chunk_hash, False
+
+        _write_atomic(chunk_path, zlib.compress(chunk, self._compression_level))
+
+        return chunk_hash, True
+
+    def _get_chunk(self, chunk_hash):
+        """
+        Internal function that returns the contents of the given chunk
+        :param chunk_hash: str
+        :return: bytes
+        """
+
+        with open(self._get_chunk_path(chunk_hash), 'rb') as fh:
+            return zlib.decompress(fh.read())
+
+
+def _write_atomic(file_path, data):
+    """
+    Internal function that writes given data into a temporary file and then moves it into the given path
+    :param file_path: str
+    :param data: bytes
+    """
+
+    file_folder = os.path.dirname(file_path)
+    if not os.path.isdir(file_folder):
+        os.makedirs(file_folder)
+
+    temp_path = '{}.{}.tmp'.format(file_path, uuid.uuid4().hex)
+    with open(temp_path, 'wb') as fh:
+        fh.write(data)
+    fileutils.replace_path(temp_path, file_path)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains file functions used to write rig builder data files safely
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import uuid
+import shutil
+
+
+def remove_path(path):
+    """
+    Removes given file or folder, if it exists
+    :param path: str
+    """
+
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.isfile(path):
+        os.remove(path)
+
+
+def replace_path(source_path, target_path):
+    """
+    Moves source file or folder into target path, replacing it if it already exists. Files are replaced atomically
+    Folders cannot be replaced atomically, so old folder is moved away first and removed once the new one is in place
+    :param source_path: str
+    :param target_path: str
+    """
+
+    if os.path.isdir(source_path) or os.path.isdir(target_path):
+        backup_path = None
+        if os.path.exists(target_path):
+            backup_path = '{}.{}.old'.format(source_path, uuid.uuid4().hex)
+            os.rename(target_path, backup_path)
+        os.rename(source_path, target_path)
+        if backup_path:
+            remove_path(backup_path)
+    elif hasattr(os, 'replace'):
+        os.replace(source_path, target_path)
+    else:
+        if os.path.isfile(target_path):
+            os.remove(target_path)
+        os.rename(source_path, target_path)
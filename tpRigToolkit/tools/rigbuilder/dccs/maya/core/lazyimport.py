@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains lazy module proxies used to defer heavy imports (tpDcc, Maya, rig modules, numpy) until they are
+actually used, so browsing rig builder components and data does not load them
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import sys
+import types
+import importlib
+
+
+class LazyModule(types.ModuleType, object):
+    """
+    Module proxy that imports the real module the first time one of its attributes is accessed
+    """
+
+    def __init__(self, module_name):
+        super(LazyModule, self).__init__(module_name)
+
+        self.__dict__['_lazy_module_name'] = module_name
+        self.__dict__['_lazy_module'] = None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        if self.__dict__['_lazy_module'] is None:
+            return '<lazy module "{}" (not loaded)>'.format(self.__dict__['_lazy_module_name'])
+
+        return repr(self.__dict__['_lazy_module'])
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _load(self):
+        """
+        Internal function that imports the real module
+        :return: module
+        """
+
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_lazy_module_name'])
+            self.__dict__['_lazy_module'] = module
+
+        return module
+
+
+class LazyAttribute(object):
+    """
+    Class attribute whose value is computed the first time it is accessed. Used for class attributes that are read
+    from lazy modules, so defining the class does not import them
+    """
+
+    def __init__(self, function):
+        self._function = function           # Function that returns the value of the attribute
+        self._value = None
+        self._computed = False
+
+    def __get__(self, instance, owner):
+        if not self._computed:
+            self._value = self._function()
+            self._computed = True
+
+        return self._value
+
+
+def lazy_module(module_name):
+    """
+    Returns a proxy of the given module that imports it the first time it is used
+    If the module is already imported, the module itself is returned
+    :param module_name: str, full name of the module (for example, tpDcc.dccs.maya.core.rig)
+    :return: module or LazyModule
+    """
+
+    module = sys.modules.get(module_name, None)
+    if module is not None:
+        return module
+
+    return LazyModule(module_name)
+
+
+def is_loaded(module):
+    """
+    Returns whether or not given module is loaded. Modules that are not lazy proxies are always loaded
+    :param module: module or LazyModule
+    :return: bool
+    """
+
+    if isinstance(module, LazyModule):
+        return module.__dict__['_lazy_module'] is not None
+
+    return True
+
+
+def load(module):
+    """
+    Forces the import of the given lazy module
+    :param module: module or LazyModule
+    :return: module, real module
+    """
+
+    if isinstance(module, LazyModule):
+        return module._load()
+
+    return module
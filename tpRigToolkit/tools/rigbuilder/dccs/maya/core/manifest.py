@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a cached manifest of the rig builder components defined in the nodes of the rig builder packages.
+Components are found by parsing their source files, so the node palette can be populated without importing any node
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import ast
+import json
+import uuid
+import importlib
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import fileutils
+
+MANIFEST_FILE_NAME = '.components.json'
+MANIFEST_VERSION = 1
+PACKAGES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'packages')
+PACKAGES_MODULE = 'tpRigToolkit.tools.rigbuilder.dccs.maya.packages'
+COMPONENT_ATTRIBUTES = ['COLOR', 'SHORT_NAME', 'DESCRIPTION', 'ICON']
+
+
+def get_components(packages_path=None, packages_module=None, manifest_path=None):
+    """
+    Returns all the components defined in the nodes of the given packages folder. Inherited attributes and options
+    of components whose base class is defined in the same packages are resolved
+    :param packages_path: str or None, folder that contains the rig builder packages (package/nodes/*.py)
+    :param packages_module: str or None, module name of the packages folder
+    :param manifest_path: str or None, file where manifest is cached
+    :return: list(dict)
+    """
+
+    manifest = get_component_manifest(
+        packages_path=packages_path, packages_module=packages_module, manifest_path=manifest_path)
+
+    components = list()
+    for file_path in sorted(manifest['files']):
+        components.extend(manifest['files'][file_path]['components'])
+
+    return _resolve_inheritance(components)
+
+
+def get_component(name, **kwargs):
+    """
+    Returns the manifest entry of the component with the given class name
+    :param name: str
+    :return: dict or None
+    """
+
+    for component in get_components(**kwargs):
+        if component['name'] == name:
+            return component
+
+    return None
+
+
+def load_component_class(component):
+    """
+    Imports the module of the given component and returns its class
+    :param component: dict, component manifest entry
+    :return: type
+    """
+
+    return getattr(importlib.import_module(component['module']), component['name'])
+
+
+def get_component_manifest(packages_path=None, packages_module=None, manifest_path=None):
+    """
+    Returns the component manifest of the given packages folder. Manifest is cached in disk and only the node files
+    whose modification time or size changed since the manifest was generated are parsed again
+    :param packages_path: str or None, folder that contains the rig builder packages (package/nodes/*.py)
+    :param packages_module: str or None, module name of the packages folder
+    :param manifest_path: str or None, file where manifest is cached
+    :return: dict
+    """
+
+    packages_path = packages_path or PACKAGES_PATH
+    packages_module = packages_module or PACKAGES_MODULE
+    manifest_path = manifest_path or os.path.join(packages_path, MANIFEST_FILE_NAME)
+
+    manifest = read_manifest(manifest_path)
+    if not manifest or manifest.get('version') != MANIFEST_VERSION or manifest.get('module') != packages_module:
+        manifest = {'version': MANIFEST_VERSION, 'module': packages_module, 'files': dict()}
+
+    changed = False
+    found_files = set()
+    for package_name in sorted(os.listdir(packages_path)):
+        package_path = os.path.join(packages_path, package_name)
+        nodes_path = os.path.join(package_path, 'nodes')
+        if not os.path.isdir(nodes_path):
+            continue
+        package_info = _get_file_stats(os.path.join(package_path, '__init__.py'))
+        for file_name in sorted(os.listdir(nodes_path)):
+            if not file_name.endswith('.py') or file_name.startswith('__'):
+                continue
+            file_path = os.path.join(nodes_path, file_name)
+            relative_path = '{}/nodes/{}'.format(package_name, file_name)
+            found_files.add(relative_path)
+            file_info = _get_file_stats(file_path)
+            file_info['package_mtime'] = package_info['mtime']
+            cached_info = manifest['files'].get(relative_path, None)
+            if cached_info and all(cached_info.get(key) == value for key, value in file_info.items()):
+                continue
+            module_name = '{}.{}.nodes.{}'.format(packages_module, package_name, os.path.splitext(file_name)[0])
+            file_info['components'] = parse_components(
+                file_path, module_name, package=_get_package_name(package_path) or package_name)
+            manifest['files'][relative_path] = file_info
+            changed = True
+
+    for relative_path in list(manifest['files']):
+        if relative_path not in found_files:
+            manifest['files'].pop(relative_path)
+            changed = True
+
+    if changed:
+        write_manifest(manifest_path, manifest)
+
+    return manifest
+
+
+def read_manifest(manifest_path):
+    """
+    Reads the manifest stored in the given file
+    :param manifest_path: str
+    :return: dict or None
+    """
+
+    if not os.path.isfile(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, 'r') as fh:
+            return json.load(fh)
+    except ValueError:
+        return None
+
+
+def write_manifest(manifest_path, manifest):
+    """
+    Writes given manifest into the given file. Packages folder can be read only, so write errors are ignored
+    :param manifest_path: str
+    :param manifest: dict
+    :return: bool, whether or not the manifest was written
+    """
+
+    temp_path = '{}.{}.tmp'.format(manifest_path, uuid.uuid4().hex)
+    try:
+        with open(temp_path, 'w') as fh:
+            json.dump(manifest, fh, indent=1, sort_keys=True)
+        fileutils.replace_path(temp_path, manifest_path)
+    except (IOError, OSError):
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+        return False
+
+    return True
+
+
+def parse_components(file_path, module_name, package=None):
+    """
+    Parses given node file and returns the components it defines, without importing it
+    :param file_path: str
+    :param module_name: str, module name of the node file
+    :param package: str or None, name of the package the node belongs to
+    :return: list(dict), files with syntax errors do not define any component
+    """
+
+    with open(file_path, 'rb') as fh:
+        try:
+            tree = ast.parse(fh.read(), filename=file_path)
+        except (SyntaxError, ValueError):
+            return list()
+
+    components = list()
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        component = {
+            'name': node.name, 'module': module_name, 'package': package,
+            'bases': [_get_dotted_name(base) for base in node.bases if _get_dotted_name(base) != 'object'],
+            'options': list()}
+        for item in node.body:
+            if isinstance(item, ast.Assign) and len(item.targets) == 1 and isinstance(item.targets[0], ast.Name):
+                if item.targets[0].id in COMPONENT_ATTRIBUTES:
+                    try:
+                        component[item.targets[0].id] = ast.literal_eval(item.value)
+                    except ValueError:
+                        pass
+            elif isinstance(item, ast.FunctionDef) and item.name == 'setup_options':
+                component['options'] = _parse_setup_options(item)
+        components.append(component)
+
+    return components
+
+
+def _get_file_stats(file_path):
+    """
+    Internal function that returns the modification time and size of the given file
+    :param file_path: str
+    :return: dict
+    """
+
+    if not os.path.isfile(file_path):
+        return {'mtime': 0, 'size': 0}
+
+    file_stat = os.stat(file_path)
+
+    return {'mtime': file_stat.st_mtime, 'size': file_stat.st_size}
+
+
+def _get_package_name(package_path):
+    """
+    Internal function that returns the MODULE_NAME defined in the given package
+    :param package_path: str
+    :return: str or None
+    """
+
+    init_path = os.path.join(package_path, '__init__.py')
+    if not os.path.isfile(init_path):
+        return None
+
+    with open(init_path, 'rb') as fh:
+        try:
+            tree = ast.parse(fh.read(), filename=init_path)
+        except (SyntaxError, ValueError):
+            return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id == 'MODULE_NAME':
+                try:
+                    return ast.literal_eval(node.value)
+                except ValueError:
+                    return None
+
+    return None
+
+
+def _get_dotted_name(node):
+    """
+    Internal function that returns the dotted name of the given name or attribute node (for example, component.Rig)
+    :param node: ast.AST
+    :return: str
+    """
+
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return '{}.{}'.format(_get_dotted_name(node.value), node.attr)
+
+    return ''
+
+
+def _parse_setup_options(function_node):
+    """
+    Internal function that returns the options added by the given setup_options function
+    (setup_options['Name'] = {...} statements). Options with non literal values are skipped
+    :param function_node: ast.FunctionDef
+    :return: list(list(str, dict)), options in definition order
+    """
+
+    index_type = getattr(ast, 'Index', None)
+    options = list()
+    for node in ast.walk(function_node):
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        if not isinstance(target, ast.Subscript) or _get_dotted_name(target.value) != 'setup_options':
+            continue
+        key_node = target.slice.value if index_type and isinstance(target.slice, index_type) else target.slice
+        try:
+            options.append((node.lineno, ast.literal_eval(key_node), ast.literal_eval(node.value)))
+        except ValueError:
+            continue
+
+    return [[option_name, option_value] for _, option_name, option_value in sorted(options, key=lambda o: o[0])]
+
+
+def _resolve_inheritance(components):
+    """
+    Internal function that adds to each component the attributes and options of its base classes found in the
+    same manifest. Base class options go first, because setup_options calls its super implementation first
+    :param components: list(dict)
+    :return: list(dict)
+    """
+
+    components_by_name = dict((component['name'], component) for component in components)
+    resolved = dict()
+
+    def _resolve(component, visited):
+        if component['name'] in resolved:
+            return resolved[component['name']]
+        resolved_component = dict(component)
+        resolved_options = list()
+        for base in component['bases']:
+            base_component = components_by_name.get(base.split('.')[-1], None)
+            if not base_component or base_component['name'] in visited:
+                continue
+            resolved_base = _resolve(base_component, visited | set([component['name']]))
+            for attribute in COMPONENT_ATTRIBUTES:
+                if attribute not in resolved_component and attribute in resolved_base:
+                    resolved_component[attribute] = resolved_base[attribute]
+            resolved_options.extend(resolved_base['options'])
+        option_names = [option[0] for option in component['options']]
+        resolved_options = [option for option in resolved_options if option[0] not in option_names]
+        resolved_component['options'] = resolved_options + list(component['options'])
+        resolved[component['name']] = resolved_component
+        return resolved_component
+
+    return [_resolve(component, set()) for component in components]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains pure Python functions to work with transform matrices stored as flat lists of 16 values,
+following Maya conventions (row vectors, translation stored in the last row), so transforms can be computed from
+cached world matrices without creating temporary nodes in the scene
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import math
+
+IDENTITY_MATRIX = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+AXES = 'xyz'
+
+
+def multiply_matrices(matrix_a, matrix_b):
+    """
+    Returns the product of the given matrices. With row vectors, matrix_a transform is applied first
+    :param matrix_a: list(float), 16 values
+    :param matrix_b: list(float), 16 values
+    :return: list(float)
+    """
+
+    result = [0.0] * 16
+    for row in range(4):
+        a0, a1, a2, a3 = matrix_a[row * 4:row * 4 + 4]
+        for column in range(4):
+            b0, b1, b2, b3 = matrix_b[column::4]
+            result[row * 4 + column] = a0 * b0 + a1 * b1 + a2 * b2 + a3 * b3
+
+    return result
+
+
+def get_euler_matrix(rotation, rotate_order='xyz'):
+    """
+    Returns the rotation matrix of the given euler rotation
+    :param rotation: list(float), rotation in degrees around X, Y and Z axes
+    :param rotate_order: str, order in which axes rotations are applied (xyz, yzx, zxy, xzy, yxz or zyx)
+    :return: list(float)
+    """
+
+    axis_matrices = dict()
+    for axis, angle in zip(AXES, rotation):
+        cos_angle = math.cos(math.radians(angle))
+        sin_angle = math.sin(math.radians(angle))
+        axis_matrix = list(IDENTITY_MATRIX)
+        first, second = [i for i in range(3) if i != AXES.index(axis)]
+        if axis == 'y':
+            sin_angle = -sin_angle
+        axis_matrix[first * 4 + first] = cos_angle
+        axis_matrix[first * 4 + second] = sin_angle
+        axis_matrix[second * 4 + first] = -sin_angle
+        axis_matrix[second * 4 + second] = cos_angle
+        axis_matrices[axis] = axis_matrix
+
+    result = IDENTITY_MATRIX
+    for axis in rotate_order:
+        result = multiply_matrices(result, axis_matrices[axis])
+
+    return result
+
+
+def flip_matrix_axes(matrix, axes='yz'):
+    """
+    Returns the given matrix with the given axes pointing in the opposite direction. Position and scale are kept.
+    Flipping two axes is the same as rotating the transform 180 degrees around its remaining axis
+    :param matrix: list(float), 16 values
+    :param axes: str, axes to flip
+    :return: list(float)
+    """
+
+    flipped_matrix = list(matrix)
+    for axis in axes:
+        row = AXES.index(axis) * 4
+        flipped_matrix[row:row + 3] = [-value for value in matrix[row:row + 3]]
+
+    return flipped_matrix
+
+
+def inverse_matrix(matrix):
+    """
+    Returns the inverse of the given affine transform matrix
+    :param matrix: list(float), 16 values
+    :return: list(float)
+    """
+
+    a, b, c = matrix[0:3]
+    d, e, f = matrix[4:7]
+    g, h, i = matrix[8:11]
+    cofactors = [e * i - f * h, c * h - b * i, b * f - c * e,
+                 f * g - d * i, a * i - c * g, c * d - a * f,
+                 d * h - e * g, b * g - a * h, a * e - b * d]
+    determinant = a * cofactors[0] + b * cofactors[3] + c * cofactors[6]
+    if abs(determinant) < 1e-12:
+        raise ValueError('Impossible to invert a singular matrix')
+
+    rotation = [value / determinant for value in cofactors]
+    x, y, z = matrix[12:15]
+    translation = [-(x * rotation[column] + y * rotation[3 + column] + z * rotation[6 + column]) for column in range(3)]
+
+    return rotation[0:3] + [0.0] + rotation[3:6] + [0.0] + rotation[6:9] + [0.0] + translation + [1.0]
+
+
+def get_rotate_matrix(matrix):
+    """
+    Returns the rotation of the given transform matrix, without its translation and scale
+    :param matrix: list(float), 16 values
+    :return: list(float)
+    """
+
+    rotate_matrix = list(IDENTITY_MATRIX)
+    for row in range(3):
+        axis = matrix[row * 4:row * 4 + 3]
+        length = math.sqrt(sum(value * value for value in axis))
+        if length < 1e-12:
+            raise ValueError('Impossible to get the rotation of a matrix with a zero scale axis')
+        rotate_matrix[row * 4:row * 4 + 3] = [value / length for value in axis]
+
+    return rotate_matrix
+
+
+def is_close(matrix_a, matrix_b, tolerance=1e-6):
+    """
+    Returns whether or not the given matrices are equal within the given tolerance
+    :param matrix_a: list(float)
+    :param matrix_b: list(float)
+    :param tolerance: float
+    :return: bool
+    """
+
+    return all(abs(value_a - value_b) <= tolerance for value_a, value_b in zip(matrix_a, matrix_b))
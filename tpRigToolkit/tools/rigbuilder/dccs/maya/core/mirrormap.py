@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a bidirectional map between node names and the names of their mirror nodes, built once from a
+naming rule mirror function
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+_MIRROR_MAPS = dict()
+
+
+def get_mirror_map(cache_key, mirror_name_fn, names=None):
+    """
+    Returns the mirror map cached with the given key (for example, project and naming rule), creating it if it does not
+    exist, and makes sure it contains the given names
+    :param cache_key: hashable
+    :param mirror_name_fn: fn, function that returns the mirror name of a name
+    :param names: list(str) or None
+    :return: MirrorMap
+    """
+
+    mirror_map = _MIRROR_MAPS.get(cache_key, None)
+    if mirror_map is None:
+        mirror_map = _MIRROR_MAPS[cache_key] = MirrorMap(mirror_name_fn)
+    if names:
+        mirror_map.update(names)
+
+    return mirror_map
+
+
+def clear_mirror_maps():
+    """
+    Removes all cached mirror maps
+    """
+
+    _MIRROR_MAPS.clear()
+
+
+class MirrorMap(object):
+    """
+    Maps names with the names of their mirror nodes in both directions. Mirror function is expected to be symmetric
+    (the mirror of the mirror name is the original name), so it is called only once per pair of names.
+    Names are classified when added: paired (its mirror name is also in the map), centered (its mirror name is itself)
+    or unmatched (its mirror name is not in the map)
+    """
+
+    def __init__(self, mirror_name_fn, names=None):
+        self._mirror_name_fn = mirror_name_fn       # Function that returns the mirror name of a name
+        self._mirror_names = dict()                 # Maps names with the name returned by the mirror function
+        self._names = set()                         # Names of the nodes added to the map
+        self._pairs = dict()                        # Maps names with their mirror, in both directions
+        self._unmatched = set()                     # Names whose mirror name is not in the map
+
+        if names:
+            self.update(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def update(self, names):
+        """
+        Adds the given names into the map. Unmatched names whose mirror is added are paired
+        :param names: list(str)
+        :return: int, number of new names
+        """
+
+        new_names = [name for name in names if name not in self._names]
+        self._names.update(new_names)
+        for name in new_names:
+            mirror_name = self.get_mirror_name(name)
+            if not mirror_name or mirror_name == name:
+                continue
+            if mirror_name in self._names:
+                self._pairs[name] = mirror_name
+                self._pairs[mirror_name] = name
+                self._unmatched.discard(mirror_name)
+            else:
+                self._unmatched.add(name)
+
+        return len(new_names)
+
+    def get_mirror(self, name):
+        """
+        Returns the mirror of the given name if both of them are in the map
+        :param name: str
+        :return: str or None
+        """
+
+        return self._pairs.get(name, None)
+
+    def get_mirror_name(self, name):
+        """
+        Returns the mirror name of the given name, even if it is not in the map. Mirror function is called only the
+        first time a name is queried
+        :param name: str
+        :return: str
+        """
+
+        if name in self._mirror_names:
+            return self._mirror_names[name]
+
+        mirror_name = self._mirror_names[name] = self._mirror_name_fn(name)
+        if mirror_name:
+            self._mirror_names.setdefault(mirror_name, name)
+
+        return mirror_name
+
+    def get_mirror_names(self, names):
+        """
+        Returns the mirror names of the given names
+        :param names: list(str)
+        :return: list(str)
+        """
+
+        return [self.get_mirror_name(name) for name in names]
+
+    def is_centered(self, name):
+        """
+        Returns whether or not the given name is its own mirror
+        :param name: str
+        :return: bool
+        """
+
+        mirror_name = self.get_mirror_name(name)
+
+        return not mirror_name or mirror_name == name
+
+    def get_unmatched(self):
+        """
+        Returns the names of the map whose mirror name is not in the map
+        :return: list(str)
+        """
+
+        return sorted(self._unmatched)
+
+    def get_pairs(self):
+        """
+        Returns all pairs of mirrored names. Each pair is returned only once
+        :return: list(tuple(str, str))
+        """
+
+        return sorted((name, mirror) for name, mirror in self._pairs.items() if name < mirror)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains vectorized functions to compute the pole vector position and orientation of many limbs at once
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import numpy as np
+
+AXES = 'xyz'
+STRAIGHT_TOLERANCE = 1e-4
+FALLBACK_VECTORS = [(0.0, 0.0, 1.0), (0.0, 1.0, 0.0), (1.0, 0.0, 0.0)]
+
+
+def get_pole_vectors(positions, offsets=1.0, fallback_vector=None):
+    """
+    Returns the pole vector position and orientation of the given limbs. Pole vectors are placed in the plane of each
+    limb, starting at its mid joint and moving away from the line between its start and end joints, at a distance
+    equal to the length of that line multiplied by the offset of the limb.
+    Straight limbs have no plane, so the given fallback vector (or the first world axis that is not parallel to the
+    limb) is used as pole direction
+    :param positions: list or np.array, (N, 3, 3) world positions of the start, mid and end joints of each limb
+    :param offsets: float or list(float), offset of all limbs or of each limb
+    :param fallback_vector: list(float) or np.array or None, (3) or (N, 3) pole direction used by straight limbs
+    :return: tuple(np.array, np.array), (N, 3) pole positions and (N, 3, 3) orientations. The rows of each orientation
+        are its X (aim from start to end joint), Y (pole direction) and Z axes
+    """
+
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3, 3)
+    limb_count = len(positions)
+    start, mid, end = positions[:, 0], positions[:, 1], positions[:, 2]
+
+    chain = end - start
+    chain_length = np.linalg.norm(chain, axis=1)
+    aim = np.tile(np.array([1.0, 0.0, 0.0]), (limb_count, 1))
+    valid_chain = chain_length > 0.0
+    aim[valid_chain] = chain[valid_chain] / chain_length[valid_chain, None]
+
+    up = _get_perpendicular(mid - start, aim)
+    up_length = np.linalg.norm(up, axis=1)
+    straight = up_length <= STRAIGHT_TOLERANCE * np.maximum(chain_length, 1.0)
+    fallback_vectors = list(FALLBACK_VECTORS)
+    if fallback_vector is not None:
+        fallback_vectors.insert(0, fallback_vector)
+    for vector in fallback_vectors:
+        if not straight.any():
+            break
+        vectors = np.broadcast_to(np.asarray(vector, dtype=np.float64), (limb_count, 3))[straight]
+        fallback_up = _get_perpendicular(vectors, aim[straight])
+        up[straight] = fallback_up
+        up_length[straight] = np.linalg.norm(fallback_up, axis=1)
+        straight = up_length <= STRAIGHT_TOLERANCE
+
+    up /= up_length[:, None]
+    side = np.cross(aim, up)
+
+    offsets = np.broadcast_to(np.asarray(offsets, dtype=np.float64), (limb_count,))
+    pole_positions = mid + up * (chain_length * offsets)[:, None]
+
+    return pole_positions, np.stack([aim, up, side], axis=1)
+
+
+def mirror_pole_vectors(pole_positions, orientations, axis='x'):
+    """
+    Returns the pole vectors of the limbs that mirror the given ones across the plane perpendicular to the given axis.
+    The result is the same that computing the pole vectors of the mirrored limbs, so each pair of mirrored limbs
+    only needs to be computed once
+    :param pole_positions: np.array, (N, 3)
+    :param orientations: np.array, (N, 3, 3)
+    :param axis: str, x, y or z
+    :return: tuple(np.array, np.array)
+    """
+
+    axis_index = AXES.index(axis)
+    mirrored_positions = np.array(pole_positions, dtype=np.float64)
+    mirrored_positions[:, axis_index] *= -1.0
+    mirrored_orientations = np.array(orientations, dtype=np.float64)
+    mirrored_orientations[:, :, axis_index] *= -1.0
+
+    # Mirroring flips handedness, so Z axis is computed again from the mirrored X and Y axes
+    mirrored_orientations[:, 2] *= -1.0
+
+    return mirrored_positions, mirrored_orientations
+
+
+def _get_perpendicular(vectors, directions):
+    """
+    Internal function that returns the component of the given vectors that is perpendicular to the given directions
+    :param vectors: np.array, (N, 3)
+    :param directions: np.array, (N, 3) normalized directions
+    :return: np.array, (N, 3)
+    """
+
+    return vectors - directions * np.einsum('ij,ij->i', vectors, directions)[:, None]
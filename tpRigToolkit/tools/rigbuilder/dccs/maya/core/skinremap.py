@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions and classes to remap skin weights between meshes with different topology
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights
+
+REMAP_MODE_NEAREST = 0
+REMAP_MODE_INTERPOLATE = 1
+
+
+class GridIndex(object):
+    """
+    Uniform grid spatial index that allows vectorized k nearest neighbours queries over a set of points
+    """
+
+    QUERY_CHUNK_SIZE = 65536
+
+    def __init__(self, points, points_per_cell=2.0):
+        self._points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if not self._points.size:
+            raise ValueError('Impossible to build a spatial index without points!')
+
+        self._min = self._points.min(axis=0)
+        extent = np.maximum(self._points.max(axis=0) - self._min, 1e-8)
+
+        # Mesh vertices lie on a surface, so cell size is computed assuming points are spread over the two biggest
+        # sides of the bounding box. That way each occupied cell contains, on average, the given number of points
+        # Flat sides are ignored, so points that lie on a line are spread over its length
+        sides = np.sort(extent)[1:]
+        sides = sides[sides > float(extent.max()) * 1e-3]
+        self._cell_size = (float(np.prod(sides)) * points_per_cell / len(self._points)) ** (1.0 / len(sides))
+        self._cell_size = max(self._cell_size, float(extent.max()) / 1024.0)
+        self._dimensions = np.floor(extent / self._cell_size).astype(np.int64) + 1
+
+        keys = self._get_keys(self._get_cells(self._points))
+        self._order = np.argsort(keys, kind='stable')
+        self._cell_keys, self._cell_starts, self._cell_counts = np.unique(
+            keys[self._order], return_index=True, return_counts=True)
+
+    # ==============================================================================================
+    # PROPERTIES
+    # ==============================================================================================
+
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def query(self, points, k=1):
+        """
+        Returns the k nearest indexed points to each one of the given points
+        :param points: np.array, (N, 3) array of query points
+        :param k: int, number of neighbours to return
+        :return: tuple(np.array, np.array), (N, k) arrays with distances and indices of the nearest points
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        k = min(int(k), len(self._points))
+        best_distances = np.full((len(points), k), np.inf)
+        best_indices = np.full((len(points), k), -1, dtype=np.int64)
+
+        # Queries are solved in chunks to keep the memory used by the candidates arrays bounded
+        for chunk_start in range(0, len(points), self.QUERY_CHUNK_SIZE):
+            chunk = slice(chunk_start, chunk_start + self.QUERY_CHUNK_SIZE)
+            self._query_chunk(points[chunk], best_distances[chunk], best_indices[chunk])
+
+        return np.sqrt(best_distances), best_indices
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _query_chunk(self, points, best_distances, best_indices):
+        """
+        Internal function that solves the nearest neighbours of the given points, storing them in the given arrays
+        :param points: np.array
+        :param best_distances: np.array, (N, k) array where squared distances are stored
+        :param best_indices: np.array, (N, k) array where nearest points indices are stored
+        """
+
+        k = best_distances.shape[1]
+        # Points outside the grid are moved to the nearest grid cell. Projecting a point into the grid box never
+        # increases its distance to the indexed points, so the ring radius check below remains valid
+        query_cells = np.clip(self._get_cells(points), 0, self._dimensions - 1)
+        max_ring = int(self._dimensions.max())
+
+        active = np.arange(len(points))
+        ring = 0
+        while active.size and ring <= max_ring:
+            candidate_queries, candidate_points = self._get_ring_candidates(query_cells[active], ring)
+            if candidate_queries.size:
+                candidate_queries = active[candidate_queries]
+                deltas = points[candidate_queries] - self._points[candidate_points]
+                candidate_distances = np.einsum('ij,ij->i', deltas, deltas)
+                self._merge_candidates(
+                    best_distances, best_indices, active, candidate_queries, candidate_points, candidate_distances)
+
+            # Points that have not been checked yet are at least ring * cell_size away from the query point
+            radius = ring * self._cell_size
+            resolved = best_distances[active, k - 1] <= radius * radius
+            active = active[~resolved]
+            ring += 1
+
+    def _get_cells(self, points):
+        """
+        Internal function that returns the grid cell coordinates of the given points
+        :param points: np.array
+        :return: np.array
+        """
+
+        return np.floor((points - self._min) / self._cell_size).astype(np.int64)
+
+    def _get_keys(self, cells):
+        """
+        Internal function that returns the linear key of the given cell coordinates
+        :param cells: np.array
+        :return: np.array
+        """
+
+        return cells[:, 0] + self._dimensions[0] * (cells[:, 1] + self._dimensions[1] * cells[:, 2])
+
+    def _get_ring_candidates(self, query_cells, ring):
+        """
+        Internal function that returns all indexed points located in the cells of the given ring around each query
+        :param query_cells: np.array
+        :param ring: int
+        :return: tuple(np.array, np.array), query position and point index of each candidate
+        """
+
+        offsets = _get_ring_offsets(ring, self._dimensions)
+        cells = (query_cells[:, np.newaxis, :] + offsets[np.newaxis, :, :]).reshape(-1, 3)
+        cell_queries = np.repeat(np.arange(len(query_cells)), len(offsets))
+        valid = np.all((cells >= 0) & (cells < self._dimensions), axis=1)
+        cells, cell_queries = cells[valid], cell_queries[valid]
+
+        keys = self._get_keys(cells)
+        positions = np.searchsorted(self._cell_keys, keys)
+        positions = np.minimum(positions, len(self._cell_keys) - 1)
+        occupied = self._cell_keys[positions] == keys
+        positions, cell_queries = positions[occupied], cell_queries[occupied]
+
+        counts = self._cell_counts[positions]
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        group_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        sorted_positions = np.repeat(self._cell_starts[positions], counts) + np.arange(total) - group_offsets
+
+        return np.repeat(cell_queries, counts), self._order[sorted_positions]
+
+    def _merge_candidates(self, best_distances, best_indices, active, queries, indices, distances):
+        """
+        Internal function that merges new candidates with the current best neighbours of each query
+        """
+
+        k = best_distances.shape[1]
+        all_queries = np.concatenate([np.repeat(active, k), queries])
+        all_indices = np.concatenate([best_indices[active].ravel(), indices])
+        all_distances = np.concatenate([best_distances[active].ravel(), distances])
+
+        order = np.lexsort((all_distances, all_queries))
+        all_queries, all_indices, all_distances = all_queries[order], all_indices[order], all_distances[order]
+        group_starts = np.r_[0, np.flatnonzero(np.diff(all_queries)) + 1]
+        group_sizes = np.diff(np.r_[group_starts, all_queries.size])
+        ranks = np.arange(all_queries.size) - np.repeat(group_starts, group_sizes)
+        keep = ranks < k
+
+        best_distances[all_queries[keep], ranks[keep]] = all_distances[keep]
+        best_indices[all_queries[keep], ranks[keep]] = all_indices[keep]
+
+
+def _get_ring_offsets(ring, dimensions):
+    """
+    Internal function that returns all cell offsets located exactly at the given Chebyshev distance
+    Offsets along each axis are clamped to the grid dimensions, because bigger offsets always leave the grid, so flat
+    and thin grids only walk the cells of the ring that can be inside the grid
+    :param ring: int
+    :param dimensions: np.array, number of cells of the grid along each axis
+    :return: np.array
+    """
+
+    axis_ranges = [np.arange(-min(ring, size - 1), min(ring, size - 1) + 1) for size in dimensions]
+    offsets = np.stack(np.meshgrid(*axis_ranges, indexing='ij'), axis=-1).reshape(-1, 3)
+
+    return offsets[np.abs(offsets).max(axis=1) == ring]
+
+
+def remap_weights(matrix, source_positions, target_positions, mode=REMAP_MODE_NEAREST, neighbours=4, index=None):
+    """
+    Remaps given skin weights into a new set of vertex positions
+    :param matrix: SkinWeightsMatrix, weights of the source vertices
+    :param source_positions: np.array, (N, 3) array with source vertices positions
+    :param target_positions: np.array, (M, 3) array with target vertices positions
+    :param mode: int, REMAP_MODE_NEAREST or REMAP_MODE_INTERPOLATE
+    :param neighbours: int, number of source vertices blended in REMAP_MODE_INTERPOLATE mode
+    :param index: GridIndex or None, spatial index of the source positions (it is built if not given)
+    :return: SkinWeightsMatrix
+    """
+
+    target_positions = np.asarray(target_positions, dtype=np.float64).reshape(-1, 3)
+    index = index or GridIndex(source_positions)
+    k = 1 if mode == REMAP_MODE_NEAREST else neighbours
+    distances, indices = index.query(target_positions, k=k)
+
+    if k == 1:
+        blend = np.ones(indices.shape, dtype=np.float64)
+    else:
+        # Inverse distance weighting. Target vertices that overlap a source vertex just copy its weights
+        exact = distances[:, 0] <= 1e-10
+        blend = 1.0 / np.maximum(distances, 1e-10) ** 2
+        blend[exact] = 0.0
+        blend[exact, 0] = 1.0
+        blend /= blend.sum(axis=1)[:, np.newaxis]
+
+    # Index clamps the number of neighbours to the number of source vertices
+    target_vertices = np.repeat(np.arange(len(target_positions)), indices.shape[1])
+    source_vertices = indices.ravel()
+    blend = blend.ravel()
+
+    # Gather the sparse rows of all source vertices that contribute to each target vertex
+    row_starts = np.searchsorted(matrix.vertices, source_vertices, side='left')
+    row_counts = np.searchsorted(matrix.vertices, source_vertices, side='right') - row_starts
+    total = int(row_counts.sum())
+    group_offsets = np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+    entries = np.repeat(row_starts, row_counts) + np.arange(total) - group_offsets
+
+    vertices = np.repeat(target_vertices, row_counts)
+    influences = matrix.influences[entries]
+    weights = matrix.weights[entries] * np.repeat(blend, row_counts)
+
+    influence_count = max(len(matrix.influence_names), 1)
+    keys, inverse = np.unique(vertices * influence_count + influences, return_inverse=True)
+    weights = np.bincount(inverse.ravel(), weights=weights, minlength=keys.size)
+    valid = weights > 0.0
+
+    remapped = skinweights.SkinWeightsMatrix(
+        (keys // influence_count)[valid], (keys % influence_count)[valid], weights[valid], matrix.influence_names,
+        vertex_count=len(target_positions))
+
+    return skinweights.normalize_weights(remapped)
+
+
+def remap_weights_folder(weights_path, target_positions, output_path, mode=REMAP_MODE_NEAREST, neighbours=4):
+    """
+    Remaps the weights of all meshes stored in the given skin weights data folder into new vertex positions
+    Remapped meshes are written into the given output folder with the same layout
+    :param weights_path: str, skin weights data folder
+    :param target_positions: dict(str, np.array), dictionary that maps mesh names with their new vertex positions
+    :param output_path: str, folder where remapped weights are stored
+    :param mode: int, REMAP_MODE_NEAREST or REMAP_MODE_INTERPOLATE
+    :param neighbours: int
+    :return: list(str), list of remapped mesh names
+    """
+
+    remapped_meshes = list()
+    for mesh_folder in skinweights.get_mesh_folders(weights_path):
+        mesh_name = os.path.basename(mesh_folder)
+        mesh_positions = target_positions.get(mesh_name, None)
+        source_positions = skinweights.read_vertex_positions(mesh_folder)
+        if mesh_positions is None or source_positions is None:
+            continue
+
+        matrix = skinweights.read_mesh_weights(mesh_folder)
+        remapped = remap_weights(matrix, source_positions, mesh_positions, mode=mode, neighbours=neighbours)
+
+        output_folder = os.path.join(output_path, mesh_name)
+        if not os.path.isdir(output_folder):
+            os.makedirs(output_folder)
+        skinweights.copy_mesh_info(mesh_folder, output_folder)
+        skinweights.write_mesh_weights(output_folder, remapped)
+        skinweights.write_vertex_positions(output_folder, mesh_positions)
+        remapped_meshes.append(mesh_name)
+
+    return remapped_meshes
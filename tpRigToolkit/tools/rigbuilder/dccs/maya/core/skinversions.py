@@ -0,0 +1,383 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains classes to store skin weights versions as base snapshots plus sparse deltas
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import json
+import time
+
+import numpy as np
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights
+
+MANIFEST_FILE = 'versions.json'
+
+
+class SkinWeightsVersions(object):
+    """
+    Stores the versions of the weights of a mesh. Each version is stored either as a full snapshot (base) or as a
+    delta that only contains the vertices that changed since its base. Because deltas are always computed against
+    their base, any version is rebuilt by applying a single delta to a single base.
+    A new base is stored (compaction) when the delta becomes too big compared with its base
+    """
+
+    def __init__(self, versions_path, compaction_ratio=0.25):
+        self._versions_path = versions_path
+        self._compaction_ratio = compaction_ratio           # Delta/base entries ratio that triggers a new base
+        self._manifest = None
+        self._bases_cache = dict()
+        self._base_offsets = None                           # Vertex offsets of the cached base
+
+    # ==============================================================================================
+    # PROPERTIES
+    # ==============================================================================================
+
+    @property
+    def versions_path(self):
+        return self._versions_path
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def versions(self):
+        """
+        Returns the info of all stored versions
+        :return: list(dict)
+        """
+
+        return list(self._get_manifest())
+
+    def latest_version(self):
+        """
+        Returns the number of the last stored version
+        :return: int, 0 if no versions stored yet
+        """
+
+        versions = self._get_manifest()
+
+        return versions[-1]['version'] if versions else 0
+
+    def save_version(self, matrix, comment='', tolerance=1e-6, force_base=False):
+        """
+        Stores given weights as a new version
+        :param matrix: SkinWeightsMatrix
+        :param comment: str
+        :param tolerance: float, weight differences smaller than this value are not considered changes
+        :param force_base: bool, whether to store the weights as a full snapshot even if the delta is small
+        :return: dict, info of the new version
+        """
+
+        versions = self._get_manifest()
+        version = self.latest_version() + 1
+        version_info = {'version': version, 'comment': comment, 'time': time.time()}
+
+        base_info = self._get_base_info(versions[-1]) if versions else None
+        delta = None
+        if base_info and not force_base:
+            base_matrix = self._load_base(base_info['version'])
+            delta = compute_delta(base_matrix, matrix, tolerance=tolerance)
+            if len(delta['weights']) > max(len(base_matrix), 1) * self._compaction_ratio:
+                delta = None
+
+        if delta is None:
+            file_name = 'base_{:04d}.npz'.format(version)
+            self._save_arrays(file_name, _matrix_to_arrays(matrix))
+            self._bases_cache = {version: matrix}
+            self._base_offsets = None
+            version_info.update({'type': 'base', 'file': file_name, 'changed': matrix.vertex_count})
+        else:
+            file_name = 'delta_{:04d}.npz'.format(version)
+            self._save_arrays(file_name, delta)
+            version_info.update({
+                'type': 'delta', 'file': file_name, 'base': base_info['version'],
+                'changed': int(len(delta['changed_vertices']))})
+
+        version_info['size'] = os.path.getsize(os.path.join(self._versions_path, file_name))
+        versions.append(version_info)
+        self._save_manifest()
+
+        return version_info
+
+    def load_version(self, version=None):
+        """
+        Rebuilds the weights of the given version
+        :param version: int or None, if not given, last version is loaded
+        :return: SkinWeightsMatrix
+        """
+
+        versions = self._get_manifest()
+        if not versions:
+            return None
+        version = version or versions[-1]['version']
+        version_info = self._get_version_info(version)
+        if not version_info:
+            raise ValueError('Version {} does not exist in "{}"'.format(version, self._versions_path))
+
+        base_info = self._get_base_info(version_info)
+        base_matrix = self._load_base(base_info['version'])
+        if version_info['type'] == 'base':
+            return base_matrix
+
+        return apply_delta(
+            base_matrix, self._load_arrays(version_info['file']), base_offsets=self._get_base_offsets(base_matrix))
+
+    def compact(self):
+        """
+        Forces the storage of latest version as a new base
+        :return: dict, info of the new version
+        """
+
+        latest = self.load_version()
+        if latest is None:
+            return None
+
+        return self.save_version(
+            latest, comment='Compaction of version {}'.format(self.latest_version()), force_base=True)
+
+    def disk_usage(self):
+        """
+        Returns the total number of bytes used by all the stored versions
+        :return: int
+        """
+
+        return sum(version_info.get('size', 0) for version_info in self._get_manifest())
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _get_manifest(self):
+        """
+        Internal function that returns the list of versions stored in the manifest file
+        :return: list(dict)
+        """
+
+        if self._manifest is None:
+            manifest_path = os.path.join(self._versions_path, MANIFEST_FILE)
+            if os.path.isfile(manifest_path):
+                with open(manifest_path, 'r') as fh:
+                    self._manifest = json.load(fh)
+            else:
+                self._manifest = list()
+
+        return self._manifest
+
+    def _save_manifest(self):
+        """
+        Internal function that writes the versions manifest file
+        """
+
+        manifest_path = os.path.join(self._versions_path, MANIFEST_FILE)
+        with open(manifest_path, 'w') as fh:
+            json.dump(self._get_manifest(), fh, indent=2)
+
+    def _get_version_info(self, version):
+        """
+        Internal function that returns the info of the given version
+        :param version: int
+        :return: dict or None
+        """
+
+        for version_info in self._get_manifest():
+            if version_info['version'] == version:
+                return version_info
+
+        return None
+
+    def _get_base_info(self, version_info):
+        """
+        Internal function that returns the info of the base version of the given version
+        :param version_info: dict
+        :return: dict
+        """
+
+        if version_info['type'] == 'base':
+            return version_info
+
+        return self._get_version_info(version_info['base'])
+
+    def _load_base(self, version):
+        """
+        Internal function that loads the base snapshot of the given version. Last loaded base is cached
+        :param version: int
+        :return: SkinWeightsMatrix
+        """
+
+        if version not in self._bases_cache:
+            version_info = self._get_version_info(version)
+            self._bases_cache = {version: _arrays_to_matrix(self._load_arrays(version_info['file']))}
+            self._base_offsets = None
+
+        return self._bases_cache[version]
+
+    def _get_base_offsets(self, base_matrix):
+        """
+        Internal function that returns the vertex offsets of the given cached base. Offsets are computed only once
+        per loaded base, so deltas applied to the same base do not scan it again
+        :param base_matrix: SkinWeightsMatrix
+        :return: np.array
+        """
+
+        if self._base_offsets is None:
+            self._base_offsets = get_vertex_offsets(base_matrix)
+
+        return self._base_offsets
+
+    def _save_arrays(self, file_name, arrays):
+        """
+        Internal function that stores given arrays into a compressed file
+        :param file_name: str
+        :param arrays: dict(str, np.array)
+        """
+
+        if not os.path.isdir(self._versions_path):
+            os.makedirs(self._versions_path)
+
+        with open(os.path.join(self._versions_path, file_name), 'wb') as fh:
+            np.savez_compressed(fh, **arrays)
+
+    def _load_arrays(self, file_name):
+        """
+        Internal function that loads the arrays stored in the given compressed file
+        :param file_name: str
+        :return: dict(str, np.array)
+        """
+
+        with np.load(os.path.join(self._versions_path, file_name)) as arrays:
+            return {key: arrays[key] for key in arrays.files}
+
+
+def _matrix_to_arrays(matrix):
+    """
+    Internal function that converts given matrix into a dictionary of arrays
+    :param matrix: SkinWeightsMatrix
+    :return: dict(str, np.array)
+    """
+
+    return {
+        'vertices': matrix.vertices, 'influences': matrix.influences, 'weights': matrix.weights,
+        'influence_names': np.array(matrix.influence_names, dtype=np.str_),
+        'vertex_count': np.array(matrix.vertex_count)
+    }
+
+
+def _arrays_to_matrix(arrays):
+    """
+    Internal function that converts given dictionary of arrays into a matrix
+    :param arrays: dict(str, np.array)
+    :return: SkinWeightsMatrix
+    """
+
+    return skinweights.SkinWeightsMatrix(
+        arrays['vertices'], arrays['influences'], arrays['weights'], [str(name) for name in arrays['influence_names']],
+        vertex_count=int(arrays['vertex_count']))
+
+
+def _reindex_influences(matrix, influence_names):
+    """
+    Internal function that returns the influence indices of the given matrix using the given influence names order
+    :param matrix: SkinWeightsMatrix
+    :param influence_names: list(str)
+    :return: np.array
+    """
+
+    indices = {name: i for i, name in enumerate(influence_names)}
+    mapping = np.array([indices[name] for name in matrix.influence_names], dtype=np.int64)
+
+    return mapping[matrix.influences] if mapping.size else matrix.influences
+
+
+def compute_delta(base_matrix, matrix, tolerance=1e-6):
+    """
+    Returns the delta arrays that contain the vertices of the given matrix that are different from the base matrix
+    :param base_matrix: SkinWeightsMatrix
+    :param matrix: SkinWeightsMatrix
+    :param tolerance: float
+    :return: dict(str, np.array)
+    """
+
+    influence_names = list(matrix.influence_names)
+    for name in base_matrix.influence_names:
+        if name not in influence_names:
+            influence_names.append(name)
+    influence_count = max(len(influence_names), 1)
+
+    base_keys = base_matrix.vertices * influence_count + _reindex_influences(base_matrix, influence_names)
+    keys = matrix.vertices * influence_count + _reindex_influences(matrix, influence_names)
+    all_keys, inverse = np.unique(np.concatenate([base_keys, keys]), return_inverse=True)
+    differences = np.bincount(
+        inverse.ravel(), weights=np.concatenate([-base_matrix.weights, matrix.weights]), minlength=all_keys.size)
+    changed = np.unique(all_keys[np.abs(differences) > tolerance] // influence_count)
+
+    # Vertices added or removed from the mesh are always considered changes
+    changed_mask = np.zeros(max(matrix.vertex_count, base_matrix.vertex_count), dtype=bool)
+    changed_mask[changed] = True
+    changed_mask[min(matrix.vertex_count, base_matrix.vertex_count):] = True
+    entries = changed_mask[matrix.vertices]
+
+    return {
+        'changed_vertices': np.flatnonzero(changed_mask),
+        'vertices': matrix.vertices[entries],
+        'influences': _reindex_influences(matrix, influence_names)[entries],
+        'weights': matrix.weights[entries],
+        'influence_names': np.array(influence_names, dtype=np.str_),
+        'vertex_count': np.array(matrix.vertex_count)
+    }
+
+
+def get_vertex_offsets(matrix):
+    """
+    Returns the offset where the entries of each vertex start in the given vertex sorted matrix. Entries of vertex i
+    are stored between offsets[i] and offsets[i + 1]
+    :param matrix: SkinWeightsMatrix
+    :return: np.array
+    """
+
+    return np.searchsorted(matrix.vertices, np.arange(matrix.vertex_count + 1))
+
+
+def apply_delta(base_matrix, delta, base_offsets=None):
+    """
+    Applies given delta arrays into the base matrix.
+    Entries of the changed vertices are located with the vertex offsets of the base and delta entries are inserted
+    in their sorted positions, so no sorting or full scan of the base is needed: apart from the copy of the
+    resulting arrays, the work done is proportional to the number of changed vertices
+    :param base_matrix: SkinWeightsMatrix
+    :param delta: dict(str, np.array)
+    :param base_offsets: np.array or None, vertex offsets of the base. Computed if not given
+    :return: SkinWeightsMatrix
+    """
+
+    influence_names = [str(name) for name in delta['influence_names']]
+    vertex_count = int(delta['vertex_count'])
+    if base_offsets is None:
+        base_offsets = get_vertex_offsets(base_matrix)
+
+    changed_vertices = np.asarray(delta['changed_vertices'], dtype=np.int64)
+    changed_vertices = changed_vertices[changed_vertices < base_matrix.vertex_count]
+    starts = base_offsets[changed_vertices]
+    lengths = base_offsets[changed_vertices + 1] - starts
+    removed = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))
+
+    base_influences = base_matrix.influences
+    if list(base_matrix.influence_names) != influence_names:
+        base_influences = _reindex_influences(base_matrix, influence_names)
+    vertices = np.delete(base_matrix.vertices, removed)
+    positions = np.searchsorted(vertices, delta['vertices'])
+
+    return skinweights.SkinWeightsMatrix(
+        np.insert(vertices, positions, delta['vertices']),
+        np.insert(np.delete(base_influences, removed), positions, delta['influences']),
+        np.insert(np.delete(base_matrix.weights, removed), positions, delta['weights']),
+        influence_names, vertex_count=vertex_count)
@@ -0,0 +1,587 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions and classes to work with skin cluster weights outside of Maya
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import json
+import shutil
+import hashlib
+
+import numpy as np
+
+INFLUENCE_INFO_FILE = 'influence.info'
+WEIGHTS_EXTENSION = '.weights'
+VERTEX_POSITIONS_FILE = 'vertex.positions'
+
+_WEIGHTS_HASH_CACHE = dict()
+
+
+class SkinWeightsMatrix(object):
+    """
+    Sparse skin weights matrix stored in vertex major order (CSR like).
+    Each non zero weight is stored as a (vertex, influence, weight) triplet, sorted by vertex index
+    """
+
+    def __init__(self, vertices, influences, weights, influence_names, vertex_count=None):
+        self.vertices = np.asarray(vertices, dtype=np.int64)
+        self.influences = np.asarray(influences, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.influence_names = list(influence_names)
+        if vertex_count is None:
+            vertex_count = int(self.vertices.max()) + 1 if self.vertices.size else 0
+        self.vertex_count = int(vertex_count)
+
+    def __len__(self):
+        return int(self.weights.size)
+
+    # ==============================================================================================
+    # CLASS METHODS
+    # ==============================================================================================
+
+    @classmethod
+    def from_influence_weights(cls, influence_weights):
+        """
+        Creates a new sparse matrix from a dictionary that maps influence names with their per vertex weights
+        :param influence_weights: dict(str, list(float))
+        :return: SkinWeightsMatrix
+        """
+
+        influence_names = list(influence_weights.keys())
+        vertex_count = 0
+        vertices, influences, weights = list(), list(), list()
+        for i, influence_name in enumerate(influence_names):
+            influence_values = np.asarray(influence_weights[influence_name], dtype=np.float64)
+            vertex_count = max(vertex_count, influence_values.size)
+            non_zero = np.flatnonzero(influence_values)
+            vertices.append(non_zero)
+            influences.append(np.full(non_zero.size, i, dtype=np.int64))
+            weights.append(influence_values[non_zero])
+
+        if not influence_names:
+            return cls(list(), list(), list(), list(), vertex_count=0)
+
+        vertices = np.concatenate(vertices)
+        order = np.argsort(vertices, kind='stable')
+
+        return cls(
+            vertices[order], np.concatenate(influences)[order], np.concatenate(weights)[order],
+            influence_names, vertex_count=vertex_count)
+
+    @classmethod
+    def from_dense(cls, dense_weights, influence_names):
+        """
+        Creates a new sparse matrix from a dense (vertex_count x influence_count) weights array
+        :param dense_weights: np.array
+        :param influence_names: list(str)
+        :return: SkinWeightsMatrix
+        """
+
+        dense_weights = np.asarray(dense_weights, dtype=np.float64)
+        vertices, influences = np.nonzero(dense_weights)
+
+        return cls(
+            vertices, influences, dense_weights[vertices, influences], influence_names,
+            vertex_count=dense_weights.shape[0])
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def copy(self):
+        """
+        Returns a copy of this matrix
+        :return: SkinWeightsMatrix
+        """
+
+        return SkinWeightsMatrix(
+            self.vertices.copy(), self.influences.copy(), self.weights.copy(), self.influence_names,
+            vertex_count=self.vertex_count)
+
+    def influence_counts(self):
+        """
+        Returns the number of influences that affect each vertex
+        :return: np.array
+        """
+
+        return np.bincount(self.vertices, minlength=self.vertex_count)
+
+    def vertex_sums(self):
+        """
+        Returns the sum of all the weights of each vertex
+        :return: np.array
+        """
+
+        return np.bincount(self.vertices, weights=self.weights, minlength=self.vertex_count)
+
+    def to_dense(self):
+        """
+        Returns dense (vertex_count x influence_count) version of the weights
+        :return: np.array
+        """
+
+        dense = np.zeros((self.vertex_count, len(self.influence_names)), dtype=np.float64)
+        dense[self.vertices, self.influences] = self.weights
+
+        return dense
+
+    def to_influence_weights(self):
+        """
+        Returns a dictionary that maps each influence with its per vertex weights
+        :return: dict(str, np.array)
+        """
+
+        influence_weights = dict()
+        order = np.argsort(self.influences, kind='stable')
+        bounds = np.searchsorted(self.influences[order], np.arange(len(self.influence_names) + 1))
+        for i, influence_name in enumerate(self.influence_names):
+            influence_values = np.zeros(self.vertex_count, dtype=np.float64)
+            indices = order[bounds[i]:bounds[i + 1]]
+            influence_values[self.vertices[indices]] = self.weights[indices]
+            influence_weights[influence_name] = influence_values
+
+        return influence_weights
+
+    def filter(self, mask):
+        """
+        Returns a new matrix that only contains the entries of the given mask
+        :param mask: np.array(bool)
+        :return: SkinWeightsMatrix
+        """
+
+        # Gathering by index is several times faster than boolean indexing when the mask is not contiguous
+        indices = np.flatnonzero(mask)
+
+        return SkinWeightsMatrix(
+            self.vertices.take(indices), self.influences.take(indices), self.weights.take(indices),
+            self.influence_names, vertex_count=self.vertex_count)
+
+
+def _get_group_starts(sorted_vertices):
+    """
+    Internal function that returns the index where each vertex group starts in the given sorted vertices array
+    :param sorted_vertices: np.array
+    :return: np.array
+    """
+
+    return np.r_[0, np.flatnonzero(np.diff(sorted_vertices)) + 1]
+
+
+def prune_weights(matrix, threshold):
+    """
+    Removes all weights that are lower than the given threshold.
+    The biggest weight of each vertex is always kept to avoid leaving vertices without influences
+    :param matrix: SkinWeightsMatrix
+    :param threshold: float
+    :return: SkinWeightsMatrix
+    """
+
+    if not len(matrix) or threshold <= 0.0:
+        return matrix
+
+    keep = matrix.weights >= threshold
+
+    # Biggest weights only need to be found for the vertices whose weights are all under the threshold
+    kept_counts = np.bincount(matrix.vertices.take(np.flatnonzero(keep)), minlength=matrix.vertex_count)
+    empty_indices = np.flatnonzero(kept_counts.take(matrix.vertices) == 0)
+    if empty_indices.size:
+        empty_weights = matrix.weights.take(empty_indices)
+        group_start = _get_group_starts(matrix.vertices.take(empty_indices))
+        group_max = np.maximum.reduceat(empty_weights, group_start)
+        group_sizes = np.diff(np.r_[group_start, empty_indices.size])
+        keep[empty_indices[empty_weights == np.repeat(group_max, group_sizes)]] = True
+
+    return matrix.filter(keep)
+
+
+def limit_influences(matrix, max_influences):
+    """
+    Makes sure that no vertex is affected by more than the given number of influences, keeping the biggest ones
+    :param matrix: SkinWeightsMatrix
+    :param max_influences: int
+    :return: SkinWeightsMatrix
+    """
+
+    if not len(matrix) or not max_influences or max_influences <= 0:
+        return matrix
+
+    counts = matrix.influence_counts()
+    over_limit = counts[matrix.vertices] > max_influences
+    if not over_limit.any():
+        return matrix
+
+    # We only rank the entries of the vertices that exceed the limit, usually a tiny part of the mesh. Vertices are
+    # affected by few influences, so ranking by comparing each entry with its neighbours is faster than sorting
+    over_indices = np.flatnonzero(over_limit)
+    vertices = matrix.vertices.take(over_indices)
+    weights = matrix.weights.take(over_indices)
+    ranks = np.zeros(over_indices.size, dtype=np.int64)
+    for offset in range(1, int(counts.max())):
+        same_vertex = vertices[offset:] == vertices[:-offset]
+        previous_weights, next_weights = weights[:-offset], weights[offset:]
+        ranks[:-offset] += same_vertex & (next_weights > previous_weights)
+        ranks[offset:] += same_vertex & (previous_weights >= next_weights)
+
+    keep = np.ones(len(matrix), dtype=bool)
+    keep[over_indices[ranks >= max_influences]] = False
+
+    return matrix.filter(keep)
+
+
+def normalize_weights(matrix):
+    """
+    Normalizes weights so the weights of each vertex sum 1.0
+    :param matrix: SkinWeightsMatrix
+    :return: SkinWeightsMatrix
+    """
+
+    if not len(matrix):
+        return matrix
+
+    sums = matrix.vertex_sums()
+    vertex_sums = sums[matrix.vertices]
+    valid = vertex_sums > 0.0
+    weights = matrix.weights.copy()
+    weights[valid] /= vertex_sums[valid]
+
+    return SkinWeightsMatrix(
+        matrix.vertices, matrix.influences, weights, matrix.influence_names, vertex_count=matrix.vertex_count)
+
+
+def process_weights(matrix, prune_threshold=0.0, max_influences=None, normalize=True):
+    """
+    Runs the full weights processing stage: pruning, influences limit and normalization
+    :param matrix: SkinWeightsMatrix
+    :param prune_threshold: float, weights lower than this value are removed
+    :param max_influences: int or None, maximum number of influences per vertex
+    :param normalize: bool, whether or not weights should be normalized after processing
+    :return: tuple(SkinWeightsMatrix, dict), processed matrix and processing stats
+    """
+
+    counts_before = matrix.influence_counts()
+    entries_before = len(matrix)
+
+    pruned = prune_weights(matrix, prune_threshold)
+    pruned_count = entries_before - len(pruned)
+    limited = limit_influences(pruned, max_influences)
+    limited_count = len(pruned) - len(limited)
+    result = normalize_weights(limited) if normalize else limited
+
+    counts_after = result.influence_counts()
+    stats = {
+        'vertices': matrix.vertex_count,
+        'influences': len(matrix.influence_names),
+        'entries_before': entries_before,
+        'entries_after': len(result),
+        'pruned': pruned_count,
+        'limited': limited_count,
+        'vertices_changed': int(np.count_nonzero(counts_before != counts_after)),
+        'max_influences_before': int(counts_before.max()) if counts_before.size else 0,
+        'max_influences_after': int(counts_after.max()) if counts_after.size else 0,
+        'normalized': normalize
+    }
+
+    return result, stats
+
+
+# ==============================================================================================
+# FILES
+# ==============================================================================================
+
+def get_mesh_folders(weights_path):
+    """
+    Returns all mesh folders stored in the given skin weights data folder
+    :param weights_path: str
+    :return: list(str)
+    """
+
+    if not weights_path or not os.path.isdir(weights_path):
+        return list()
+
+    mesh_folders = list()
+    for folder_name in sorted(os.listdir(weights_path)):
+        folder_path = os.path.join(weights_path, folder_name)
+        if os.path.isfile(os.path.join(folder_path, INFLUENCE_INFO_FILE)):
+            mesh_folders.append(folder_path)
+
+    return mesh_folders
+
+
+def get_influence_files(mesh_folder):
+    """
+    Returns a dictionary that maps influence names with their weights file inside the given mesh folder
+    :param mesh_folder: str
+    :return: dict(str, str)
+    """
+
+    influence_files = dict()
+    for file_name in sorted(os.listdir(mesh_folder)):
+        if not file_name.endswith(WEIGHTS_EXTENSION):
+            continue
+        influence_files[file_name[:-len(WEIGHTS_EXTENSION)]] = os.path.join(mesh_folder, file_name)
+
+    return influence_files
+
+
+def parse_weights(weights_text):
+    """
+    Parses the contents of a weights file (a list of per vertex weights) into an array
+    :param weights_text: str
+    :return: np.array
+    """
+
+    weights_text = weights_text.strip().lstrip('[').rstrip(']')
+    if not weights_text:
+        return np.zeros(0, dtype=np.float64)
+
+    return np.array(weights_text.split(','), dtype=np.float64)
+
+
+def format_weights(weights):
+    """
+    Converts given per vertex weights into the text stored in weights files
+    :param weights: np.array or list(float)
+    :return: str
+    """
+
+    return '[{}]'.format(', '.join(repr(float(value)) for value in weights))
+
+
+def read_mesh_weights(mesh_folder):
+    """
+    Reads all influence weights stored in the given mesh folder
+    :param mesh_folder: str
+    :return: SkinWeightsMatrix
+    """
+
+    influence_weights = dict()
+    for influence_name, file_path in get_influence_files(mesh_folder).items():
+        with open(file_path, 'r') as fh:
+            influence_weights[influence_name] = parse_weights(fh.read())
+
+    return SkinWeightsMatrix.from_influence_weights(influence_weights)
+
+
+def write_mesh_weights(mesh_folder, matrix):
+    """
+    Writes given weights into the influence weights files of the given mesh folder.
+    Influences are never removed from disk, they are just zeroed, so influence info file remains valid
+    :param mesh_folder: str
+    :param matrix: SkinWeightsMatrix
+    """
+
+    for influence_name, influence_values in matrix.to_influence_weights().items():
+        file_path = os.path.join(mesh_folder, '{}{}'.format(influence_name, WEIGHTS_EXTENSION))
+        with open(file_path, 'w') as fh:
+            fh.write(format_weights(influence_values))
+
+
+def write_mesh_folder(mesh_folder, matrix, source_folder=None):
+    """
+    Writes a complete mesh folder with the given weights. Non weights files are copied from the source mesh folder
+    Vertex positions are only copied if they still match the number of vertices of the weights
+    :param mesh_folder: str
+    :param matrix: SkinWeightsMatrix
+    :param source_folder: str or None, mesh folder whose influence info is copied
+    """
+
+    if not os.path.isdir(mesh_folder):
+        os.makedirs(mesh_folder)
+    if source_folder and os.path.isdir(source_folder):
+        copy_mesh_info(source_folder, mesh_folder)
+        positions = read_vertex_positions(source_folder)
+        if positions is not None and len(positions) == matrix.vertex_count:
+            write_vertex_positions(mesh_folder, positions)
+    write_mesh_weights(mesh_folder, matrix)
+
+
+def read_vertex_positions(mesh_folder):
+    """
+    Reads the vertex positions stored with the weights of the given mesh folder
+    :param mesh_folder: str
+    :return: np.array or None, (N, 3) array of vertex positions or None if positions were not stored
+    """
+
+    file_path = os.path.join(mesh_folder, VERTEX_POSITIONS_FILE)
+    if not os.path.isfile(file_path):
+        return None
+
+    with open(file_path, 'rb') as fh:
+        return np.load(fh).reshape(-1, 3)
+
+
+def write_vertex_positions(mesh_folder, positions):
+    """
+    Stores given vertex positions with the weights of the given mesh folder
+    :param mesh_folder: str
+    :param positions: np.array or list(list(float, float, float))
+    """
+
+    file_path = os.path.join(mesh_folder, VERTEX_POSITIONS_FILE)
+    with open(file_path, 'wb') as fh:
+        np.save(fh, np.asarray(positions, dtype=np.float64).reshape(-1, 3))
+
+
+def copy_mesh_info(source_folder, target_folder):
+    """
+    Copies all the non weights files (influence info, etc) from one mesh folder into another one
+    :param source_folder: str
+    :param target_folder: str
+    """
+
+    for file_name in os.listdir(source_folder):
+        file_path = os.path.join(source_folder, file_name)
+        if file_name.endswith(WEIGHTS_EXTENSION) or file_name == VERTEX_POSITIONS_FILE or not os.path.isfile(file_path):
+            continue
+        shutil.copy2(file_path, os.path.join(target_folder, file_name))
+
+
+def get_mesh_folder_signature(mesh_folder):
+    """
+    Returns a signature of the files stored in the given mesh folder, built with their names, sizes and
+    modification times. Signature changes each time a file of the folder is modified
+    :param mesh_folder: str
+    :return: list(list(str, float, int))
+    """
+
+    signature = list()
+    for file_name in sorted(os.listdir(mesh_folder)):
+        file_path = os.path.join(mesh_folder, file_name)
+        if os.path.isfile(file_path):
+            signature.append([file_name, os.path.getmtime(file_path), os.path.getsize(file_path)])
+
+    return signature
+
+
+def get_mesh_weights_hash(mesh_folder, block_size=1 << 20):
+    """
+    Returns a content hash of all the files stored in the given mesh folder.
+    Hashes are cached using the size and modification time of the files, so files are only read when they change
+    :param mesh_folder: str
+    :param block_size: int, size of the blocks files are read with
+    :return: str
+    """
+
+    signature = get_mesh_folder_signature(mesh_folder)
+    file_paths = [os.path.join(mesh_folder, file_info[0]) for file_info in signature]
+    cached = _WEIGHTS_HASH_CACHE.get(mesh_folder, None)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    hasher = hashlib.sha1()
+    for file_path in file_paths:
+        hasher.update(os.path.basename(file_path).encode('utf-8'))
+        with open(file_path, 'rb') as fh:
+            for block in iter(lambda: fh.read(block_size), b''):
+                hasher.update(block)
+    weights_hash = hasher.hexdigest()
+    _WEIGHTS_HASH_CACHE[mesh_folder] = (signature, weights_hash)
+
+    return weights_hash
+
+
+def get_topology_fingerprint(vertex_count, influences):
+    """
+    Returns a fingerprint that identifies a skinned mesh topology: its vertex count and its influences
+    :param vertex_count: int
+    :param influences: list(str)
+    :return: str
+    """
+
+    text = '{}|{}'.format(int(vertex_count), ','.join(sorted(influences)))
+
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def compute_mesh_stats(mesh_folder):
+    """
+    Computes the stats of the weights stored in the given mesh folder.
+    Influence files are read one by one, so full weights matrix is never loaded in memory
+    :param mesh_folder: str
+    :return: dict
+    """
+
+    influence_counts = np.zeros(0, dtype=np.int32)
+    influence_sums = dict()
+    for influence_name, file_path in get_influence_files(mesh_folder).items():
+        with open(file_path, 'r') as fh:
+            influence_values = parse_weights(fh.read())
+        if influence_values.size > influence_counts.size:
+            influence_counts = np.pad(influence_counts, (0, influence_values.size - influence_counts.size), 'constant')
+        influence_counts[:influence_values.size] += influence_values > 0.0
+        influence_sums[influence_name] = float(influence_values.sum())
+
+    return {
+        'vertices': int(influence_counts.size),
+        'influences': len(influence_sums),
+        'influence_sums': influence_sums,
+        'max_influences': int(influence_counts.max()) if influence_counts.size else 0,
+        'influences_histogram': np.bincount(influence_counts).tolist()
+    }
+
+
+def get_weights_stats(weights_path, stats_path=None):
+    """
+    Returns the stats of all the meshes stored in the given skin weights data folder.
+    If a stats file path is given, stats are cached in it and only meshes whose files changed are computed again
+    :param weights_path: str
+    :param stats_path: str or None, sidecar file where stats are cached
+    :return: dict(str, dict), dictionary that maps each mesh with its stats
+    """
+
+    cached_stats = dict()
+    if stats_path and os.path.isfile(stats_path):
+        try:
+            with open(stats_path, 'r') as fh:
+                cached_stats = json.load(fh)
+        except ValueError:
+            cached_stats = dict()
+
+    all_stats = dict()
+    stats_changed = False
+    for mesh_folder in get_mesh_folders(weights_path):
+        mesh_name = os.path.basename(mesh_folder)
+        signature = get_mesh_folder_signature(mesh_folder)
+        mesh_cache = cached_stats.get(mesh_name, dict())
+        if mesh_cache.get('signature', None) != signature:
+            mesh_cache = {'signature': signature, 'stats': compute_mesh_stats(mesh_folder)}
+            stats_changed = True
+        all_stats[mesh_name] = mesh_cache
+    stats_changed = stats_changed or set(all_stats) != set(cached_stats)
+
+    if stats_path and stats_changed:
+        with open(stats_path, 'w') as fh:
+            json.dump(all_stats, fh)
+
+    return {mesh_name: mesh_cache['stats'] for mesh_name, mesh_cache in all_stats.items()}
+
+
+def process_weights_folder(weights_path, prune_threshold=0.0, max_influences=None, normalize=True):
+    """
+    Processes all the meshes weights stored in the given skin weights data folder
+    :param weights_path: str
+    :param prune_threshold: float
+    :param max_influences: int or None
+    :param normalize: bool
+    :return: dict(str, dict), dictionary that maps each mesh with its processing stats
+    """
+
+    all_stats = dict()
+    for mesh_folder in get_mesh_folders(weights_path):
+        matrix = read_mesh_weights(mesh_folder)
+        result, stats = process_weights(
+            matrix, prune_threshold=prune_threshold, max_influences=max_influences, normalize=normalize)
+        if stats['pruned'] or stats['limited'] or normalize:
+            write_mesh_weights(mesh_folder, result)
+        all_stats[os.path.basename(mesh_folder)] = stats
+
+    return all_stats
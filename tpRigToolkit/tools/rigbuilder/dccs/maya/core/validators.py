@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains validators of rig builder data files. Files are validated in parallel using a process pool
+Usage: python -m tpRigToolkit.tools.rigbuilder.dccs.maya.core.validators <data_directory> [--processes N] [--no-cache]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import re
+import sys
+import json
+import argparse
+import multiprocessing
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import catalog, asciiscene, fileutils
+
+CACHE_FILE_NAME = '.validation.json'
+SKIN_WEIGHTS_EXTENSION = '.skin'
+
+LEVEL_WARNING = 'warning'
+LEVEL_ERROR = 'error'
+
+_VALIDATORS = dict()
+_UNCACHEABLE_VALIDATORS = set()
+
+
+def register_validator(extension, validator_function, cacheable=True):
+    """
+    Registers a validator for the data files with the given extension
+    Validators are executed in worker processes, so they must be module level functions
+    :param extension: str, extension of the data files (for example, .ma)
+    :param validator_function: callable, function that receives a file path and returns a list of issues, where
+        each issue is a tuple(level, message)
+    :param cacheable: bool, False for validators whose result does not only depend on the validated file contents
+        (for example, validators that check other files exist). Those are executed even if the file did not change
+    """
+
+    validators = _VALIDATORS.setdefault(extension.lower(), list())
+    if validator_function not in validators:
+        validators.append(validator_function)
+    if not cacheable:
+        _UNCACHEABLE_VALIDATORS.add(_get_validator_name(validator_function))
+
+
+def get_validators(extension):
+    """
+    Returns all validators registered for the given extension
+    :param extension: str
+    :return: list(callable)
+    """
+
+    return list(_VALIDATORS.get(extension.lower(), list()))
+
+
+def iterate_validation(directory, processes=None, use_cache=True, validators=None):
+    """
+    Validates all data files of the given directory in a process pool. Results are returned as soon as each file
+    is validated. Results are cached by file hash, so files are only validated again if their contents changed
+    :param directory: str
+    :param processes: int or None, number of worker processes (None uses the number of CPUs)
+    :param use_cache: bool, whether to reuse the results of files that did not change since last validation
+    :param validators: dict(str, list(callable)) or None, validators to use for each extension (registered ones
+        are used if not given)
+    :return: generator(dict), result of each file: path, hash, issues and whether it was retrieved from cache
+    """
+
+    directory = os.path.normpath(os.path.abspath(directory))
+    validators = validators if validators is not None else _VALIDATORS
+    cache_path = os.path.join(directory, CACHE_FILE_NAME)
+    cache = _load_cache(cache_path) if use_cache else dict()
+
+    tasks = list()
+    new_cache = dict()
+    for relative_path, full_path in _find_data_files(directory, validators):
+        file_validators = validators[os.path.splitext(full_path)[-1].lower()]
+        validator_names = [_get_validator_name(validator) for validator in file_validators]
+        uncacheable_names = _UNCACHEABLE_VALIDATORS.intersection(validator_names)
+        cached = cache.get(relative_path, None)
+        if cached and cached.get('validators') != validator_names:
+            cached = None
+
+        # Files whose modification time and size did not change are not even hashed
+        mtime, size = catalog.get_path_mtime_and_size(full_path)
+        if cached and (cached['mtime'], cached['size']) == (mtime, size):
+            if not uncacheable_names:
+                new_cache[relative_path] = cached
+                yield _get_result(relative_path, cached, validator_names, True)
+                continue
+        tasks.append(
+            (relative_path, full_path, file_validators, validator_names, uncacheable_names, mtime, size, cached))
+
+    if tasks:
+        pool = multiprocessing.Pool(processes)
+        try:
+            for relative_path, entry, validator_names, from_cache in pool.imap_unordered(_validate_file, tasks):
+                new_cache[relative_path] = entry
+                yield _get_result(relative_path, entry, validator_names, from_cache)
+        finally:
+            pool.close()
+            pool.join()
+
+    if use_cache:
+        _save_cache(cache_path, new_cache)
+
+
+def validate(directory, processes=None, use_cache=True, validators=None):
+    """
+    Validates all data files of the given directory and returns all the results
+    :param directory: str
+    :param processes: int or None
+    :param use_cache: bool
+    :param validators: dict(str, list(callable)) or None
+    :return: list(dict), results sorted by path
+    """
+
+    results = iterate_validation(directory, processes=processes, use_cache=use_cache, validators=validators)
+
+    return sorted(results, key=lambda result: result['path'])
+
+
+# ==============================================================================================
+# VALIDATORS
+# ==============================================================================================
+
+def validate_maya_ascii_syntax(file_path):
+    """
+    Validates that all statements of the given Maya ASCII file are terminated
+    :param file_path: str
+    :return: list(tuple(str, str))
+    """
+
+    errors, command_counts = asciiscene.validate_syntax(file_path)
+    issues = [(LEVEL_ERROR, error) for error in errors]
+    if not errors and not command_counts:
+        issues.append((LEVEL_ERROR, 'File does not contain any statement'))
+
+    return issues
+
+
+def validate_maya_ascii_student_license(file_path):
+    """
+    Validates that the given Maya ASCII file was not saved with a student license
+    :param file_path: str
+    :return: list(tuple(str, str))
+    """
+
+    if catalog.get_maya_ascii_info(file_path).get('student', False):
+        return [(LEVEL_ERROR, 'File was saved with a student license')]
+
+    return list()
+
+
+def validate_maya_ascii_references(file_path):
+    """
+    Validates that all files referenced by the given Maya ASCII file exist
+    Relative paths are resolved from the file folder and environment variables are expanded.
+    References are declared in the header of the file, so parsing stops in the first node creation statement
+    :param file_path: str
+    :return: list(tuple(str, str))
+    """
+
+    reference_regex = re.compile(r'^file\s')
+    reference_flags = set(['-r', '-reference', '-rdi', '-referenceDepthInfo'])
+
+    issues = list()
+    with open(file_path, 'r') as fh:
+        for statement in asciiscene.iterate_statements(fh):
+            if statement.text.startswith('createNode'):
+                break
+            if not reference_regex.match(statement.text):
+                continue
+            tokens = statement.get_tokens()
+            if not reference_flags.intersection(tokens):
+                continue
+            reference_path = os.path.expandvars(tokens[-1].strip('"'))
+            if not os.path.isabs(reference_path):
+                reference_path = os.path.join(os.path.dirname(file_path), reference_path)
+            if not os.path.exists(reference_path):
+                issues.append((LEVEL_ERROR, 'Referenced file not found: {}'.format(tokens[-1].strip('"'))))
+
+    return issues
+
+
+def validate_skin_weights(weights_path, tolerance=1e-3):
+    """
+    Validates the consistency of the influences of all meshes stored in the given skin weights data folder:
+    all influences store the same number of vertices and weights of each vertex are valid and normalized
+    :param weights_path: str
+    :param tolerance: float
+    :return: list(tuple(str, str))
+    """
+
+    import numpy as np
+    from tpRigToolkit.tools.rigbuilder.dccs.maya.core import skinweights
+
+    mesh_folders = skinweights.get_mesh_folders(weights_path)
+    if not mesh_folders:
+        return [(LEVEL_ERROR, 'Skin weights data does not contain any mesh')]
+
+    issues = list()
+    for mesh_folder in mesh_folders:
+        mesh_name = os.path.basename(mesh_folder)
+        influence_files = skinweights.get_influence_files(mesh_folder)
+        if not influence_files:
+            issues.append((LEVEL_ERROR, '{}: no influence weights stored'.format(mesh_name)))
+            continue
+
+        vertex_count = None
+        vertex_sums = None
+        for influence_name, file_path in influence_files.items():
+            with open(file_path, 'r') as fh:
+                try:
+                    influence_weights = skinweights.parse_weights(fh.read())
+                except ValueError:
+                    issues.append((LEVEL_ERROR, '{}: invalid weights file of {}'.format(mesh_name, influence_name)))
+                    continue
+            if vertex_count is None:
+                vertex_count = influence_weights.size
+                vertex_sums = np.zeros(vertex_count, dtype=np.float64)
+            if influence_weights.size != vertex_count:
+                issues.append((LEVEL_ERROR, '{}: {} stores {} vertices, expected {}'.format(
+                    mesh_name, influence_name, influence_weights.size, vertex_count)))
+                continue
+            if not np.all(np.isfinite(influence_weights)) or np.any(influence_weights < 0.0):
+                issues.append((LEVEL_ERROR, '{}: {} has negative or invalid weights'.format(mesh_name, influence_name)))
+                continue
+            vertex_sums += influence_weights
+
+        if vertex_sums is not None:
+            not_normalized = int(np.count_nonzero(np.abs(vertex_sums - 1.0) > tolerance))
+            if not_normalized:
+                issues.append((LEVEL_WARNING, '{}: {} vertices are not normalized'.format(mesh_name, not_normalized)))
+
+        positions = skinweights.read_vertex_positions(mesh_folder)
+        if positions is not None and vertex_count is not None and len(positions) != vertex_count:
+            issues.append((LEVEL_ERROR, '{}: stored vertex positions ({}) do not match weights vertices ({})'.format(
+                mesh_name, len(positions), vertex_count)))
+
+    return issues
+
+
+# ==============================================================================================
+# INTERNAL
+# ==============================================================================================
+
+def _get_validator_name(validator_function):
+    """
+    Internal function that returns the unique name of the given validator
+    :param validator_function: callable
+    :return: str
+    """
+
+    return '{}.{}'.format(validator_function.__module__, validator_function.__name__)
+
+
+def _find_data_files(directory, validators):
+    """
+    Internal function that returns all data files of the given directory that have validators. Hidden files are skipped
+    :param directory: str
+    :param validators: dict(str, list(callable))
+    :return: list(tuple(str, str)), relative and full path of each data file
+    """
+
+    data_files = list()
+    for root, dir_names, file_names in os.walk(directory):
+        dir_names.sort()
+        for dir_name in list(dir_names):
+            if dir_name.startswith('.'):
+                dir_names.remove(dir_name)
+            elif os.path.splitext(dir_name)[-1].lower() in validators:
+                dir_names.remove(dir_name)
+                data_files.append(os.path.join(root, dir_name))
+        for file_name in sorted(file_names):
+            if file_name.startswith('.'):
+                continue
+            if os.path.splitext(file_name)[-1].lower() in validators:
+                data_files.append(os.path.join(root, file_name))
+
+    return [(os.path.relpath(full_path, directory).replace('\\', '/'), full_path) for full_path in data_files]
+
+
+def _validate_file(task):
+    """
+    Internal function that validates a data file. Executed in worker processes
+    :param task: tuple
+    :return: tuple(str, dict, list(str), bool), relative path, cache entry, validators names and whether the file
+        did not change since its last validation (so only uncacheable validators were executed)
+    """
+
+    relative_path, full_path, file_validators, validator_names, uncacheable_names, mtime, size, cached = task
+
+    if cached and (cached['mtime'], cached['size']) == (mtime, size):
+        file_hash = cached['hash']
+    else:
+        file_hash = catalog.get_path_hash(full_path)
+    cached_issues = cached['issues'] if cached and cached['hash'] == file_hash else dict()
+
+    issues = dict()
+    for validator, validator_name in zip(file_validators, validator_names):
+        if validator_name in cached_issues and validator_name not in uncacheable_names:
+            issues[validator_name] = cached_issues[validator_name]
+            continue
+        try:
+            validator_issues = validator(full_path) or list()
+        except Exception as exc:
+            validator_issues = [(LEVEL_ERROR, 'Validator {} failed: {}'.format(validator_name, exc))]
+        issues[validator_name] = [list(issue) for issue in validator_issues]
+
+    entry = {'hash': file_hash, 'mtime': mtime, 'size': size, 'validators': validator_names, 'issues': issues}
+
+    return relative_path, entry, validator_names, bool(cached_issues)
+
+
+def _get_result(relative_path, entry, validator_names, from_cache):
+    """
+    Internal function that converts given cache entry into a validation result
+    :param relative_path: str
+    :param entry: dict
+    :param validator_names: list(str), names of the validators, in execution order
+    :param from_cache: bool
+    :return: dict
+    """
+
+    issues = [tuple(issue) for validator_name in validator_names for issue in entry['issues'].get(validator_name, ())]
+
+    return {
+        'path': relative_path, 'hash': entry['hash'], 'issues': issues, 'cached': from_cache,
+        'valid': not any(level == LEVEL_ERROR for level, _ in issues)
+    }
+
+
+def _load_cache(cache_path):
+    """
+    Internal function that loads the validation results cache
+    :param cache_path: str
+    :return: dict
+    """
+
+    if not os.path.isfile(cache_path):
+        return dict()
+
+    try:
+        with open(cache_path, 'r') as fh:
+            return json.load(fh)
+    except ValueError:
+        return dict()
+
+
+def _save_cache(cache_path, cache):
+    """
+    Internal function that stores the validation results cache
+    :param cache_path: str
+    :param cache: dict
+    """
+
+    temp_path = '{}.tmp'.format(cache_path)
+    with open(temp_path, 'w') as fh:
+        json.dump(cache, fh)
+    fileutils.replace_path(temp_path, cache_path)
+
+
+register_validator('.ma', validate_maya_ascii_syntax)
+register_validator('.ma', validate_maya_ascii_student_license)
+register_validator('.ma', validate_maya_ascii_references, cacheable=False)
+register_validator(SKIN_WEIGHTS_EXTENSION, validate_skin_weights)
+
+
+def main(args=None):
+    """
+    Validates all data files of a rig builder data directory. Returns a non zero exit code if any file is not valid
+    :param args: list(str) or None
+    :return: int
+    """
+
+    parser = argparse.ArgumentParser(description='Validates rig builder data files')
+    parser.add_argument('directory', help='Data directory to validate')
+    parser.add_argument('--processes', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--no-cache', action='store_true', help='Validate all files, even the ones that did not change')
+    parsed_args = parser.parse_args(args)
+
+    file_count = invalid_count = 0
+    for result in iterate_validation(
+            parsed_args.directory, processes=parsed_args.processes, use_cache=not parsed_args.no_cache):
+        file_count += 1
+        invalid_count += 0 if result['valid'] else 1
+        print('{} {}{}'.format(
+            'OK  ' if result['valid'] else 'FAIL', result['path'], ' (cached)' if result['cached'] else ''))
+        for level, message in result['issues']:
+            print('    {}: {}'.format(level, message))
+        sys.stdout.flush()
+
+    print('{} files validated, {} not valid'.format(file_count, invalid_count))
+
+    return 1 if invalid_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,14 +8,22 @@ Module that contains data Maya ASCII widget
 from __future__ import print_function, division, absolute_import
 
 import os
+import uuid
+import shutil
+import tempfile
 
-import tpDcc as tp
 from tpDcc.libs.qt.widgets.library import utils
 
-from tpDcc.dccs.maya.core import helpers
-from tpDcc.dccs.maya.data import base as maya_base
-
+import tpRigToolkit
 from tpRigToolkit.tools.rigbuilder.core import data
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asyncsave, catalog, lazyimport
+
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+maya_base = lazyimport.lazy_module('tpDcc.dccs.maya.data.base')
+helpers = lazyimport.lazy_module('tpDcc.dccs.maya.core.helpers')
+asciiscene = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.asciiscene')
+chunkstore = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.chunkstore')
 
 
 class MayaAsciiPreviewWidget(data.DataPreviewWidget, object):
@@ -48,19 +56,22 @@ class MayaAsciiTransferObject(utils.TransferObject, object):
 
 class MayaAscii(data.DataItem, object):
 
-    Extension = '.{}'.format(maya_base.MayaAsciiFileData.get_data_extension())
-    Extensions = ['.{}'.format(maya_base.MayaAsciiFileData.get_data_extension())]
+    # Data class attributes are read the first time they are used, so importing this module does not load Maya
+    Extension = lazyimport.LazyAttribute(lambda: '.{}'.format(maya_base.MayaAsciiFileData.get_data_extension()))
+    Extensions = lazyimport.LazyAttribute(lambda: ['.{}'.format(maya_base.MayaAsciiFileData.get_data_extension())])
     MenuOrder = 2
-    MenuName = maya_base.MayaAsciiFileData.get_data_title()
+    MenuName = lazyimport.LazyAttribute(lambda: maya_base.MayaAsciiFileData.get_data_title())
     MenuIconPath = 'maya_ascii_data.png'
     TypeIconPath = 'maya_ascii_data.png'
-    DataType = maya_base.MayaAsciiFileData.get_data_type()
+    DataType = lazyimport.LazyAttribute(lambda: maya_base.MayaAsciiFileData.get_data_type())
     DefaultDataFileName = 'new_maya_ascii_file'
     PreviewWidgetClass = MayaAsciiPreviewWidget
 
     def __init__(self, *args, **kwargs):
         super(MayaAscii, self).__init__(*args, **kwargs)
 
+        self._save_job = None                   # Last background save job of the file
+
         self.set_transfer_class(MayaAsciiTransferObject)
         self.set_data_class(maya_base.MayaAsciiFileData)
 
@@ -71,7 +82,135 @@ class MayaAscii(data.DataItem, object):
         """
 
         student_icon = tp.ResourcesMgr().icon('student')
+        version_icon = tp.ResourcesMgr().icon('version')
+        compact_icon = tp.ResourcesMgr().icon('compress')
+        save_icon = tp.ResourcesMgr().icon('save')
+        menu.addAction(save_icon, 'Save (Background)', self._on_save_file_async)
         menu.addAction(student_icon, 'Clean Student License', self._on_clean_student_license)
+        menu.addAction(compact_icon, 'Compact File', self._on_compact_file)
+        menu.addSeparator()
+        menu.addAction(version_icon, 'Store File Version', self._on_store_file_version)
+
+    def save_file_async(self, compact=False):
+        """
+        Saves current scene into the Maya ASCII file of this item without blocking Maya until the data file is written.
+        Maya needs to export the scene in the main thread, so it is exported into a capture file in the local temporary
+        folder. Compaction and the copy into the data directory (usually a network share) are done by the background
+        save queue. Capture file is removed once the save finishes, even if it is superseded by a newer save
+        :param compact: bool, whether to compact the file before replacing the data file
+        :return: SaveJob
+        """
+
+        file_path = os.path.join(self.path(), self.name())
+        capture_path = os.path.join(tempfile.gettempdir(), '{}.{}.capture.ma'.format(
+            os.path.splitext(self.name())[0], uuid.uuid4().hex))
+        maya.cmds.file(
+            capture_path, exportAll=True, preserveReferences=True, type='mayaAscii', force=True)
+
+        self._save_job = asyncsave.get_save_queue().submit(
+            file_path, _write_maya_ascii_capture, args=(capture_path, compact), callback=self._on_file_saved,
+            cleanup_paths=[capture_path])
+
+        return self._save_job
+
+    def save_status(self):
+        """
+        Returns the status of the last background save of this item
+        :return: str or None
+        """
+
+        return self._save_job.status if self._save_job else None
+
+    def flush_saves(self, timeout=None):
+        """
+        Waits until the background save of this item is written to disk
+        :param timeout: float or None
+        :return: bool, True if save finished; False if timeout was reached
+        """
+
+        return self._save_job.wait(timeout) if self._save_job else True
+
+    def compact_file(self):
+        """
+        Compacts Maya ASCII file removing redundant statements, so Maya loads it faster
+        File is only replaced if the compacted file passes syntax validation
+        :return: dict, compaction stats
+        """
+
+        file_path = os.path.join(self.path(), self.name())
+        if not os.path.isfile(file_path):
+            return None
+
+        stats = asciiscene.compact_maya_ascii(file_path)
+        if not stats['valid']:
+            tpRigToolkit.logger.warning('Maya ASCII file {} was not compacted: {}'.format(
+                self.name(), '; '.join(stats['errors'])))
+            return stats
+
+        tpRigToolkit.logger.info(
+            'Compacted {}: {} bytes removed ({} -> {}), {} statements removed ({} -> {})'.format(
+                self.name(), stats['bytes_before'] - stats['bytes_after'], stats['bytes_before'],
+                stats['bytes_after'], stats['statements_before'] - stats['statements_after'],
+                stats['statements_before'], stats['statements_after']))
+
+        return stats
+
+    def store_file_version(self):
+        """
+        Stores current Maya ASCII file as a new version in the deduplicated store of its data directory
+        :return: dict, recipe of the new version
+        """
+
+        file_path = os.path.join(self.path(), self.name())
+        if not os.path.isfile(file_path):
+            return None
+
+        recipe = chunkstore.store_data_version(file_path)
+        tpRigToolkit.logger.info('Stored version {} of {} ({} bytes, {} new bytes)'.format(
+            recipe['key'], self.name(), recipe['size'], recipe['new_size']))
+
+        return recipe
+
+    def restore_file_version(self, version=None):
+        """
+        Restores Maya ASCII file to the given version stored in the deduplicated store of its data directory
+        :param version: int or None, if not given, last stored version is restored
+        :return: str or None, restored file path
+        """
+
+        return chunkstore.restore_data_version(os.path.join(self.path(), self.name()), version=version)
+
+    def _on_file_saved(self, job):
+        """
+        Internal callback function that is called by the save queue when the Maya ASCII file is saved
+        :param job: SaveJob
+        """
+
+        if job.status == job.STATUS_DONE:
+            tpRigToolkit.logger.info('Saved {} in background ({:.2f}s)'.format(self.name(), job.write_time))
+        elif job.status == job.STATUS_FAILED:
+            tpRigToolkit.logger.error('Error while saving {}: {}'.format(self.name(), job.error))
+
+    def _on_save_file_async(self):
+        """
+        Internal callback function that is triggered when user presses Save (Background) action
+        """
+
+        return self.save_file_async()
+
+    def _on_compact_file(self):
+        """
+        Internal callback function that is triggered when user presses Compact File action
+        """
+
+        return self.compact_file()
+
+    def _on_store_file_version(self):
+        """
+        Internal callback function that is triggered when user presses Store File Version action
+        """
+
+        return self.store_file_version()
 
     def _on_clean_student_license(self):
         """
@@ -95,8 +234,40 @@ class MayaAscii(data.DataItem, object):
         :return: list(dict)
         """
 
+        # Info is cached in the data catalog, so it is only built again when the file changes
+        file_path = os.path.join(self.path(), self.name())
+        data_catalog = catalog.get_data_catalog(self.path())
+        file_info = data_catalog.get_info(file_path) or dict()
+        if 'item_info' in file_info:
+            return file_info['item_info']
+
         info_list = super(MayaAscii, self).info() or list()
 
         info_list = [{k: v for k, v in d.items() if v != 'contains'} for d in info_list]
 
+        if file_info:
+            info_list.append({'name': 'plugins', 'value': ', '.join(sorted(file_info.get('requires', dict())))})
+            info_list.append({'name': 'student', 'value': file_info.get('student', False)})
+            file_info['item_info'] = info_list
+            data_catalog.set_info(file_path, file_info)
+
         return info_list
+
+
+def _write_maya_ascii_capture(temp_path, capture_path, compact):
+    """
+    Internal function that writes the given scene capture into the given temporary path of the data file. Executed by
+    the save queue
+    :param temp_path: str
+    :param capture_path: str
+    :param compact: bool
+    :return: dict or None, compaction stats
+    """
+
+    stats = None
+    if compact:
+        stats = asciiscene.compact_maya_ascii(capture_path, output_path=temp_path)
+    if not stats or not stats['valid']:
+        shutil.copyfile(capture_path, temp_path)
+
+    return stats
@@ -7,29 +7,736 @@ Module that contains data Maya Skin Cluster weights widget
 
 from __future__ import print_function, division, absolute_import
 
-import tpDcc as tp
-from tpDcc.dccs.maya.data import skin as maya_skin
+import os
+import time
+import shutil
+import tempfile
+from functools import partial
 
+import tpRigToolkit
 from tpRigToolkit.tools.rigbuilder.core import data
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import asyncsave, catalog, lazyimport
+
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+maya_skin = lazyimport.lazy_module('tpDcc.dccs.maya.data.skin')
+QtWidgets = lazyimport.lazy_module('Qt.QtWidgets')
+skinstatsworker = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.data.skinstatsworker')
+skinweights = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.skinweights')
+skinremap = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.skinremap')
+skinversions = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.skinversions')
+chunkstore = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.chunkstore')
+
+
+def _stop_worker(worker, *args):
+    """
+    Internal function that stops the given worker thread and waits until it finishes
+    :param worker: QThread or None
+    """
+
+    if worker is None:
+        return
+
+    try:
+        if worker.isRunning():
+            worker.quit()
+            worker.wait()
+    except RuntimeError:
+        # Worker was already deleted
+        pass
 
 
 class MayaSkinClusterWeightsPreivewWidget(data.DataPreviewWidget, object):
     def __init__(self, item, parent=None):
+        self._stats_worker = None
+
         super(MayaSkinClusterWeightsPreivewWidget, self).__init__(item=item, parent=parent)
 
+    def ui(self):
+        super(MayaSkinClusterWeightsPreivewWidget, self).ui()
+
+        self._stats_lbl = QtWidgets.QLabel('Computing weights stats ...')
+        self._stats_lbl.setWordWrap(True)
+        self._process_stats_lbl = QtWidgets.QLabel()
+        self._process_stats_lbl.setWordWrap(True)
+        self._process_stats_lbl.setVisible(False)
+        self.main_layout.addWidget(self._stats_lbl)
+        self.main_layout.addWidget(self._process_stats_lbl)
+
+        self.update_stats()
+        self.update_process_stats()
+        self.item().add_process_callback(self.update_process_stats)
+
+    def closeEvent(self, event):
+        """
+        Overrides base closeEvent function to stop listening to the weights processing of the item
+        :param event: QCloseEvent
+        """
+
+        self.item().remove_process_callback(self.update_process_stats)
+        _stop_worker(self._stats_worker)
+
+        super(MayaSkinClusterWeightsPreivewWidget, self).closeEvent(event)
+
+    def update_stats(self):
+        """
+        Launches the computation of the item weights stats in a background thread
+        """
+
+        if self._stats_worker and self._stats_worker.isRunning():
+            return
+
+        weights_path, stats_path = self.item().weights_path(), self.item().stats_path()
+        self._stats_worker = skinstatsworker.SkinWeightsStatsWorker(weights_path, stats_path, parent=self)
+        self._stats_worker.statsComputed.connect(self._on_stats_computed)
+        self._stats_worker.statsFailed.connect(self._on_stats_failed)
+        # Worker is a child of the widget, so it must be finished before the widget deletes it
+        self.destroyed.connect(partial(_stop_worker, self._stats_worker))
+        self._stats_worker.start()
+
+    def update_process_stats(self):
+        """
+        Updates the label that shows the stats of the last weights processing of the item
+        """
+
+        process_stats = self.item().process_stats()
+        if not process_stats:
+            self._process_stats_lbl.setVisible(False)
+            return
+
+        lines = list()
+        for mesh_name, stats in sorted(process_stats.items()):
+            lines.append(
+                '{}: {} pruned, {} over max influences removed, max influences {} -> {}, '
+                '{}/{} vertices changed'.format(
+                    mesh_name, stats['pruned'], stats['limited'], stats['max_influences_before'],
+                    stats['max_influences_after'], stats['vertices_changed'], stats['vertices']))
+        self._process_stats_lbl.setText('\n'.join(lines))
+        self._process_stats_lbl.setVisible(True)
+
+    def _on_stats_computed(self, weights_stats):
+        """
+        Internal callback function that is called when weights stats are computed by the background worker
+        :param weights_stats: dict(str, dict)
+        """
+
+        if not weights_stats:
+            self._stats_lbl.setText('No weights found')
+            return
+
+        lines = list()
+        for mesh_name, stats in sorted(weights_stats.items()):
+            histogram = ', '.join(
+                '{}: {}'.format(i, count) for i, count in enumerate(stats['influences_histogram']) if count)
+            top_influences = sorted(stats['influence_sums'].items(), key=lambda item: item[1], reverse=True)[:5]
+            lines.append('{}: {} vertices, {} influences, max {} influences per vertex'.format(
+                mesh_name, stats['vertices'], stats['influences'], stats['max_influences']))
+            lines.append('    Influences per vertex: {}'.format(histogram))
+            lines.append('    Top influences: {}'.format(
+                ', '.join('{} ({:.1f})'.format(name, value) for name, value in top_influences)))
+        self._stats_lbl.setText('\n'.join(lines))
+
+    def _on_stats_failed(self, error):
+        """
+        Internal callback function that is called when weights stats computation fails
+        :param error: str
+        """
+
+        self._stats_lbl.setText('Impossible to compute weights stats: {}'.format(error))
+
 
 class MayaSkinClusterWeights(data.DataItem, object):
 
-    Extension = '.{}'.format(maya_skin.SkinWeightsData.get_data_extension())
-    Extensions = ['.{}'.format(maya_skin.SkinWeightsData.get_data_extension())]
-    MenuName = maya_skin.SkinWeightsData.get_data_title()
+    IMPORT_MODE_INDEX = 0
+    IMPORT_MODE_POSITION = 1
+
+    WEIGHTS_HASH_ATTRIBUTE = 'rigBuilderWeightsHash'
+    TOPOLOGY_HASH_ATTRIBUTE = 'rigBuilderTopologyHash'
+    IMPORT_TIME_ATTRIBUTE = 'rigBuilderImportTime'
+
+    # Data class attributes are read the first time they are used, so importing this module does not load Maya
+    Extension = lazyimport.LazyAttribute(lambda: '.{}'.format(maya_skin.SkinWeightsData.get_data_extension()))
+    Extensions = lazyimport.LazyAttribute(lambda: ['.{}'.format(maya_skin.SkinWeightsData.get_data_extension())])
+    MenuName = lazyimport.LazyAttribute(lambda: maya_skin.SkinWeightsData.get_data_title())
     MenuOrder = 4
     MenuIconPath = 'skin_weights_data.png'
     TypeIconPath = 'skin_weights_data.png'
-    DataType = maya_skin.SkinWeightsData.get_data_type()
+    DataType = lazyimport.LazyAttribute(lambda: maya_skin.SkinWeightsData.get_data_type())
     PreviewWidgetClass = MayaSkinClusterWeightsPreivewWidget
 
     def __init__(self, *args, **kwargs):
         super(MayaSkinClusterWeights, self).__init__(*args, **kwargs)
 
+        self._prune_threshold = 0.001           # Weights lower than this value are removed during processing
+        self._max_influences = 4                # Maximum number of influences per vertex after processing
+        self._normalize = True                  # Whether or not weights are normalized after processing
+        self._process_stats = dict()            # Stats of the last weights processing, per mesh
+        self._process_callbacks = list()        # Functions called each time weights are processed
+        self._import_mode = self.IMPORT_MODE_INDEX          # Whether weights are imported by vertex index or position
+        self._remap_mode = skinremap.REMAP_MODE_INTERPOLATE  # Remap mode used when importing by vertex position
+        self._save_jobs = dict()                # Background save job of each mesh
+        self._version_on_save = True            # Whether a weights version is stored after each background save
+
         self.set_data_class(maya_skin.SkinWeightsData)
+
+    def context_menu(self, menu):
+        """
+        Overrides base data.DataItem context_menu function
+        :return:
+        """
+
+        clean_icon = tp.ResourcesMgr().icon('clean')
+        position_icon = tp.ResourcesMgr().icon('position')
+        import_icon = tp.ResourcesMgr().icon('import')
+        export_icon = tp.ResourcesMgr().icon('export')
+        version_icon = tp.ResourcesMgr().icon('version')
+        menu.addAction(clean_icon, 'Process Weights', self._on_process_weights)
+        menu.addAction(position_icon, 'Store Vertex Positions', self._on_store_vertex_positions)
+        menu.addAction(import_icon, 'Import Weights (By Position)', self._on_import_weights_by_position)
+        menu.addAction(export_icon, 'Export Weights (Background)', self._on_export_weights_async)
+        menu.addSeparator()
+        menu.addAction(version_icon, 'Save Version', self._on_save_version)
+
+    def info(self):
+        """
+        Returns the info to display to the user
+        :return: list(dict)
+        """
+
+        # Info is cached in the data catalog, so it is only built again when the weights change
+        weights_path = self.weights_path()
+        data_catalog = catalog.get_data_catalog(self.path())
+        weights_info = data_catalog.get_info(weights_path) or dict()
+        if 'item_info' in weights_info:
+            return weights_info['item_info']
+
+        info_list = super(MayaSkinClusterWeights, self).info() or list()
+
+        if weights_info:
+            info_list.append({'name': 'meshes', 'value': ', '.join(sorted(weights_info.get('meshes', dict())))})
+            weights_info['item_info'] = info_list
+            data_catalog.set_info(weights_path, weights_info)
+
+        return info_list
+
+    def import_data(self, *args, **kwargs):
+        """
+        Overrides base data.DataItem import_data function
+        This is the import entry point used by the data library and by rig builds, so weights are imported through
+        import_weights and meshes whose weights file and topology did not change are skipped
+        :return: bool
+        """
+
+        return self.import_weights(force=kwargs.get('force', False), import_mode=kwargs.get('import_mode', None))
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def set_prune_threshold(self, value):
+        """
+        Sets the threshold used to prune weights during processing
+        :param value: float
+        """
+
+        self._prune_threshold = value
+
+    def set_max_influences(self, value):
+        """
+        Sets the maximum number of influences per vertex enforced during processing
+        :param value: int or None
+        """
+
+        self._max_influences = value
+
+    def set_normalize(self, flag):
+        """
+        Sets whether or not weights are normalized during processing
+        :param flag: bool
+        """
+
+        self._normalize = flag
+
+    def set_import_mode(self, import_mode):
+        """
+        Sets how weights are matched with mesh vertices during import
+        :param import_mode: int (IMPORT_MODE_INDEX = 0; IMPORT_MODE_POSITION = 1)
+        """
+
+        self._import_mode = import_mode
+
+    def set_remap_mode(self, remap_mode):
+        """
+        Sets how weights are remapped when importing them by vertex position
+        :param remap_mode: int (skinremap.REMAP_MODE_NEAREST = 0; skinremap.REMAP_MODE_INTERPOLATE = 1)
+        """
+
+        self._remap_mode = remap_mode
+
+    def set_version_on_save(self, flag):
+        """
+        Sets whether or not a weights version is stored each time the weights of a mesh are saved in background
+        :param flag: bool
+        """
+
+        self._version_on_save = flag
+
+    def weights_path(self):
+        """
+        Returns the path of the folder where the weights of this item are stored
+        :return: str
+        """
+
+        return os.path.join(self.path(), self.name())
+
+    def stats_path(self):
+        """
+        Returns the path of the sidecar file where the weights stats of this item are cached
+        :return: str
+        """
+
+        return os.path.join(self.path(), '.{}.stats'.format(self.name()))
+
+    def process_stats(self):
+        """
+        Returns the stats of the last weights processing
+        :return: dict(str, dict)
+        """
+
+        return self._process_stats
+
+    def add_process_callback(self, callback):
+        """
+        Adds a function that is called each time the weights of this item are processed
+        :param callback: fn
+        """
+
+        if callback not in self._process_callbacks:
+            self._process_callbacks.append(callback)
+
+    def remove_process_callback(self, callback):
+        """
+        Removes a function added with add_process_callback
+        :param callback: fn
+        """
+
+        if callback in self._process_callbacks:
+            self._process_callbacks.remove(callback)
+
+    def process_weights(self):
+        """
+        Prunes, limits max influences and normalizes the weights stored in the data file of this item
+        :return: dict(str, dict), dictionary that maps each mesh with its processing stats
+        """
+
+        weights_path = self.weights_path()
+        if not os.path.isdir(weights_path):
+            return dict()
+
+        self._process_stats = skinweights.process_weights_folder(
+            weights_path, prune_threshold=self._prune_threshold, max_influences=self._max_influences,
+            normalize=self._normalize)
+        for mesh_name, stats in self._process_stats.items():
+            tpRigToolkit.logger.info(
+                'Processed skin weights of {}: {} entries pruned, {} entries over max influences removed'.format(
+                    mesh_name, stats['pruned'], stats['limited']))
+        for callback in list(self._process_callbacks):
+            callback()
+
+        return self._process_stats
+
+    def store_vertex_positions(self):
+        """
+        Stores the world space vertex positions of the skinned meshes with their weights, so weights can be
+        remapped later into meshes with a different topology
+        :return: list(str), list of meshes whose vertex positions have been stored
+        """
+
+        weights_path = self.weights_path()
+
+        stored_meshes = list()
+        for mesh_folder in skinweights.get_mesh_folders(weights_path):
+            mesh_name = os.path.basename(mesh_folder)
+            mesh_positions = self._get_mesh_positions(mesh_name)
+            if mesh_positions is None:
+                tpRigToolkit.logger.warning('Impossible to store vertex positions of "{}"'.format(mesh_name))
+                continue
+            skinweights.write_vertex_positions(mesh_folder, mesh_positions)
+            stored_meshes.append(mesh_name)
+
+        return stored_meshes
+
+    def import_weights(self, force=False, import_mode=None):
+        """
+        Imports the weights of this item taking into account current import mode.
+        Meshes whose weights file and topology did not change since their last import are skipped
+        :param force: bool, whether to import the weights of all meshes, even the ones that did not change
+        :param import_mode: int or None, import mode used instead of the current import mode of the item
+        :return: bool
+        """
+
+        import_mode = self._import_mode if import_mode is None else import_mode
+        weights_path = self.weights_path()
+        if not os.path.isdir(weights_path):
+            return False
+
+        mesh_folders = list()
+        skipped_meshes = list()
+        time_saved = 0.0
+        for mesh_folder in skinweights.get_mesh_folders(weights_path):
+            import_time = None if force else self._get_up_to_date_import_time(mesh_folder)
+            if import_time is None:
+                mesh_folders.append(mesh_folder)
+            else:
+                skipped_meshes.append(os.path.basename(mesh_folder))
+                time_saved += import_time
+
+        if skipped_meshes:
+            tpRigToolkit.logger.info(
+                'Skipped {} of {} skin weights imports, weights and topology did not change ({:.2f}s saved)'.format(
+                    len(skipped_meshes), len(skipped_meshes) + len(mesh_folders), time_saved))
+        if not mesh_folders:
+            return True
+
+        temp_path = tempfile.mkdtemp()
+        try:
+            import_path = os.path.join(temp_path, self.name())
+            if import_mode == self.IMPORT_MODE_POSITION:
+                target_positions = dict()
+                for mesh_folder in mesh_folders:
+                    mesh_name = os.path.basename(mesh_folder)
+                    mesh_positions = self._get_mesh_positions(mesh_name)
+                    if mesh_positions is not None:
+                        target_positions[mesh_name] = mesh_positions
+                imported_meshes = skinremap.remap_weights_folder(
+                    weights_path, target_positions, import_path, mode=self._remap_mode)
+                if not imported_meshes:
+                    tpRigToolkit.logger.warning(
+                        'No weights remapped. Make sure vertex positions were stored with the weights!')
+                    return False
+            elif skipped_meshes:
+                imported_meshes = list()
+                for mesh_folder in mesh_folders:
+                    mesh_name = os.path.basename(mesh_folder)
+                    shutil.copytree(mesh_folder, os.path.join(import_path, mesh_name))
+                    imported_meshes.append(mesh_name)
+            else:
+                imported_meshes = [os.path.basename(mesh_folder) for mesh_folder in mesh_folders]
+                import_path = weights_path
+
+            start_time = time.time()
+            self.data_class()(name=self.name(), path=os.path.dirname(import_path)).import_data(import_path)
+            import_time = (time.time() - start_time) / len(imported_meshes)
+        finally:
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+        for mesh_name in imported_meshes:
+            self._store_import_hashes(os.path.join(weights_path, mesh_name), import_time)
+
+        return True
+
+    def save_weights_version(self, comment='', mesh_names=None):
+        """
+        Stores current weights of this item as a new version. Only the vertices that changed since the last base
+        snapshot of each mesh are stored
+        :param comment: str
+        :param mesh_names: list(str) or None, meshes to store. If not given, all stored meshes are stored
+        :return: dict(str, dict), dictionary that maps each mesh with the info of its new version
+        """
+
+        weights_path = self.weights_path()
+
+        versions_info = dict()
+        for mesh_folder in skinweights.get_mesh_folders(weights_path):
+            mesh_name = os.path.basename(mesh_folder)
+            if mesh_names and mesh_name not in mesh_names:
+                continue
+            mesh_versions = skinversions.SkinWeightsVersions(self._get_versions_path(mesh_name))
+            version_info = mesh_versions.save_version(skinweights.read_mesh_weights(mesh_folder), comment=comment)
+            tpRigToolkit.logger.info(
+                'Saved skin weights version {} of {} ({}, {} changed vertices, {} bytes)'.format(
+                    version_info['version'], mesh_name, version_info['type'], version_info['changed'],
+                    version_info['size']))
+            versions_info[mesh_name] = version_info
+
+        return versions_info
+
+    def export_weights_async(self, mesh_names=None):
+        """
+        Exports the current scene weights of the meshes stored in this item without blocking Maya.
+        Only weights query happens in the main thread; formatting and writing of the weights files is done by the
+        background save queue, that replaces each mesh folder atomically once it is completely written.
+        Meshes whose influences changed need a full export, because their influence info must be regenerated
+        :param mesh_names: list(str) or None, meshes to export. If not given, all stored meshes are exported
+        :return: dict(str, SaveJob), dictionary that maps each mesh with its save job
+        """
+
+        save_queue = asyncsave.get_save_queue()
+
+        jobs = dict()
+        for mesh_folder in skinweights.get_mesh_folders(self.weights_path()):
+            mesh_name = os.path.basename(mesh_folder)
+            if mesh_names and mesh_name not in mesh_names:
+                continue
+            matrix = self._get_scene_weights(mesh_name)
+            if matrix is None:
+                tpRigToolkit.logger.warning('Impossible to export skin weights of "{}"'.format(mesh_name))
+                continue
+            stored_influences = set(skinweights.get_influence_files(mesh_folder).keys())
+            if set(matrix.influence_names) != stored_influences:
+                tpRigToolkit.logger.warning(
+                    'Influences of "{}" changed, export skin weights data again to update them'.format(mesh_name))
+                continue
+            jobs[mesh_name] = save_queue.submit(
+                mesh_folder, skinweights.write_mesh_folder, args=(matrix, mesh_folder), callback=self._on_weights_saved)
+        self._save_jobs.update(jobs)
+
+        return jobs
+
+    def save_status(self):
+        """
+        Returns the status of the last background save of each mesh
+        :return: dict(str, str)
+        """
+
+        return {mesh_name: job.status for mesh_name, job in self._save_jobs.items()}
+
+    def flush_saves(self, timeout=None):
+        """
+        Waits until all background saves of this item are written to disk
+        :param timeout: float or None
+        :return: bool, True if all saves finished; False if timeout was reached
+        """
+
+        for job in list(self._save_jobs.values()):
+            if not job.wait(timeout):
+                return False
+
+        return True
+
+    def load_weights_version(self, version=None):
+        """
+        Restores the weights stored in the data file of this item to the given version
+        :param version: int or None, if not given, last stored version is restored
+        :return: list(str), list of restored meshes
+        """
+
+        weights_path = self.weights_path()
+
+        restored_meshes = list()
+        for mesh_folder in skinweights.get_mesh_folders(weights_path):
+            mesh_name = os.path.basename(mesh_folder)
+            matrix = skinversions.SkinWeightsVersions(self._get_versions_path(mesh_name)).load_version(version)
+            if matrix is None:
+                continue
+            skinweights.write_mesh_weights(mesh_folder, matrix)
+            restored_meshes.append(mesh_name)
+
+        return restored_meshes
+
+    def store_file_version(self):
+        """
+        Stores all the files of this item as a new version in the deduplicated store of its data directory.
+        Unlike weights versions, this stores the data files as they are (including info and vertex positions files)
+        :return: dict, recipe of the new version
+        """
+
+        weights_path = self.weights_path()
+        if not os.path.isdir(weights_path):
+            return None
+
+        recipe = chunkstore.store_data_version(weights_path)
+        tpRigToolkit.logger.info('Stored version {} of {} ({} bytes, {} new bytes)'.format(
+            recipe['key'], self.name(), recipe['size'], recipe['new_size']))
+
+        return recipe
+
+    def restore_file_version(self, version=None):
+        """
+        Restores the files of this item to the given version stored in the deduplicated store of its data directory
+        :param version: int or None, if not given, last stored version is restored
+        :return: str or None, restored data folder
+        """
+
+        return chunkstore.restore_data_version(self.weights_path(), version=version)
+
+    def save_version(self, comment=''):
+        """
+        Stores current weights of this item as a new weights version and all its files as a new file version
+        :param comment: str
+        :return: tuple(dict(str, dict), dict), info of the new weights versions and recipe of the new file version
+        """
+
+        return self.save_weights_version(comment=comment), self.store_file_version()
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _get_versions_path(self, mesh_name):
+        """
+        Internal function that returns the folder where weights versions of the given mesh are stored
+        :param mesh_name: str
+        :return: str
+        """
+
+        return os.path.join(self.path(), '.{}.versions'.format(self.name()), mesh_name)
+
+    def _get_mesh_positions(self, mesh_name):
+        """
+        Internal function that returns the world space vertex positions of the given mesh in current scene
+        :param mesh_name: str
+        :return: list(float) or None
+        """
+
+        if not tp.Dcc.object_exists(mesh_name):
+            return None
+
+        return maya.cmds.xform('{}.vtx[*]'.format(mesh_name), query=True, worldSpace=True, translation=True)
+
+    def _get_scene_weights(self, mesh_name):
+        """
+        Internal function that queries the weights of the given skinned mesh in current scene
+        :param mesh_name: str
+        :return: SkinWeightsMatrix or None
+        """
+
+        skin_cluster = self._get_skin_cluster(mesh_name)
+        if not skin_cluster:
+            return None
+
+        influence_weights = dict()
+        vertices = '{}.vtx[*]'.format(mesh_name)
+        for influence in maya.cmds.skinCluster(skin_cluster, query=True, influence=True) or list():
+            influence_weights[influence] = maya.cmds.skinPercent(
+                skin_cluster, vertices, transform=influence, query=True, value=True)
+
+        return skinweights.SkinWeightsMatrix.from_influence_weights(influence_weights)
+
+    def _get_skin_cluster(self, mesh_name):
+        """
+        Internal function that returns the skin cluster that deforms the given mesh in current scene
+        :param mesh_name: str
+        :return: str or None
+        """
+
+        if not tp.Dcc.object_exists(mesh_name):
+            return None
+
+        return maya.mel.eval('findRelatedSkinCluster "{}"'.format(mesh_name)) or None
+
+    def _get_topology_fingerprint(self, mesh_name, skin_cluster):
+        """
+        Internal function that returns the topology fingerprint of the given skinned mesh in current scene
+        :param mesh_name: str
+        :param skin_cluster: str
+        :return: str
+        """
+
+        vertex_count = maya.cmds.polyEvaluate(mesh_name, vertex=True)
+        influences = maya.cmds.skinCluster(skin_cluster, query=True, influence=True) or list()
+
+        return skinweights.get_topology_fingerprint(vertex_count, influences)
+
+    def _get_up_to_date_import_time(self, mesh_folder):
+        """
+        Internal function that checks whether the weights stored in the given mesh folder are already applied
+        :param mesh_folder: str
+        :return: float or None, time the last import took if weights are up to date; None otherwise
+        """
+
+        mesh_name = os.path.basename(mesh_folder)
+        skin_cluster = self._get_skin_cluster(mesh_name)
+        if not skin_cluster:
+            return None
+        for attribute_name in [self.WEIGHTS_HASH_ATTRIBUTE, self.TOPOLOGY_HASH_ATTRIBUTE, self.IMPORT_TIME_ATTRIBUTE]:
+            if not tp.Dcc.attribute_exists(skin_cluster, attribute_name):
+                return None
+
+        weights_hash = tp.Dcc.get_attribute_value(skin_cluster, self.WEIGHTS_HASH_ATTRIBUTE)
+        topology_hash = tp.Dcc.get_attribute_value(skin_cluster, self.TOPOLOGY_HASH_ATTRIBUTE)
+        if weights_hash != skinweights.get_mesh_weights_hash(mesh_folder):
+            return None
+        if topology_hash != self._get_topology_fingerprint(mesh_name, skin_cluster):
+            return None
+
+        try:
+            return float(tp.Dcc.get_attribute_value(skin_cluster, self.IMPORT_TIME_ATTRIBUTE))
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _store_import_hashes(self, mesh_folder, import_time):
+        """
+        Internal function that stores in the skin cluster of the given mesh the hashes of the imported weights
+        :param mesh_folder: str
+        :param import_time: float, time the import took
+        """
+
+        mesh_name = os.path.basename(mesh_folder)
+        skin_cluster = self._get_skin_cluster(mesh_name)
+        if not skin_cluster:
+            return
+
+        attribute_values = {
+            self.WEIGHTS_HASH_ATTRIBUTE: skinweights.get_mesh_weights_hash(mesh_folder),
+            self.TOPOLOGY_HASH_ATTRIBUTE: self._get_topology_fingerprint(mesh_name, skin_cluster),
+            self.IMPORT_TIME_ATTRIBUTE: '{:.4f}'.format(import_time)
+        }
+        for attribute_name, attribute_value in attribute_values.items():
+            if not tp.Dcc.attribute_exists(skin_cluster, attribute_name):
+                tp.Dcc.add_string_attribute(skin_cluster, attribute_name)
+            tp.Dcc.set_string_attribute_value(skin_cluster, attribute_name, attribute_value)
+
+    # ==============================================================================================
+    # CALLBACKS
+    # ==============================================================================================
+
+    def _on_process_weights(self):
+        """
+        Internal callback function that is triggered when user presses Process Weights action
+        """
+
+        return self.process_weights()
+
+    def _on_store_vertex_positions(self):
+        """
+        Internal callback function that is triggered when user presses Store Vertex Positions action
+        """
+
+        return self.store_vertex_positions()
+
+    def _on_import_weights_by_position(self):
+        """
+        Internal callback function that is triggered when user presses Import Weights (By Position) action
+        """
+
+        return self.import_weights(import_mode=self.IMPORT_MODE_POSITION)
+
+    def _on_export_weights_async(self):
+        """
+        Internal callback function that is triggered when user presses Export Weights (Background) action
+        """
+
+        return self.export_weights_async()
+
+    def _on_weights_saved(self, job):
+        """
+        Internal callback function that is called by the save queue when the weights of a mesh are saved
+        :param job: SaveJob
+        """
+
+        mesh_name = os.path.basename(job.target_path)
+        if job.status == job.STATUS_DONE:
+            tpRigToolkit.logger.info('Saved skin weights of {} in background ({:.2f}s)'.format(
+                mesh_name, job.write_time))
+            if self._version_on_save:
+                self.save_weights_version(comment='Background save', mesh_names=[mesh_name])
+        elif job.status == job.STATUS_FAILED:
+            tpRigToolkit.logger.error('Error while saving skin weights of {}: {}'.format(mesh_name, job.error))
+
+    def _on_save_version(self):
+        """
+        Internal callback function that is triggered when user presses Save Version action
+        """
+
+        return self.save_version()
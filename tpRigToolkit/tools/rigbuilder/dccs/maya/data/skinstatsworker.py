@@ -0,0 +1,35 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the background worker that computes the stats shown in the skin weights preview widget
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from Qt.QtCore import Signal, QThread
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+
+skinweights = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.skinweights')
+
+
+class SkinWeightsStatsWorker(QThread, object):
+    """
+    Worker thread that computes the stats of a skin weights data file without blocking the UI
+    """
+
+    statsComputed = Signal(object)
+    statsFailed = Signal(str)
+
+    def __init__(self, weights_path, stats_path, parent=None):
+        super(SkinWeightsStatsWorker, self).__init__(parent)
+
+        self._weights_path = weights_path
+        self._stats_path = stats_path
+
+    def run(self):
+        try:
+            self.statsComputed.emit(skinweights.get_weights_stats(self._weights_path, self._stats_path))
+        except Exception as exc:
+            self.statsFailed.emit(str(exc))
@@ -7,10 +7,12 @@ Module that contains build node implementation for god rig component
 
 from __future__ import print_function, division, absolute_import
 
-import tpDcc as tp
-
 from tpRigToolkit.tools.rigbuilder.objects import component
-from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules import controlrig
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import skeleton
+
+tp = lazyimport.lazy_module('tpDcc')
+controlrig = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules.controlrig')
 
 
 class GodRig(component.RigComponent, object):
@@ -32,6 +34,7 @@ class GodRig(component.RigComponent, object):
 
         return setup_options
 
+    @skeleton.skeleton_run
     def run(self, *args, **kwargs):
         super(GodRig, self).run(*args, **kwargs)
 
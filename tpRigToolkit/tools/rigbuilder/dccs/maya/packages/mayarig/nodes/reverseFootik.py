@@ -5,11 +5,13 @@
 Module that contains build node implementation for simple Ik legs
 """
 
-import tpDcc as tp
-
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import api
 from tpRigToolkit.tools.rigbuilder.objects import component
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import skeleton
+
+tp = lazyimport.lazy_module('tpDcc')
+api = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.api')
 
 
 class ReverseFootIk(component.RigComponent, object):
@@ -22,11 +24,13 @@ class ReverseFootIk(component.RigComponent, object):
     def __init__(self, name=None, rig=None):
         super(ReverseFootIk, self).__init__(name=name, rig=rig)
 
+    @skeleton.skeleton_run
     def run(self, **kwargs):
         mirror = self.get_option('Mirror', group='Inputs', default=False)
         joints = self.get_option('Joints', group='Inputs')
 
         sides = ['left'] if not mirror else ['left', 'right']
+        skeleton_model = skeleton.get_skeleton()
 
         for side in sides:
             valid_joints = True
@@ -39,6 +43,8 @@ class ReverseFootIk(component.RigComponent, object):
             mid_jnt_name = api.solve_name(mid_jnt, node_type='joint', side=side)
             end_jnt_name = api.solve_name(end_jnt, node_type='jointEnd', side=side)
             for jnt in [start_jnt_name, mid_jnt_name, end_jnt_name]:
+                if skeleton_model and jnt in skeleton_model:
+                    continue
                 if not tp.Dcc.object_exists(jnt):
                     tpRigToolkit.logger.warning('Joint "{}" does not exists in current scene!'.format(jnt))
                     valid_joints = False
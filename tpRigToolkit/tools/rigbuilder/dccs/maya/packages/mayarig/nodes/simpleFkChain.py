@@ -5,9 +5,11 @@
 Module that contains build node implementation for simple Fk Chain
 """
 
-from tpRigToolkit.tools.rigbuilder.core import api
 from tpRigToolkit.tools.rigbuilder.objects import component
-from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules import fkrig
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import mirrornaming, skeleton
+
+fkrig = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules.fkrig')
 
 
 class SimpleFkChain(component.ChainComponent, object):
@@ -29,6 +31,7 @@ class SimpleFkChain(component.ChainComponent, object):
 
         return setup_options
 
+    @skeleton.skeleton_run
     def run(self, *args, **kwargs):
         super(SimpleFkChain, self).run(*args, **kwargs)
 
@@ -45,9 +48,8 @@ class SimpleFkChain(component.ChainComponent, object):
         parent_component = self.get_parent_component()
         control_size = self.get_controls_size()
 
-        mirror_side = api.get_mirror_side()
         mirror = mirror if not parent_component else mirror or parent_component.get_mirror()
-        sides = api.get_sides(skip_default=True)[0] if mirror else [api.get_default_side()]
+        sides, mirror_side = mirrornaming.get_sides(mirror)
 
         for side in sides:
             mirror_rig = mirror and side == mirror_side
@@ -75,6 +77,6 @@ class SimpleFkChain(component.ChainComponent, object):
     def _get_joints(self, mirror, fk_chain):
         joints = [fk_link['node'] for fk_link in fk_chain]
         if mirror:
-            joints = [api.get_mirror_name(joint_name) for joint_name in joints]
+            joints = mirrornaming.get_mirror_names(joints)
 
         return joints
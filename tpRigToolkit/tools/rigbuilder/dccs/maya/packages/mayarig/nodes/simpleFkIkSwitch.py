@@ -5,13 +5,15 @@
 Module that contains build node implementation for simple Fk Chain
 """
 
-import tpDcc as tp
-from tpDcc.dccs.maya.core import rig as rig_utils, constraint as cns_utils
-
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import api
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import mirrornaming
 from tpRigToolkit.tools.rigbuilder.dccs.maya.packages.mayarig.nodes import rigNode
 
+tp = lazyimport.lazy_module('tpDcc')
+rig_utils = lazyimport.lazy_module('tpDcc.dccs.maya.core.rig')
+cns_utils = lazyimport.lazy_module('tpDcc.dccs.maya.core.constraint')
+
 
 class SimpleFkIkChain(rigNode.RigNode, object):
 
@@ -27,7 +29,8 @@ class SimpleFkIkChain(rigNode.RigNode, object):
         setup_options = super(SimpleFkIkChain, self).setup_options()
 
         setup_options['Switch'] = {'value': True, 'group': None, 'type': 'group'}
-        setup_options['Attach Type'] = {'value': ['Constraint', 'Matrix'], 'group': 'Switch', 'type': 'combo'}
+        setup_options['Attach Type'] = {
+            'value': ['Constraint', 'Matrix', 'Matrix Network'], 'group': 'Switch', 'type': 'combo'}
         setup_options['Switch Attribute'] = {'value': 'fkIk', 'group': 'Switch', 'type': 'string'}
         setup_options['Auto Switch Visibility'] = {'value': True, 'group': 'Switch', 'type': 'bool'}
 
@@ -116,7 +119,7 @@ class SimpleFkIkChain(rigNode.RigNode, object):
         ik_component = children_components[1]
 
         mirror = self.get_mirror()
-        sides = api.get_sides(skip_default=True)[0] if mirror else [api.get_default_side()]
+        sides, _ = mirrornaming.get_sides(mirror)
 
         for side in sides:
             fk_joints = fk_component.get_chain_joints(side=side)
@@ -5,9 +5,11 @@
 Module that contains build node implementation for simple Ik legs
 """
 
-from tpRigToolkit.tools.rigbuilder.core import api
 from tpRigToolkit.tools.rigbuilder.objects import component
-from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules import iklimbrig
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import mirrornaming, skeleton
+
+iklimbrig = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules.iklimbrig')
 
 
 class SimpleIkChain(component.ChainComponent, object):
@@ -35,6 +37,7 @@ class SimpleIkChain(component.ChainComponent, object):
 
         return setup_options
 
+    @skeleton.skeleton_run
     def run(self, *args, **kwargs):
         super(SimpleIkChain, self).run(*args, **kwargs)
 
@@ -52,9 +55,8 @@ class SimpleIkChain(component.ChainComponent, object):
         parent_component = self.get_parent_component()
         control_size = self.get_controls_size()
 
-        mirror_side = api.get_mirror_side()
         mirror = mirror if not parent_component else mirror or parent_component.get_mirror()
-        sides = api.get_sides(skip_default=True)[0] if mirror else [api.get_default_side()]
+        sides, mirror_side = mirrornaming.get_sides(mirror)
 
         for side in sides:
             mirror_rig = mirror and side == mirror_side
@@ -85,6 +87,6 @@ class SimpleIkChain(component.ChainComponent, object):
     def _get_joints(self, mirror, ik_chain):
         joints = ik_chain
         if mirror:
-            joints = [api.get_mirror_name(joint_name) for joint_name in joints]
+            joints = mirrornaming.get_mirror_names(joints)
 
         return joints
@@ -10,9 +10,12 @@ from __future__ import print_function, division, absolute_import
 from collections import OrderedDict
 
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import controls
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import channelstate
 
-import tpDcc as tp
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+controls = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.controls')
 
 
 class RigControl(object):
@@ -26,10 +29,11 @@ class RigControl(object):
         'zyx': 5
     }
 
-    def __init__(self, name, tag=True):
+    def __init__(self, name, tag=True, channel_states=None):
         self._control = name
         self._curve_type = 'circle'
         self._control_data = OrderedDict()
+        self._channel_states = channel_states       # If given, channel changes are declared instead of applied
 
         if not tp.Dcc.object_exists(self._control):
             self._create(tag=tag)
@@ -208,6 +212,10 @@ class RigControl(object):
         Unlock and set keyable the control translate attributes
         """
 
+        if self._channel_states is not None:
+            self._channel_states.unlock_and_show(self._control, channelstate.TRANSLATE_ATTRIBUTES)
+            return
+
         for axis in 'XYZ':
             tp.Dcc.unlock_attribute(self._control, 'translate{}'.format(axis))
             tp.Dcc.keyable_attribute(self._control, 'translate{}'.format(axis))
@@ -217,6 +225,10 @@ class RigControl(object):
         Unlock and set keyable the control rotate attributes
         """
 
+        if self._channel_states is not None:
+            self._channel_states.unlock_and_show(self._control, channelstate.ROTATE_ATTRIBUTES)
+            return
+
         for axis in 'XYZ':
             tp.Dcc.unlock_attribute(self._control, 'rotate{}'.format(axis))
             tp.Dcc.keyable_attribute(self._control, 'rotate{}'.format(axis))
@@ -226,6 +238,10 @@ class RigControl(object):
         Unlock and set keyable the control scale attributes
         """
 
+        if self._channel_states is not None:
+            self._channel_states.unlock_and_show(self._control, channelstate.SCALE_ATTRIBUTES)
+            return
+
         for axis in 'XYZ':
             tp.Dcc.unlock_attribute(self._control, 'scale{}'.format(axis))
             tp.Dcc.keyable_attribute(self._control, 'scale{}'.format(axis))
@@ -236,7 +252,9 @@ class RigControl(object):
         :param attributes: list<str>, list of attributes to hide and lock (['translateX', 'translateY'])
         """
 
-        if attributes:
+        if attributes and self._channel_states is not None:
+            self._channel_states.lock_and_hide(self._control, attributes)
+        elif attributes:
             tp.Dcc.hide_attributes(self._control, attributes)
         else:
             self.hide_translate_attributes()
@@ -248,6 +266,10 @@ class RigControl(object):
         Lock and hide the translate attributes on the control
         """
 
+        if self._channel_states is not None:
+            self._channel_states.lock_and_hide(self._control, channelstate.TRANSLATE_ATTRIBUTES)
+            return
+
         tp.Dcc.lock_translate_attributes(self._control)
         tp.Dcc.hide_translate_attributes(self._control)
 
@@ -256,6 +278,10 @@ class RigControl(object):
         Lock and hide the rotate attributes on the control
         """
 
+        if self._channel_states is not None:
+            self._channel_states.lock_and_hide(self._control, channelstate.ROTATE_ATTRIBUTES)
+            return
+
         tp.Dcc.lock_rotate_attributes(self._control)
         tp.Dcc.hide_rotate_attributes(self._control)
 
@@ -264,6 +290,10 @@ class RigControl(object):
         Lock and hide the scale attributes on the control
         """
 
+        if self._channel_states is not None:
+            self._channel_states.lock_and_hide(self._control, channelstate.SCALE_ATTRIBUTES)
+            return
+
         tp.Dcc.lock_scale_attributes(self._control)
         tp.Dcc.hide_scale_attributes(self._control)
 
@@ -272,6 +302,10 @@ class RigControl(object):
         Lock and hide the visibility attribute on the control
         """
 
+        if self._channel_states is not None:
+            self._channel_states.lock_and_hide(self._control, channelstate.VISIBILITY_ATTRIBUTES)
+            return
+
         tp.Dcc.lock_visibility_attribute(self._control)
         tp.Dcc.hide_visibility_attribute(self._control)
 
@@ -288,6 +322,11 @@ class RigControl(object):
         Lock and hide all keyable attributes on the control
         """
 
+        if self._channel_states is not None and tp.is_maya():
+            keyable_attributes = maya.cmds.listAttr(self._control, keyable=True) or list()
+            self._channel_states.lock_and_hide(self._control, keyable_attributes)
+            return
+
         tp.Dcc.lock_keyable_attributes(self._control)
         tp.Dcc.hide_keyable_attributes(self._control)
 
@@ -5,13 +5,18 @@
 Module that contains base joint rig implementations for tpRigToolkit-tools-rigbuilder for Maya
 """
 
-import tpDcc as tp
-from tpDcc.libs.python import python
-import tpDcc.dccs.maya as maya
-from tpDcc.dccs.maya.core import joint as joint_utils, rig as rig_utils, shape as shape_utils
-
 import tpRigToolkit
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
 from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core import rig
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import attributeschema, jointchain, matrixattach, skeleton
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import switchnetwork
+
+tp = lazyimport.lazy_module('tpDcc')
+python = lazyimport.lazy_module('tpDcc.libs.python.python')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+joint_utils = lazyimport.lazy_module('tpDcc.dccs.maya.core.joint')
+rig_utils = lazyimport.lazy_module('tpDcc.dccs.maya.core.rig')
+shape_utils = lazyimport.lazy_module('tpDcc.dccs.maya.core.shape')
 
 
 class JointRig(rig.Rig, object):
@@ -21,6 +26,7 @@ class JointRig(rig.Rig, object):
 
     ATTACH_TYPE_CONSTRAINT = 0
     ATTACH_TYPE_MATRIX = 1
+    ATTACH_TYPE_MATRIX_NETWORK = 2
 
     def __init__(self, *args, **kwargs):
         super(JointRig, self).__init__(*args, **kwargs)
@@ -83,7 +89,7 @@ class JointRig(rig.Rig, object):
     def set_attach_type(self, attach_type):
         """
         Sets which attach type is used in case joints are attached
-        :param attach_type: int (ATTACH_TYPE_CONSTRAINT = 0; ATTACH_TYPE_MATRIX = 1)
+        :param attach_type: int (ATTACH_TYPE_CONSTRAINT = 0; ATTACH_TYPE_MATRIX = 1; ATTACH_TYPE_MATRIX_NETWORK = 2)
         """
 
         self._attach_type = attach_type
@@ -106,7 +112,10 @@ class JointRig(rig.Rig, object):
         :param joints: list(str), list of joints to check
         """
 
+        skeleton_model = skeleton.get_skeleton()
         for jnt in joints:
+            if skeleton_model and skeleton_model.is_transform(jnt):
+                continue
             if tp.Dcc.node_is_joint(jnt) or tp.Dcc.node_is_transform(jnt):
                 continue
             raise Exception('{} is not a joint or transform'.format(jnt))
@@ -276,21 +285,39 @@ class BufferRig(JointRig, object):
         """
 
         if self._create_buffer_joints:
-            if self._build_hierarchy:
-                build_hierarchy = joint_utils.BuildJointHierarchy()
-                build_hierarchy.set_transforms(self._joints)
-                build_hierarchy.set_replace(self._buffer_replace[0], self._buffer_replace[1])
-                self._buffer_joints = build_hierarchy.create()
+            buffer_parent = self._get_buffer_joints_parent()
+            if tp.is_maya():
+                # Duplicated joints are created already named, oriented and parented from the original joints matrices
+                self._buffer_joints = jointchain.duplicate_chain(
+                    self._joints, parent=buffer_parent, replace=self._buffer_replace,
+                    build_hierarchy=self._build_hierarchy)
             else:
-                self._buffer_joints = tp.Dcc.duplicate_hierarchy(
-                    self._joints, stop_at=self._joints[-1], force_only_these=self._joints,
-                    replace_str=self._buffer_replace[0], new_str=self._buffer_replace[1])
-
-            # Duplicated joints are stored in the setup group
-            tp.Dcc.set_parent(self._buffer_joints[0], self._setup_group)
+                if self._build_hierarchy:
+                    build_hierarchy = joint_utils.BuildJointHierarchy()
+                    build_hierarchy.set_transforms(self._joints)
+                    build_hierarchy.set_replace(self._buffer_replace[0], self._buffer_replace[1])
+                    self._buffer_joints = build_hierarchy.create()
+                else:
+                    self._buffer_joints = tp.Dcc.duplicate_hierarchy(
+                        self._joints, stop_at=self._joints[-1], force_only_these=self._joints,
+                        replace_str=self._buffer_replace[0], new_str=self._buffer_replace[1])
+                tp.Dcc.set_parent(self._buffer_joints[0], buffer_parent)
+
+            skeleton_model = skeleton.get_skeleton()
+            if skeleton_model and len(self._buffer_joints) == len(self._joints):
+                skeleton_model.add_duplicates(self._joints, self._buffer_joints)
+                skeleton_model.set_parent(self._buffer_joints[0], buffer_parent)
 
         return self._buffer_joints
 
+    def _get_buffer_joints_parent(self):
+        """
+        Internal function that returns the node where duplicated joints are stored
+        :return: str
+        """
+
+        return self._setup_group
+
     def _attach_joints(self, source_chain, target_chain):
         """
         Internal function that attaches source chain into given target chain
@@ -302,9 +329,21 @@ class BufferRig(JointRig, object):
         if not self._attach_chain:
             return False
 
+        if self._attach_type == self.ATTACH_TYPE_MATRIX_NETWORK and tp.is_maya():
+            return self._attach_joints_network(source_chain, target_chain)
+
+        attach_type = self._attach_type
+        if attach_type == self.ATTACH_TYPE_MATRIX_NETWORK:
+            attach_type = self.ATTACH_TYPE_MATRIX
+
+        # In Maya, constraint weights are connected to the switch network, so DCC switch nodes are not created
+        switch_network = self._create_switch and tp.is_maya() and attach_type == self.ATTACH_TYPE_CONSTRAINT
         tp.Dcc.attach_joints(
-            source_chain=source_chain, target_chain=target_chain, attach_type=self._attach_type,
-            create_switch=self._create_switch, switch_attribute_name=self._switch_attribute_name)
+            source_chain=source_chain, target_chain=target_chain, attach_type=attach_type,
+            create_switch=self._create_switch and not switch_network, switch_attribute_name=self._switch_attribute_name)
+        if switch_network:
+            self._connect_switch_network(source_chain, target_chain)
+            return True
 
         if self._create_switch:
             if tp.Dcc.attribute_exists(target_chain[0], self._switch_attribute_name):
@@ -317,6 +356,65 @@ class BufferRig(JointRig, object):
 
         return True
 
+    def _attach_joints_network(self, source_chain, target_chain):
+        """
+        Internal function that attaches source chain into given target chain with a matrix blend network
+        :param source_chain: list(str)
+        :param target_chain: list(str)
+        :return: bool
+        """
+
+        switch_attribute = self._switch_attribute_name if self._create_switch else None
+        chain_index = matrixattach.attach_chain(
+            source_chain, target_chain, switch_node=target_chain[0], switch_attribute=switch_attribute)
+
+        if self._create_switch and self._auto_switch_visibility:
+            switch = switchnetwork.SwitchNetwork(target_chain[0], self._switch_attribute_name)
+            switch.connect_visibility(chain_index, self._controls_group)
+
+        return True
+
+    def _connect_switch_network(self, source_chain, target_chain):
+        """
+        Internal function that connects the constraints that attach source chain into given target chain to the
+        switch network of the target chain. Only the weights of the source chain are connected, the rest of chains
+        attached to the switch are not modified
+        :param source_chain: list(str)
+        :param target_chain: list(str)
+        :return: bool, False if target chain is not attached with constraints
+        """
+
+        index, weight_plugs = switchnetwork.get_constraint_weight_plugs(source_chain, target_chain)
+        if index < 0:
+            return False
+
+        switchnetwork.create_switch_attribute(target_chain[0], self._switch_attribute_name, index)
+        switch = switchnetwork.SwitchNetwork(target_chain[0], self._switch_attribute_name)
+        switch.connect_weights(index, weight_plugs)
+        if self._auto_switch_visibility:
+            switch.connect_visibility(index, self._controls_group)
+
+        return True
+
+    def _get_max_value(self, node, attribute_name):
+        """
+        Internal function that returns the maximum value of the given integer attribute
+        Maya returns the maximum value inside a list, and no value if the attribute does not exist or has no maximum
+        :param node: str
+        :param attribute_name: str
+        :return: int, 0 if the attribute has no valid maximum value
+        """
+
+        if not tp.Dcc.attribute_exists(node, attribute_name):
+            return 0
+        max_value = tp.Dcc.attribute_query(node, attribute_name, max=True)
+        if isinstance(max_value, (list, tuple)):
+            max_value = max_value[0] if max_value else None
+        try:
+            return max(int(max_value), 0)
+        except (TypeError, ValueError):
+            return 0
+
     def _post_add_shape_switch(self):
         if not self._create_buffer_joints or not self._switch_shape_attribute_name or not self._create_switch:
             return
@@ -348,19 +446,13 @@ class BufferRig(JointRig, object):
 
         joint_shape = shapes[0]
 
-        if not tp.Dcc.attribute_exists(joint_shape, name):
-            tp.Dcc.add_integer_attribute(joint_shape, name, keyable=True, min_value=0)
+        max_value = max(self._get_max_value(self._joints[0], name), self._get_max_value(joint_shape, name))
+
+        switch_attributes = attributeschema.AttributeSchema([attributeschema.AttributeSpec(
+            name, attributeschema.TYPE_LONG, default=max_value, min_value=0, max_value=max_value, keyable=True)])
+        switch_attributes.apply(joint_shape)
         if not tp.Dcc.is_attribute_connected(self._joints[0], self._switch_attribute_name):
             tp.Dcc.connect_attribute(joint_shape, name, self._joints[0], self._switch_attribute_name)
-
-        max_value = tp.Dcc.attribute_query(self._joints[0], name, max=True)
-        try:
-            test_max = tp.Dcc.attribute_query(joint_shape, name, max=True)
-            max_value = test_max if max_value < test_max else max_value
-        except Exception:
-            pass
-
-        tp.Dcc.add_integer_attribute(joint_shape, name, max_value=max_value, default_value=max_value)
         for ctrl in self.controls:
             maya.cmds.parent(shapes[0], ctrl, add=True, shape=True)
         tp.Dcc.connect_message_attribute(shapes[0], self._controls_group, self._switch_attribute_name)
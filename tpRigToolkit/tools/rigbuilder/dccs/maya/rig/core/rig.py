@@ -7,13 +7,16 @@ Module that contains base rig implementation for tpRigToolkits-tools-rigbuilder-
 
 from __future__ import print_function, division, absolute_import
 
-import tpDcc as tp
-import tpDcc.dccs.maya as maya
-from tpDcc.libs.python import python
-
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import api
-from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core import control
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import attributeschema, channelstate, controltable, controlsets
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import metadata
+
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+python = lazyimport.lazy_module('tpDcc.libs.python.python')
+api = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.api')
+control = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core.control')
 
 
 class Rig(object):
@@ -21,6 +24,13 @@ class Rig(object):
     Base class to create rigs
     """
 
+    CONTROLS_GROUP_ATTRIBUTES = attributeschema.AttributeSchema([
+        attributeschema.AttributeSpec('rigControlGroup', attributeschema.TYPE_BOOL, default=True, locked=True),
+        attributeschema.AttributeSpec('description', attributeschema.TYPE_STRING, locked=True),
+        attributeschema.AttributeSpec('side', attributeschema.TYPE_STRING),
+        attributeschema.AttributeSpec('className', attributeschema.TYPE_STRING)
+    ])
+
     def __init__(self, *args, **kwargs):
         super(Rig, self).__init__()
 
@@ -29,10 +39,8 @@ class Rig(object):
         self._side = kwargs.get('side', api.get_default_side())     # Side of the rig component
         self._description = kwargs.get('description', 'rig')        # Description of the rig component
 
-        self._controls = list()                                     # List of all controls of the rig component
-        self._sub_controls = list()                                 # List of all sub controls of the rig component
-        self._controls_dict = dict()                                # Dict that maps controls with sub controls
-        self._sub_controls_with_buffer = list()                     # Lif of sub controls with buffer group
+        self._control_table = controltable.ControlTable()           # Controls, sub controls and groups of the rig
+        self._channel_states = channelstate.ChannelStateSpec()      # Channels state applied to controls after build
         self._connect_sub_vis_attr = None                           # Node that contains sub visibility attribute
 
         self._control_size = 1.0                                    # Size of the controls of the rig component
@@ -60,6 +68,7 @@ class Rig(object):
 
         self._connect_messages = True                               # Sets if rig should use messages to connect info
         self._connect_messages_node = None                          # Node that rig component messages are connected to
+        self._message_layout = metadata.LAYOUT_ATTRIBUTES           # Layout of the message attributes of the rig
 
         self._create_default_groups()
 
@@ -79,6 +88,26 @@ class Rig(object):
     def controls(self):
         return self._controls
 
+    @property
+    def control_table(self):
+        return self._control_table
+
+    @property
+    def _controls(self):
+        return self._control_table.get_controls(controltable.ROLE_CONTROL)
+
+    @property
+    def _sub_controls(self):
+        return self._control_table.get_controls(controltable.ROLE_SUB_CONTROL)
+
+    @property
+    def _sub_controls_with_buffer(self):
+        return self._control_table.get_last_sub_controls()
+
+    @property
+    def _controls_dict(self):
+        return controltable.ControlTableView(self._control_table)
+
     @property
     def mirror(self):
         return self._mirror
@@ -138,6 +167,15 @@ class Rig(object):
 
         self._connect_messages = flag
 
+    def set_message_layout(self, layout):
+        """
+        Sets the layout of the message attributes that link rig controls group with its controls and joints
+        :param layout: str, metadata.LAYOUT_ATTRIBUTES (control1..N) or metadata.LAYOUT_MULTI (controls[0..N-1]).
+            Multi layout connects all messages in bulk and keeps control1..N names as aliases
+        """
+
+        self._message_layout = layout
+
     def set_setup_parent(self, parent_transform):
         """
         Sets the parent of the setup group for this rig
@@ -185,7 +223,7 @@ class Rig(object):
         :return: list(str)
         """
 
-        return self._controls_dict.keys()
+        return self._control_table.get_controls()
 
     def get_control_groups(self, group_type):
         """
@@ -194,12 +232,7 @@ class Rig(object):
         :return: list(str)
         """
 
-        entries = list()
-        for ctrl in self._controls:
-            if group_type in self._controls_dict[ctrl]:
-                entries.append(self._controls_dict[ctrl][group_type])
-
-        return entries
+        return self._control_table.get_groups(group_type, role=controltable.ROLE_CONTROL)
 
     def get_sub_control_groups(self, group_type):
         """
@@ -208,12 +241,26 @@ class Rig(object):
         :return: list(str)
         """
 
-        entries = list()
-        for ctrl in self._sub_controls:
-            if group_type in self._controls_dict[ctrl]:
-                entries.append(self._controls_dict[ctrl][group_type])
+        return self._control_table.get_groups(group_type, role=controltable.ROLE_SUB_CONTROL)
 
-        return entries
+    def get_control_group(self, control_name, group_type):
+        """
+        Returns the group of the given type of the given control
+        :param control_name: str
+        :param group_type: str, 'buffer' or 'driver'
+        :return: str or None
+        """
+
+        return self._control_table.get_group(control_name, group_type)
+
+    def get_sub_controls(self, control_name):
+        """
+        Returns the sub controls of the given control
+        :param control_name: str
+        :return: list(str)
+        """
+
+        return self._control_table.get_sub_controls(control_name)
 
     def get_control_size(self):
         """
@@ -422,17 +469,11 @@ class Rig(object):
 
     def _create_controls_group_attributes(self):
         """
-          Internal function that creates default attributes for rig control group
-          """
+        Internal function that creates default attributes for rig control group
+        """
 
-        tp.Dcc.add_bool_attribute(self._controls_group, 'rigControlGroup', default_value=True)
-        tp.Dcc.lock_attribute(self._controls_group, 'rigControlGroup')
-        tp.Dcc.add_string_attribute(self._controls_group, 'description')
-        tp.Dcc.set_string_attribute_value(self._controls_group, 'description', self._description)
-        tp.Dcc.lock_attribute(self._controls_group, 'description')
-        tp.Dcc.add_string_attribute(self._controls_group, 'side')
-        side = self._side or 'c'
-        tp.Dcc.set_string_attribute_value(self._controls_group, 'side', side)
+        self.CONTROLS_GROUP_ATTRIBUTES.apply(self._controls_group, values={
+            'description': self._description, 'side': self._side or 'c', 'className': self.__class__.__name__})
 
     def _parent_default_group(self, group, parent):
         """
@@ -521,7 +562,7 @@ class Rig(object):
         sub = kwargs.pop('sub', False)
         control_data = kwargs.pop('control_data', dict())
 
-        new_ctrl = control.RigControl(self._get_control_name(*args, **kwargs))
+        new_ctrl = control.RigControl(self._get_control_name(*args, **kwargs), channel_states=self._channel_states)
         tp.Dcc.set_parent(new_ctrl.control(), self._controls_group)
 
         if control_data:
@@ -557,11 +598,9 @@ class Rig(object):
         new_ctrl.hide_visibility_attribute()
 
         if sub:
-            self._sub_controls.append(new_ctrl.get())
-            self._sub_controls_with_buffer[-1] = new_ctrl.get()
+            self._control_table.add_control(new_ctrl.get(), role=controltable.ROLE_SUB_CONTROL)
         else:
-            self._controls.append(new_ctrl.get())
-            self._sub_controls_with_buffer.append(None)
+            self._control_table.add_control(new_ctrl.get())
 
         if self._control_offset_axis:
             offset_rotation = None
@@ -574,8 +613,6 @@ class Rig(object):
             if offset_rotation:
                 new_ctrl.rotate_shape(*offset_rotation)
 
-        self._controls_dict[new_ctrl.get()] = dict()
-
         return new_ctrl
 
     # ==============================================================================================
@@ -651,7 +688,6 @@ class Rig(object):
         Internal function that is created after the rig is created
         """
 
-        tp.Dcc.add_string_attribute(self._controls_group, 'className', str(self.__class__.__name__))
         if tp.Dcc.object_exists(self._setup_group):
             if tp.Dcc.node_is_empty(self._setup_group):
                 parent = tp.Dcc.node_parent(self._setup_group)
@@ -664,6 +700,7 @@ class Rig(object):
             self._post_create_rotate_order()
         except Exception as exc:
             tpRigToolkit.logger.warning('Impossible to add rotate order to channel box: {}'.format(exc))
+        self._post_apply_channel_states()
 
         if self._connect_messages:
             self._post_create_messages()
@@ -689,16 +726,23 @@ class Rig(object):
         Makes sure that rotate order axis is available in channel box for all rig controls
         """
 
-        for ctrl in self._controls:
-            is_locked = False
-            for axis in 'XYZ':
-                if tp.Dcc.is_attribute_locked(ctrl, 'rotate{}'.format(axis)):
-                    is_locked = True
-            if is_locked:
+        controls = self._controls
+        locked_states = self._channel_states.get_locked_states(controls, channelstate.ROTATE_ATTRIBUTES)
+        for ctrl in controls:
+            if any(locked_states[ctrl]):
                 continue
+            self._channel_states.set_state(ctrl, ['rotateOrder'], hidden=False, keyable=True)
+
+    def _post_apply_channel_states(self):
+        """
+        Internal function that is called during post create function
+        Applies the channels state declared by the rig controls during the build in a single pass. Channel changes
+        done after the build are applied immediately
+        """
 
-            tp.Dcc.show_attribute(ctrl, 'rotateOrder')
-            tp.Dcc.keyable_attribute(ctrl, 'rotateOrder')
+        applied = self._channel_states.apply()
+        self._channel_states.set_deferred(False)
+        tpRigToolkit.logger.debug('Applied state of {} channels of rig {}'.format(applied, self._description))
 
     def _post_create_message(self, attr_name, description):
         """
@@ -714,8 +758,12 @@ class Rig(object):
         if value is None:
             return
 
-        index = 1
         value = python.force_list(value)
+        if self._message_layout == metadata.LAYOUT_MULTI:
+            metadata.connect_messages(value, self._controls_group, description)
+            return value
+
+        index = 1
         for sub_value in value:
             tp.Dcc.connect_message_attribute(sub_value, self._controls_group, '{}{}'.format(description, index))
             index += 1
@@ -746,48 +794,19 @@ class Rig(object):
     def _post_add_to_control_set(self):
         """
         Adds rig controls to default controls set
+        Control sets are resolved through the control set registry of the current build, so sets hierarchy is only
+        resolved once per build and all rig controls are added to their set with a single call
         """
 
-        set_name = 'set_controls'
-        exists = False
-        if tp.Dcc.object_exists(set_name) and tp.Dcc.node_type(set_name) == 'objectSet':
-            exists = True
-        if not exists:
-            sets = tp.Dcc.get_selection_groups(name='{}*'.format(set_name))
-            if sets:
-                set_name = sets[0]
-                exists = True
-            if not exists:
-                tp.Dcc.create_selection_group(name=tp.Dcc.find_unique_name(set_name), empty=True)
-
-        parent_set = set_name
-        child_set = None
-
-        for set_name in self._custom_sets:
-            if set_name == parent_set:
-                continue
-            custom_set_name = 'set_{}'.format(set_name)
-            if not tp.Dcc.object_exists(custom_set_name):
-                custom_set_name = tp.Dcc.create_selection_group(name=custom_set_name, empty=True)
-            tp.Dcc.add_node_to_selection_group(custom_set_name, parent_set, force=False)
-            parent_set = custom_set_name
-
+        registry = controlsets.get_control_set_registry()
         if self.__class__ != Rig:
-            child_set = 'set_{}'.format(self._description)
-            if self._side:
-                child_set = 'set_{}_{}'.format(self._description, self._side)
-            if child_set != parent_set:
-                if not tp.Dcc.object_exists(child_set):
-                    tp.Dcc.create_selection_group(name=child_set, empty=True)
-                tp.Dcc.add_node_to_selection_group(child_set, parent_set, force=False)
-
-        if not child_set:
-            child_set = parent_set
-
-        controls = self.get_all_controls()
-        for ctrl in controls:
-            tpRigToolkit.logger.info('Adding control: {} to control sets'.format(ctrl))
-            tp.Dcc.add_node_to_selection_group(ctrl, child_set, force=False)
+            child_set = registry.get_rig_set(self._custom_sets, description=self._description, side=self._side)
+        else:
+            child_set = registry.get_rig_set(self._custom_sets)
+
+        added = registry.add_controls(child_set, self.get_all_controls())
+        tpRigToolkit.logger.info('Added {} controls of rig {} to control set: {}'.format(
+            added, self._description, child_set))
 
     def _post_connect_controller(self):
         """
@@ -797,7 +816,7 @@ class Rig(object):
         if not tp.is_maya():
             return
 
-        controller = tp.Dcc.get_message_input(self._controls_group, 'control1')
+        controller = metadata.get_message(self._controls_group, 'control', 1)
         if not self._pick_walk_parent:
             parent = tp.Dcc.node_parent(self._controls_group)
             if not parent:
@@ -1,4 +1,3 @@
 order = [
-    'tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules.ribbon',
     'tpRigToolkit.tools.rigbuilder.dccs.maya.rig.modules.fkrig'
 ]
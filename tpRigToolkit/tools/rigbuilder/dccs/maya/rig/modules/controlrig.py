@@ -5,12 +5,13 @@
 Module that contains control rig module implementation for tpRigToolkits-tools-rigbuilder for Maya
 """
 
-import tpDcc as tp
-from tpDcc.libs.python import python
-
-from tpRigToolkit.tools.rigbuilder.core import api
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
 from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core import rig
 
+tp = lazyimport.lazy_module('tpDcc')
+python = lazyimport.lazy_module('tpDcc.libs.python.python')
+api = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.api')
+
 
 class ControlRig(rig.Rig, object):
     def __init__(self, *args, **kwargs):
@@ -7,10 +7,12 @@ Module that contains FK rig implementations for tpRigToolkit-tools-rigbuilder fo
 
 from __future__ import print_function, division, absolute_import
 
-import tpDcc as tp
-import tpDcc.dccs.maya as maya
-
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
 from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core import joint as rig_joint
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import skeleton
+
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
 
 
 class FkRig(rig_joint.BufferRig, object):
@@ -70,7 +72,7 @@ class FkRig(rig_joint.BufferRig, object):
         if not sub:
             self._current_buffer_group = buffer_group
 
-        self._controls_dict[new_control.get()]['buffer'] = buffer_group
+        self._control_table.set_group(new_control.get(), 'buffer', buffer_group)
 
         if not sub:
             pass
@@ -140,11 +142,9 @@ class FkRig(rig_joint.BufferRig, object):
             return
 
         if self._create_sub_controls:
-            control = self._controls_dict[control]['subs'][-1]
+            control = self._control_table.get_sub_controls(control)[-1]
 
-        control_buffer = None
-        if 'buffer' in self._controls_dict[control]:
-            control_buffer = self._controls_dict[control]['buffer']
+        control_buffer = self._control_table.get_group(control, 'buffer')
         if control_buffer:
             offset_rotation = None
             if self._offset_rotation:
@@ -223,7 +223,15 @@ class FkRig(rig_joint.BufferRig, object):
         :param current_transform: str, transform linked to the given Fk chain control
         """
 
-        control_buffer = self._controls_dict[control]['buffer']
+        control_buffer = self._control_table.get_group(control, 'buffer')
+
+        # Joints of the skeleton of the build have no pivot offsets, so buffer is matched with a single world matrix
+        # set. Matrix is read from the scene, because previous rigs of the build can move joints after session start
+        skeleton_model = skeleton.get_skeleton()
+        if self._match_to_rotation and skeleton_model and skeleton_model.is_joint(current_transform):
+            maya.cmds.xform(control_buffer, matrix=skeleton.read_world_matrix(current_transform), worldSpace=True)
+            return
+
         if self._match_to_rotation:
             tp.Dcc.match_rotation(current_transform, control_buffer)
 
@@ -265,13 +273,13 @@ class FkRig(rig_joint.BufferRig, object):
         self._attach(control, current_transform)
 
         if self._create_sub_controls:
-            last_control = self._controls_dict[self._last_control.get()]['subs'][-1]
-            tp.Dcc.set_parent(self._controls_dict[control]['buffer'], last_control)
+            last_control = self._control_table.get_sub_controls(self._last_control.get())[-1]
+            tp.Dcc.set_parent(self._control_table.get_group(control, 'buffer'), last_control)
             if tp.is_maya():
                 maya.cmds.controller(control, last_control, p=True)
         else:
             if self._last_control:
-                tp.Dcc.set_parent(self._controls_dict[control]['buffer'], self._last_control.get())
+                tp.Dcc.set_parent(self._control_table.get_group(control, 'buffer'), self._last_control.get())
                 if tp.is_maya():
                     maya.cmds.controller(control, self._last_control.get(), p=True)
 
@@ -7,13 +7,15 @@ Module that contains FK rig implementations for tpRigToolkit-tools-rigbuilder fo
 
 from __future__ import print_function, division, absolute_import
 
-import tpDcc as tp
-
-from tpRigToolkit.tools.rigbuilder.core import api
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport, matrixmath
 from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.core import joint as rig_joint
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import attributeschema, polesolver
 
-import tpDcc.dccs.maya as maya
-from tpDcc.dccs.maya.core import ik, rig as rig_utils
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+ik = lazyimport.lazy_module('tpDcc.dccs.maya.core.ik')
+rig_utils = lazyimport.lazy_module('tpDcc.dccs.maya.core.rig')
+api = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.api')
 
 
 class IkLimbRig(rig_joint.BufferRig, object):
@@ -21,6 +23,12 @@ class IkLimbRig(rig_joint.BufferRig, object):
     Module to setup Ik limb rigs
     """
 
+    POLE_VECTOR_ATTRIBUTES = attributeschema.AttributeSchema([
+        attributeschema.AttributeSpec('POLE_VECTOR', attributeschema.TYPE_TITLE),
+        attributeschema.AttributeSpec('poleVisibility', attributeschema.TYPE_BOOL, keyable=True),
+        attributeschema.AttributeSpec('twist', attributeschema.TYPE_LONG, keyable=True)
+    ])
+
     def __init__(self, *args, **kwargs):
         super(IkLimbRig, self).__init__(*args, **kwargs)
 
@@ -49,6 +57,7 @@ class IkLimbRig(rig_joint.BufferRig, object):
         self._match_bottom_control_to_joint = True          # Whether or not bottom control matches last joint rotation
         self._orient_constraint = True                      # Whether or not end effector controls ik handle rotation
         self._create_sub_control = True                     # Whether create sub control or not
+        self._pole_limb = None                              # Limb added to the pole vector solver of the session
 
     # ==============================================================================================
     # OVERRIDES
@@ -93,6 +102,17 @@ class IkLimbRig(rig_joint.BufferRig, object):
 
         self._create_ik_handle()
 
+    def set_joints(self, joints):
+        """
+        Overrides base set_joints function
+        Limb is added to the pole vector solver of the current session, so it is solved with the rest of limbs
+        :param joints: list(str)
+        """
+
+        super(IkLimbRig, self).set_joints(joints)
+
+        self._add_pole_limb()
+
     def _duplicate_joints(self):
         """
         Overrides base _duplicate_joints function
@@ -108,10 +128,17 @@ class IkLimbRig(rig_joint.BufferRig, object):
 
         self._ik_chain = self._buffer_joints
 
-        if self._create_buffer_joints:
-            ik_group = self._create_group('ik')
-            tp.Dcc.set_parent(self._ik_chain[0], ik_group)
-            tp.Dcc.set_parent(ik_group, self._setup_group)
+    def _get_buffer_joints_parent(self):
+        """
+        Overrides base _get_buffer_joints_parent function
+        Ik joints are stored in their own group inside the setup group
+        :return: str
+        """
+
+        ik_group = self._create_group('ik')
+        tp.Dcc.set_parent(ik_group, self._setup_group)
+
+        return ik_group
 
     # ==============================================================================================
     # BASE
@@ -218,6 +245,7 @@ class IkLimbRig(rig_joint.BufferRig, object):
         """
 
         self._pole_vector_control_offset = value
+        self._add_pole_limb()
 
     def set_pole_angle_joints(self, joints):
         """
@@ -226,6 +254,7 @@ class IkLimbRig(rig_joint.BufferRig, object):
         """
 
         self._pole_angle_joints = joints
+        self._add_pole_limb()
 
     # ==============================================================================================
     # PRIVATE
@@ -332,9 +361,7 @@ class IkLimbRig(rig_joint.BufferRig, object):
         control = self._pole_vector_control
         self._pole_vector_control = self._pole_vector_control.get()
 
-        tp.Dcc.add_title_attribute(self._bottom_control, 'POLE_VECTOR')
-        tp.Dcc.add_bool_attribute(self._bottom_control, 'poleVisibility')
-        tp.Dcc.add_integer_attribute(self._bottom_control, 'twist')
+        self.POLE_VECTOR_ATTRIBUTES.apply(self._bottom_control)
         if tp.Dcc.name_is_left(self._side):
             tp.Dcc.connect_attribute(self._bottom_control, 'twist', self._ik_handle, 'twist')
         else:
@@ -342,8 +369,9 @@ class IkLimbRig(rig_joint.BufferRig, object):
 
         pole_joints = self._get_pole_joints()
 
-        pole_vector_position = tp.Dcc.get_pole_vector_position(
-            pole_joints[0], pole_joints[1], pole_joints[2], offset=self._pole_vector_control_offset)
+        # Ik chain is duplicated in place, so the limb of the original joints gives the same pole vector
+        pole_vector_position, _ = polesolver.get_pole_vector_solver().get_pole_vector(
+            self._get_pole_limb_joints()[:3], offset=self._pole_vector_control_offset)
         tp.Dcc.move_node(control.get(), pole_vector_position[0], pole_vector_position[1], pole_vector_position[2])
 
         self._create_pole_vector_constraint()
@@ -381,24 +409,47 @@ class IkLimbRig(rig_joint.BufferRig, object):
 
         return self._pole_angle_joints
 
+    def _get_pole_limb_joints(self):
+        """
+        Returns the original joints used to solve the pole vector, that are available before the rig is created
+        :return: list(str)
+        """
+
+        if not self._pole_angle_joints and self._joints:
+            mid_joint_index = int(len(self._joints) / 2)
+            return [self._joints[0], self._joints[mid_joint_index], self._joints[-1]]
+
+        return self._pole_angle_joints
+
+    def _add_pole_limb(self):
+        """
+        Internal function that adds the limb of the rig to the pole vector solver of the current session, replacing
+        the limb added with previous joints or offset
+        """
+
+        solver = polesolver.get_pole_vector_solver()
+        if self._pole_limb:
+            solver.remove_limb(*self._pole_limb)
+            self._pole_limb = None
+
+        joints = self._get_pole_limb_joints()
+        if len(joints) >= 3:
+            self._pole_limb = (joints[:3], self._pole_vector_control_offset)
+            solver.add_limb(*self._pole_limb)
+
     def _fix_right_side_orient(self, control):
         """
         Internal function that fixes right side control to reverse orientation on YZ channels
+        Rotating 180 degrees around Y and Z local axes is the same as flipping those axes, so the new orientation
+        is computed from the world matrix of the control, without temporary nodes
         :param control: str, name of the control we want to fix orient of
         """
 
         if not self._right_side_fix or not tp.Dcc.name_is_right(side=self._side):
             return
 
-        xform_locator = tp.Dcc.create_locator()
-        tp.Dcc.match_translation_rotation(control, xform_locator)
-
-        buffer_group = tp.Dcc.create_buffer_group(xform_locator)
-        tp.Dcc.set_attribute_value(xform_locator, 'rotateY', 180)
-        tp.Dcc.set_attribute_value(xform_locator, 'rotateZ', 180)
-        tp.Dcc.match_translation_rotation(xform_locator, control)
-
-        tp.Dcc.delete_object(buffer_group)
+        world_matrix = maya.cmds.xform(control, query=True, matrix=True, worldSpace=True)
+        maya.cmds.xform(control, matrix=matrixmath.flip_matrix_axes(world_matrix, 'yz'), worldSpace=True)
 
     def _create_buffer_joint(self):
         """
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that adds the modifications done with Maya API modifiers to the undo queue. Modifiers executed from scripts
+are not added to the undo queue, so this module is also a Maya plugin that registers an undoable command. Each
+commit executes that command, which stores the undo and redo functions of the committed modification
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+COMMAND_NAME = 'rigBuilderApiUndo'
+
+_PENDING = list()
+_COMMAND_CLASS = None
+
+
+def maya_useNewAPI():
+    """
+    Tells Maya that the plugin uses Maya Python API 2.0
+    """
+
+    pass
+
+
+def commit(*modifiers):
+    """
+    Adds the given modifiers to the undo queue as a single undo step. Modifiers must be already executed and they
+    must not be executed again, because undoing a modifier undoes all its operations
+    :param modifiers: list(OpenMaya.MDGModifier)
+    :return: bool, whether or not modification was added to the undo queue
+    """
+
+    def _undo():
+        for modifier in reversed(modifiers):
+            modifier.undoIt()
+
+    def _redo():
+        for modifier in modifiers:
+            modifier.doIt()
+
+    return add_undo(_undo, _redo)
+
+
+def add_undo(undo_function, redo_function):
+    """
+    Adds a modification, that is already done, to the undo queue
+    :param undo_function: callable, function that undoes the modification
+    :param redo_function: callable, function that does the modification again
+    :return: bool, whether or not modification was added to the undo queue
+    """
+
+    if not maya.cmds.undoInfo(query=True, state=True):
+        return False
+
+    load_plugin()
+    _PENDING.append((undo_function, redo_function))
+    try:
+        getattr(maya.cmds, COMMAND_NAME)()
+    finally:
+        del _PENDING[:]
+
+    return True
+
+
+def pop_pending():
+    """
+    Returns the undo and redo functions of the modification that is being committed
+    :return: tuple(callable, callable)
+    """
+
+    return _PENDING.pop(0)
+
+
+def load_plugin():
+    """
+    Loads the plugin that registers the undo command, if it is not loaded yet
+    """
+
+    plugin_path = '{}.py'.format(os.path.splitext(os.path.abspath(__file__))[0])
+    if not maya.cmds.pluginInfo(plugin_path, query=True, loaded=True):
+        maya.cmds.loadPlugin(plugin_path, quiet=True)
+
+
+def initializePlugin(plugin):
+    """
+    Registers the undo command. Called by Maya when the plugin is loaded
+    :param plugin: OpenMaya.MObject
+    """
+
+    OpenMaya.MFnPlugin(plugin, __author__, '1.0').registerCommand(COMMAND_NAME, _create_command)
+
+
+def uninitializePlugin(plugin):
+    """
+    Deregisters the undo command. Called by Maya when the plugin is unloaded
+    :param plugin: OpenMaya.MObject
+    """
+
+    OpenMaya.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)
+
+
+def _create_command():
+    """
+    Internal function that creates a new instance of the undo command
+    The command class is created the first time it is needed, so importing this module does not load Maya
+    :return: OpenMaya.MPxCommand
+    """
+
+    global _COMMAND_CLASS
+    if _COMMAND_CLASS is None:
+
+        class ApiUndoCommand(OpenMaya.MPxCommand):
+            def __init__(self):
+                super(ApiUndoCommand, self).__init__()
+
+                self._undo_function = None
+                self._redo_function = None
+
+            def doIt(self, args):
+                # Plugin file is loaded by Maya as a different module, so pending modifications are read from the
+                # module imported by the rig builder
+                from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo
+                self._undo_function, self._redo_function = apiundo.pop_pending()
+
+            def undoIt(self):
+                self._undo_function()
+
+            def redoIt(self):
+                self._redo_function()
+
+            def isUndoable(self):
+                return True
+
+        _COMMAND_CLASS = ApiUndoCommand
+
+    return _COMMAND_CLASS()
@@ -0,0 +1,481 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains attribute schemas: reusable declarations of a group of attributes (type, default value, range,
+keyable and lock state) that can be applied to many nodes at once
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+from collections import OrderedDict
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, metadata
+
+tp = lazyimport.lazy_module('tpDcc')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+TYPE_BOOL = 'bool'
+TYPE_LONG = 'long'
+TYPE_DOUBLE = 'double'
+TYPE_STRING = 'string'
+TYPE_TITLE = 'title'            # Locked enum attribute used to separate groups of attributes in the channel box
+ATTRIBUTE_TYPES = [TYPE_BOOL, TYPE_LONG, TYPE_DOUBLE, TYPE_STRING, TYPE_TITLE]
+NUMERIC_TYPES = [TYPE_BOOL, TYPE_LONG, TYPE_DOUBLE]
+
+_TYPE_CASTS = {TYPE_BOOL: bool, TYPE_LONG: int, TYPE_DOUBLE: float, TYPE_STRING: str}
+
+
+class AttributeSpec(object):
+    """
+    Declaration of a single attribute of an attribute schema
+    """
+
+    __slots__ = ('name', 'attribute_type', 'default', 'min_value', 'max_value', 'keyable', 'locked')
+
+    def __init__(self, name, attribute_type, default=None, min_value=None, max_value=None, keyable=False,
+                 locked=False):
+        if attribute_type not in ATTRIBUTE_TYPES:
+            raise ValueError('Attribute type "{}" not supported: {}'.format(attribute_type, ATTRIBUTE_TYPES))
+        if attribute_type not in NUMERIC_TYPES and (min_value is not None or max_value is not None):
+            raise ValueError('Attribute "{}" of type "{}" cannot have a range'.format(name, attribute_type))
+
+        self.name = name
+        self.attribute_type = attribute_type
+        self.min_value = min_value
+        self.max_value = max_value
+        self.keyable = keyable
+        self.locked = True if attribute_type == TYPE_TITLE else locked
+        self.default = None
+        self.default = self.get_value(default)
+
+    def __repr__(self):
+        return '<AttributeSpec {} ({})>'.format(self.name, self.attribute_type)
+
+    def get_value(self, value):
+        """
+        Returns given value converted to the type of the attribute. If no value is given, default value is returned
+        :param value: object or None
+        :return: object
+        """
+
+        if self.attribute_type == TYPE_TITLE:
+            return None
+        if value is None:
+            value = self.default
+            if self.attribute_type == TYPE_STRING:
+                return value
+            if value is None:
+                value = self.min_value if self.min_value is not None else 0
+
+        value = _TYPE_CASTS[self.attribute_type](value)
+        if self.min_value is not None and value < self.min_value:
+            raise ValueError('Value {} of attribute "{}" is lower than {}'.format(value, self.name, self.min_value))
+        if self.max_value is not None and value > self.max_value:
+            raise ValueError('Value {} of attribute "{}" is greater than {}'.format(value, self.name, self.max_value))
+
+        return value
+
+
+class AttributeSchema(object):
+    """
+    Ordered group of attribute declarations. Applying a schema to nodes creates the attributes that do not exist and
+    updates only the attributes whose declared state differs from the one of the scene, so applying the same schema
+    again is almost free. Attributes that already exist keep their value unless a new value is given
+    """
+
+    def __init__(self, attributes=None):
+        self._attributes = OrderedDict()            # Maps attribute names with their AttributeSpec
+
+        for attribute in attributes or list():
+            self._attributes[attribute.name] = attribute
+
+    def __len__(self):
+        return len(self._attributes)
+
+    def __contains__(self, name):
+        return name in self._attributes
+
+    def __iter__(self):
+        return iter(self._attributes.values())
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def add_attribute(self, name, attribute_type, default=None, min_value=None, max_value=None, keyable=False,
+                      locked=False):
+        """
+        Declares a new attribute in the schema
+        :param name: str
+        :param attribute_type: str, one of ATTRIBUTE_TYPES
+        :param default: object or None
+        :param min_value: int or float or None
+        :param max_value: int or float or None
+        :param keyable: bool
+        :param locked: bool
+        :return: AttributeSpec
+        """
+
+        attribute = AttributeSpec(
+            name, attribute_type, default=default, min_value=min_value, max_value=max_value, keyable=keyable,
+            locked=locked)
+        self._attributes[name] = attribute
+
+        return attribute
+
+    def get_attribute(self, name):
+        """
+        Returns the declaration of the given attribute
+        :param name: str
+        :return: AttributeSpec or None
+        """
+
+        return self._attributes.get(name, None)
+
+    def get_values(self, values=None):
+        """
+        Returns given values converted to the type of their attributes
+        :param values: dict(str, object) or None
+        :return: dict(str, object)
+        """
+
+        resolved_values = dict()
+        for name, value in (values or dict()).items():
+            if name not in self._attributes:
+                raise KeyError('Attribute "{}" is not declared in the schema'.format(name))
+            resolved_values[name] = self._attributes[name].get_value(value)
+
+        return resolved_values
+
+    def get_pending_attributes(self, state, values=None):
+        """
+        Returns the attributes whose state in a node differs from the declared one
+        :param state: dict(str, dict), maps existing attributes of the node with their value, default, min_value,
+            max_value, keyable and locked state. Attributes that do not exist in the node are not included
+        :param values: dict(str, object) or None, values converted with get_values
+        :return: list(str)
+        """
+
+        values = values or dict()
+        pending_attributes = list()
+        for name, attribute in self._attributes.items():
+            attribute_state = state.get(name, None)
+            if attribute_state is None:
+                pending_attributes.append(name)
+                continue
+            range_state = (attribute_state['default'], attribute_state['min_value'], attribute_state['max_value'])
+            range_spec = (attribute.default, attribute.min_value, attribute.max_value)
+            if attribute_state['locked'] != attribute.locked:
+                pending_attributes.append(name)
+            elif attribute.attribute_type != TYPE_TITLE and attribute_state['keyable'] != attribute.keyable:
+                pending_attributes.append(name)
+            elif name in values and attribute_state['value'] != values[name]:
+                pending_attributes.append(name)
+            elif attribute.attribute_type in NUMERIC_TYPES and range_state != range_spec:
+                pending_attributes.append(name)
+
+        return pending_attributes
+
+    def apply(self, nodes, values=None):
+        """
+        Applies the schema to the given nodes
+        :param nodes: list(str) or str
+        :param values: dict(str, object) or None, values set in all the nodes. Attributes that are created take their
+            default value if no value is given
+        :return: int, number of attributes that were created or updated
+        """
+
+        if not isinstance(nodes, (list, tuple)):
+            nodes = [nodes]
+        values = self.get_values(values)
+        if not nodes or not self._attributes:
+            return 0
+
+        if tp.is_maya():
+            return self._apply_maya(nodes, values)
+
+        return self._apply_dcc(nodes, values)
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _apply_maya(self, nodes, values):
+        """
+        Internal function that applies the schema using Maya API. All attributes are created with a single DG modifier
+        and all values are set with another one. Previous state of the updated attributes is stored, so the whole
+        application is added to the undo queue as a single step
+        :param nodes: list(str)
+        :param values: dict(str, object)
+        :return: int
+        """
+
+        modifier = OpenMaya.MDGModifier()
+        pending_nodes = list()
+        for node in nodes:
+            node_object = metadata.get_node_object(node)
+            node_fn = OpenMaya.MFnDependencyNode(node_object)
+            state = self._read_maya_state(node_fn, values)
+            pending_attributes = self.get_pending_attributes(state, values)
+            if not pending_attributes:
+                continue
+            for name in pending_attributes:
+                if name not in state:
+                    modifier.addAttribute(node_object, self._create_maya_attribute(self._attributes[name]))
+            pending_nodes.append((node_fn, pending_attributes, state))
+        if not pending_nodes:
+            return 0
+        modifier.doIt()
+
+        # Previous state is None for created attributes
+        plug_states = list()
+        for node_fn, pending_attributes, state in pending_nodes:
+            for name in pending_attributes:
+                plug = node_fn.findPlug(name, False)
+                previous_state = state.get(name, None)
+                if previous_state is not None:
+                    previous_state = dict(previous_state, channel_box=plug.isChannelBox)
+                plug_states.append((plug, self._attributes[name], previous_state))
+
+        self._unlock_maya_plugs(plug_states)
+        for plug, attribute, previous_state in plug_states:
+            if attribute.name in values:
+                self._set_maya_plug_value(modifier, plug, attribute, values[attribute.name])
+            elif previous_state is None and attribute.attribute_type == TYPE_STRING and attribute.default:
+                self._set_maya_plug_value(modifier, plug, attribute, attribute.default)
+        modifier.doIt()
+        self._lock_maya_plugs(plug_states)
+
+        def _undo():
+            for plug, _, _ in plug_states:
+                plug.isLocked = False
+            modifier.undoIt()
+            for plug, attribute, previous_state in plug_states:
+                if previous_state is None:
+                    continue
+                if attribute.attribute_type in NUMERIC_TYPES:
+                    self._update_maya_numeric_attribute(
+                        plug, previous_state['default'], previous_state['min_value'], previous_state['max_value'])
+                plug.isKeyable = previous_state['keyable']
+                plug.isChannelBox = previous_state['channel_box']
+                plug.isLocked = previous_state['locked']
+
+        def _redo():
+            self._unlock_maya_plugs(plug_states)
+            modifier.doIt()
+            self._lock_maya_plugs(plug_states)
+
+        apiundo.add_undo(_undo, _redo)
+
+        return len(plug_states)
+
+    def _unlock_maya_plugs(self, plug_states):
+        """
+        Internal function that unlocks the given plugs before setting their values and updates the default value and
+        the range of the existing numeric attributes
+        :param plug_states: list(tuple(OpenMaya.MPlug, AttributeSpec, dict or None))
+        """
+
+        for plug, attribute, previous_state in plug_states:
+            if previous_state is None:
+                continue
+            plug.isLocked = False
+            if attribute.attribute_type in NUMERIC_TYPES:
+                self._update_maya_numeric_attribute(plug, attribute.default, attribute.min_value, attribute.max_value)
+
+    def _lock_maya_plugs(self, plug_states):
+        """
+        Internal function that sets the declared keyable, channel box and locked state of the given plugs
+        :param plug_states: list(tuple(OpenMaya.MPlug, AttributeSpec, dict or None))
+        """
+
+        for plug, attribute, _ in plug_states:
+            if attribute.attribute_type == TYPE_TITLE:
+                plug.isChannelBox = True
+            else:
+                plug.isKeyable = attribute.keyable
+            plug.isLocked = attribute.locked
+
+    def _read_maya_state(self, node_fn, values):
+        """
+        Internal function that returns the state of the attributes of the schema in the given node
+        :param node_fn: OpenMaya.MFnDependencyNode
+        :param values: dict(str, object), values are only read for the attributes included in this dictionary
+        :return: dict(str, dict)
+        """
+
+        state = dict()
+        for name, attribute in self._attributes.items():
+            if not node_fn.hasAttribute(name):
+                continue
+            plug = node_fn.findPlug(name, False)
+            attribute_state = state[name] = {
+                'value': None, 'default': None, 'min_value': None, 'max_value': None,
+                'keyable': plug.isKeyable, 'locked': plug.isLocked}
+            if attribute.attribute_type in NUMERIC_TYPES:
+                cast = _TYPE_CASTS[attribute.attribute_type]
+                numeric_fn = OpenMaya.MFnNumericAttribute(plug.attribute())
+                attribute_state['default'] = cast(numeric_fn.default)
+                if numeric_fn.hasMin():
+                    attribute_state['min_value'] = cast(numeric_fn.getMin())
+                if numeric_fn.hasMax():
+                    attribute_state['max_value'] = cast(numeric_fn.getMax())
+            if name in values:
+                attribute_state['value'] = self._get_maya_plug_value(plug, attribute)
+
+        return state
+
+    def _create_maya_attribute(self, attribute):
+        """
+        Internal function that creates a new Maya attribute from the given declaration
+        :param attribute: AttributeSpec
+        :return: OpenMaya.MObject
+        """
+
+        if attribute.attribute_type == TYPE_TITLE:
+            attribute_fn = OpenMaya.MFnEnumAttribute()
+            attribute_object = attribute_fn.create(attribute.name, attribute.name, 0)
+            attribute_fn.addField(attribute.name, 0)
+            attribute_fn.channelBox = True
+        elif attribute.attribute_type == TYPE_STRING:
+            attribute_fn = OpenMaya.MFnTypedAttribute()
+            attribute_object = attribute_fn.create(attribute.name, attribute.name, OpenMaya.MFnData.kString)
+        else:
+            numeric_type = {
+                TYPE_BOOL: OpenMaya.MFnNumericData.kBoolean, TYPE_LONG: OpenMaya.MFnNumericData.kLong,
+                TYPE_DOUBLE: OpenMaya.MFnNumericData.kDouble}[attribute.attribute_type]
+            attribute_fn = OpenMaya.MFnNumericAttribute()
+            attribute_object = attribute_fn.create(attribute.name, attribute.name, numeric_type, attribute.default)
+            if attribute.min_value is not None:
+                attribute_fn.setMin(attribute.min_value)
+            if attribute.max_value is not None:
+                attribute_fn.setMax(attribute.max_value)
+        attribute_fn.keyable = attribute.keyable
+
+        return attribute_object
+
+    def _update_maya_numeric_attribute(self, plug, default, min_value, max_value):
+        """
+        Internal function that updates the default value and the range of an existing numeric attribute
+        Maya API cannot remove the range of an attribute, so None minimum and maximum values are not changed
+        :param plug: OpenMaya.MPlug
+        :param default: bool or int or float
+        :param min_value: int or float or None
+        :param max_value: int or float or None
+        """
+
+        numeric_fn = OpenMaya.MFnNumericAttribute(plug.attribute())
+        numeric_fn.default = default
+        if min_value is not None:
+            numeric_fn.setMin(min_value)
+        if max_value is not None:
+            numeric_fn.setMax(max_value)
+
+    def _get_maya_plug_value(self, plug, attribute):
+        """
+        Internal function that returns the value of the given plug
+        :param plug: OpenMaya.MPlug
+        :param attribute: AttributeSpec
+        :return: object
+        """
+
+        if attribute.attribute_type == TYPE_BOOL:
+            return plug.asBool()
+        elif attribute.attribute_type == TYPE_LONG:
+            return plug.asInt()
+        elif attribute.attribute_type == TYPE_DOUBLE:
+            return plug.asDouble()
+        elif attribute.attribute_type == TYPE_STRING:
+            return plug.asString()
+
+        return None
+
+    def _set_maya_plug_value(self, modifier, plug, attribute, value):
+        """
+        Internal function that adds the change of the value of the given plug into the given DG modifier
+        :param modifier: OpenMaya.MDGModifier
+        :param plug: OpenMaya.MPlug
+        :param attribute: AttributeSpec
+        :param value: object
+        """
+
+        if attribute.attribute_type == TYPE_BOOL:
+            modifier.newPlugValueBool(plug, value)
+        elif attribute.attribute_type == TYPE_LONG:
+            modifier.newPlugValueInt(plug, value)
+        elif attribute.attribute_type == TYPE_DOUBLE:
+            modifier.newPlugValueDouble(plug, value)
+        elif attribute.attribute_type == TYPE_STRING:
+            modifier.newPlugValueString(plug, value or '')
+
+    def _apply_dcc(self, nodes, values):
+        """
+        Internal function that applies the schema with DCC attribute functions
+        :param nodes: list(str)
+        :param values: dict(str, object)
+        :return: int
+        """
+
+        applied = 0
+        for node in nodes:
+            for name, attribute in self._attributes.items():
+                exists = tp.Dcc.attribute_exists(node, name)
+                if exists and self._is_dcc_attribute_updated(node, attribute, values):
+                    continue
+                if exists:
+                    tp.Dcc.unlock_attribute(node, name)
+                if attribute.attribute_type == TYPE_TITLE:
+                    if not exists:
+                        tp.Dcc.add_title_attribute(node, name)
+                elif attribute.attribute_type == TYPE_STRING:
+                    if not exists:
+                        tp.Dcc.add_string_attribute(node, name, keyable=attribute.keyable)
+                    value = values.get(name, None if exists else attribute.default)
+                    if value is not None:
+                        tp.Dcc.set_string_attribute_value(node, name, value)
+                else:
+                    add_attribute_fn = {
+                        TYPE_BOOL: tp.Dcc.add_bool_attribute, TYPE_LONG: tp.Dcc.add_integer_attribute,
+                        TYPE_DOUBLE: tp.Dcc.add_float_attribute}[attribute.attribute_type]
+                    range_kwargs = dict()
+                    if attribute.min_value is not None:
+                        range_kwargs['min_value'] = attribute.min_value
+                    if attribute.max_value is not None:
+                        range_kwargs['max_value'] = attribute.max_value
+                    add_attribute_fn(
+                        node, name, default_value=attribute.default, keyable=attribute.keyable, **range_kwargs)
+                    if name in values:
+                        tp.Dcc.set_attribute_value(node, name, values[name])
+                if attribute.locked:
+                    tp.Dcc.lock_attribute(node, name)
+                applied += 1
+
+        return applied
+
+    def _is_dcc_attribute_updated(self, node, attribute, values):
+        """
+        Internal function that returns whether or not an existing attribute already has its declared state
+        :param node: str
+        :param attribute: AttributeSpec
+        :param values: dict(str, object)
+        :return: bool
+        """
+
+        name = attribute.name
+        if tp.Dcc.is_attribute_locked(node, name) != attribute.locked:
+            return False
+        if name in values and tp.Dcc.get_attribute_value(node, name) != values[name]:
+            return False
+        if attribute.min_value is not None and tp.Dcc.attribute_query(node, name, min=True) != attribute.min_value:
+            return False
+        if attribute.max_value is not None and tp.Dcc.attribute_query(node, name, max=True) != attribute.max_value:
+            return False
+
+        return True
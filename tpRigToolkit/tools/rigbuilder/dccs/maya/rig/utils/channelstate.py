@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a declarative specification of the lock, hide and keyable state of control channels, so rigs
+can collect the state of all their channels during the build and apply it in a single pass
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+from collections import OrderedDict
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, metadata
+
+tp = lazyimport.lazy_module('tpDcc')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+TRANSLATE_ATTRIBUTES = ['translateX', 'translateY', 'translateZ']
+ROTATE_ATTRIBUTES = ['rotateX', 'rotateY', 'rotateZ']
+SCALE_ATTRIBUTES = ['scaleX', 'scaleY', 'scaleZ']
+VISIBILITY_ATTRIBUTES = ['visibility']
+
+
+class ChannelStateSpec(object):
+    """
+    Stores the desired state of node attributes: locked, hidden and keyable. None means that the state is not changed.
+    Declaring a channel keyable shows it and hiding a channel makes it not keyable, so the last declaration wins.
+    Once deferring is disabled (for example, after the rig build), declared states are applied immediately
+    """
+
+    def __init__(self, deferred=True):
+        self._states = OrderedDict()                # Maps nodes with the state of their attributes
+        self._deferred = deferred                   # Whether states are applied by apply or when declared
+
+    def __len__(self):
+        return sum(len(attributes) for attributes in self._states.values())
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def set_state(self, node, attributes, locked=None, hidden=None, keyable=None):
+        """
+        Declares the state of the given attributes of the given node
+        :param node: str
+        :param attributes: list(str)
+        :param locked: bool or None
+        :param hidden: bool or None
+        :param keyable: bool or None
+        """
+
+        if keyable:
+            hidden = False
+        elif hidden:
+            keyable = False
+
+        node_states = self._states.setdefault(node, OrderedDict())
+        for attribute in attributes:
+            state = node_states.setdefault(attribute, {'locked': None, 'hidden': None, 'keyable': None})
+            if locked is not None:
+                state['locked'] = locked
+            if hidden is not None:
+                state['hidden'] = hidden
+            if keyable is not None:
+                state['keyable'] = keyable
+
+        if not self._deferred:
+            self.apply()
+
+    def set_deferred(self, flag):
+        """
+        Sets whether or not declared states are stored until apply is called
+        :param flag: bool
+        """
+
+        self._deferred = flag
+        if not flag:
+            self.apply()
+
+    def lock_and_hide(self, node, attributes):
+        """
+        Declares given attributes as locked and hidden
+        :param node: str
+        :param attributes: list(str)
+        """
+
+        self.set_state(node, attributes, locked=True, hidden=True)
+
+    def unlock_and_show(self, node, attributes):
+        """
+        Declares given attributes as unlocked and keyable
+        :param node: str
+        :param attributes: list(str)
+        """
+
+        self.set_state(node, attributes, locked=False, keyable=True)
+
+    def get_state(self, node, attribute):
+        """
+        Returns the declared state of the given attribute
+        :param node: str
+        :param attribute: str
+        :return: dict or None, dictionary with locked, hidden and keyable keys
+        """
+
+        return self._states.get(node, dict()).get(attribute, None)
+
+    def get_locked_states(self, nodes, attributes):
+        """
+        Returns whether or not the given attributes of the given nodes are locked. Declared states have priority
+        over the current state of the scene, which is read in a single batch for the remaining attributes
+        :param nodes: list(str)
+        :param attributes: list(str)
+        :return: dict(str, list(bool)), locked state of each attribute of each node
+        """
+
+        locked_states = dict()
+        pending_nodes = list()
+        for node in nodes:
+            node_states = self._states.get(node, dict())
+            declared = [node_states.get(attribute, dict()).get('locked', None) for attribute in attributes]
+            locked_states[node] = declared
+            if None in declared:
+                pending_nodes.append(node)
+
+        scene_states = read_locked_states(pending_nodes, attributes)
+        for node in pending_nodes:
+            locked_states[node] = [
+                scene_locked if declared is None else declared
+                for declared, scene_locked in zip(locked_states[node], scene_states[node])]
+
+        return locked_states
+
+    def apply(self):
+        """
+        Applies all declared states to the scene in a single pass and clears them
+        :return: int, number of attributes whose state was applied
+        """
+
+        if not self._states:
+            return 0
+
+        if tp.is_maya():
+            applied = self._apply_maya()
+        else:
+            applied = self._apply_dcc()
+        self._states.clear()
+
+        return applied
+
+    def clear(self):
+        """
+        Removes all declared states
+        """
+
+        self._states.clear()
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _apply_maya(self):
+        """
+        Internal function that applies declared states through Maya API plugs, without executing any command
+        Previous states of the plugs are stored, so the whole pass is added to the undo queue as a single step
+        :return: int
+        """
+
+        plug_states = list()
+        for node, node_states in self._states.items():
+            node_fn = OpenMaya.MFnDependencyNode(metadata.get_node_object(node))
+            for attribute, state in node_states.items():
+                plug = node_fn.findPlug(attribute, False)
+                keyable, channel_box, locked = previous_state = _get_plug_state(plug)
+                if state['keyable'] is not None:
+                    keyable = state['keyable']
+                if state['hidden']:
+                    keyable = channel_box = False
+                elif state['hidden'] is not None and not keyable:
+                    channel_box = True
+                if state['locked'] is not None:
+                    locked = state['locked']
+                plug_states.append((plug, previous_state, (keyable, channel_box, locked)))
+
+        def _set_plug_states(state_index):
+            for plug_state in plug_states:
+                _set_plug_state(plug_state[0], plug_state[state_index])
+
+        _set_plug_states(2)
+        apiundo.add_undo(lambda: _set_plug_states(1), lambda: _set_plug_states(2))
+
+        return len(plug_states)
+
+    def _apply_dcc(self):
+        """
+        Internal function that applies declared states with DCC attribute functions
+        :return: int
+        """
+
+        applied = 0
+        for node, node_states in self._states.items():
+            for attribute, state in node_states.items():
+                if state['keyable']:
+                    tp.Dcc.keyable_attribute(node, attribute)
+                if state['hidden']:
+                    tp.Dcc.hide_attributes(node, [attribute])
+                elif state['hidden'] is not None:
+                    tp.Dcc.show_attribute(node, attribute)
+                if state['locked']:
+                    tp.Dcc.lock_attribute(node, attribute)
+                elif state['locked'] is not None:
+                    tp.Dcc.unlock_attribute(node, attribute)
+                applied += 1
+
+        return applied
+
+
+def read_locked_states(nodes, attributes):
+    """
+    Returns whether or not the given attributes of the given nodes are locked in the scene
+    :param nodes: list(str)
+    :param attributes: list(str)
+    :return: dict(str, list(bool))
+    """
+
+    if not nodes:
+        return dict()
+
+    locked_states = dict()
+    if tp.is_maya():
+        for node in nodes:
+            node_fn = OpenMaya.MFnDependencyNode(metadata.get_node_object(node))
+            locked_states[node] = [node_fn.findPlug(attribute, False).isLocked for attribute in attributes]
+    else:
+        for node in nodes:
+            locked_states[node] = [tp.Dcc.is_attribute_locked(node, attribute) for attribute in attributes]
+
+    return locked_states
+
+
+def _get_plug_state(plug):
+    """
+    Internal function that returns the keyable, channel box and locked state of the given plug
+    :param plug: OpenMaya.MPlug
+    :return: tuple(bool, bool, bool)
+    """
+
+    return plug.isKeyable, plug.isChannelBox, plug.isLocked
+
+
+def _set_plug_state(plug, state):
+    """
+    Internal function that sets the keyable, channel box and locked state of the given plug
+    :param plug: OpenMaya.MPlug
+    :param state: tuple(bool, bool, bool)
+    """
+
+    plug.isKeyable, plug.isChannelBox, plug.isLocked = state
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a registry of the control sets used by rigs during a build, so the control sets hierarchy is
+resolved only once per build and controls are added to their sets in bulk
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import contextlib
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+
+CONTROLS_SET_NAME = 'set_controls'
+
+_ACTIVE_REGISTRY = None
+_SHARED_REGISTRY = None
+
+
+@contextlib.contextmanager
+def control_sets_session():
+    """
+    Context manager that shares a control set registry between all the rigs created inside it (for example,
+    during a whole rig build), so each control set is resolved or created only once
+    :return: ControlSetRegistry
+    """
+
+    global _ACTIVE_REGISTRY
+    previous_registry = _ACTIVE_REGISTRY
+    _ACTIVE_REGISTRY = ControlSetRegistry()
+    try:
+        yield _ACTIVE_REGISTRY
+    finally:
+        _ACTIVE_REGISTRY = previous_registry
+
+
+def get_control_set_registry():
+    """
+    Returns the control set registry of the current session. If no session is active, the registry shared by all
+    rigs created in the current DCC session is returned
+    :return: ControlSetRegistry
+    """
+
+    global _SHARED_REGISTRY
+    if _ACTIVE_REGISTRY:
+        return _ACTIVE_REGISTRY
+    if not _SHARED_REGISTRY:
+        _SHARED_REGISTRY = ControlSetRegistry()
+
+    return _SHARED_REGISTRY
+
+
+class ControlSetRegistry(object):
+    """
+    Caches the control sets found or created in the scene and the parent of each one of them.
+    Cached sets can be deleted from the scene (for example, when a new scene is opened), so all the sets from the root
+    set to the set returned for a rig are checked and, if any of them does not exist anymore, the sets hierarchy is
+    resolved again
+    """
+
+    def __init__(self):
+        self._root_set = None                       # Name of the set that contains all rig control sets
+        self._sets = dict()                         # Maps set names with their scene set and parent set
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def get_root_set(self):
+        """
+        Returns the set that contains all the control sets of the scene, creating it if it does not exist
+        :return: str
+        """
+
+        if self._root_set:
+            return self._root_set
+
+        set_name = CONTROLS_SET_NAME
+        if not tp.Dcc.object_exists(set_name) or tp.Dcc.node_type(set_name) != 'objectSet':
+            sets = tp.Dcc.get_selection_groups(name='{}*'.format(set_name))
+            if sets:
+                set_name = sets[0]
+            else:
+                set_name = tp.Dcc.create_selection_group(name=tp.Dcc.find_unique_name(set_name), empty=True)
+        self._root_set = set_name
+
+        return self._root_set
+
+    def get_set(self, set_name, parent_set):
+        """
+        Returns given set, creating it if it does not exist, and makes sure it is a member of the given parent set
+        :param set_name: str
+        :param parent_set: str
+        :return: str
+        """
+
+        if set_name == parent_set:
+            return set_name
+        cached_set = self._sets.get(set_name, None)
+        if cached_set and cached_set[1] == parent_set:
+            return cached_set[0]
+
+        scene_set = set_name
+        if not tp.Dcc.object_exists(set_name):
+            scene_set = tp.Dcc.create_selection_group(name=set_name, empty=True) or set_name
+        tp.Dcc.add_node_to_selection_group(scene_set, parent_set, force=False)
+        self._sets[set_name] = (scene_set, parent_set)
+
+        return scene_set
+
+    def get_rig_set(self, custom_sets=None, description=None, side=None):
+        """
+        Returns the set where the controls of a rig are added: set_description_side, member of the given custom
+        sets hierarchy, member of the root control set
+        :param custom_sets: list(str) or None, names of the custom sets (without set_ prefix), from parent to child
+        :param description: str or None, description of the rig. If not given, the last custom set is returned
+        :param side: str or None, side of the rig
+        :return: str
+        """
+
+        set_path = self._resolve_rig_set(custom_sets, description, side)
+        if not all(tp.Dcc.object_exists(set_name) for set_name in set_path):
+            self.clear()
+            set_path = self._resolve_rig_set(custom_sets, description, side)
+
+        return set_path[-1]
+
+    def add_controls(self, set_name, controls):
+        """
+        Adds given controls to the given set with a single membership call
+        :param set_name: str
+        :param controls: list(str)
+        :return: int, number of controls added
+        """
+
+        controls = list(controls)
+        if not controls:
+            return 0
+
+        if tp.is_maya():
+            maya.cmds.sets(controls, add=set_name)
+        else:
+            for control_name in controls:
+                tp.Dcc.add_node_to_selection_group(control_name, set_name, force=False)
+
+        return len(controls)
+
+    def clear(self):
+        """
+        Clears all cached sets
+        """
+
+        self._root_set = None
+        self._sets.clear()
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _resolve_rig_set(self, custom_sets, description, side):
+        """
+        Internal function that returns the sets from the root set to the set where the controls of a rig are added
+        using cached sets
+        :param custom_sets: list(str) or None
+        :param description: str or None
+        :param side: str or None
+        :return: list(str)
+        """
+
+        set_path = [self.get_root_set()]
+        for set_name in custom_sets or list():
+            if set_name == set_path[-1]:
+                continue
+            set_path.append(self.get_set('set_{}'.format(set_name), set_path[-1]))
+
+        if description:
+            rig_set = 'set_{}_{}'.format(description, side) if side else 'set_{}'.format(description)
+            set_path.append(self.get_set(rig_set, set_path[-1]))
+
+        return set_path
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a columnar table used by rigs to store their controls, sub controls and control groups
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import bisect
+from array import array
+
+ROLE_CONTROL = 'control'
+ROLE_SUB_CONTROL = 'sub'
+ROLES = [ROLE_CONTROL, ROLE_SUB_CONTROL]
+
+
+class ControlTable(object):
+    """
+    Stores rig controls in columns: one row per control with its name, role (control or sub control) and parent
+    control row. Each group type (buffer, driver, ...) is stored in its own column. Rows are indexed by control name,
+    by role and by group type, so lookups do not need to scan all the controls of the rig
+    """
+
+    __slots__ = ('_names', '_rows', '_roles', '_parents', '_role_rows', '_sub_rows', '_group_columns', '_group_rows')
+
+    def __init__(self):
+        self._names = list()                        # Name of each control
+        self._rows = dict()                         # Maps control names with their rows
+        self._roles = array('b')                    # Role index of each control
+        self._parents = array('l')                  # Row of the parent control of each sub control (-1 if none)
+        self._role_rows = [array('l') for _ in ROLES]
+        self._sub_rows = dict()                     # Maps control rows with the rows of their sub controls
+        self._group_columns = dict()                # Maps group types with the group of each control (or None)
+        self._group_rows = dict()                   # Maps group types with the rows that have a group of that type
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __iter__(self):
+        return iter(self._names)
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def add_control(self, name, role=ROLE_CONTROL, parent=None):
+        """
+        Adds a new control into the table
+        :param name: str
+        :param role: str, ROLE_CONTROL or ROLE_SUB_CONTROL
+        :param parent: str or None, control the sub control belongs to. If not given, sub controls belong to the last
+            added control
+        :return: int, row of the control
+        """
+
+        if name in self._rows:
+            raise ValueError('Control "{}" already exists in control table'.format(name))
+
+        role_index = ROLES.index(role)
+        if parent is not None:
+            parent_row = self._rows[parent]
+        elif role == ROLE_SUB_CONTROL and self._role_rows[0]:
+            parent_row = self._role_rows[0][-1]
+        else:
+            parent_row = -1
+
+        row = len(self._names)
+        self._names.append(name)
+        self._rows[name] = row
+        self._roles.append(role_index)
+        self._parents.append(parent_row)
+        self._role_rows[role_index].append(row)
+        if parent_row >= 0:
+            self._sub_rows.setdefault(parent_row, array('l')).append(row)
+        for group_column in self._group_columns.values():
+            group_column.append(None)
+
+        return row
+
+    def get_row(self, name):
+        """
+        Returns the row of the given control
+        :param name: str
+        :return: int, -1 if control is not in the table
+        """
+
+        return self._rows.get(name, -1)
+
+    def get_controls(self, role=None):
+        """
+        Returns the controls of the given role in creation order
+        :param role: str or None, if not given all controls are returned
+        :return: list(str)
+        """
+
+        if role is None:
+            return list(self._names)
+
+        names = self._names
+        return [names[row] for row in self._role_rows[ROLES.index(role)]]
+
+    def get_role(self, name):
+        """
+        Returns the role of the given control
+        :param name: str
+        :return: str
+        """
+
+        return ROLES[self._roles[self._rows[name]]]
+
+    def get_parent(self, name):
+        """
+        Returns the control the given sub control belongs to
+        :param name: str
+        :return: str or None
+        """
+
+        parent_row = self._parents[self._rows[name]]
+
+        return self._names[parent_row] if parent_row >= 0 else None
+
+    def get_sub_controls(self, name):
+        """
+        Returns the sub controls of the given control
+        :param name: str
+        :return: list(str)
+        """
+
+        names = self._names
+        return [names[row] for row in self._sub_rows.get(self._rows[name], ())]
+
+    def get_last_sub_controls(self):
+        """
+        Returns, for each control, its last sub control or None if the control has no sub controls
+        :return: list(str or None)
+        """
+
+        names = self._names
+        last_sub_controls = list()
+        for row in self._role_rows[0]:
+            sub_rows = self._sub_rows.get(row, None)
+            last_sub_controls.append(names[sub_rows[-1]] if sub_rows else None)
+
+        return last_sub_controls
+
+    def set_group(self, name, group_type, group_name):
+        """
+        Sets the group of the given type of the given control
+        :param name: str, control name
+        :param group_type: str, 'buffer' or 'driver'
+        :param group_name: str
+        """
+
+        row = self._rows[name]
+        group_column = self._group_columns.get(group_type, None)
+        if group_column is None:
+            group_column = self._group_columns[group_type] = [None] * len(self._names)
+            self._group_rows[group_type] = array('l')
+        if group_column[row] is None:
+            # Rows are kept sorted, so groups are returned in control creation order
+            group_rows = self._group_rows[group_type]
+            if not group_rows or group_rows[-1] < row:
+                group_rows.append(row)
+            else:
+                bisect.insort(group_rows, row)
+        group_column[row] = group_name
+
+    def get_group(self, name, group_type, default=None):
+        """
+        Returns the group of the given type of the given control
+        :param name: str, control name
+        :param group_type: str, 'buffer' or 'driver'
+        :param default: object, value returned if control has no group of the given type
+        :return: str or object
+        """
+
+        group_column = self._group_columns.get(group_type, None)
+        if group_column is None:
+            return default
+        group_name = group_column[self._rows[name]]
+
+        return default if group_name is None else group_name
+
+    def get_group_types(self, name):
+        """
+        Returns the types of the groups of the given control
+        :param name: str
+        :return: list(str)
+        """
+
+        row = self._rows[name]
+
+        return [group_type for group_type, column in self._group_columns.items() if column[row] is not None]
+
+    def get_groups(self, group_type, role=None):
+        """
+        Returns the groups of the given type of the controls of the given role
+        :param group_type: str, 'buffer' or 'driver'
+        :param role: str or None, if not given groups of all controls are returned
+        :return: list(str)
+        """
+
+        group_column = self._group_columns.get(group_type, None)
+        if group_column is None:
+            return list()
+
+        group_rows = self._group_rows[group_type]
+        if role is None:
+            return [group_column[row] for row in group_rows]
+
+        # We iterate the smallest index: rows of the role or rows with a group of the given type
+        role_index = ROLES.index(role)
+        role_rows = self._role_rows[role_index]
+        if len(role_rows) < len(group_rows):
+            return [group_column[row] for row in role_rows if group_column[row] is not None]
+
+        roles = self._roles
+
+        return [group_column[row] for row in group_rows if roles[row] == role_index]
+
+    def clear(self):
+        """
+        Removes all controls from the table
+        """
+
+        self.__init__()
+
+
+class ControlTableView(object):
+    """
+    Dictionary like view of a control table that maps each control with a dictionary of its groups
+    ({'buffer': group, 'subs': [sub controls]}). Used to keep rigs that access control dictionaries working
+    """
+
+    __slots__ = ('_table',)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def __iter__(self):
+        return iter(self._table)
+
+    def __getitem__(self, name):
+        if name not in self._table:
+            raise KeyError(name)
+
+        return ControlTableRow(self._table, name)
+
+    def __setitem__(self, name, value):
+        if name not in self._table:
+            self._table.add_control(name)
+        for key, group_name in value.items():
+            ControlTableRow(self._table, name)[key] = group_name
+
+    def keys(self):
+        return self._table.get_controls()
+
+    def values(self):
+        return [ControlTableRow(self._table, name) for name in self._table]
+
+    def items(self):
+        return [(name, ControlTableRow(self._table, name)) for name in self._table]
+
+    def get(self, name, default=None):
+        return self[name] if name in self._table else default
+
+
+class ControlTableRow(object):
+    """
+    Dictionary like view of the groups of a control stored in a control table
+    """
+
+    __slots__ = ('_table', '_name')
+
+    def __init__(self, table, name):
+        self._table = table
+        self._name = name
+
+    def __contains__(self, key):
+        if key == 'subs':
+            return bool(self._table.get_sub_controls(self._name))
+
+        return self._table.get_group(self._name, key) is not None
+
+    def __getitem__(self, key):
+        if key == 'subs':
+            sub_controls = self._table.get_sub_controls(self._name)
+            if not sub_controls:
+                raise KeyError(key)
+            return sub_controls
+
+        group_name = self._table.get_group(self._name, key)
+        if group_name is None:
+            raise KeyError(key)
+
+        return group_name
+
+    def __setitem__(self, key, value):
+        if key == 'subs':
+            raise KeyError('Sub controls must be added to the control table with add_control')
+
+        self._table.set_group(self._name, key, value)
+
+    def keys(self):
+        return self._table.get_group_types(self._name) + (['subs'] if 'subs' in self else list())
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
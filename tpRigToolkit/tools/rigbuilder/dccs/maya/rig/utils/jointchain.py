@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to duplicate joint chains from the matrices of their joints, creating all the new
+joints already named, oriented and parented with a single batch of DG operations
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import math
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport, matrixmath
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo
+
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+AXES = 'XYZ'
+
+# Rotate orders, sorted by the value of the rotateOrder attribute
+ROTATE_ORDERS = ('xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx')
+
+# Joint attributes whose values are copied from the original joints, with the type of their values
+COPIED_ATTRIBUTES = (
+    ('preferredAngleX', 'angle'), ('preferredAngleY', 'angle'), ('preferredAngleZ', 'angle'),
+    ('segmentScaleCompensate', 'bool'), ('radius', 'double'), ('side', 'int'), ('type', 'int'),
+    ('otherType', 'string'), ('drawLabel', 'bool'))
+
+
+def get_chain_parents(joints, parents, build_hierarchy=False):
+    """
+    Returns the index of the parent of each joint of a duplicated chain
+    :param joints: list(str), joints to duplicate
+    :param parents: list(list(str)), ancestors of each joint, from its parent to the root of the scene
+    :param build_hierarchy: bool, if True each joint is parented to the previous one. Otherwise each joint is parented
+        to its nearest ancestor that is also duplicated
+    :return: list(int), index of the parent of each joint, -1 for joints parented to the chain parent
+    """
+
+    if build_hierarchy:
+        return list(range(-1, len(joints) - 1))
+
+    joint_indices = dict((joint, i) for i, joint in enumerate(joints))
+    chain_parents = list()
+    for ancestors in parents:
+        parent_index = -1
+        for ancestor in ancestors:
+            if ancestor in joint_indices:
+                parent_index = joint_indices[ancestor]
+                break
+        chain_parents.append(parent_index)
+
+    return chain_parents
+
+
+def get_duplicate_name(joint, replace=None):
+    """
+    Returns the name of the duplicate of the given joint
+    :param joint: str
+    :param replace: list(str) or None, old and new strings used to rename the joint
+    :return: str
+    """
+
+    name = joint.rsplit('|', 1)[-1]
+
+    return name.replace(replace[0], replace[1]) if replace else name
+
+
+def get_joint_orient_matrix(local_matrix, rotation=(0.0, 0.0, 0.0), rotate_axis=(0.0, 0.0, 0.0), rotate_order='xyz'):
+    """
+    Returns the joint orient a joint needs to have the given local matrix with the given rotation values and rotate
+    axis. Joint local matrix is scale * rotateAxis * rotate * jointOrient * translate, so joint orient is the rotation
+    left after removing the rotate axis and the rotation values from the local rotation
+    :param local_matrix: list(float), 16 values
+    :param rotation: list(float), rotation values of the joint, in degrees
+    :param rotate_axis: list(float), rotate axis of the joint, in degrees
+    :param rotate_order: str, rotate order of the rotation values of the joint
+    :return: list(float), rotation matrix of the joint orient
+    """
+
+    rotate_matrix = matrixmath.get_rotate_matrix(local_matrix)
+    offset_matrix = matrixmath.multiply_matrices(
+        matrixmath.get_euler_matrix(rotate_axis), matrixmath.get_euler_matrix(rotation, rotate_order))
+
+    return matrixmath.multiply_matrices(matrixmath.inverse_matrix(offset_matrix), rotate_matrix)
+
+
+def duplicate_chain(joints, parent=None, replace=None, build_hierarchy=False):
+    """
+    Duplicates the given joints. Local matrices, rotations and joint orients of the original joints are read once,
+    new joints are created, renamed and parented with a single DAG modifier and all their attributes are set with a
+    single DG modifier. Both modifiers are added to the undo queue as a single undo step.
+    New joints keep the world transform, the rotation values and the rotate axis of the original joints, the rest of
+    their orientation is stored in their joint orient. Preferred angles, segment scale compensate, radius and labels
+    (COPIED_ATTRIBUTES) are copied too. User defined attributes are not copied
+    :param joints: list(str), joints to duplicate
+    :param parent: str or None, node where the root of the new chain is parented
+    :param replace: list(str) or None, old and new strings used to rename the new joints
+    :param build_hierarchy: bool, if True each new joint is parented to the previous one and rotation values are
+        frozen into joint orients. Otherwise new joints keep the hierarchy of the original joints
+    :return: list(str), new joints
+    """
+
+    if not joints:
+        return list()
+
+    selection = OpenMaya.MSelectionList()
+    for joint in joints:
+        selection.add(joint)
+    dag_paths = [selection.getDagPath(i) for i in range(len(joints))]
+    world_matrices = [dag_path.inclusiveMatrix() for dag_path in dag_paths]
+    chain_parents = get_chain_parents(
+        [dag_path.fullPathName() for dag_path in dag_paths],
+        [_get_ancestors(dag_path) for dag_path in dag_paths], build_hierarchy=build_hierarchy)
+
+    parent_object = OpenMaya.MObject.kNullObj
+    parent_world_matrix = OpenMaya.MMatrix()
+    if parent:
+        parent_selection = OpenMaya.MSelectionList()
+        parent_selection.add(parent)
+        parent_path = parent_selection.getDagPath(0)
+        parent_object = parent_path.node()
+        parent_world_matrix = parent_path.inclusiveMatrix()
+
+    dag_modifier = OpenMaya.MDagModifier()
+    new_objects = list()
+    used_names = set()
+    for i, joint in enumerate(joints):
+        chain_parent = chain_parents[i]
+        new_parent = new_objects[chain_parent] if chain_parent >= 0 else parent_object
+        new_object = dag_modifier.createNode('joint', new_parent)
+        dag_modifier.renameNode(new_object, _get_unique_name(get_duplicate_name(joint, replace), used_names))
+        new_objects.append(new_object)
+    dag_modifier.doIt()
+
+    dg_modifier = OpenMaya.MDGModifier()
+    for i, dag_path in enumerate(dag_paths):
+        chain_parent = chain_parents[i]
+        new_parent_matrix = world_matrices[chain_parent] if chain_parent >= 0 else parent_world_matrix
+        local_matrix = OpenMaya.MTransformationMatrix(world_matrices[i] * new_parent_matrix.inverse())
+        source_fn = OpenMaya.MFnDependencyNode(dag_path.node())
+        rotate_order = source_fn.findPlug('rotateOrder', False).asInt()
+        rotation = OpenMaya.MEulerRotation(0.0, 0.0, 0.0, rotate_order)
+        if not build_hierarchy:
+            rotation = OpenMaya.MFnTransform(dag_path).rotation(asQuaternion=False)
+        rotate_axis = OpenMaya.MEulerRotation(
+            *[source_fn.findPlug('rotateAxis{}'.format(axis), False).asMAngle().asRadians() for axis in AXES])
+
+        joint_orient_matrix = get_joint_orient_matrix(
+            _get_matrix_values(local_matrix.asMatrix()), _get_degrees(rotation), _get_degrees(rotate_axis),
+            rotate_order=ROTATE_ORDERS[rotate_order])
+        joint_orient = OpenMaya.MTransformationMatrix(OpenMaya.MMatrix(joint_orient_matrix)).rotation(
+            asQuaternion=False)
+        values = {
+            'translate': local_matrix.translation(OpenMaya.MSpace.kTransform),
+            'rotate': rotation, 'rotateAxis': rotate_axis, 'jointOrient': joint_orient,
+            'scale': local_matrix.scale(OpenMaya.MSpace.kTransform)}
+        new_fn = OpenMaya.MFnDependencyNode(new_objects[i])
+        for attribute_name, value in values.items():
+            for axis_index, axis in enumerate(AXES):
+                plug = new_fn.findPlug('{}{}'.format(attribute_name, axis), False)
+                if attribute_name in ('rotate', 'rotateAxis', 'jointOrient'):
+                    dg_modifier.newPlugValueMAngle(plug, OpenMaya.MAngle(value[axis_index]))
+                else:
+                    dg_modifier.newPlugValueDouble(plug, value[axis_index])
+        dg_modifier.newPlugValueInt(new_fn.findPlug('rotateOrder', False), rotate_order)
+        _copy_attributes(dg_modifier, source_fn, new_fn)
+        if chain_parent >= 0:
+            parent_fn = OpenMaya.MFnDependencyNode(new_objects[chain_parent])
+            dg_modifier.connect(parent_fn.findPlug('scale', False), new_fn.findPlug('inverseScale', False))
+    dg_modifier.doIt()
+    apiundo.commit(dag_modifier, dg_modifier)
+
+    return [OpenMaya.MFnDagNode(new_object).partialPathName() for new_object in new_objects]
+
+
+def _copy_attributes(modifier, source_fn, target_fn):
+    """
+    Internal function that copies the values of the COPIED_ATTRIBUTES of the given source joint into the given joint
+    :param modifier: OpenMaya.MDGModifier
+    :param source_fn: OpenMaya.MFnDependencyNode
+    :param target_fn: OpenMaya.MFnDependencyNode
+    """
+
+    for attribute_name, value_type in COPIED_ATTRIBUTES:
+        if not source_fn.hasAttribute(attribute_name):
+            continue
+        source_plug = source_fn.findPlug(attribute_name, False)
+        target_plug = target_fn.findPlug(attribute_name, False)
+        if value_type == 'angle':
+            modifier.newPlugValueMAngle(target_plug, source_plug.asMAngle())
+        elif value_type == 'double':
+            modifier.newPlugValueDouble(target_plug, source_plug.asDouble())
+        elif value_type == 'bool':
+            modifier.newPlugValueBool(target_plug, source_plug.asBool())
+        elif value_type == 'int':
+            modifier.newPlugValueInt(target_plug, source_plug.asInt())
+        else:
+            modifier.newPlugValueString(target_plug, source_plug.asString())
+
+
+def _get_ancestors(dag_path):
+    """
+    Internal function that returns the full path of the ancestors of the given DAG path, from its parent to the root
+    :param dag_path: OpenMaya.MDagPath
+    :return: list(str)
+    """
+
+    full_path = dag_path.fullPathName()
+    tokens = full_path.split('|')
+
+    return ['|'.join(tokens[:i]) for i in range(len(tokens) - 1, 1, -1)]
+
+
+def _get_degrees(rotation):
+    """
+    Internal function that returns the angles of the given euler rotation in degrees
+    :param rotation: OpenMaya.MEulerRotation
+    :return: list(float)
+    """
+
+    return [math.degrees(rotation[axis_index]) for axis_index in range(3)]
+
+
+def _get_matrix_values(matrix):
+    """
+    Internal function that returns the values of the given Maya matrix
+    :param matrix: OpenMaya.MMatrix
+    :return: list(float)
+    """
+
+    return [matrix.getElement(row, column) for row in range(4) for column in range(4)]
+
+
+def _get_unique_name(name, used_names):
+    """
+    Internal function that returns a name that is not used by any node of the scene or by the given names
+    :param name: str
+    :param used_names: set(str), names given to the new nodes. Returned name is added to this set
+    :return: str
+    """
+
+    unique_name = name
+    index = 1
+    while unique_name in used_names or _node_exists(unique_name):
+        unique_name = '{}{}'.format(name, index)
+        index += 1
+    used_names.add(unique_name)
+
+    return unique_name
+
+
+def _node_exists(name):
+    """
+    Internal function that returns whether or not a node with the given name exists, without executing any command
+    :param name: str
+    :return: bool
+    """
+
+    try:
+        OpenMaya.MSelectionList().add(name)
+    except RuntimeError:
+        return False
+
+    return True
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to attach joint chains to other chains with a matrix blend network. Each target joint
+is driven by one blendMatrix node, that blends the world matrices of all the chains attached to it, and one multMatrix
+node, that connects the blended matrix to the offset parent matrix of the joint. Chains can be attached one by one
+and switch weights are shared by all the joints of a chain.
+Offset parent matrices and blendMatrix nodes are only available in Maya 2020 or newer
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, attributeschema, metadata
+
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+
+def get_chain_count(joint):
+    """
+    Returns the number of chains attached to the given joint with a matrix blend network
+    :param joint: str
+    :return: int
+    """
+
+    blend_object = _get_blend_node(_get_dag_paths([joint])[0])
+    if blend_object is None:
+        return 0
+
+    return _get_input_count(blend_object)
+
+
+def attach_chain(source_chain, target_chain, switch_node=None, switch_attribute=None):
+    """
+    Attaches the given source chain to the given target chain. The first attached chain creates the blend network of
+    the target chain, the following ones are added as new targets of the existing network
+    :param source_chain: list(str)
+    :param target_chain: list(str)
+    :param switch_node: str or None, node that contains the switch attribute. Target chain root is used by default
+    :param switch_attribute: str or None, attribute whose value (from 0 to the number of chains minus 1) selects the
+        chain that drives the target chain. If not given, last attached chain drives the target chain
+    :return: int, index of the source chain in the switch
+    """
+
+    if len(source_chain) != len(target_chain):
+        raise ValueError(
+            'Source chain has {} joints and target chain has {} joints'.format(len(source_chain), len(target_chain)))
+    if not source_chain:
+        return -1
+
+    source_paths = _get_dag_paths(source_chain)
+    target_paths = _get_dag_paths(target_chain)
+    blend_objects = [_get_blend_node(target_path) for target_path in target_paths]
+    if any(blend_object is None for blend_object in blend_objects):
+        if any(blend_object is not None for blend_object in blend_objects):
+            raise ValueError('Target chain is partially attached: {}'.format(target_chain))
+        blend_objects = list()
+    chain_index = _get_input_count(blend_objects[0]) if blend_objects else 0
+
+    switch_plug = None
+    if switch_attribute:
+        switch_node = switch_node or target_chain[0]
+        switch_attributes = attributeschema.AttributeSchema([attributeschema.AttributeSpec(
+            switch_attribute, attributeschema.TYPE_DOUBLE, default=0.0, min_value=0.0, max_value=float(chain_index),
+            keyable=True)])
+        switch_attributes.apply(switch_node)
+        switch_fn = OpenMaya.MFnDependencyNode(metadata.get_node_object(switch_node))
+        switch_plug = switch_fn.findPlug(switch_attribute, False)
+
+    modifier = OpenMaya.MDGModifier()
+    if not blend_objects:
+        for source_path, target_path in zip(source_paths, target_paths):
+            blend_objects.append(_create_network(modifier, source_path, target_path))
+    else:
+        weight_plug = None
+        if switch_plug is not None:
+            weight_object = modifier.createNode('remapValue')
+            modifier.renameNode(weight_object, '{}_{}{}'.format(
+                _get_short_name(target_paths[0]), switch_plug.partialName(useLongNames=True), chain_index))
+            weight_fn = OpenMaya.MFnDependencyNode(weight_object)
+            modifier.newPlugValueDouble(weight_fn.findPlug('inputMin', False), chain_index - 1)
+            modifier.newPlugValueDouble(weight_fn.findPlug('inputMax', False), chain_index)
+            modifier.connect(switch_plug, weight_fn.findPlug('inputValue', False))
+            weight_plug = weight_fn.findPlug('outValue', False)
+        for source_path, blend_object in zip(source_paths, blend_objects):
+            blend_fn = OpenMaya.MFnDependencyNode(blend_object)
+            target_plug = blend_fn.findPlug('target', False).elementByLogicalIndex(chain_index - 1)
+            modifier.connect(
+                _get_world_matrix_plug(source_path), target_plug.child(blend_fn.attribute('targetMatrix')))
+            if weight_plug is not None:
+                modifier.connect(weight_plug, target_plug.child(blend_fn.attribute('weight')))
+    modifier.doIt()
+    apiundo.commit(modifier)
+
+    return chain_index
+
+
+def _create_network(modifier, source_path, target_path):
+    """
+    Internal function that creates the blend network of a target joint, driven by the given source joint
+    The multMatrix node removes the rest local matrix of the joint and its parent world matrix from the blended world
+    matrix, so joint keeps its translate, rotate, scale and joint orient values
+    :param modifier: OpenMaya.MDGModifier
+    :param source_path: OpenMaya.MDagPath
+    :param target_path: OpenMaya.MDagPath
+    :return: OpenMaya.MObject, blendMatrix node
+    """
+
+    target_name = _get_short_name(target_path)
+    target_fn = OpenMaya.MFnDependencyNode(target_path.node())
+    blend_object = modifier.createNode('blendMatrix')
+    mult_object = modifier.createNode('multMatrix')
+    modifier.renameNode(blend_object, '{}_attachBlend'.format(target_name))
+    modifier.renameNode(mult_object, '{}_attachMult'.format(target_name))
+    blend_fn = OpenMaya.MFnDependencyNode(blend_object)
+    mult_fn = OpenMaya.MFnDependencyNode(mult_object)
+
+    rest_matrix = OpenMaya.MFnTransform(target_path).transformationMatrix()
+    matrix_plug = mult_fn.findPlug('matrixIn', False)
+    modifier.newPlugValue(matrix_plug.elementByLogicalIndex(0), OpenMaya.MFnMatrixData().create(rest_matrix.inverse()))
+    modifier.connect(blend_fn.findPlug('outputMatrix', False), matrix_plug.elementByLogicalIndex(1))
+    modifier.connect(
+        target_fn.findPlug('parentInverseMatrix', False).elementByLogicalIndex(0), matrix_plug.elementByLogicalIndex(2))
+    modifier.connect(_get_world_matrix_plug(source_path), blend_fn.findPlug('inputMatrix', False))
+    modifier.connect(mult_fn.findPlug('matrixSum', False), target_fn.findPlug('offsetParentMatrix', False))
+
+    return blend_object
+
+
+def _get_blend_node(dag_path):
+    """
+    Internal function that returns the blendMatrix node that drives the given joint
+    :param dag_path: OpenMaya.MDagPath
+    :return: OpenMaya.MObject or None
+    """
+
+    offset_plug = OpenMaya.MFnDependencyNode(dag_path.node()).findPlug('offsetParentMatrix', False)
+    if not offset_plug.isDestination:
+        return None
+    mult_fn = OpenMaya.MFnDependencyNode(offset_plug.source().node())
+    if mult_fn.typeName != 'multMatrix':
+        return None
+    blend_plug = mult_fn.findPlug('matrixIn', False).elementByLogicalIndex(1)
+    if not blend_plug.isDestination:
+        return None
+    blend_object = blend_plug.source().node()
+
+    return blend_object if OpenMaya.MFnDependencyNode(blend_object).typeName == 'blendMatrix' else None
+
+
+def _get_input_count(blend_object):
+    """
+    Internal function that returns the number of matrices blended by the given blendMatrix node
+    :param blend_object: OpenMaya.MObject
+    :return: int
+    """
+
+    return 1 + OpenMaya.MFnDependencyNode(blend_object).findPlug('target', False).numConnectedElements()
+
+
+def _get_dag_paths(nodes):
+    """
+    Internal function that returns the DAG paths of the given nodes
+    :param nodes: list(str)
+    :return: list(OpenMaya.MDagPath)
+    """
+
+    selection = OpenMaya.MSelectionList()
+    for node in nodes:
+        selection.add(node)
+
+    return [selection.getDagPath(i) for i in range(len(nodes))]
+
+
+def _get_world_matrix_plug(dag_path):
+    """
+    Internal function that returns the world matrix plug of the given DAG path instance
+    :param dag_path: OpenMaya.MDagPath
+    :return: OpenMaya.MPlug
+    """
+
+    world_plug = OpenMaya.MFnDependencyNode(dag_path.node()).findPlug('worldMatrix', False)
+
+    return world_plug.elementByLogicalIndex(dag_path.instanceNumber())
+
+
+def _get_short_name(dag_path):
+    """
+    Internal function that returns the name of the given DAG path without its parents
+    :param dag_path: OpenMaya.MDagPath
+    :return: str
+    """
+
+    return dag_path.partialPathName().rsplit('|', 1)[-1]
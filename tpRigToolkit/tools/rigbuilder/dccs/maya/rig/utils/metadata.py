@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to write and read the message attributes that link rig groups with their controls,
+sub controls and joints
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import re
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo
+
+tp = lazyimport.lazy_module('tpDcc')
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+LAYOUT_ATTRIBUTES = 'attributes'        # One message attribute per node: control1, control2, ...
+LAYOUT_MULTI = 'multi'                  # One multi message attribute per description: controls[0], controls[1], ...
+MESSAGE_DESCRIPTIONS = ['control', 'subControl', 'joint']
+
+_MULTI_ELEMENT_REGEX = re.compile(r'^s\[(\d+)\]$')
+_ATTRIBUTE_INDEX_REGEX = re.compile(r'^(\d+)$')
+
+
+def get_multi_attribute_name(description):
+    """
+    Returns the name of the multi message attribute used to store the messages of the given description
+    :param description: str, for example: control
+    :return: str, for example: controls
+    """
+
+    return '{}s'.format(description)
+
+
+def parse_message_attribute(attribute_name, descriptions=None):
+    """
+    Returns the description and index (starting at 1) of the given message attribute. Both layouts are supported:
+    control3 and controls[2] return ('control', 3)
+    :param attribute_name: str
+    :param descriptions: list(str) or None
+    :return: tuple(str, int) or None, None if the attribute is not a message attribute of the given descriptions
+    """
+
+    for description in descriptions or MESSAGE_DESCRIPTIONS:
+        if not attribute_name.startswith(description):
+            continue
+        suffix = attribute_name[len(description):]
+        element_match = _MULTI_ELEMENT_REGEX.match(suffix)
+        if element_match:
+            return description, int(element_match.group(1)) + 1
+        index_match = _ATTRIBUTE_INDEX_REGEX.match(suffix)
+        if index_match:
+            return description, int(index_match.group(1))
+
+    return None
+
+
+def connect_messages(nodes, target_node, description, add_aliases=True):
+    """
+    Connects the message of the given nodes into the multi message attribute of the given description of the target
+    node. Attribute creation and all connections are done with a single DG modifier, that is added to the undo queue.
+    Empty nodes are skipped but keep their index, so elements of different descriptions stay aligned.
+    Message attributes of the old layout (description1..N) are replaced by aliases of the multi attribute elements
+    :param nodes: list(str or None)
+    :param target_node: str
+    :param description: str
+    :param add_aliases: bool, whether or not to add description1..N aliases, so old attribute names are still valid
+    :return: int, number of connected nodes
+    """
+
+    attribute_name = get_multi_attribute_name(description)
+    target_object = get_node_object(target_node)
+    target_fn = OpenMaya.MFnDependencyNode(target_object)
+    current_aliases = dict(target_fn.getAliasList()) if add_aliases else dict()
+    aliases = list()
+    for i, node in enumerate(nodes):
+        if node and add_aliases:
+            aliases.append(('{}{}'.format(description, i + 1), '{}[{}]'.format(attribute_name, i)))
+
+    modifier = OpenMaya.MDGModifier()
+    if not target_fn.hasAttribute(attribute_name):
+        message_fn = OpenMaya.MFnMessageAttribute()
+        attribute = message_fn.create(attribute_name, attribute_name)
+        message_fn.array = True
+        modifier.addAttribute(target_object, attribute)
+    for alias_name, _ in aliases:
+        if alias_name not in current_aliases and target_fn.hasAttribute(alias_name):
+            modifier.removeAttribute(target_object, target_fn.attribute(alias_name))
+    modifier.doIt()
+
+    array_plug = target_fn.findPlug(attribute_name, False)
+    connected = 0
+    for i, node in enumerate(nodes):
+        if not node:
+            continue
+        source_plug = OpenMaya.MFnDependencyNode(get_node_object(node)).findPlug('message', False)
+        modifier.connect(source_plug, array_plug.elementByLogicalIndex(i))
+        connected += 1
+    modifier.doIt()
+
+    aliases = [alias for alias in aliases if current_aliases.get(alias[0], None) != alias[1]]
+    removed_aliases = [(alias_name, current_aliases[alias_name]) for alias_name, _ in aliases
+                       if alias_name in current_aliases]
+
+    def _set_aliases(aliases_to_add, aliases_to_remove):
+        for alias_name, plug_name in aliases_to_remove:
+            target_fn.setAlias(alias_name, plug_name, _get_plug(target_node, plug_name), add=False)
+        for alias_name, plug_name in aliases_to_add:
+            target_fn.setAlias(alias_name, plug_name, _get_plug(target_node, plug_name), add=True)
+
+    def _undo():
+        _set_aliases(removed_aliases, aliases)
+        modifier.undoIt()
+
+    def _redo():
+        modifier.doIt()
+        _set_aliases(aliases, removed_aliases)
+
+    _set_aliases(aliases, removed_aliases)
+    apiundo.add_undo(_undo, _redo)
+
+    return connected
+
+
+def get_rig_messages(node, descriptions=None):
+    """
+    Returns all the nodes connected to the message attributes of the given node with a single query.
+    Both layouts are supported
+    :param node: str, rig group
+    :param descriptions: list(str) or None, descriptions to return
+    :return: dict(str, list(str)), nodes of each description sorted by their index
+    """
+
+    descriptions = descriptions or MESSAGE_DESCRIPTIONS
+    connections = maya.cmds.listConnections(
+        node, source=True, destination=False, connections=True, plugs=False, skipConversionNodes=True) or list()
+
+    indexed_nodes = dict((description, dict()) for description in descriptions)
+    for i in range(0, len(connections), 2):
+        parsed_attribute = parse_message_attribute(connections[i].split('.', 1)[-1], descriptions)
+        if parsed_attribute:
+            indexed_nodes[parsed_attribute[0]][parsed_attribute[1]] = connections[i + 1]
+
+    return dict(
+        (description, [nodes[index] for index in sorted(nodes)]) for description, nodes in indexed_nodes.items())
+
+
+def get_messages(node, description):
+    """
+    Returns all the nodes connected to the message attributes of the given description of the given node
+    :param node: str, rig group
+    :param description: str
+    :return: list(str)
+    """
+
+    return get_rig_messages(node, [description])[description]
+
+
+def get_message(node, description, index):
+    """
+    Returns the node connected to the message attribute of the given description and index of the given node
+    :param node: str, rig group
+    :param description: str
+    :param index: int, index of the message (starting at 1)
+    :return: str or None
+    """
+
+    attribute_name = get_multi_attribute_name(description)
+    if maya.cmds.attributeQuery(attribute_name, node=node, exists=True):
+        connections = maya.cmds.listConnections(
+            '{}.{}[{}]'.format(node, attribute_name, index - 1), source=True, destination=False)
+        return connections[0] if connections else None
+
+    return tp.Dcc.get_message_input(node, '{}{}'.format(description, index))
+
+
+def get_node_object(node):
+    """
+    Returns the MObject of the given node
+    :param node: str
+    :return: OpenMaya.MObject
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(node)
+
+    return selection.getDependNode(0)
+
+
+def _get_plug(node, attribute_name):
+    """
+    Internal function that returns the plug of the given attribute of the given node
+    :param node: str
+    :param attribute_name: str, attribute name, it can be an element of a multi attribute (for example, controls[0])
+    :return: OpenMaya.MPlug
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add('{}.{}'.format(node, attribute_name))
+
+    return selection.getPlug(0)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to resolve mirror names and sides with the naming rule of the current project,
+cached per naming rule content, so rig components do not resolve them again on each run
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import weakref
+import hashlib
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport, mirrormap
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import skeleton
+
+api = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.api')
+
+# Naming rule attributes that define how names are solved
+RULE_ATTRIBUTES = ('name', 'expression', 'iterator_format')
+
+_SIDES = dict()
+_SESSION_MIRROR_MAP = dict()
+
+
+def get_cache_key():
+    """
+    Returns the key used to cache mirror maps and sides: hash of the content of the naming rule of the current
+    project, so an edited rule gets a new key. Edited tokens keep the key, so they need a clear_cache call
+    :return: str or None, None if there is no current project or it has no naming rule
+    """
+
+    current_project = api.get_current_project()
+    if not current_project:
+        return None
+    rule = current_project.get_name_rule()
+    if not rule:
+        return None
+
+    rule_content = repr([(attribute, getattr(rule, attribute, None)) for attribute in RULE_ATTRIBUTES])
+
+    return hashlib.sha1(rule_content.encode('utf-8')).hexdigest()
+
+
+def get_mirror_map():
+    """
+    Returns the mirror map of the naming rule of the current project. If a skeleton session is active, the map is
+    created once per session with all the nodes of the skeleton. Mirror names are cached per naming rule, so they
+    are shared between sessions
+    :return: mirrormap.MirrorMap
+    """
+
+    cache_key = get_cache_key()
+    mirror_map = mirrormap.get_mirror_map(cache_key, api.get_mirror_name)
+    skeleton_model = skeleton.get_skeleton()
+    if skeleton_model is None:
+        return mirror_map
+
+    skeleton_ref = _SESSION_MIRROR_MAP.get('skeleton', None)
+    if skeleton_ref is None or skeleton_ref() is not skeleton_model or _SESSION_MIRROR_MAP['key'] != cache_key:
+        _SESSION_MIRROR_MAP.update(
+            skeleton=weakref.ref(skeleton_model), key=cache_key,
+            mirror_map=mirrormap.MirrorMap(mirror_map.get_mirror_name, list(skeleton_model)))
+
+    return _SESSION_MIRROR_MAP['mirror_map']
+
+
+def get_mirror_names(names):
+    """
+    Returns the mirror names of the given names
+    :param names: list(str)
+    :return: list(str)
+    """
+
+    return get_mirror_map().get_mirror_names(names)
+
+
+def get_sides(mirror):
+    """
+    Returns the sides a component is built for and the side of its mirror rig
+    :param mirror: bool, whether or not the component is mirrored
+    :return: tuple(list(str), str)
+    """
+
+    cache_key = get_cache_key()
+    sides = _SIDES.get(cache_key, None)
+    if sides is None:
+        sides = _SIDES[cache_key] = (
+            list(api.get_sides(skip_default=True)[0]), [api.get_default_side()], api.get_mirror_side())
+    mirror_sides, default_sides, mirror_side = sides
+
+    return list(mirror_sides if mirror else default_sides), mirror_side
+
+
+def clear_cache():
+    """
+    Removes all cached mirror maps and sides (for example, when the naming rule of a project is edited)
+    """
+
+    mirrormap.clear_mirror_maps()
+    _SIDES.clear()
+    _SESSION_MIRROR_MAP.clear()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a solver that computes the pole vectors of all the limbs of a build in a single batch
+Limbs are only batched inside a pole vectors session: rigs add their limbs to the session solver when their joints
+are set, and the first pole vector that is requested solves all of them. Outside a session, each limb is solved alone
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import contextlib
+from collections import OrderedDict
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+
+np = lazyimport.lazy_module('numpy')
+polevectors = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.dccs.maya.core.polevectors')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+_ACTIVE_SOLVER = None
+
+
+@contextlib.contextmanager
+def pole_vectors_session():
+    """
+    Context manager that shares a pole vector solver between all the rigs created inside it (for example, during a
+    whole rig build), so limbs added to the solver before creating their rigs are solved together
+    :return: PoleVectorSolver
+    """
+
+    global _ACTIVE_SOLVER
+    previous_solver = _ACTIVE_SOLVER
+    _ACTIVE_SOLVER = PoleVectorSolver()
+    try:
+        yield _ACTIVE_SOLVER
+    finally:
+        _ACTIVE_SOLVER = previous_solver
+
+
+def get_pole_vector_solver():
+    """
+    Returns the pole vector solver of the current session. If no session is active, a new solver is returned, because
+    joints can be moved between builds and solved pole vectors cannot be reused
+    :return: PoleVectorSolver
+    """
+
+    if _ACTIVE_SOLVER is not None:
+        return _ACTIVE_SOLVER
+
+    return PoleVectorSolver()
+
+
+def read_world_positions(nodes):
+    """
+    Returns the world position of the given transforms, reading their world matrices through Maya API in a single
+    pass, without executing any command
+    :param nodes: list(str)
+    :return: np.array, (N, 3)
+    """
+
+    selection = OpenMaya.MSelectionList()
+    for node in nodes:
+        selection.add(node)
+
+    positions = np.empty((len(nodes), 3), dtype=np.float64)
+    for i in range(len(nodes)):
+        world_matrix = selection.getDagPath(i).inclusiveMatrix()
+        positions[i] = (world_matrix.getElement(3, 0), world_matrix.getElement(3, 1), world_matrix.getElement(3, 2))
+
+    return positions
+
+
+class PoleVectorSolver(object):
+    """
+    Stores limbs (start, mid and end joints) and computes the pole vectors of all the pending ones in a single batch:
+    the positions of all their joints are read at once and pole vectors are computed with vectorized operations.
+    Solved limbs can be mirrored, so the opposite side limb does not need to be solved
+    """
+
+    def __init__(self):
+        self._pending = OrderedDict()               # Limbs (joints and offset) waiting to be solved
+        self._pole_vectors = dict()                 # Maps limbs with their pole position and orientation
+
+    def __len__(self):
+        return len(self._pole_vectors)
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def add_limb(self, joints, offset=1.0):
+        """
+        Adds a limb to be solved in the next batch
+        :param joints: list(str), start, mid and end joints of the limb
+        :param offset: float, pole vector offset
+        """
+
+        limb = self._get_limb(joints, offset)
+        if limb not in self._pole_vectors and limb not in self._pending:
+            self._pending[limb] = None
+
+    def add_limbs(self, limbs, offset=1.0):
+        """
+        Adds the given limbs to be solved in the next batch
+        :param limbs: list(list(str)), start, mid and end joints of each limb
+        :param offset: float, pole vector offset used by all limbs
+        """
+
+        for joints in limbs:
+            self.add_limb(joints, offset)
+
+    def remove_limb(self, joints, offset=1.0):
+        """
+        Removes the given limb from the next batch. Limbs that are already solved are kept
+        :param joints: list(str), start, mid and end joints of the limb
+        :param offset: float, pole vector offset
+        """
+
+        self._pending.pop(self._get_limb(joints, offset), None)
+
+    def solve(self):
+        """
+        Computes the pole vectors of all pending limbs
+        :return: int, number of solved limbs
+        """
+
+        if not self._pending:
+            return 0
+
+        nodes = list()
+        node_indices = dict()
+        for joints, _ in self._pending:
+            for joint in joints:
+                if joint not in node_indices:
+                    node_indices[joint] = len(nodes)
+                    nodes.append(joint)
+        node_positions = read_world_positions(nodes)
+
+        limb_indices = [[node_indices[joint] for joint in joints] for joints, _ in self._pending]
+        offsets = [offset for _, offset in self._pending]
+        pole_positions, orientations = polevectors.get_pole_vectors(node_positions[limb_indices], offsets)
+        for limb, pole_position, orientation in zip(self._pending, pole_positions, orientations):
+            self._pole_vectors[limb] = (pole_position, orientation)
+
+        solved = len(self._pending)
+        self._pending.clear()
+
+        return solved
+
+    def get_pole_vector(self, joints, offset=1.0):
+        """
+        Returns the pole vector of the given limb, solving all pending limbs if needed
+        :param joints: list(str), start, mid and end joints of the limb
+        :param offset: float, pole vector offset
+        :return: tuple(list(float), list(list(float))), pole position and orientation (X, Y and Z axes)
+        """
+
+        limb = self._get_limb(joints, offset)
+        if limb not in self._pole_vectors:
+            self.add_limb(joints, offset)
+            self.solve()
+        pole_position, orientation = self._pole_vectors[limb]
+
+        return pole_position.tolist(), orientation.tolist()
+
+    def get_mirror_pole_vector(self, joints, offset=1.0, axis='x'):
+        """
+        Returns the pole vector of the limb that mirrors the given one across the plane perpendicular to the given axis
+        :param joints: list(str), start, mid and end joints of the limb to mirror
+        :param offset: float, pole vector offset
+        :param axis: str, x, y or z
+        :return: tuple(list(float), list(list(float))), pole position and orientation (X, Y and Z axes)
+        """
+
+        pole_position, orientation = self.get_pole_vector(joints, offset)
+        mirrored_positions, mirrored_orientations = polevectors.mirror_pole_vectors(
+            [pole_position], [orientation], axis)
+
+        return mirrored_positions[0].tolist(), mirrored_orientations[0].tolist()
+
+    def clear(self):
+        """
+        Removes all solved and pending limbs
+        """
+
+        self._pending.clear()
+        self._pole_vectors.clear()
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _get_limb(self, joints, offset):
+        """
+        Internal function that returns the key used to store the given limb
+        :param joints: list(str)
+        :param offset: float
+        :return: tuple(tuple(str), float)
+        """
+
+        if len(joints) != 3:
+            raise ValueError('Pole vectors need 3 joints (start, mid and end) but {} were given'.format(len(joints)))
+
+        return tuple(joints), float(offset)
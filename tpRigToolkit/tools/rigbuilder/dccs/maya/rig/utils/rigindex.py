@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains an in-memory index of the rigs of the scene, so tools can find the controls of a character or
+the rig that owns a node without walking all the transforms of the scene
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import metadata
+
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+RIG_GROUP_ATTRIBUTE = 'rigControlGroup'
+
+_RIG_INDEX = None
+
+
+def get_rig_index():
+    """
+    Returns the rig index of the current Maya scene
+    :return: RigIndex
+    """
+
+    global _RIG_INDEX
+    if _RIG_INDEX is None:
+        _RIG_INDEX = RigIndex(MayaSceneBackend())
+
+    return _RIG_INDEX
+
+
+def get_namespace(node):
+    """
+    Returns the namespace of the given node (characters are identified by their namespace)
+    :param node: str
+    :return: str, empty string if the node has no namespace
+    """
+
+    node = node.rsplit('|', 1)[-1]
+
+    return node.rsplit(':', 1)[0] if ':' in node else ''
+
+
+class RigInfo(object):
+    """
+    Info of a rig stored in the scene: its controls group and the data written by the rig during its creation
+    """
+
+    __slots__ = ('group', 'class_name', 'description', 'side', 'namespace', 'controls', 'sub_controls', 'joints')
+
+    def __init__(self, group, class_name=None, description=None, side=None, controls=None, sub_controls=None,
+                 joints=None):
+        self.group = group
+        self.class_name = class_name
+        self.description = description
+        self.side = side
+        self.namespace = get_namespace(group)
+        self.controls = list(controls or list())
+        self.sub_controls = list(sub_controls or list())
+        self.joints = list(joints or list())
+
+    def __repr__(self):
+        return '<RigInfo {} ({}, {}, {})>'.format(self.group, self.class_name, self.description, self.side)
+
+
+class RigIndex(object):
+    """
+    Maps rig groups with their class, side, description, controls and joints, and controls and joints with the rig
+    they belong to. Index is built with a single scan of the scene and it is rebuilt, when queried, only if the
+    generation of the scene backend changed since the last scan
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._generation = None
+        self._rigs = dict()                         # Maps rig groups with their RigInfo
+        self._namespace_rigs = dict()               # Maps namespaces with the RigInfo of their rigs
+        self._namespace_controls = dict()           # Maps namespaces with all their controls
+        self._node_rigs = dict()                    # Maps controls and joints with the RigInfo they belong to
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def rebuild(self):
+        """
+        Scans the scene and rebuilds the index
+        """
+
+        generation = self._backend.generation()
+        self._rigs.clear()
+        self._namespace_rigs.clear()
+        self._namespace_controls.clear()
+        self._node_rigs.clear()
+
+        for rig_info in self._backend.get_rigs():
+            self._rigs[rig_info.group] = rig_info
+            self._namespace_rigs.setdefault(rig_info.namespace, list()).append(rig_info)
+            namespace_controls = self._namespace_controls.setdefault(rig_info.namespace, list())
+            namespace_controls.extend(rig_info.controls)
+            namespace_controls.extend(rig_info.sub_controls)
+            for node in rig_info.joints:
+                self._node_rigs.setdefault(node, rig_info)
+            for node in rig_info.controls + rig_info.sub_controls:
+                self._node_rigs[node] = rig_info
+
+        self._generation = generation
+
+    def get_rig(self, group):
+        """
+        Returns the info of the rig of the given controls group
+        :param group: str
+        :return: RigInfo or None
+        """
+
+        self._update()
+
+        return self._rigs.get(group, None)
+
+    def get_rigs(self, namespace=None):
+        """
+        Returns the info of all the rigs of the scene or of the given namespace
+        :param namespace: str or None
+        :return: list(RigInfo)
+        """
+
+        self._update()
+        if namespace is None:
+            return list(self._rigs.values())
+
+        return list(self._namespace_rigs.get(namespace, list()))
+
+    def get_namespaces(self):
+        """
+        Returns the namespaces that contain rigs
+        :return: list(str)
+        """
+
+        self._update()
+
+        return sorted(self._namespace_rigs)
+
+    def get_character_controls(self, namespace=''):
+        """
+        Returns all the controls and sub controls of the rigs of the given namespace
+        :param namespace: str
+        :return: list(str)
+        """
+
+        self._update()
+
+        return list(self._namespace_controls.get(namespace, list()))
+
+    def get_node_rig(self, node):
+        """
+        Returns the rig that owns the given control or joint. Controls have priority over joints, because joints
+        can be linked by more than one rig
+        :param node: str
+        :return: RigInfo or None
+        """
+
+        self._update()
+
+        return self._node_rigs.get(node, None)
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _update(self):
+        """
+        Internal function that rebuilds the index if the scene changed since the last scan
+        """
+
+        if self._backend.generation() != self._generation:
+            self.rebuild()
+
+
+class MayaSceneBackend(object):
+    """
+    Reads rigs from the current Maya scene. Scene callbacks increase the generation of the backend when rig groups are
+    added, removed or renamed, when message connections into rig groups change, when nodes connected to rig groups
+    are renamed, or when a new scene is opened. Other scene changes (keyframes, constraints, ...) do not invalidate it.
+    New rig groups are found once their controls or joints are connected to them
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._callback_ids = list()
+
+    def generation(self):
+        """
+        Returns the generation of the scene
+        :return: int
+        """
+
+        if not self._callback_ids:
+            self._add_callbacks()
+
+        return self._generation
+
+    def get_rigs(self):
+        """
+        Returns the info of all the rigs of the scene
+        :return: list(RigInfo)
+        """
+
+        rigs = list()
+        groups = maya.cmds.ls('*.{}'.format(RIG_GROUP_ATTRIBUTE), objectsOnly=True, recursive=True, long=False)
+        for group in groups or list():
+            messages = metadata.get_rig_messages(group)
+            rigs.append(RigInfo(
+                group, class_name=self._get_string_attribute(group, 'className'),
+                description=self._get_string_attribute(group, 'description'),
+                side=self._get_string_attribute(group, 'side'),
+                controls=messages['control'], sub_controls=messages['subControl'], joints=messages['joint']))
+
+        return rigs
+
+    def remove_callbacks(self):
+        """
+        Removes all the scene callbacks of the backend
+        """
+
+        if self._callback_ids:
+            OpenMaya.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = list()
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _add_callbacks(self):
+        """
+        Internal function that registers the scene callbacks that invalidate the index
+        """
+
+        self._callback_ids.append(OpenMaya.MDGMessage.addNodeAddedCallback(self._on_node_changed, 'transform'))
+        self._callback_ids.append(OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_node_changed, 'transform'))
+        self._callback_ids.append(OpenMaya.MDGMessage.addConnectionCallback(self._on_connection_changed))
+        self._callback_ids.append(OpenMaya.MNodeMessage.addNameChangedCallback(
+            OpenMaya.MObject.kNullObj, self._on_name_changed))
+        for scene_message in (OpenMaya.MSceneMessage.kAfterOpen, OpenMaya.MSceneMessage.kAfterNew,
+                              OpenMaya.MSceneMessage.kAfterImport, OpenMaya.MSceneMessage.kAfterCreateReference):
+            self._callback_ids.append(OpenMaya.MSceneMessage.addCallback(scene_message, self._on_scene_changed))
+
+    def _get_string_attribute(self, node, attribute_name):
+        """
+        Internal function that returns the value of the given string attribute
+        :param node: str
+        :param attribute_name: str
+        :return: str or None
+        """
+
+        if not maya.cmds.attributeQuery(attribute_name, node=node, exists=True):
+            return None
+
+        return maya.cmds.getAttr('{}.{}'.format(node, attribute_name))
+
+    # ==============================================================================================
+    # CALLBACKS
+    # ==============================================================================================
+
+    def _on_scene_changed(self, *args):
+        """
+        Internal callback function that is called when the scene changes
+        """
+
+        self._generation += 1
+
+    def _on_node_changed(self, node, *args):
+        """
+        Internal callback function that is called when a transform node is added or removed
+        :param node: OpenMaya.MObject
+        """
+
+        if _is_rig_group(node):
+            self._generation += 1
+
+    def _on_connection_changed(self, source_plug, destination_plug, *args):
+        """
+        Internal callback function that is called when a connection is made or broken
+        :param source_plug: OpenMaya.MPlug
+        :param destination_plug: OpenMaya.MPlug
+        """
+
+        if source_plug.partialName(useLongNames=True) == 'message' and _is_rig_group(destination_plug.node()):
+            self._generation += 1
+
+    def _on_name_changed(self, node, *args):
+        """
+        Internal callback function that is called when a node is renamed
+        :param node: OpenMaya.MObject
+        """
+
+        if _is_rig_group(node) or _is_rig_member(node):
+            self._generation += 1
+
+
+def _is_rig_group(node):
+    """
+    Internal function that returns whether or not the given node is a rig group
+    :param node: OpenMaya.MObject
+    :return: bool
+    """
+
+    return OpenMaya.MFnDependencyNode(node).hasAttribute(RIG_GROUP_ATTRIBUTE)
+
+
+def _is_rig_member(node):
+    """
+    Internal function that returns whether or not the message of the given node is connected to a rig group
+    :param node: OpenMaya.MObject
+    :return: bool
+    """
+
+    node_fn = OpenMaya.MFnDependencyNode(node)
+    if not node_fn.hasAttribute('message'):
+        return False
+
+    return any(_is_rig_group(plug.node()) for plug in node_fn.findPlug('message', False).destinations())
+
+
+class MemorySceneBackend(object):
+    """
+    Stand-in scene backend that stores rigs in memory. Its generation increases each time a rig is added or removed.
+    Used to work with rig indices outside Maya
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._rigs = dict()
+
+    def generation(self):
+        """
+        Returns the generation of the scene
+        :return: int
+        """
+
+        return self._generation
+
+    def get_rigs(self):
+        """
+        Returns the info of all the rigs of the scene
+        :return: list(RigInfo)
+        """
+
+        return list(self._rigs.values())
+
+    def add_rig(self, group, **kwargs):
+        """
+        Adds a new rig into the scene
+        :param group: str, controls group of the rig
+        :param kwargs: dict, RigInfo arguments
+        :return: RigInfo
+        """
+
+        rig_info = RigInfo(group, **kwargs)
+        self._rigs[group] = rig_info
+        self._generation += 1
+
+        return rig_info
+
+    def remove_rig(self, group):
+        """
+        Removes the rig of the given controls group from the scene
+        :param group: str
+        """
+
+        if self._rigs.pop(group, None):
+            self._generation += 1
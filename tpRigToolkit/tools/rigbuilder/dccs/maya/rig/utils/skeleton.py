@@ -0,0 +1,407 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains an in-memory model of the skeleton of the scene (names, types, hierarchy and matrices of its
+transforms), loaded once at the start of a build and shared by all the rigs, so rigs do not query the same joints
+again and again
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import functools
+import contextlib
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport, matrixmath, mirrormap
+
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+api = lazyimport.lazy_module('tpRigToolkit.tools.rigbuilder.core.api')
+
+NODE_TYPE_JOINT = 'joint'
+NODE_TYPE_TRANSFORM = 'transform'
+
+_ACTIVE_SKELETON = None
+_PREVIOUS_SKELETONS = list()
+
+
+def begin_skeleton_session(mirror_name_fn=None):
+    """
+    Loads the skeleton of the current scene and shares it between all the rigs created until end_skeleton_session is
+    called. Build runners call it before the first build node runs and end_skeleton_session after the last one, so
+    the whole build uses a single skeleton. Sessions can be nested
+    :param mirror_name_fn: fn or None, function that returns the mirror name of a node name
+    :return: SkeletonModel
+    """
+
+    global _ACTIVE_SKELETON
+    _PREVIOUS_SKELETONS.append(_ACTIVE_SKELETON)
+    _ACTIVE_SKELETON = load_scene_skeleton(mirror_name_fn=mirror_name_fn)
+
+    return _ACTIVE_SKELETON
+
+
+def end_skeleton_session():
+    """
+    Ends the current skeleton session and restores the skeleton of the previous one, if any
+    """
+
+    global _ACTIVE_SKELETON
+    _ACTIVE_SKELETON = _PREVIOUS_SKELETONS.pop() if _PREVIOUS_SKELETONS else None
+
+
+@contextlib.contextmanager
+def skeleton_session(mirror_name_fn=None):
+    """
+    Context manager that loads the skeleton of the current scene and shares it between all the rigs created inside
+    it (for example, during a whole rig build)
+    :param mirror_name_fn: fn or None, function that returns the mirror name of a node name
+    :return: SkeletonModel
+    """
+
+    skeleton_model = begin_skeleton_session(mirror_name_fn=mirror_name_fn)
+    try:
+        yield skeleton_model
+    finally:
+        end_skeleton_session()
+
+
+def skeleton_run(fn):
+    """
+    Decorator for the run function of build nodes. If no skeleton session is active, a new one is opened while the
+    node runs, so all the rigs created by the node share the same skeleton. If a session is active (opened by the
+    build runner or by a parent node) it is reused
+    :param fn: fn
+    :return: fn
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _ACTIVE_SKELETON is not None:
+            return fn(*args, **kwargs)
+        with skeleton_session(mirror_name_fn=api.get_mirror_name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def get_skeleton():
+    """
+    Returns the skeleton of the current session
+    :return: SkeletonModel or None, None if no session is active
+    """
+
+    return _ACTIVE_SKELETON
+
+
+def load_scene_skeleton(mirror_name_fn=None):
+    """
+    Returns a new skeleton model with all the transforms of the current Maya scene, read with a single pass over the
+    scene DAG, without executing any command
+    :param mirror_name_fn: fn or None, function that returns the mirror name of a node name
+    :return: SkeletonModel
+    """
+
+    skeleton_model = SkeletonModel(mirror_name_fn=mirror_name_fn)
+    dag_iterator = OpenMaya.MItDag(OpenMaya.MItDag.kDepthFirst, OpenMaya.MFn.kTransform)
+    while not dag_iterator.isDone():
+        dag_path = dag_iterator.getPath()
+        parent_path = OpenMaya.MDagPath(dag_path).pop()
+        parent = parent_path.partialPathName() if parent_path.length() else None
+        world_matrix = dag_path.inclusiveMatrix()
+        local_matrix = world_matrix * dag_path.exclusiveMatrixInverse()
+        skeleton_model.add_node(
+            dag_path.partialPathName(),
+            NODE_TYPE_JOINT if dag_path.hasFn(OpenMaya.MFn.kJoint) else NODE_TYPE_TRANSFORM, parent=parent,
+            world_matrix=_get_matrix_values(world_matrix), local_matrix=_get_matrix_values(local_matrix))
+        dag_iterator.next()
+
+    return skeleton_model
+
+
+def read_world_matrix(node):
+    """
+    Returns the current world matrix of the given transform, read through Maya API without executing any command
+    :param node: str
+    :return: list(float)
+    """
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(node)
+
+    return _get_matrix_values(selection.getDagPath(0).inclusiveMatrix())
+
+
+class SkeletonNode(object):
+    """
+    Data of a transform stored in a skeleton model
+    """
+
+    __slots__ = ('name', 'node_type', 'parent', 'children', 'world_matrix', 'local_matrix')
+
+    def __init__(self, name, node_type, parent=None, world_matrix=None, local_matrix=None):
+        self.name = name
+        self.node_type = node_type
+        self.parent = parent
+        self.children = list()
+        self.world_matrix = list(world_matrix or matrixmath.IDENTITY_MATRIX)
+        self.local_matrix = list(local_matrix) if local_matrix else None
+
+    def __repr__(self):
+        return '<SkeletonNode {} ({})>'.format(self.name, self.node_type)
+
+
+class SkeletonModel(object):
+    """
+    Stores the transforms of a skeleton with their type, parent, children and world and local matrices, and the
+    mirror of each one of them. Rigs update the model when they duplicate or reparent joints, so it stays valid during
+    the whole build. Local matrices of reparented nodes are computed, when queried, from the world matrix of their
+    new parent
+    """
+
+    def __init__(self, mirror_name_fn=None):
+        self._nodes = dict()                        # Maps node names with their SkeletonNode
+        self._orphans = dict()                      # Maps parents not added yet with their children
+        self._mirror_name_fn = mirror_name_fn       # Function used to find the mirror of each node
+        self._mirror_map = None                     # Mirror map of the skeleton nodes, built when first queried
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def add_node(self, name, node_type=NODE_TYPE_JOINT, parent=None, world_matrix=None, local_matrix=None):
+        """
+        Adds a new node into the skeleton
+        :param name: str
+        :param node_type: str, NODE_TYPE_JOINT or NODE_TYPE_TRANSFORM
+        :param parent: str or None
+        :param world_matrix: list(float) or None
+        :param local_matrix: list(float) or None, if not given it is computed from the world matrix of the parent
+        :return: SkeletonNode
+        """
+
+        if name in self._nodes:
+            self.remove_node(name)
+
+        node = SkeletonNode(name, node_type, parent=parent, world_matrix=world_matrix, local_matrix=local_matrix)
+        self._nodes[name] = node
+        self._add_child(parent, name)
+        node.children.extend(self._orphans.pop(name, list()))
+        if self._mirror_map is not None:
+            self._mirror_map.update([name])
+
+        return node
+
+    def remove_node(self, name):
+        """
+        Removes given node from the skeleton. Its children keep their parent name
+        :param name: str
+        """
+
+        node = self._nodes.pop(name, None)
+        if not node:
+            return
+        self._remove_child(node.parent, name)
+        if node.children:
+            self._orphans[name] = node.children
+        self._mirror_map = None
+
+    def get_node_type(self, name):
+        """
+        Returns the type of the given node
+        :param name: str
+        :return: str or None, None if the node is not in the skeleton
+        """
+
+        node = self._nodes.get(name, None)
+
+        return node.node_type if node else None
+
+    def is_joint(self, name):
+        """
+        Returns whether or not given node is a joint
+        :param name: str
+        :return: bool
+        """
+
+        return self.get_node_type(name) == NODE_TYPE_JOINT
+
+    def is_transform(self, name):
+        """
+        Returns whether or not given node is a transform (joints are transforms)
+        :param name: str
+        :return: bool
+        """
+
+        return name in self._nodes
+
+    def get_parent(self, name):
+        """
+        Returns the parent of the given node
+        :param name: str
+        :return: str or None
+        """
+
+        return self._nodes[name].parent
+
+    def get_children(self, name):
+        """
+        Returns the children of the given node
+        :param name: str
+        :return: list(str)
+        """
+
+        return list(self._nodes[name].children)
+
+    def get_world_matrix(self, name):
+        """
+        Returns the world matrix of the given node
+        :param name: str
+        :return: list(float)
+        """
+
+        return list(self._nodes[name].world_matrix)
+
+    def get_world_position(self, name):
+        """
+        Returns the world position of the given node
+        :param name: str
+        :return: list(float)
+        """
+
+        return self._nodes[name].world_matrix[12:15]
+
+    def get_local_matrix(self, name):
+        """
+        Returns the matrix of the given node relative to its parent
+        :param name: str
+        :return: list(float) or None, None if the node has a parent that is not in the skeleton
+        """
+
+        node = self._nodes[name]
+        if node.local_matrix is not None:
+            return list(node.local_matrix)
+        if not node.parent:
+            return list(node.world_matrix)
+        parent_node = self._nodes.get(node.parent, None)
+        if not parent_node:
+            return None
+        node.local_matrix = matrixmath.multiply_matrices(
+            node.world_matrix, matrixmath.inverse_matrix(parent_node.world_matrix))
+
+        return list(node.local_matrix)
+
+    def get_mirror(self, name):
+        """
+        Returns the node that mirrors the given one
+        :param name: str
+        :return: str or None, None if the node has no mirror node in the skeleton
+        """
+
+        mirror_map = self.get_mirror_map()
+
+        return mirror_map.get_mirror(name) if mirror_map else None
+
+    def get_mirror_map(self):
+        """
+        Returns the mirror map of the nodes of the skeleton
+        :return: mirrormap.MirrorMap or None, None if the skeleton has no mirror name function
+        """
+
+        if self._mirror_map is None and self._mirror_name_fn:
+            self._mirror_map = mirrormap.MirrorMap(self._mirror_name_fn, list(self._nodes))
+
+        return self._mirror_map
+
+    def set_parent(self, name, parent):
+        """
+        Updates the parent of the given node. As in the scene, world matrix of the node is kept
+        :param name: str
+        :param parent: str or None
+        """
+
+        node = self._nodes[name]
+        self._remove_child(node.parent, name)
+        node.parent = parent
+        node.local_matrix = None
+        self._add_child(parent, name)
+
+    def add_duplicates(self, source_nodes, new_nodes):
+        """
+        Adds the nodes created by duplicating the given nodes. New nodes take the type and matrices of their source
+        nodes and they are parented to the duplicate of the parent of their source nodes (if it was also duplicated)
+        or to the same parent of their source nodes
+        :param source_nodes: list(str)
+        :param new_nodes: list(str)
+        :return: int, number of added nodes
+        """
+
+        if len(source_nodes) != len(new_nodes):
+            raise ValueError('{} duplicated nodes given for {} source nodes'.format(len(new_nodes), len(source_nodes)))
+
+        duplicates = dict(zip(source_nodes, new_nodes))
+        added = 0
+        for source_node, new_node in zip(source_nodes, new_nodes):
+            node = self._nodes.get(source_node, None)
+            if not node:
+                continue
+            self.add_node(
+                new_node, node.node_type, parent=duplicates.get(node.parent, node.parent),
+                world_matrix=node.world_matrix, local_matrix=node.local_matrix)
+            added += 1
+
+        return added
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _add_child(self, parent, name):
+        """
+        Internal function that adds given node to the children of the given parent
+        :param parent: str or None
+        :param name: str
+        """
+
+        if not parent:
+            return
+        parent_node = self._nodes.get(parent, None)
+        if parent_node:
+            parent_node.children.append(name)
+        else:
+            self._orphans.setdefault(parent, list()).append(name)
+
+    def _remove_child(self, parent, name):
+        """
+        Internal function that removes given node from the children of the given parent
+        :param parent: str or None
+        :param name: str
+        """
+
+        parent_node = self._nodes.get(parent, None)
+        children = parent_node.children if parent_node else self._orphans.get(parent, list())
+        if name in children:
+            children.remove(name)
+
+
+def _get_matrix_values(matrix):
+    """
+    Internal function that returns the values of the given Maya matrix
+    :param matrix: OpenMaya.MMatrix
+    :return: list(float)
+    """
+
+    return [matrix.getElement(row, column) for row in range(4) for column in range(4)]
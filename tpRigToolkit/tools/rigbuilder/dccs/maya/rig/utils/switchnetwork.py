@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a lightweight switch network. A switch attribute drives one weight node per index, and all
+constraint weights of an index are connected to that node. Control group visibilities of an index are connected to
+one condition node per index, that is only true when the switch value is the index. Index nodes are created when a
+chain joins the switch, so existing nodes are never rebuilt
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+from tpRigToolkit.tools.rigbuilder.dccs.maya.core import lazyimport
+from tpRigToolkit.tools.rigbuilder.dccs.maya.rig.utils import apiundo, attributeschema, metadata
+
+maya = lazyimport.lazy_module('tpDcc.dccs.maya')
+OpenMaya = lazyimport.lazy_module('maya.api.OpenMaya')
+
+INDEX_ATTRIBUTE = 'switchIndex'
+WEIGHT_NODE_TYPE = 'remapValue'
+VISIBILITY_NODE_TYPE = 'condition'
+
+
+def get_index_weight(switch_value, index):
+    """
+    Returns the weight of the given index with the given switch value. Weight is 1 when the switch value is the index
+    and decreases linearly to 0 at the previous and next indices, so the weights of all indices always sum 1
+    :param switch_value: float
+    :param index: int
+    :return: float
+    """
+
+    return max(1.0 - abs(switch_value - index), 0.0)
+
+
+def create_switch_attribute(node, attribute, index):
+    """
+    Creates the switch attribute in the given node, or updates its range so it includes the given index
+    :param node: str
+    :param attribute: str
+    :param index: int
+    """
+
+    max_value = float(index)
+    if maya.cmds.attributeQuery(attribute, node=node, exists=True):
+        if maya.cmds.attributeQuery(attribute, node=node, maxExists=True):
+            max_value = max(max_value, maya.cmds.attributeQuery(attribute, node=node, maximum=True)[0])
+
+    switch_attributes = attributeschema.AttributeSchema([attributeschema.AttributeSpec(
+        attribute, attributeschema.TYPE_DOUBLE, default=0.0, min_value=0.0, max_value=max_value, keyable=True)])
+    switch_attributes.apply(node)
+
+
+def get_constraint_weight_plugs(source_chain, target_chain):
+    """
+    Returns the constraint weight attributes that blend each source joint into its target joint
+    :param source_chain: list(str)
+    :param target_chain: list(str)
+    :return: tuple(int, list(str)), index of the source chain in the constraints targets and weight attributes.
+        Index is -1 if target joints are not constrained to the source joints
+    """
+
+    index = -1
+    weight_plugs = list()
+    for source, target in zip(source_chain, target_chain):
+        source = maya.cmds.ls(source, long=True)[0]
+        constraints = maya.cmds.listConnections(target, source=True, destination=False, type='constraint') or list()
+        for constraint in sorted(set(constraints)):
+            constraint_fn = getattr(maya.cmds, maya.cmds.nodeType(constraint))
+            constraint_targets = maya.cmds.ls(constraint_fn(constraint, query=True, targetList=True), long=True)
+            if source not in constraint_targets:
+                continue
+            target_index = constraint_targets.index(source)
+            weight_aliases = constraint_fn(constraint, query=True, weightAliasList=True)
+            weight_plugs.append('{}.{}'.format(constraint, weight_aliases[target_index]))
+            index = max(index, target_index)
+
+    return index, weight_plugs
+
+
+class SwitchNetwork(object):
+    """
+    Switch network of a switch attribute. Index nodes of the existing indices are found from the connections of the
+    switch attribute, so a network can be created again for the same attribute at any time
+    """
+
+    def __init__(self, node, attribute):
+        self._node = node                   # Node that contains the switch attribute
+        self._attribute = attribute         # Name of the switch attribute
+        self._weight_nodes = dict()         # Maps indices with the weight node of each index
+        self._visibility_nodes = dict()     # Maps indices with the visibility condition node of each index
+
+        self._load()
+
+    def __len__(self):
+        return len(set(self._weight_nodes) | set(self._visibility_nodes))
+
+    # ==============================================================================================
+    # PROPERTIES
+    # ==============================================================================================
+
+    @property
+    def node(self):
+        return self._node
+
+    @property
+    def attribute(self):
+        return self._attribute
+
+    # ==============================================================================================
+    # BASE
+    # ==============================================================================================
+
+    def get_index_count(self):
+        """
+        Returns the number of indices of the switch
+        :return: int
+        """
+
+        indices = set(self._weight_nodes) | set(self._visibility_nodes)
+
+        return max(indices) + 1 if indices else 0
+
+    def get_weight_plug(self, index):
+        """
+        Returns the attribute that contains the weight of the given index, creating its weight node if necessary
+        :param index: int
+        :return: str
+        """
+
+        weight_node = self._weight_nodes.get(index, None)
+        if not weight_node:
+            weight_node = self._weight_nodes[index] = self._create_weight_node(index)
+
+        return '{}.outValue'.format(weight_node)
+
+    def get_visibility_plug(self, index):
+        """
+        Returns the attribute that is 1 when the switch value is the given index and 0 otherwise, creating its
+        condition node if necessary
+        :param index: int
+        :return: str
+        """
+
+        visibility_node = self._visibility_nodes.get(index, None)
+        if not visibility_node:
+            visibility_node = self._visibility_nodes[index] = self._create_visibility_node(index)
+
+        return '{}.outColorR'.format(visibility_node)
+
+    def connect_weights(self, index, plugs):
+        """
+        Connects the weight of the given index into the given attributes
+        :param index: int
+        :param plugs: list(str)
+        """
+
+        self._connect(self.get_weight_plug(index), plugs)
+
+    def connect_visibility(self, index, nodes):
+        """
+        Connects the visibility of the given nodes to the condition of the given index, so nodes are only visible
+        while the switch value is the index
+        :param index: int
+        :param nodes: list(str) or str
+        """
+
+        if not isinstance(nodes, (list, tuple)):
+            nodes = [nodes]
+
+        self._connect(self.get_visibility_plug(index), ['{}.visibility'.format(node) for node in nodes])
+
+    # ==============================================================================================
+    # INTERNAL
+    # ==============================================================================================
+
+    def _load(self):
+        """
+        Internal function that finds the index nodes connected to the switch attribute
+        """
+
+        switch_plug = self._get_switch_plug()
+        for destination_plug in switch_plug.destinations():
+            index_fn = OpenMaya.MFnDependencyNode(destination_plug.node())
+            if not index_fn.hasAttribute(INDEX_ATTRIBUTE):
+                continue
+            index = index_fn.findPlug(INDEX_ATTRIBUTE, False).asInt()
+            if index_fn.typeName == VISIBILITY_NODE_TYPE:
+                self._visibility_nodes[index] = index_fn.name()
+            else:
+                self._weight_nodes[index] = index_fn.name()
+
+    def _connect(self, source_plug, plugs):
+        """
+        Internal function that connects the given source attribute into the given attributes, if they are not
+        connected yet
+        :param source_plug: str
+        :param plugs: list(str)
+        """
+
+        for plug in plugs:
+            if not maya.cmds.isConnected(source_plug, plug):
+                maya.cmds.connectAttr(source_plug, plug, force=True)
+
+    def _get_switch_plug(self):
+        """
+        Internal function that returns the plug of the switch attribute
+        :return: OpenMaya.MPlug
+        """
+
+        node_fn = OpenMaya.MFnDependencyNode(metadata.get_node_object(self._node))
+
+        return node_fn.findPlug(self._attribute, False)
+
+    def _create_index_node(self, modifier, node_type, index, suffix=''):
+        """
+        Internal function that creates a node of the given index, tagged with the index attribute, and adds the
+        connection of the switch attribute into the given input attribute of the node to the given DG modifier
+        :param modifier: OpenMaya.MDGModifier
+        :param node_type: str
+        :param index: int
+        :param suffix: str
+        :return: OpenMaya.MFnDependencyNode
+        """
+
+        index_object = modifier.createNode(node_type)
+        node_name = self._node.rsplit('|', 1)[-1]
+        modifier.renameNode(index_object, '{}_{}{}{}'.format(node_name, self._attribute, index, suffix))
+        index_attribute = OpenMaya.MFnNumericAttribute().create(
+            INDEX_ATTRIBUTE, INDEX_ATTRIBUTE, OpenMaya.MFnNumericData.kInt, index)
+        modifier.addAttribute(index_object, index_attribute)
+        modifier.doIt()
+
+        index_fn = OpenMaya.MFnDependencyNode(index_object)
+        modifier.newPlugValueInt(index_fn.findPlug(INDEX_ATTRIBUTE, False), index)
+
+        return index_fn
+
+    def _create_weight_node(self, index):
+        """
+        Internal function that creates the weight node of the given index. It is a remapValue node whose ramp goes from
+        0 at the previous index to 1 at the index and back to 0 at the next index
+        :param index: int
+        :return: str
+        """
+
+        modifier = OpenMaya.MDGModifier()
+        weight_fn = self._create_index_node(modifier, WEIGHT_NODE_TYPE, index)
+        modifier.newPlugValueDouble(weight_fn.findPlug('inputMin', False), index - 1)
+        modifier.newPlugValueDouble(weight_fn.findPlug('inputMax', False), index + 1)
+        value_plug = weight_fn.findPlug('value', False)
+        for point_index, (position, value) in enumerate(((0.0, 0.0), (0.5, 1.0), (1.0, 0.0))):
+            point_plug = value_plug.elementByLogicalIndex(point_index)
+            modifier.newPlugValueDouble(point_plug.child(0), position)
+            modifier.newPlugValueDouble(point_plug.child(1), value)
+            modifier.newPlugValueInt(point_plug.child(2), 1)
+        modifier.connect(self._get_switch_plug(), weight_fn.findPlug('inputValue', False))
+        modifier.doIt()
+        apiundo.commit(modifier)
+
+        return weight_fn.name()
+
+    def _create_visibility_node(self, index):
+        """
+        Internal function that creates the visibility node of the given index. It is a condition node whose red output
+        is 1 when the switch value is equal to the index and 0 otherwise
+        :param index: int
+        :return: str
+        """
+
+        modifier = OpenMaya.MDGModifier()
+        visibility_fn = self._create_index_node(modifier, VISIBILITY_NODE_TYPE, index, suffix='Visibility')
+        modifier.newPlugValueDouble(visibility_fn.findPlug('secondTerm', False), index)
+        modifier.newPlugValueInt(visibility_fn.findPlug('operation', False), 0)
+        modifier.newPlugValueDouble(visibility_fn.findPlug('colorIfTrueR', False), 1.0)
+        modifier.newPlugValueDouble(visibility_fn.findPlug('colorIfFalseR', False), 0.0)
+        modifier.connect(self._get_switch_plug(), visibility_fn.findPlug('firstTerm', False))
+        modifier.doIt()
+        apiundo.commit(modifier)
+
+        return visibility_fn.name()